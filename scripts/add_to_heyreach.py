@@ -2,12 +2,27 @@
 """
 Add campaign prospects to HeyReach lead list.
 Creates a new list and adds all prospects with custom fields.
+
+Leads are sent in parallel chunks of up to 100 (the HeyReach per-call limit).
+Each acknowledged lead is recorded in a local SQLite ledger
+(data/heyreach/lead_ledger.db), as is the id of the list created for
+LIST_NAME. A rerun adds to the same list and only sends the leads that are
+missing from it.
+
+Usage:
+    python add_to_heyreach.py
+    python add_to_heyreach.py --workers 8 --list-id 123456
 """
 
+import argparse
 import os
 import sys
 from datagen_sdk import DatagenClient
 
+from heyreach_loader import DEFAULT_LEDGER_PATH, DEFAULT_WORKERS, MAX_LEADS_PER_REQUEST, LeadLedger, load_leads
+from message_renderer import MessageTemplate, extract_first_name, split_name
+from neon_client import NeonClient
+
 # Verify API key
 DATAGEN_API_KEY = os.getenv("DATAGEN_API_KEY")
 if not DATAGEN_API_KEY:
@@ -34,20 +49,7 @@ Would you be interested in learning Claude Code from us? We're offering free 1:1
 
 Yu-Sheng"""
 
-
-def extract_first_name(full_name):
-    """Extract first name from full name, handling emojis."""
-    if not full_name:
-        return "there"
-
-    # Remove common emojis
-    clean_name = full_name.replace("🦾", "").replace("👨‍💻", "").replace("🪄", "").strip()
-
-    # Split and get first part
-    parts = clean_name.split()
-    if parts:
-        return parts[0]
-    return "there"
+MESSAGE = MessageTemplate(MESSAGE_TEMPLATE)
 
 
 def fetch_campaign_prospects():
@@ -70,25 +72,10 @@ def fetch_campaign_prospects():
 
     print(f"📊 Fetching prospects from {CAMPAIGN_TABLE}...")
 
-    result = client.execute_tool(
-        "mcp_Neon_run_sql",
-        {
-            "params": {
-                "projectId": PROJECT_ID,
-                "branchId": BRANCH_ID,
-                "databaseName": DATABASE,
-                "sql": query
-            }
-        }
-    )
-
-    # Parse result
-    if result and len(result) > 0:
-        prospects = result[0]
-        print(f"✅ Found {len(prospects)} pending prospects\n")
-        return prospects
-
-    return []
+    neon = NeonClient(client, project_id=PROJECT_ID, branch_id=BRANCH_ID, database_name=DATABASE)
+    prospects = neon.query(query)
+    print(f"✅ Found {len(prospects)} pending prospects\n")
+    return prospects
 
 
 def create_heyreach_list():
@@ -121,16 +108,12 @@ def format_leads_for_heyreach(prospects):
 
     leads = []
 
-    for prospect in prospects:
-        first_name = extract_first_name(prospect.get("name", ""))
-
-        # Create the personalized message
-        message = MESSAGE_TEMPLATE.format(first_name=first_name)
+    # Render every personalized message in one pass
+    messages = MESSAGE.render_many([{"first_name": extract_first_name(p.get("name"))} for p in prospects])
 
+    for prospect, message in zip(prospects, messages):
         # Split name into first and last
-        name_parts = prospect.get("name", "").replace("🦾", "").replace("👨‍💻", "").replace("🪄", "").strip().split()
-        first = name_parts[0] if name_parts else ""
-        last = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
+        first, last = split_name(prospect.get("name"))
 
         lead = {
             "profileUrl": prospect.get("linkedin_url"),
@@ -159,63 +142,56 @@ def format_leads_for_heyreach(prospects):
     return leads
 
 
-def add_leads_to_heyreach(list_id, leads):
-    """Add leads to HeyReach list in batches of 100."""
+def add_leads_to_heyreach(list_id, leads, ledger=None, workers=DEFAULT_WORKERS, chunk_size=MAX_LEADS_PER_REQUEST):
+    """Add leads to HeyReach list in parallel chunks, skipping leads the ledger has already seen."""
 
     total_leads = len(leads)
-    batch_size = 100
-    batches = [leads[i:i + batch_size] for i in range(0, total_leads, batch_size)]
-
     print(f"📤 Adding {total_leads} leads to HeyReach list {list_id}...")
-    print(f"   Processing in {len(batches)} batch(es)\n")
-
-    total_added = 0
-    total_updated = 0
-    total_failed = 0
-
-    for i, batch in enumerate(batches, 1):
-        print(f"   Batch {i}/{len(batches)}: Adding {len(batch)} leads...")
-
-        result = client.execute_tool(
-            "mcp_Heyreach_add_leads_to_list_v2",
-            {
-                "listId": list_id,
-                "leads": batch
-            }
-        )
-
-        # Parse result
-        if result and isinstance(result, list) and len(result) > 0:
-            batch_result = result[0]
-            added = batch_result.get("addedCount", 0)
-            updated = batch_result.get("updatedCount", 0)
-            failed = batch_result.get("failedCount", 0)
-
-            total_added += added
-            total_updated += updated
-            total_failed += failed
-
-            print(f"   ✅ Batch {i}: Added {added}, Updated {updated}, Failed {failed}")
-        else:
-            print(f"   ❌ Batch {i} failed")
-            print(f"   Result: {result}")
+    print(f"   Chunks of up to {chunk_size}, {workers} in parallel\n")
+
+    result, err = load_leads(
+        client,
+        list_id,
+        leads,
+        ledger=ledger,
+        chunk_size=chunk_size,
+        workers=workers,
+        log=lambda line: print(f"   {line}"),
+    )
 
     print(f"\n{'='*80}")
     print(f"SUMMARY:")
     print(f"{'='*80}")
-    print(f"✅ Total Added: {total_added}")
-    print(f"🔄 Total Updated: {total_updated}")
-    print(f"❌ Total Failed: {total_failed}")
+    print(f"⏭️  Already in list: {result.skipped}")
+    print(f"✅ Total Added: {result.added}")
+    print(f"🔄 Total Updated: {result.updated}")
+    print(f"❌ Total Failed: {result.failed}")
+    print(f"⏱️  {result.calls} calls in {result.seconds:.1f}s")
     print(f"{'='*80}\n")
+    if err:
+        print(f"❌ {err}")
+        for error in result.errors[:10]:
+            print(f"   - {error}")
+        print("   Rerun to retry the leads that are missing.\n")
 
     return {
-        "added": total_added,
-        "updated": total_updated,
-        "failed": total_failed
+        "added": result.added,
+        "updated": result.updated,
+        "failed": result.failed,
+        "skipped": result.skipped
     }
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Add campaign prospects to a HeyReach lead list")
+    parser.add_argument("--list-id", type=int, help="Add to this existing HeyReach list instead of the one created for LIST_NAME")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Chunks sent in parallel (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--chunk-size", type=int, default=MAX_LEADS_PER_REQUEST,
+                        help=f"Leads per call (max {MAX_LEADS_PER_REQUEST})")
+    parser.add_argument("--ledger", default=str(DEFAULT_LEDGER_PATH), help="SQLite ledger of acknowledged leads")
+    args = parser.parse_args()
+
     print("="*80)
     print("ADD PROSPECTS TO HEYREACH")
     print("="*80)
@@ -229,12 +205,27 @@ def main():
         print("❌ No pending prospects found")
         sys.exit(0)
 
-    # Step 2: Create HeyReach list
-    list_id = create_heyreach_list()
+    # Step 2: Reuse this campaign's HeyReach list, or create it
+    ledger = LeadLedger(args.ledger)
+    list_id = args.list_id
+    if not list_id:
+        list_id, err = ledger.get_list_id(LIST_NAME)
+        if err:
+            print(f"❌ {err}")
+            sys.exit(1)
+        if list_id:
+            print(f"♻️  Reusing HeyReach list {list_id} created for '{LIST_NAME}'\n")
 
     if not list_id:
-        print("❌ Failed to create HeyReach list")
-        sys.exit(1)
+        list_id = create_heyreach_list()
+
+        if not list_id:
+            print("❌ Failed to create HeyReach list")
+            sys.exit(1)
+
+        err = ledger.save_list_id(LIST_NAME, list_id)
+        if err:
+            print(f"⚠️  {err} (a rerun will create another list)")
 
     # Step 3: Format leads
     print("🔧 Formatting leads for HeyReach...")
@@ -242,7 +233,8 @@ def main():
     print(f"✅ Formatted {len(leads)} leads\n")
 
     # Step 4: Add leads to HeyReach
-    result = add_leads_to_heyreach(list_id, leads)
+    result = add_leads_to_heyreach(list_id, leads, ledger=ledger, workers=args.workers, chunk_size=args.chunk_size)
+    ledger.close()
 
     # Step 5: Next steps
     print("\n" + "="*80)
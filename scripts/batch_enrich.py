@@ -9,6 +9,7 @@ Usage:
     python batch_enrich.py --input leads.csv --integrations linkedin_profile,web_research
     python batch_enrich.py --input leads.csv --integrations linkedin_profile --parallel 10 --output enriched.csv
     python batch_enrich.py --input leads_enriched.csv --integrations linkedin_profile,heyreach_engagement --skip-existing
+    python batch_enrich.py --input leads.csv --integrations heyreach_engagement,heyreach_campaigns --prefetch
 
 Arguments:
     --input: Input CSV file path
@@ -16,6 +17,7 @@ Arguments:
     --parallel: Number of parallel workers (default: 5)
     --output: Output CSV file path (default: input_enriched.csv)
     --skip-existing: Skip integrations if their output columns already have data (saves API calls)
+    --prefetch: Bulk-load data once for integrations that support it (HeyReach) instead of per-row calls
 """
 
 import argparse
@@ -111,6 +113,25 @@ def validate_integrations(integration_names: List[str]) -> tuple[List[Any], str]
     return modules, ""
 
 
+def prefetch_integrations(rows: List[Dict[str, Any]], integrations: List[Dict]) -> Dict[str, str]:
+    """
+    Run the optional prefetch phase of each integration that has one.
+
+    Returns:
+        {integration_name: error} for prefetches that failed (those integrations
+        fall back to per-row API calls)
+    """
+    errors = {}
+    for integration in integrations:
+        prefetch = getattr(integration["module"], "prefetch", None)
+        if prefetch is None:
+            continue
+        err = prefetch(rows)
+        if err:
+            errors[integration["name"]] = err
+    return errors
+
+
 def validate_columns(headers: List[str], integrations: List[Dict]) -> str:
     """
     Validate that required input columns exist.
@@ -223,7 +244,8 @@ def run_batch(
     integration_names: List[str],
     parallel: int = 5,
     output_path: str = None,
-    skip_existing: bool = False
+    skip_existing: bool = False,
+    prefetch: bool = False
 ) -> tuple[Dict[str, Any], str]:
     """
     Run batch enrichment with rich terminal UI.
@@ -246,6 +268,8 @@ def run_batch(
     config_table.add_row("Parallel Workers", str(parallel))
     if skip_existing:
         config_table.add_row("Skip Existing", "[yellow]Yes - will skip integrations with existing data[/yellow]")
+    if prefetch:
+        config_table.add_row("Prefetch", "Yes - bulk-load HeyReach data before enriching rows")
     console.print(config_table)
     console.print()
 
@@ -269,6 +293,14 @@ def run_batch(
         if err:
             return {}, err
     console.print("✓ All required columns present", style="green")
+
+    if prefetch:
+        with console.status("[cyan]Prefetching integration data...", spinner="dots"):
+            prefetch_errors = prefetch_integrations(rows, integrations)
+        for name, prefetch_err in prefetch_errors.items():
+            console.print(f"⚠️  Prefetch failed for {name} (falling back to per-row calls): {prefetch_err}", style="yellow")
+        if not prefetch_errors:
+            console.print("✓ Prefetch complete", style="green")
     console.print()
 
     # Collect all output columns
@@ -445,6 +477,8 @@ def main():
     parser.add_argument("--output", help="Output CSV file path (default: input_enriched.csv)")
     parser.add_argument("--skip-existing", action="store_true",
                        help="Skip integrations if their output columns already have data (saves API calls)")
+    parser.add_argument("--prefetch", action="store_true",
+                       help="Bulk-load HeyReach data once instead of per-row API calls (best for large tables)")
 
     args = parser.parse_args()
 
@@ -457,7 +491,8 @@ def main():
         integration_names=integration_names,
         parallel=args.parallel,
         output_path=args.output,
-        skip_existing=args.skip_existing
+        skip_existing=args.skip_existing,
+        prefetch=args.prefetch
     )
 
     if err:
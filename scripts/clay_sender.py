@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Async Clay webhook sender: concurrent batches, adaptive batch size, resumable.
+
+One httpx.AsyncClient (a pooled keep-alive connection set) is shared by N
+workers. Each worker takes the next batch off a shared queue. A batch's
+size is chosen when it is taken, so the size can change mid-run:
+
+- It grows while batches are acknowledged faster than the target latency.
+- It halves when batches come back slow, or when Clay answers 413 (the
+  rejected batch is split and resent).
+- A 429 pauses every worker for the server's Retry-After (or a backoff) and
+  holds the size steady for a while.
+
+5xx, timeouts and connection errors are retried with the same Retry-After /
+backoff rules. Other 4xx responses fail the batch.
+
+Acknowledged row ids are written to an on-disk SQLite checkpoint as each
+batch succeeds. An interrupted send that is rerun skips them instead of
+sending duplicates. The checkpoint is cleared once a send finishes with no
+failures.
+
+The same file keeps, per webhook, a hash of every row payload Clay has
+acknowledged. Incremental sends (the default) skip rows whose payload hash
+is unchanged, so a daily push of a large table only sends the rows that
+were enriched or edited since the last successful send. Bookkeeping
+columns (_created_at, _updated_at) are left out of the hash.
+
+Usage:
+    from clay_sender import ClayCheckpoint, send_rows
+
+    checkpoint = ClayCheckpoint(lead_dir / CHECKPOINT_DB_NAME, webhook_url)
+    try:
+        result = send_rows(webhook_url, rows, checkpoint=checkpoint, concurrency=8)
+        # incremental=False resends unchanged rows too
+    finally:
+        checkpoint.close()
+    print(result.format_summary())
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import httpx
+
+CHECKPOINT_DB_NAME = "clay_state.db"
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_MIN_BATCH_SIZE = 1
+DEFAULT_MAX_BATCH_SIZE = 500
+DEFAULT_TARGET_LATENCY = 2.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_TIMEOUT = 30.0
+MAX_RETRY_AFTER = 300.0
+# Batches to hold the size after a 429 before growing again
+THROTTLE_COOLDOWN_BATCHES = 10
+
+SUCCESS_STATUSES = (200, 201, 202)
+
+# Columns that change without the exported data changing
+HASH_IGNORED_COLUMNS = frozenset({"_created_at", "_updated_at"})
+
+
+def sanitize_row(row: dict) -> dict:
+    """Convert row to JSON-serializable format."""
+    result = {}
+    for key, value in row.items():
+        if value is None:
+            result[key] = None
+        elif isinstance(value, (str, int, float, bool)):
+            result[key] = value
+        else:
+            # Convert to string for non-JSON types
+            result[key] = str(value)
+    return result
+
+
+def row_id(row: dict) -> str:
+    """
+    Stable identity of a lead row for checkpointing.
+
+    SQLite rows use their _id. CSV rows have no id, so the row's content is
+    hashed instead (identical CSV rows count as one).
+    """
+    if row.get("_id") is not None:
+        return str(row["_id"])
+    canonical = json.dumps(sanitize_row(row), sort_keys=True, ensure_ascii=False)
+    return "sha1:" + hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def payload_hash(payload: dict) -> str:
+    """Hash of a sanitized row payload, ignoring bookkeeping columns."""
+    exported = {k: v for k, v in payload.items() if k not in HASH_IGNORED_COLUMNS}
+    canonical = json.dumps(exported, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def webhook_key(webhook_url: str) -> str:
+    """Checkpoint key for a webhook (hashed, so the URL's token isn't stored)."""
+    return hashlib.sha256(webhook_url.encode("utf-8")).hexdigest()[:32]
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - (now or datetime.now(timezone.utc))).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class ClayCheckpoint:
+    """
+    Per-webhook send state, in a SQLite file next to the lead list.
+
+    clay_send_checkpoint holds the row ids acknowledged by an unfinished send.
+    clay_export_state holds the payload hash of every row Clay has
+    acknowledged, which drives incremental sends.
+    """
+
+    def __init__(self, db_path: Path, webhook_url: str):
+        self.db_path = Path(db_path)
+        self.webhook = webhook_key(webhook_url)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS clay_send_checkpoint (
+                    webhook TEXT NOT NULL,
+                    row_id TEXT NOT NULL,
+                    acked_at TEXT NOT NULL,
+                    PRIMARY KEY (webhook, row_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS clay_export_state (
+                    webhook TEXT NOT NULL,
+                    row_id TEXT NOT NULL,
+                    payload_hash TEXT NOT NULL,
+                    sent_at TEXT NOT NULL,
+                    PRIMARY KEY (webhook, row_id)
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def load(self) -> tuple[set[str], str]:
+        """Row ids already acknowledged by this webhook in an unfinished send."""
+        if not self.db_path.exists():
+            return set(), ""
+        try:
+            rows = self._connect().execute(
+                "SELECT row_id FROM clay_send_checkpoint WHERE webhook = ?", (self.webhook,)
+            ).fetchall()
+            return {r[0] for r in rows}, ""
+        except sqlite3.Error as e:
+            return set(), f"Failed to read checkpoint: {e}"
+
+    def load_hashes(self) -> tuple[dict[str, str], str]:
+        """Payload hash last acknowledged by this webhook, by row id."""
+        if not self.db_path.exists():
+            return {}, ""
+        try:
+            rows = self._connect().execute(
+                "SELECT row_id, payload_hash FROM clay_export_state WHERE webhook = ?", (self.webhook,)
+            ).fetchall()
+            return dict(rows), ""
+        except sqlite3.Error as e:
+            return {}, f"Failed to read export state: {e}"
+
+    def mark(self, acked: Iterable[tuple[str, str]]) -> str:
+        """Record acknowledged (row_id, payload_hash) pairs (committed immediately)."""
+        now = datetime.now(timezone.utc).isoformat()
+        acked = list(acked)
+        try:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO clay_send_checkpoint (webhook, row_id, acked_at) VALUES (?, ?, ?)",
+                [(self.webhook, rid, now) for rid, _ in acked],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO clay_export_state (webhook, row_id, payload_hash, sent_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.webhook, rid, digest, now) for rid, digest in acked],
+            )
+            conn.commit()
+            return ""
+        except sqlite3.Error as e:
+            return f"Failed to write checkpoint: {e}"
+
+    def clear(self) -> str:
+        """Forget this webhook's in-progress send (export hashes are kept)."""
+        if not self.db_path.exists():
+            return ""
+        try:
+            conn = self._connect()
+            conn.execute("DELETE FROM clay_send_checkpoint WHERE webhook = ?", (self.webhook,))
+            conn.commit()
+            return ""
+        except sqlite3.Error as e:
+            return f"Failed to clear checkpoint: {e}"
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class AdaptiveBatchSizer:
+    """
+    Batch size steered by acknowledged-batch latency and 413 / 429 responses.
+
+    Additive increase while batches beat the target latency, multiplicative
+    decrease when they miss it or the payload is rejected as too large.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_BATCH_SIZE,
+        *,
+        min_size: int = DEFAULT_MIN_BATCH_SIZE,
+        max_size: int = DEFAULT_MAX_BATCH_SIZE,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+    ):
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.size = min(max(initial, self.min_size), self.max_size)
+        self.target_latency = target_latency
+        self._hold = 0
+        self._ceiling = self.max_size
+
+    def record_success(self, batch_len: int, seconds: float) -> None:
+        if seconds > self.target_latency:
+            self.size = max(self.min_size, self.size // 2)
+            return
+        if self._hold:
+            self._hold -= 1
+            return
+        # Only grow on batches that actually used the current size
+        if batch_len >= self.size:
+            self.size = min(self._ceiling, self.size + max(1, self.size // 4))
+
+    def record_too_large(self, batch_len: int) -> None:
+        """413: the server's limit is below batch_len, so stay under it from now on."""
+        self._ceiling = max(self.min_size, min(self._ceiling, batch_len - 1))
+        self.size = max(self.min_size, min(self.size, batch_len // 2))
+
+    def record_throttled(self) -> None:
+        """429: hold the current size for a while (smaller batches would mean more requests)."""
+        self._hold = THROTTLE_COOLDOWN_BATCHES
+
+
+@dataclass
+class SendResult:
+    """Outcome of a send_rows() call."""
+
+    total: int = 0
+    sent: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    batches: int = 0
+    retries: int = 0
+    throttled: int = 0
+    seconds: float = 0.0
+    final_batch_size: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+    def format_summary(self) -> str:
+        rate = self.sent / self.seconds if self.seconds else 0.0
+        return (
+            f"sent={self.sent} unchanged={self.unchanged} skipped={self.skipped} failed={self.failed} "
+            f"batches={self.batches} retries={self.retries} throttled={self.throttled} "
+            f"batch_size={self.final_batch_size} time={self.seconds:.1f}s ({rate:.0f} rows/s)"
+        )
+
+
+@dataclass
+class SendPlan:
+    """Which items a send would push, and why the rest are left out."""
+
+    to_send: list[tuple[str, dict]]
+    # Acknowledged with the same payload by an earlier send
+    unchanged: int = 0
+    # Acknowledged by the unfinished send being resumed
+    skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def plan_send(
+    items: list[tuple[str, dict]],
+    checkpoint: Optional[ClayCheckpoint],
+    *,
+    incremental: bool = True,
+    hashes: Optional[dict[str, str]] = None,
+) -> SendPlan:
+    """
+    Split (row_id, payload) items into those to send and those to skip.
+
+    Args:
+        items: (row_id, payload) pairs
+        checkpoint: Send state (None sends everything)
+        incremental: Skip rows whose payload hash matches the one this
+            webhook last acknowledged
+        hashes: Precomputed payload hashes by row id
+
+    Returns:
+        SendPlan
+    """
+    if checkpoint is None:
+        return SendPlan(to_send=list(items))
+    errors = []
+    done, err = checkpoint.load()
+    if err:
+        errors.append(err)
+    previous: dict[str, str] = {}
+    if incremental:
+        previous, err = checkpoint.load_hashes()
+        if err:
+            errors.append(err)
+    if hashes is None:
+        hashes = {rid: payload_hash(payload) for rid, payload in items}
+
+    plan = SendPlan(to_send=[], errors=errors)
+    for item in items:
+        rid = item[0]
+        if previous.get(rid) == hashes[rid]:
+            plan.unchanged += 1
+        elif rid in done:
+            plan.skipped += 1
+        else:
+            plan.to_send.append(item)
+    return plan
+
+
+class AsyncClaySender:
+    """Sends (row_id, payload) pairs to one webhook with N concurrent batches."""
+
+    def __init__(
+        self,
+        webhook_url: str,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        sizer: Optional[AdaptiveBatchSizer] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+        checkpoint: Optional[ClayCheckpoint] = None,
+        on_batch: Optional[Callable[[int, int, str], None]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize AsyncClaySender.
+
+        Args:
+            webhook_url: Clay table webhook URL
+            concurrency: Batches in flight at once (also the connection pool size)
+            sizer: Batch size policy (default: AdaptiveBatchSizer())
+            max_retries: Attempts per batch, including the first, for 429 / 5xx /
+                timeouts (same meaning as send_to_clay's original --max-retries)
+            timeout: Per-request timeout in seconds
+            checkpoint: Where acknowledged row ids are recorded
+            on_batch: Called as on_batch(batch_num, rows, error) after each batch
+            transport: Custom httpx transport (e.g. httpx.MockTransport for tests)
+        """
+        self.webhook_url = webhook_url
+        self.concurrency = max(1, concurrency)
+        self.sizer = sizer or AdaptiveBatchSizer()
+        self.max_retries = max(1, max_retries)
+        self.timeout = timeout
+        self.checkpoint = checkpoint
+        self.on_batch = on_batch
+        self.transport = transport
+        self._queue: deque = deque()
+        self._hashes: dict[str, str] = {}
+        self._resume_at = 0.0
+        self._result = SendResult()
+
+    def _take(self) -> list[tuple[str, dict]]:
+        n = min(self.sizer.size, len(self._queue))
+        return [self._queue.popleft() for _ in range(n)]
+
+    async def _wait_if_paused(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _finish(self, batch: list[tuple[str, dict]], error: str) -> None:
+        result = self._result
+        result.batches += 1
+        if error:
+            result.failed += len(batch)
+            result.errors.append(error)
+        else:
+            result.sent += len(batch)
+            if self.checkpoint is not None:
+                err = self.checkpoint.mark((rid, self._hashes[rid]) for rid, _ in batch)
+                if err:
+                    result.errors.append(err)
+        if self.on_batch is not None:
+            self.on_batch(result.batches, len(batch), error)
+
+    async def _deliver(self, client: httpx.AsyncClient, batch: list[tuple[str, dict]]) -> None:
+        error = ""
+        for attempt in range(self.max_retries):
+            await self._wait_if_paused()
+            start = time.monotonic()
+            wait = None
+            try:
+                response = await client.post(self.webhook_url, json=[payload for _, payload in batch])
+            except httpx.TimeoutException:
+                error = "Request timeout"
+            except httpx.HTTPError as e:
+                error = f"Request failed: {str(e)[:100]}"
+            else:
+                status = response.status_code
+                if status in SUCCESS_STATUSES:
+                    self.sizer.record_success(len(batch), time.monotonic() - start)
+                    self._finish(batch, "")
+                    return
+                error = f"HTTP {status}: {response.text[:100]}"
+                if status == 413 and len(batch) > 1:
+                    # Too large: split and resend both halves at the smaller size
+                    self.sizer.record_too_large(len(batch))
+                    middle = len(batch) // 2
+                    await self._deliver(client, batch[:middle])
+                    await self._deliver(client, batch[middle:])
+                    return
+                if status == 429:
+                    self._result.throttled += 1
+                    self.sizer.record_throttled()
+                elif status < 500:
+                    break
+                wait = parse_retry_after(response.headers.get("Retry-After"))
+
+            if attempt == self.max_retries - 1:
+                break
+            self._result.retries += 1
+            wait = 2 ** attempt if wait is None else wait
+            if error.startswith("HTTP 429"):
+                # Throttling applies to the whole webhook, so every worker waits
+                self._resume_at = max(self._resume_at, time.monotonic() + wait)
+            else:
+                await asyncio.sleep(wait)
+
+        self._finish(batch, error)
+
+    async def _worker(self, client: httpx.AsyncClient) -> None:
+        while self._queue:
+            batch = self._take()
+            if batch:
+                await self._deliver(client, batch)
+
+    async def send(self, items: Iterable[tuple[str, dict]], incremental: bool = True) -> SendResult:
+        """
+        Send items, skipping ids already in the checkpoint.
+
+        Args:
+            items: (row_id, payload) pairs
+            incremental: Also skip rows whose payload hash matches the one
+                this webhook last acknowledged
+
+        Returns:
+            SendResult (errors are collected on it, never raised)
+        """
+        start = time.monotonic()
+        items = list(items)
+        self._hashes = {rid: payload_hash(payload) for rid, payload in items}
+        plan = plan_send(items, self.checkpoint, incremental=incremental, hashes=self._hashes)
+        self._queue = deque(plan.to_send)
+        self._result = SendResult(
+            total=len(items),
+            unchanged=plan.unchanged,
+            skipped=plan.skipped,
+            errors=list(plan.errors),
+        )
+
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            headers={"Content-Type": "application/json"},
+            transport=self.transport,
+        ) as client:
+            await asyncio.gather(*(self._worker(client) for _ in range(self.concurrency)))
+
+        result = self._result
+        result.seconds = time.monotonic() - start
+        result.final_batch_size = self.sizer.size
+        if self.checkpoint is not None and result.ok:
+            err = self.checkpoint.clear()
+            if err:
+                result.errors.append(err)
+        return result
+
+
+def send_rows(
+    webhook_url: str,
+    rows: list[dict],
+    *,
+    checkpoint: Optional[ClayCheckpoint] = None,
+    incremental: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    target_latency: float = DEFAULT_TARGET_LATENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    on_batch: Optional[Callable[[int, int, str], None]] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> SendResult:
+    """
+    Send lead rows to a Clay webhook (blocking wrapper around AsyncClaySender).
+
+    Args:
+        webhook_url: Clay table webhook URL
+        rows: Lead rows (sanitized before sending)
+        checkpoint: Resume / export state; rows it already holds are skipped
+        incremental: Skip rows unchanged since this webhook last acknowledged them
+        concurrency: Batches in flight at once
+        batch_size: Starting batch size
+        max_batch_size: Upper bound for adaptive growth
+        target_latency: Seconds per batch above which the batch size shrinks
+        max_retries: Attempts per batch, including the first
+        on_batch: Progress callback on_batch(batch_num, rows, error)
+        transport: Custom httpx transport (tests)
+
+    Returns:
+        SendResult
+    """
+    sender = AsyncClaySender(
+        webhook_url,
+        concurrency=concurrency,
+        sizer=AdaptiveBatchSizer(batch_size, max_size=max_batch_size, target_latency=target_latency),
+        max_retries=max_retries,
+        checkpoint=checkpoint,
+        on_batch=on_batch,
+        transport=transport,
+    )
+    return asyncio.run(sender.send(((row_id(row), sanitize_row(row)) for row in rows), incremental=incremental))
@@ -10,7 +10,6 @@ This script:
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import re
 from pathlib import Path
@@ -18,6 +17,8 @@ from typing import Any
 
 from datagen_sdk import DatagenClient
 
+from neon_client import Json, NeonClient
+
 
 def _load_env_file(path: Path) -> None:
     """Load environment variables from a simple KEY=VALUE file."""
@@ -70,7 +71,7 @@ def sanitize_table_name(name: str) -> str:
 
 
 def create_campaign(
-    client: DatagenClient,
+    neon: NeonClient,
     name: str,
     description: str,
     custom_columns: dict[str, str],
@@ -80,7 +81,7 @@ def create_campaign(
     Create a new campaign with custom columns.
 
     Args:
-        client: DatagenClient instance
+        neon: NeonClient instance
         name: Campaign name (human-readable)
         description: Campaign description
         custom_columns: Dict of column_name -> column_type (e.g., {"comment_text": "TEXT"})
@@ -107,33 +108,17 @@ def create_campaign(
 
     # Step 1: Register campaign
     print("\n1. Registering campaign...")
-    insert_campaign_sql = f"""
+    insert_campaign_sql = """
     INSERT INTO campaigns (name, description, status, campaign_type, table_name, table_schema)
-    VALUES (
-        '{name.replace("'", "''")}',
-        '{description.replace("'", "''")}',
-        'draft',
-        '{campaign_type}',
-        '{table_name}',
-        '{json.dumps(table_schema)}'::jsonb
-    )
+    VALUES (%s, %s, 'draft', %s, %s, %s)
     RETURNING id, table_name;
     """
 
-    result = client.execute_tool(
-        "mcp_Neon_run_sql",
-        {
-            "params": {
-                "projectId": "blue-tree-25780810",
-                "branchId": "br-cool-leaf-afau0ra8",
-                "databaseName": "neondb",
-                "sql": insert_campaign_sql
-            }
-        }
+    campaign_data = neon.query_one(
+        insert_campaign_sql,
+        [name, description, campaign_type, table_name, Json(table_schema)],
+        retry=False,
     )
-
-    # Parse result
-    campaign_data = result[0][0] if result and result[0] else {}
     campaign_id = campaign_data.get('id')
 
     print(f"  ✓ Campaign registered with ID: {campaign_id}")
@@ -163,45 +148,11 @@ def create_campaign(
     )
     """
 
-    client.execute_tool(
-        "mcp_Neon_run_sql",
-        {
-            "params": {
-                "projectId": "blue-tree-25780810",
-                "branchId": "br-cool-leaf-afau0ra8",
-                "databaseName": "neondb",
-                "sql": create_table_sql
-            }
-        }
-    )
-
-    # Create indexes separately
+    # Table and indexes go in one transaction
     index1_sql = f"CREATE INDEX idx_{table_name}_prospect ON {table_name}(prospect_id)"
     index2_sql = f"CREATE INDEX idx_{table_name}_status ON {table_name}(status)"
 
-    client.execute_tool(
-        "mcp_Neon_run_sql",
-        {
-            "params": {
-                "projectId": "blue-tree-25780810",
-                "branchId": "br-cool-leaf-afau0ra8",
-                "databaseName": "neondb",
-                "sql": index1_sql
-            }
-        }
-    )
-
-    client.execute_tool(
-        "mcp_Neon_run_sql",
-        {
-            "params": {
-                "projectId": "blue-tree-25780810",
-                "branchId": "br-cool-leaf-afau0ra8",
-                "databaseName": "neondb",
-                "sql": index2_sql
-            }
-        }
-    )
+    neon.execute_many([create_table_sql, index1_sql, index2_sql])
 
     print(f"  ✓ Table created: {table_name}")
 
@@ -214,7 +165,7 @@ def create_campaign(
 
 
 def populate_from_post(
-    client: DatagenClient,
+    neon: NeonClient,
     table_name: str,
     post_url: str,
     column_mappings: dict[str, str]
@@ -223,7 +174,7 @@ def populate_from_post(
     Populate campaign table from engagements on a specific post.
 
     Args:
-        client: DatagenClient instance
+        neon: NeonClient instance
         table_name: Campaign table name
         post_url: LinkedIn post URL to filter by
         column_mappings: Dict mapping campaign columns to data source
@@ -256,24 +207,12 @@ def populate_from_post(
     FROM engagements e
     JOIN prospects p ON p.id = e.prospect_id
     JOIN linkedin_posts lp ON lp.id = e.post_id
-    WHERE lp.post_url = '{post_url.replace("'", "''")}'
+    WHERE lp.post_url = %s
     ON CONFLICT (prospect_id) DO NOTHING
     RETURNING id;
     """
 
-    result = client.execute_tool(
-        "mcp_Neon_run_sql",
-        {
-            "params": {
-                "projectId": "blue-tree-25780810",
-                "branchId": "br-cool-leaf-afau0ra8",
-                "databaseName": "neondb",
-                "sql": populate_sql
-            }
-        }
-    )
-
-    count = len(result[0]) if result and result[0] else 0
+    count = len(neon.query(populate_sql, [post_url], retry=False))
     print(f"   ✓ Added {count} prospects")
 
     return count
@@ -345,12 +284,12 @@ Examples:
 
     # Load environment
     _ensure_env_loaded()
-    client = DatagenClient()
+    neon = NeonClient(DatagenClient())
 
     # Create campaign
     try:
         result = create_campaign(
-            client,
+            neon,
             args.name,
             args.description,
             custom_columns,
@@ -377,32 +316,22 @@ Examples:
                 column_mappings[col_name.strip()] = source.strip()
 
             count = populate_from_post(
-                client,
+                neon,
                 result['table_name'],
                 args.populate_from_post,
                 column_mappings
             )
 
             # Update campaign metrics
-            update_sql = f"""
+            update_sql = """
             UPDATE campaigns
-            SET total_prospects = {count},
+            SET total_prospects = %s,
                 status = 'active',
                 updated_at = NOW()
-            WHERE id = {result['campaign_id']};
+            WHERE id = %s;
             """
 
-            client.execute_tool(
-                "mcp_Neon_run_sql",
-                {
-                    "params": {
-                        "projectId": "blue-tree-25780810",
-                        "branchId": "br-cool-leaf-afau0ra8",
-                        "databaseName": "neondb",
-                        "sql": update_sql
-                    }
-                }
-            )
+            neon.execute(update_sql, [count, result['campaign_id']])
 
             print(f"\n✓ Campaign populated and activated!")
 
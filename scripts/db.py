@@ -7,32 +7,175 @@ Provides SQLite-backed storage for lead tables with:
 - Transaction support
 - Incremental updates
 - Execution tracking
+- Thread-local read connections with a single serialized writer
+- Append-only change log (changes_since) for downstream consumers
+
+LeadDBBackend defines the storage API; LeadDB is the SQLite implementation
+db_postgres.PostgresLeadDB stores the same tables in Postgres/Neon and
+db_sharded.ShardedLeadDB spreads one table over N SQLite files.
+Use open_lead_db() to pick one (LEAD_DB_URL selects Postgres).
 
 Error-first pattern: All functions return (result, error) tuples.
 """
 
+import csv
+import os
 import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from datetime import datetime
 import json
-from threading import Lock
+from threading import Lock, RLock, local
 import hashlib
+import time
 
 
-class LeadDB:
-    """SQLite database for a single lead table."""
+# Row update for batch writes: (row_id, updates, status, error)
+RowUpdate = tuple[int, dict, Optional[str], Optional[str]]
+# (cache_key, node_name, input_hash, config_hash, result, error)
+CacheEntry = tuple[str, str, str, str, dict, str]
+# Change-log cursor. Opaque to callers: pass back exactly what changes_since /
+# latest_change_cursor returned (an int seq for one database, a "12,40,7"
+# string of per-shard seqs for ShardedLeadDB). 0 means "from the beginning".
+ChangeCursor = int | str
+
+# Change-log column name recorded for newly inserted rows
+ROW_INSERTED = "*"
+
+
+def value_hash(value) -> str:
+    """Hash of a cell value as stored in a TEXT column (used by the change log)."""
+    if value is None:
+        text = ""
+    elif isinstance(value, bool):
+        text = "1" if value else "0"
+    else:
+        text = str(value)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024  # 256 MB
+
 
-    def __init__(self, db_path: Path):
+class ConnectionManager:
+    """
+    SQLite connection manager: one writer, one read-only connection per thread.
+
+    WAL mode lets readers run against the last committed snapshot while the
+    writer appends to the log, so reads never wait on the write lock. All
+    writes are serialized through a single connection guarded by an RLock.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+    ):
+        self.db_path = Path(db_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        self.writer: Optional[sqlite3.Connection] = None
+        self._write_lock = RLock()
+        self._local = local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = Lock()
+        self._stats_lock = Lock()
+        self._stats = {
+            "reader_connections": 0,
+            "reads": 0,
+            "writes": 0,
+            "write_wait_seconds": 0.0,
+            "max_write_wait_seconds": 0.0,
+        }
+
+    def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+
+    def open(self) -> str:
         """
-        Initialize LeadDB with path to database file.
+        Open the writer connection (creates the database file if missing).
 
-        Args:
-            db_path: Path to SQLite database file
+        Returns:
+            error: Empty string on success, error message on failure
         """
-        self.db_path = db_path
-        self.conn: Optional[sqlite3.Connection] = None
-        self._lock = Lock()  # Thread safety for updates
+        try:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # Enable WAL mode for concurrent reads during writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._apply_pragmas(conn)
+            self.writer = conn
+            return ""
+        except Exception as e:
+            return f"connect error: {e}"
+
+    def reader(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = self.db_path.resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._apply_pragmas(conn)
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+            with self._stats_lock:
+                self._stats["reader_connections"] += 1
+        with self._stats_lock:
+            self._stats["reads"] += 1
+        return conn
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Hold the writer lock and yield the writer connection."""
+        started = time.perf_counter()
+        with self._write_lock:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self._stats["writes"] += 1
+                self._stats["write_wait_seconds"] += waited
+                if waited > self._stats["max_write_wait_seconds"]:
+                    self._stats["max_write_wait_seconds"] = waited
+            yield self.writer
+
+    def stats(self) -> dict:
+        """Snapshot of connection counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["busy_timeout_ms"] = self.busy_timeout_ms
+        stats["mmap_size"] = self.mmap_size
+        return stats
+
+    def close(self) -> None:
+        """Close the writer and every reader opened by any thread."""
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for conn in readers:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = local()
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+
+class LeadDBBackend(ABC):
+    """
+    Storage API for a single lead table.
+
+    Implementations keep the same tables (leads, columns, executions,
+    row_executions, node_cache) and the same (result, error) return contract.
+    """
 
     def __enter__(self):
         """Context manager entry."""
@@ -41,24 +184,171 @@ class LeadDB:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        if self.conn:
-            self.conn.close()
+        self.close()
+
+    @abstractmethod
+    def connect(self) -> str: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    @abstractmethod
+    def init_schema(self) -> str: ...
+
+    @abstractmethod
+    def import_csv(self, csv_rows: list[dict], source_row_indexes: Optional[list[int]] = None) -> tuple[int, str]: ...
+
+    @abstractmethod
+    def get_rows(self, status: Optional[str] = None, limit: Optional[int] = None) -> tuple[list[dict], str]: ...
+
+    @abstractmethod
+    def filter_rows(self, where_clause: str) -> tuple[list[dict], str]: ...
+
+    @abstractmethod
+    def update_row(self, row_id: int, updates: dict, status: Optional[str] = None, error: Optional[str] = None) -> str: ...
+
+    @abstractmethod
+    def update_rows(self, row_updates: list[RowUpdate]) -> str: ...
+
+    @abstractmethod
+    def start_execution(self, workflow_type: str, workflow_name: str, total_rows: int, config: Optional[dict] = None) -> tuple[int, str]: ...
+
+    @abstractmethod
+    def complete_execution(self, execution_id: int, success_count: int, failed_count: int, output_path: Optional[str] = None) -> str: ...
+
+    @abstractmethod
+    def has_completed_row_execution(self, row_id: int, node_name: str, input_hash: str, config_hash: str) -> tuple[bool, str]: ...
+
+    @abstractmethod
+    def start_row_execution(self, execution_id: int, row_id: int, node_name: str, input_hash: str, config_hash: str, cache_hit: bool) -> tuple[int, str]: ...
+
+    @abstractmethod
+    def complete_row_execution(self, row_execution_id: int, status: str, error: Optional[str]) -> str: ...
+
+    @abstractmethod
+    def get_cache_entry(self, cache_key: str) -> tuple[Optional[dict], str, str]: ...
+
+    @abstractmethod
+    def set_cache_entry(self, cache_key: str, node_name: str, input_hash: str, config_hash: str, result: dict, error: str) -> str: ...
+
+    @abstractmethod
+    def export_to_csv(self, output_path: Optional[Path] = None) -> tuple[list[dict], str]: ...
+
+    def set_cache_entries(self, entries: list[CacheEntry]) -> str:
+        """
+        Store many cached node results.
+
+        Backends that can upsert a batch in one round trip override this.
+
+        Returns:
+            error: Empty string on success, first error message on failure
+        """
+        for entry in entries:
+            err = self.set_cache_entry(*entry)
+            if err:
+                return err
+        return ""
+
+    def copy_to_csv(self, output_path: Path, status: Optional[str] = None) -> tuple[int, str]:
+        """
+        Write the table (internal _ columns excluded) to a CSV file.
+
+        Backends that can stream the file server-side (Postgres COPY) override this.
+
+        Args:
+            output_path: Destination CSV path
+            status: Optional _status filter (e.g. 'completed')
+
+        Returns:
+            (bytes_written, error): Size of the CSV written and error message
+        """
+        rows, err = self.get_rows(status=status)
+        if err:
+            return 0, err
+        try:
+            fieldnames = [k for k in rows[0] if not k.startswith("_")] if rows else []
+            with open(output_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+                return f.tell(), ""
+        except Exception as e:
+            return 0, f"copy_to_csv error: {e}"
+
+    # Change-log cursors are opaque (see ChangeCursor): store and pass them back unchanged
+    @abstractmethod
+    def changes_since(self, cursor: ChangeCursor = 0, limit: int = 1000) -> tuple[list[dict], ChangeCursor, str]: ...
+
+    @abstractmethod
+    def latest_change_cursor(self) -> tuple[ChangeCursor, str]: ...
+
+    @abstractmethod
+    def get_stats(self) -> tuple[dict, str]: ...
+
+    @abstractmethod
+    def get_connection_stats(self) -> tuple[dict, str]: ...
+
+
+class LeadDB(LeadDBBackend):
+    """SQLite database for a single lead table."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+    ):
+        """
+        Initialize LeadDB with path to database file.
+
+        Args:
+            db_path: Path to SQLite database file
+            busy_timeout_ms: How long a connection waits on a locked database
+            mmap_size: Bytes of the database file to memory-map per connection
+        """
+        self.db_path = db_path
+        self.conn: Optional[sqlite3.Connection] = None  # Writer connection
+        self._pool = ConnectionManager(db_path, busy_timeout_ms, mmap_size)
 
     def connect(self) -> str:
         """
         Connect to database.
 
+        Opens the single writer connection; read-only connections are opened
+        lazily, one per thread, the first time that thread reads.
+
         Returns:
             error: Empty string on success, error message on failure
         """
-        try:
-            self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row  # Dict-like access
-            # Enable WAL mode for concurrent reads during writes
-            self.conn.execute("PRAGMA journal_mode=WAL")
-            return ""
-        except Exception as e:
-            return f"connect error: {e}"
+        err = self._pool.open()
+        if err:
+            return err
+        self.conn = self._pool.writer
+        return ""
+
+    def close(self) -> None:
+        """Close writer and reader connections."""
+        self._pool.close()
+        self.conn = None
+
+    def _reader(self) -> sqlite3.Connection:
+        """Read-only connection for the calling thread."""
+        return self._pool.reader()
+
+    def _writer(self):
+        """Context manager holding the write lock around the writer connection."""
+        return self._pool.write()
+
+    def get_connection_stats(self) -> tuple[dict, str]:
+        """
+        Get connection pool statistics (reader count, reads, writes, lock waits).
+
+        Returns:
+            (stats, error): Dict with stats and error message
+        """
+        if not self.conn:
+            return {}, "not connected"
+        return self._pool.stats(), ""
 
     def init_schema(self) -> str:
         """
@@ -140,6 +430,17 @@ class LeadDB:
 
                 CREATE INDEX IF NOT EXISTS idx_node_cache_node ON node_cache(node_name);
                 CREATE INDEX IF NOT EXISTS idx_node_cache_hashes ON node_cache(input_hash, config_hash);
+
+                -- Append-only change log, written in the same transaction as the row update
+                CREATE TABLE IF NOT EXISTS changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    row_id INTEGER,
+                    column_name TEXT,
+                    value_hash TEXT,
+                    changed_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_changes_row ON changes(row_id);
             """)
 
             # Add forward-compatible columns (SQLite lacks ADD COLUMN IF NOT EXISTS)
@@ -191,12 +492,13 @@ class LeadDB:
         except Exception as e:
             return f"ensure_column error: {e}"
 
-    def import_csv(self, csv_rows: list[dict]) -> tuple[int, str]:
+    def import_csv(self, csv_rows: list[dict], source_row_indexes: Optional[list[int]] = None) -> tuple[int, str]:
         """
         Import CSV rows into database.
 
         Args:
             csv_rows: List of dicts representing CSV rows
+            source_row_indexes: Optional original CSV positions (default: 0..n-1)
 
         Returns:
             (row_count, error): Number of rows imported and error message
@@ -208,7 +510,7 @@ class LeadDB:
             return 0, "empty csv_rows"
 
         try:
-            with self._lock:
+            with self._writer():
                 cursor = self.conn.cursor()
 
                 # Get CSV columns (all keys from first row)
@@ -220,18 +522,28 @@ class LeadDB:
                     if err:
                         return 0, err
 
+                cursor.execute("SELECT COALESCE(MAX(_id), 0) FROM leads")
+                previous_max_id = cursor.fetchone()[0]
+
                 # Insert rows
                 insert_columns = ["_source_row_index"] + csv_columns
                 columns_str = ", ".join([self._quote_ident(c) for c in insert_columns])
                 for idx, row in enumerate(csv_rows):
                     placeholders = ", ".join(["?"] * len(insert_columns))
-                    values = [idx] + [row.get(col, "") for col in csv_columns]
+                    source_idx = source_row_indexes[idx] if source_row_indexes else idx
+                    values = [source_idx] + [row.get(col, "") for col in csv_columns]
 
                     cursor.execute(
                         f"INSERT INTO leads ({columns_str}) VALUES ({placeholders})",
                         values
                     )
 
+                # One change-log entry per new row
+                cursor.execute(
+                    "INSERT INTO changes (row_id, column_name) SELECT _id, ? FROM leads WHERE _id > ? ORDER BY _id",
+                    (ROW_INSERTED, previous_max_id),
+                )
+
                 self.conn.commit()
                 return len(csv_rows), ""
 
@@ -275,6 +587,23 @@ class LeadDB:
         except Exception as e:
             return f"add_column error: {e}"
 
+    def ensure_columns(self, column_names: list[str], source: str) -> str:
+        """
+        Add any missing columns to the leads table (keeps sharded schemas aligned).
+
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        if not self.conn:
+            return "not connected"
+
+        with self._writer():
+            for col in column_names:
+                err = self._add_column_if_needed(col, source)
+                if err:
+                    return err
+        return ""
+
     def get_rows(self, status: Optional[str] = None, limit: Optional[int] = None) -> tuple[list[dict], str]:
         """
         Get rows from database, optionally filtered by status.
@@ -290,7 +619,7 @@ class LeadDB:
             return [], "not connected"
 
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
 
             query = "SELECT * FROM leads"
             params = []
@@ -327,7 +656,7 @@ class LeadDB:
             return [], "empty where_clause"
 
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
 
             # Build query with WHERE clause
             query = f"SELECT * FROM leads WHERE {where_clause}"
@@ -339,6 +668,63 @@ class LeadDB:
         except Exception as e:
             return [], f"filter_rows error: {e}"
 
+    def _execute_row_update(self, cursor: sqlite3.Cursor, row_id: int, updates: dict, status: Optional[str], error: Optional[str]) -> None:
+        """Run the UPDATE and change-log inserts for one row (caller holds the writer and commits)."""
+        set_clauses = []
+        values = []
+
+        # Add update columns
+        for col, val in updates.items():
+            set_clauses.append(f"{self._quote_ident(col)} = ?")
+            values.append(val)
+
+        # Always update timestamp
+        set_clauses.append("_updated_at = datetime('now')")
+
+        # Optional status update
+        if status:
+            set_clauses.append("_status = ?")
+            values.append(status)
+
+        # Optional error update
+        if error is not None:
+            set_clauses.append("_error = ?")
+            values.append(error if error else None)
+
+        # Add row_id for WHERE clause
+        values.append(row_id)
+
+        # Capture previous values so only real changes reach the change log
+        new_values = dict(updates)
+        if status:
+            new_values["_status"] = status
+        if error is not None:
+            new_values["_error"] = error if error else None
+        old_row = None
+        if new_values:
+            old_columns = ", ".join(self._quote_ident(c) for c in new_values)
+            cursor.execute(f"SELECT {old_columns} FROM leads WHERE _id = ?", (row_id,))
+            old_row = cursor.fetchone()
+
+        set_clause = ", ".join(set_clauses)
+        cursor.execute(
+            f"UPDATE leads SET {set_clause} WHERE _id = ?",
+            values
+        )
+
+        if old_row is None:
+            return
+        changes = []
+        for idx, (col, val) in enumerate(new_values.items()):
+            new_hash = value_hash(val)
+            if value_hash(old_row[idx]) != new_hash:
+                changes.append((row_id, col, new_hash))
+        if changes:
+            cursor.executemany(
+                "INSERT INTO changes (row_id, column_name, value_hash) VALUES (?, ?, ?)",
+                changes,
+            )
+
     def update_row(self, row_id: int, updates: dict, status: Optional[str] = None, error: Optional[str] = None) -> str:
         """
         Update a row with enrichment data.
@@ -356,7 +742,7 @@ class LeadDB:
             return "not connected"
 
         try:
-            with self._lock:
+            with self._writer():
                 cursor = self.conn.cursor()
 
                 # Add columns for new fields
@@ -365,36 +751,44 @@ class LeadDB:
                     if err:
                         return err
 
-                # Build UPDATE query
-                set_clauses = []
-                values = []
+                self._execute_row_update(cursor, row_id, updates, status, error)
 
-                # Add update columns
-                for col, val in updates.items():
-                    set_clauses.append(f"{self._quote_ident(col)} = ?")
-                    values.append(val)
+                self.conn.commit()
+                return ""
 
-                # Always update timestamp
-                set_clauses.append("_updated_at = datetime('now')")
+        except Exception as e:
+            if self.conn:
+                self.conn.rollback()
+            return f"update_row error: {e}"
 
-                # Optional status update
-                if status:
-                    set_clauses.append("_status = ?")
-                    values.append(status)
+    def update_rows(self, row_updates: list[RowUpdate]) -> str:
+        """
+        Update many rows in a single transaction.
 
-                # Optional error update
-                if error is not None:
-                    set_clauses.append("_error = ?")
-                    values.append(error if error else None)
+        Args:
+            row_updates: List of (row_id, updates, status, error) tuples
 
-                # Add row_id for WHERE clause
-                values.append(row_id)
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        if not self.conn:
+            return "not connected"
 
-                set_clause = ", ".join(set_clauses)
-                cursor.execute(
-                    f"UPDATE leads SET {set_clause} WHERE _id = ?",
-                    values
-                )
+        if not row_updates:
+            return ""
+
+        try:
+            with self._writer():
+                cursor = self.conn.cursor()
+
+                new_columns = {col for _, updates, _, _ in row_updates for col in updates}
+                for col in sorted(new_columns):
+                    err = self._add_column_if_needed(col, "enrichment")
+                    if err:
+                        return err
+
+                for row_id, updates, status, error in row_updates:
+                    self._execute_row_update(cursor, row_id, updates, status, error)
 
                 self.conn.commit()
                 return ""
@@ -402,7 +796,7 @@ class LeadDB:
         except Exception as e:
             if self.conn:
                 self.conn.rollback()
-            return f"update_row error: {e}"
+            return f"update_rows error: {e}"
 
     def start_execution(self, workflow_type: str, workflow_name: str, total_rows: int, config: Optional[dict] = None) -> tuple[int, str]:
         """
@@ -421,14 +815,15 @@ class LeadDB:
             return 0, "not connected"
 
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                INSERT INTO executions (workflow_type, workflow_name, total_rows, config)
-                VALUES (?, ?, ?, ?)
-            """, (workflow_type, workflow_name, total_rows, json.dumps(config or {})))
+            with self._writer():
+                cursor = self.conn.cursor()
+                cursor.execute("""
+                    INSERT INTO executions (workflow_type, workflow_name, total_rows, config)
+                    VALUES (?, ?, ?, ?)
+                """, (workflow_type, workflow_name, total_rows, json.dumps(config or {})))
 
-            self.conn.commit()
-            return cursor.lastrowid, ""
+                self.conn.commit()
+                return cursor.lastrowid, ""
         except Exception as e:
             return 0, f"start_execution error: {e}"
 
@@ -449,18 +844,19 @@ class LeadDB:
             return "not connected"
 
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-                UPDATE executions
-                SET completed_at = datetime('now'),
-                    success_count = ?,
-                    failed_count = ?,
-                    output_path = ?
-                WHERE execution_id = ?
-            """, (success_count, failed_count, output_path, execution_id))
+            with self._writer():
+                cursor = self.conn.cursor()
+                cursor.execute("""
+                    UPDATE executions
+                    SET completed_at = datetime('now'),
+                        success_count = ?,
+                        failed_count = ?,
+                        output_path = ?
+                    WHERE execution_id = ?
+                """, (success_count, failed_count, output_path, execution_id))
 
-            self.conn.commit()
-            return ""
+                self.conn.commit()
+                return ""
         except Exception as e:
             return f"complete_execution error: {e}"
 
@@ -470,7 +866,7 @@ class LeadDB:
             return False, "not connected"
 
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 """
                 SELECT 1
@@ -502,16 +898,17 @@ class LeadDB:
             return 0, "not connected"
 
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO row_executions (execution_id, row_id, node_name, status, input_hash, config_hash, cache_hit)
-                VALUES (?, ?, ?, 'running', ?, ?, ?)
-                """,
-                (execution_id, row_id, node_name, input_hash, config_hash, 1 if cache_hit else 0),
-            )
-            self.conn.commit()
-            return cursor.lastrowid, ""
+            with self._writer():
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO row_executions (execution_id, row_id, node_name, status, input_hash, config_hash, cache_hit)
+                    VALUES (?, ?, ?, 'running', ?, ?, ?)
+                    """,
+                    (execution_id, row_id, node_name, input_hash, config_hash, 1 if cache_hit else 0),
+                )
+                self.conn.commit()
+                return cursor.lastrowid, ""
         except Exception as e:
             return 0, f"start_row_execution error: {e}"
 
@@ -521,19 +918,20 @@ class LeadDB:
             return "not connected"
 
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                UPDATE row_executions
-                SET completed_at = datetime('now'),
-                    status = ?,
-                    error = ?
-                WHERE id = ?
-                """,
-                (status, error if error else None, row_execution_id),
-            )
-            self.conn.commit()
-            return ""
+            with self._writer():
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    """
+                    UPDATE row_executions
+                    SET completed_at = datetime('now'),
+                        status = ?,
+                        error = ?
+                    WHERE id = ?
+                    """,
+                    (status, error if error else None, row_execution_id),
+                )
+                self.conn.commit()
+                return ""
         except Exception as e:
             return f"complete_row_execution error: {e}"
 
@@ -552,7 +950,7 @@ class LeadDB:
             return None, "", "not connected"
 
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 "SELECT result_json, error FROM node_cache WHERE cache_key = ?",
                 (cache_key,),
@@ -589,20 +987,21 @@ class LeadDB:
             return "not connected"
 
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO node_cache (cache_key, node_name, input_hash, config_hash, result_json, error)
-                VALUES (?, ?, ?, ?, ?, ?)
-                ON CONFLICT(cache_key) DO UPDATE SET
-                    created_at = datetime('now'),
-                    result_json = excluded.result_json,
-                    error = excluded.error
-                """,
-                (cache_key, node_name, input_hash, config_hash, json.dumps(result), error if error else None),
-            )
-            self.conn.commit()
-            return ""
+            with self._writer():
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO node_cache (cache_key, node_name, input_hash, config_hash, result_json, error)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                        created_at = datetime('now'),
+                        result_json = excluded.result_json,
+                        error = excluded.error
+                    """,
+                    (cache_key, node_name, input_hash, config_hash, json.dumps(result), error if error else None),
+                )
+                self.conn.commit()
+                return ""
         except Exception as e:
             return f"set_cache_entry error: {e}"
 
@@ -621,7 +1020,7 @@ class LeadDB:
             return [], "not connected"
 
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute("SELECT * FROM leads")
             rows = [dict(row) for row in cursor.fetchall()]
 
@@ -635,6 +1034,77 @@ class LeadDB:
         except Exception as e:
             return [], f"export_to_csv error: {e}"
 
+    def changes_since(self, cursor: ChangeCursor = 0, limit: int = 1000) -> tuple[list[dict], ChangeCursor, str]:
+        """
+        Read the change log after a cursor.
+
+        Each change is {seq, row_id, column_name, value_hash, changed_at};
+        column_name is "*" for newly inserted rows.
+
+        Args:
+            cursor: Cursor from a previous call, passed back unchanged (here the
+                last seq processed; 0 for the beginning)
+            limit: Maximum number of changes to return
+
+        Returns:
+            (changes, next_cursor, error): Changes in seq order, cursor to pass next time, and error
+        """
+        if not self.conn:
+            return [], cursor, "not connected"
+
+        try:
+            rows = self._reader().execute(
+                """
+                SELECT seq, row_id, column_name, value_hash, changed_at
+                FROM changes
+                WHERE seq > ?
+                ORDER BY seq
+                LIMIT ?
+                """,
+                (cursor, limit),
+            ).fetchall()
+            changes = [dict(row) for row in rows]
+            next_cursor = changes[-1]["seq"] if changes else cursor
+            return changes, next_cursor, ""
+        except Exception as e:
+            return [], cursor, f"changes_since error: {e}"
+
+    def latest_change_cursor(self) -> tuple[ChangeCursor, str]:
+        """
+        Get the newest change-log seq (start tailing from "now").
+
+        Returns:
+            (cursor, error): Latest seq (0 if empty) and error message
+        """
+        if not self.conn:
+            return 0, "not connected"
+
+        try:
+            row = self._reader().execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()
+            return row[0], ""
+        except Exception as e:
+            return 0, f"latest_change_cursor error: {e}"
+
+    def snapshot(self, output_dir: Optional[Path] = None) -> tuple[dict, str]:
+        """
+        Write a memory-mapped columnar snapshot of the leads table.
+
+        See snapshot.py for the on-disk layout and the LeadSnapshot reader.
+
+        Args:
+            output_dir: Snapshot directory (default: table.snapshot next to the db)
+
+        Returns:
+            (manifest, error): Snapshot manifest and error message
+        """
+        if not self.conn:
+            return {}, "not connected"
+
+        from snapshot import default_snapshot_path, write_snapshot
+
+        target = Path(output_dir) if output_dir else default_snapshot_path(self.db_path)
+        return write_snapshot(self._reader(), target, source=str(self.db_path))
+
     def get_stats(self) -> tuple[dict, str]:
         """
         Get database statistics.
@@ -646,7 +1116,7 @@ class LeadDB:
             return {}, "not connected"
 
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
 
             # Count rows by status
             cursor.execute("""
@@ -675,3 +1145,32 @@ class LeadDB:
             return stats, ""
         except Exception as e:
             return {}, f"get_stats error: {e}"
+
+
+def open_lead_db(db_path: Path, url: Optional[str] = None, schema: Optional[str] = None) -> tuple[Optional[LeadDBBackend], str]:
+    """
+    Create the storage backend for a lead table (not yet connected).
+
+    Args:
+        db_path: SQLite database file, used when no Postgres URL is configured
+            (a table.shards/ directory next to it selects the sharded backend)
+        url: Postgres/Neon connection URL (default: LEAD_DB_URL env var)
+        schema: Postgres schema for this lead table (default: derived from the lead directory name)
+
+    Returns:
+        (db, error): Backend instance and error message
+    """
+    url = url if url is not None else os.getenv("LEAD_DB_URL", "")
+    if not url:
+        from db_sharded import ShardedLeadDB, is_sharded, shard_dir_for
+
+        if is_sharded(db_path):
+            return ShardedLeadDB(shard_dir_for(db_path)), ""
+        return LeadDB(db_path), ""
+
+    if url.startswith(("postgres://", "postgresql://")):
+        from db_postgres import PostgresLeadDB, lead_schema_name
+
+        return PostgresLeadDB(url, schema or lead_schema_name(Path(db_path).parent.name)), ""
+
+    return None, f"unsupported LEAD_DB_URL scheme: {url.split(':', 1)[0]}"
@@ -0,0 +1,797 @@
+#!/usr/bin/env python3
+"""
+Postgres/Neon backend for lead tables.
+
+Same API and tables as the SQLite LeadDB (see db.py), stored in one Postgres
+schema per lead table (lead_<name>) so enrichment results land in the same
+database the campaign pipeline reads from.
+
+- Connection pooling via psycopg_pool (one connection per worker thread)
+- COPY for CSV imports (import_csv) and exports (copy_to_csv)
+- Pipelined batch updates (update_rows) and INSERT ... ON CONFLICT batches
+  for node results (set_cache_entries)
+- The same append-only change log as SQLite (changes_since)
+
+Enable by setting LEAD_DB_URL=postgresql://... (see db.open_lead_db).
+Requires psycopg 3 and psycopg_pool (optional dependencies).
+
+Note: workflow `where` clauses are passed through as SQL. Dynamic columns are
+TEXT, so compare against quoted literals (is_b2b = '1') to stay portable.
+
+Error-first pattern: All functions return (result, error) tuples.
+"""
+
+import json
+import re
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from db import ROW_INSERTED, CacheEntry, ChangeCursor, LeadDBBackend, RowUpdate, value_hash
+
+try:
+    from psycopg import sql
+    from psycopg.rows import dict_row
+    from psycopg.types.json import Jsonb
+    from psycopg_pool import ConnectionPool
+    PSYCOPG_AVAILABLE = True
+except ImportError:
+    PSYCOPG_AVAILABLE = False
+
+
+DEFAULT_POOL_MIN = 1
+DEFAULT_POOL_MAX = 10
+CONNECT_TIMEOUT_SECONDS = 30.0
+
+
+def lead_schema_name(lead_name: str) -> str:
+    """Postgres schema for a lead table directory name (e.g. yc-f25 -> lead_yc_f25)."""
+    name = re.sub(r"[^a-z0-9_]", "_", lead_name.lower())
+    name = re.sub(r"_+", "_", name).strip("_")
+    return f"lead_{name}" if name else "lead_default"
+
+
+def _to_text(value):
+    """Coerce a value for a dynamic TEXT column (mirrors SQLite TEXT affinity)."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class PostgresLeadDB(LeadDBBackend):
+    """Postgres database for a single lead table."""
+
+    def __init__(
+        self,
+        url: str,
+        schema: str = "public",
+        min_size: int = DEFAULT_POOL_MIN,
+        max_size: int = DEFAULT_POOL_MAX,
+    ):
+        """
+        Initialize PostgresLeadDB.
+
+        Args:
+            url: Postgres connection URL (Neon URLs work as-is)
+            schema: Schema holding this lead table's tables
+            min_size: Connections kept open in the pool
+            max_size: Upper bound on pooled connections (match --parallel)
+        """
+        self.url = url
+        self.schema = schema
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool: Optional["ConnectionPool"] = None
+        self._columns: set[str] = set()
+        self._columns_lock = Lock()
+
+    def _configure(self, conn) -> None:
+        conn.execute(sql.SQL("SET search_path TO {}").format(sql.Identifier(self.schema)))
+        conn.commit()
+
+    def connect(self) -> str:
+        """
+        Open the connection pool.
+
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        if not PSYCOPG_AVAILABLE:
+            return "postgres backend requires psycopg (pip install 'psycopg[binary]' psycopg_pool)"
+
+        try:
+            self.pool = ConnectionPool(
+                self.url,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                kwargs={"row_factory": dict_row},
+                configure=self._configure,
+                open=True,
+            )
+            self.pool.wait(timeout=CONNECT_TIMEOUT_SECONDS)
+            return ""
+        except Exception as e:
+            self.close()
+            return f"connect error: {e}"
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+    def init_schema(self) -> str:
+        """
+        Initialize database schema (create schema and tables if not exist).
+
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        if not self.pool:
+            return "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                conn.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(self.schema)))
+                conn.execute("""
+                    -- Main data table with dynamic columns
+                    CREATE TABLE IF NOT EXISTS leads (
+                        _id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                        _source_row_index INTEGER,
+                        _created_at TIMESTAMPTZ DEFAULT now(),
+                        _updated_at TIMESTAMPTZ DEFAULT now(),
+                        _status TEXT DEFAULT 'pending',
+                        _error TEXT
+                    );
+
+                    -- Column metadata (track which node produced which column)
+                    CREATE TABLE IF NOT EXISTS columns (
+                        column_name TEXT PRIMARY KEY,
+                        column_type TEXT,
+                        source TEXT,
+                        created_at TIMESTAMPTZ DEFAULT now(),
+                        description TEXT
+                    );
+
+                    -- Workflow execution history
+                    CREATE TABLE IF NOT EXISTS executions (
+                        execution_id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                        workflow_type TEXT,
+                        workflow_name TEXT,
+                        started_at TIMESTAMPTZ DEFAULT now(),
+                        completed_at TIMESTAMPTZ,
+                        total_rows INTEGER,
+                        success_count INTEGER,
+                        failed_count INTEGER,
+                        config JSONB,
+                        output_path TEXT
+                    );
+
+                    -- Row-level execution tracking
+                    CREATE TABLE IF NOT EXISTS row_executions (
+                        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                        execution_id BIGINT REFERENCES executions(execution_id),
+                        row_id BIGINT REFERENCES leads(_id),
+                        node_name TEXT,
+                        started_at TIMESTAMPTZ DEFAULT now(),
+                        completed_at TIMESTAMPTZ,
+                        status TEXT,
+                        error TEXT,
+                        input_hash TEXT,
+                        config_hash TEXT,
+                        cache_hit BOOLEAN
+                    );
+
+                    CREATE INDEX IF NOT EXISTS idx_leads_status ON leads(_status);
+                    CREATE INDEX IF NOT EXISTS idx_row_executions_execution ON row_executions(execution_id);
+                    CREATE INDEX IF NOT EXISTS idx_row_executions_lookup
+                        ON row_executions(row_id, node_name, input_hash, config_hash);
+
+                    -- Node-level cache keyed by (node_name + input_hash + config_hash)
+                    CREATE TABLE IF NOT EXISTS node_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        node_name TEXT,
+                        input_hash TEXT,
+                        config_hash TEXT,
+                        created_at TIMESTAMPTZ DEFAULT now(),
+                        result_json JSONB,
+                        error TEXT
+                    );
+
+                    CREATE INDEX IF NOT EXISTS idx_node_cache_node ON node_cache(node_name);
+
+                    -- Append-only change log, written in the same transaction as the row update
+                    CREATE TABLE IF NOT EXISTS changes (
+                        seq BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                        row_id BIGINT,
+                        column_name TEXT,
+                        value_hash TEXT,
+                        changed_at TIMESTAMPTZ DEFAULT clock_timestamp()
+                    );
+
+                    CREATE INDEX IF NOT EXISTS idx_changes_row ON changes(row_id);
+                """)
+                self._load_columns(conn)
+            return ""
+        except Exception as e:
+            return f"init_schema error: {e}"
+
+    def _load_columns(self, conn) -> None:
+        rows = conn.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_schema = %s AND table_name = 'leads'",
+            (self.schema,),
+        ).fetchall()
+        with self._columns_lock:
+            self._columns = {row["column_name"] for row in rows}
+
+    def _add_columns_if_needed(self, conn, column_names, source: str) -> list[str]:
+        """
+        Add missing TEXT columns to leads and record their metadata.
+
+        The caller commits, then passes the returned columns to
+        _columns_committed; until then a rollback would undo the ALTER.
+        """
+        with self._columns_lock:
+            missing = [c for c in column_names if c not in self._columns]
+        for col in missing:
+            conn.execute(sql.SQL("ALTER TABLE leads ADD COLUMN IF NOT EXISTS {} TEXT").format(sql.Identifier(col)))
+            conn.execute(
+                """
+                INSERT INTO columns (column_name, column_type, source)
+                VALUES (%s, 'text', %s)
+                ON CONFLICT (column_name) DO NOTHING
+                """,
+                (col, source),
+            )
+        return missing
+
+    def _columns_committed(self, columns: list[str]) -> None:
+        with self._columns_lock:
+            self._columns.update(columns)
+
+    @staticmethod
+    def _lock_change_log(conn) -> None:
+        """
+        Serialize change-log writers until this transaction commits.
+
+        Identity values are handed out before commit, so two concurrent
+        writers could commit seq 6 before seq 5; a reader that saw 6 would
+        move its cursor past 5 and never see it. Holding this lock from the
+        first seq to commit makes seqs become visible in order.
+        """
+        conn.execute("SELECT pg_advisory_xact_lock(hashtext(current_schema() || '.changes'))")
+
+    def import_csv(self, csv_rows: list[dict], source_row_indexes: Optional[list[int]] = None) -> tuple[int, str]:
+        """
+        Import CSV rows with COPY.
+
+        Args:
+            csv_rows: List of dicts representing CSV rows
+            source_row_indexes: Optional original CSV positions (default: 0..n-1)
+
+        Returns:
+            (row_count, error): Number of rows imported and error message
+        """
+        if not self.pool:
+            return 0, "not connected"
+
+        if not csv_rows:
+            return 0, "empty csv_rows"
+
+        try:
+            csv_columns = list(csv_rows[0].keys())
+            with self.pool.connection() as conn:
+                added = self._add_columns_if_needed(conn, csv_columns, "csv")
+                previous_max_id = conn.execute("SELECT COALESCE(MAX(_id), 0) AS max_id FROM leads").fetchone()["max_id"]
+                columns = sql.SQL(", ").join(sql.Identifier(c) for c in ["_source_row_index"] + csv_columns)
+                with conn.cursor() as cursor:
+                    with cursor.copy(sql.SQL("COPY leads ({}) FROM STDIN").format(columns)) as copy:
+                        for idx, row in enumerate(csv_rows):
+                            source_idx = source_row_indexes[idx] if source_row_indexes else idx
+                            copy.write_row([source_idx] + [_to_text(row.get(col, "")) for col in csv_columns])
+                # One change-log entry per new row
+                self._lock_change_log(conn)
+                conn.execute(
+                    "INSERT INTO changes (row_id, column_name) SELECT _id, %s FROM leads WHERE _id > %s ORDER BY _id",
+                    (ROW_INSERTED, previous_max_id),
+                )
+            self._columns_committed(added)
+            return len(csv_rows), ""
+        except Exception as e:
+            return 0, f"import_csv error: {e}"
+
+    def get_rows(self, status: Optional[str] = None, limit: Optional[int] = None) -> tuple[list[dict], str]:
+        """
+        Get rows from database, optionally filtered by status.
+
+        Returns:
+            (rows, error): List of row dicts and error message
+        """
+        if not self.pool:
+            return [], "not connected"
+
+        try:
+            query = "SELECT * FROM leads"
+            params = []
+            if status:
+                query += " WHERE _status = %s"
+                params.append(status)
+            query += " ORDER BY _id"
+            if limit:
+                query += " LIMIT %s"
+                params.append(limit)
+
+            with self.pool.connection() as conn:
+                return conn.execute(query, params).fetchall(), ""
+        except Exception as e:
+            return [], f"get_rows error: {e}"
+
+    def filter_rows(self, where_clause: str) -> tuple[list[dict], str]:
+        """
+        Filter rows using a SQL WHERE clause.
+
+        Returns:
+            (rows, error): List of filtered row dicts and error message
+        """
+        if not self.pool:
+            return [], "not connected"
+
+        if not where_clause or not where_clause.strip():
+            return [], "empty where_clause"
+
+        try:
+            with self.pool.connection() as conn:
+                return conn.execute(f"SELECT * FROM leads WHERE {where_clause} ORDER BY _id").fetchall(), ""
+        except Exception as e:
+            return [], f"filter_rows error: {e}"
+
+    @staticmethod
+    def _row_update_statement(columns: tuple[str, ...], has_status: bool, has_error: bool):
+        set_clauses = [sql.SQL("{} = %s").format(sql.Identifier(c)) for c in columns]
+        set_clauses.append(sql.SQL("_updated_at = now()"))
+        if has_status:
+            set_clauses.append(sql.SQL("_status = %s"))
+        if has_error:
+            set_clauses.append(sql.SQL("_error = %s"))
+        return sql.SQL("UPDATE leads SET {} WHERE _id = %s").format(sql.SQL(", ").join(set_clauses))
+
+    def update_row(self, row_id: int, updates: dict, status: Optional[str] = None, error: Optional[str] = None) -> str:
+        """
+        Update a row with enrichment data.
+
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        err = self.update_rows([(row_id, updates, status, error)])
+        return err.replace("update_rows error", "update_row error", 1)
+
+    def update_rows(self, row_updates: list[RowUpdate]) -> str:
+        """
+        Update many rows in one transaction.
+
+        Rows sharing the same set of columns are sent with one pipelined
+        executemany, so a batch costs one round trip per column shape.
+
+        Args:
+            row_updates: List of (row_id, updates, status, error) tuples
+
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        if not self.pool:
+            return "not connected"
+
+        if not row_updates:
+            return ""
+
+        try:
+            groups: dict[tuple, list[list]] = {}
+            new_values: dict[int, dict] = {}
+            for row_id, updates, status, error in row_updates:
+                columns = tuple(updates.keys())
+                key = (columns, bool(status), error is not None)
+                params = [_to_text(v) for v in updates.values()]
+                values = dict(zip(columns, params))
+                if status:
+                    params.append(status)
+                    values["_status"] = status
+                if error is not None:
+                    params.append(error if error else None)
+                    values["_error"] = error if error else None
+                params.append(row_id)
+                groups.setdefault(key, []).append(params)
+                new_values.setdefault(row_id, {}).update(values)
+
+            with self.pool.connection() as conn:
+                all_columns = list(dict.fromkeys(c for columns, _, _ in groups for c in columns))
+                added = self._add_columns_if_needed(conn, all_columns, "enrichment")
+                changes = self._diff_changes(conn, new_values)
+                with conn.cursor() as cursor:
+                    for (columns, has_status, has_error), params in groups.items():
+                        cursor.executemany(self._row_update_statement(columns, has_status, has_error), params)
+                    if changes:
+                        self._lock_change_log(conn)
+                        cursor.executemany(
+                            "INSERT INTO changes (row_id, column_name, value_hash) VALUES (%s, %s, %s)",
+                            changes,
+                        )
+            self._columns_committed(added)
+            return ""
+        except Exception as e:
+            return f"update_rows error: {e}"
+
+    @staticmethod
+    def _diff_changes(conn, new_values: dict[int, dict]) -> list[tuple[int, str, str]]:
+        """Compare new values with the current rows; return (row_id, column, hash) for real changes."""
+        columns = list(dict.fromkeys(c for values in new_values.values() for c in values))
+        if not columns:
+            return []
+        query = sql.SQL("SELECT _id, {} FROM leads WHERE _id = ANY(%s)").format(
+            sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+        )
+        current = {row["_id"]: row for row in conn.execute(query, (list(new_values.keys()),)).fetchall()}
+
+        changes = []
+        for row_id, values in new_values.items():
+            old_row = current.get(row_id)
+            if old_row is None:
+                continue
+            for col, val in values.items():
+                new_hash = value_hash(val)
+                if value_hash(old_row[col]) != new_hash:
+                    changes.append((row_id, col, new_hash))
+        return changes
+
+    def start_execution(self, workflow_type: str, workflow_name: str, total_rows: int, config: Optional[dict] = None) -> tuple[int, str]:
+        """
+        Start a new execution and return execution_id.
+
+        Returns:
+            (execution_id, error): Execution ID and error message
+        """
+        if not self.pool:
+            return 0, "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    """
+                    INSERT INTO executions (workflow_type, workflow_name, total_rows, config)
+                    VALUES (%s, %s, %s, %s)
+                    RETURNING execution_id
+                    """,
+                    (workflow_type, workflow_name, total_rows, Jsonb(config or {})),
+                ).fetchone()
+            return row["execution_id"], ""
+        except Exception as e:
+            return 0, f"start_execution error: {e}"
+
+    def complete_execution(self, execution_id: int, success_count: int, failed_count: int, output_path: Optional[str] = None) -> str:
+        """
+        Mark execution as complete.
+
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        if not self.pool:
+            return "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                conn.execute(
+                    """
+                    UPDATE executions
+                    SET completed_at = now(),
+                        success_count = %s,
+                        failed_count = %s,
+                        output_path = %s
+                    WHERE execution_id = %s
+                    """,
+                    (success_count, failed_count, output_path, execution_id),
+                )
+            return ""
+        except Exception as e:
+            return f"complete_execution error: {e}"
+
+    def has_completed_row_execution(self, row_id: int, node_name: str, input_hash: str, config_hash: str) -> tuple[bool, str]:
+        """Return True if this row has already completed this node for the same inputs/config."""
+        if not self.pool:
+            return False, "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    """
+                    SELECT 1
+                    FROM row_executions
+                    WHERE row_id = %s
+                      AND node_name = %s
+                      AND input_hash = %s
+                      AND config_hash = %s
+                      AND status = 'completed'
+                    LIMIT 1
+                    """,
+                    (row_id, node_name, input_hash, config_hash),
+                ).fetchone()
+            return row is not None, ""
+        except Exception as e:
+            return False, f"has_completed_row_execution error: {e}"
+
+    def start_row_execution(
+        self,
+        execution_id: int,
+        row_id: int,
+        node_name: str,
+        input_hash: str,
+        config_hash: str,
+        cache_hit: bool,
+    ) -> tuple[int, str]:
+        """Insert a row_executions record and return its ID."""
+        if not self.pool:
+            return 0, "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    """
+                    INSERT INTO row_executions (execution_id, row_id, node_name, status, input_hash, config_hash, cache_hit)
+                    VALUES (%s, %s, %s, 'running', %s, %s, %s)
+                    RETURNING id
+                    """,
+                    (execution_id, row_id, node_name, input_hash, config_hash, bool(cache_hit)),
+                ).fetchone()
+            return row["id"], ""
+        except Exception as e:
+            return 0, f"start_row_execution error: {e}"
+
+    def complete_row_execution(self, row_execution_id: int, status: str, error: Optional[str]) -> str:
+        """Mark a row_executions record as completed/failed."""
+        if not self.pool:
+            return "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                conn.execute(
+                    """
+                    UPDATE row_executions
+                    SET completed_at = now(),
+                        status = %s,
+                        error = %s
+                    WHERE id = %s
+                    """,
+                    (status, error if error else None, row_execution_id),
+                )
+            return ""
+        except Exception as e:
+            return f"complete_row_execution error: {e}"
+
+    def get_cache_entry(self, cache_key: str) -> tuple[Optional[dict], str, str]:
+        """
+        Get a cached node result.
+
+        Returns:
+            (result_dict_or_none, cached_error, error)
+        """
+        if not self.pool:
+            return None, "", "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute(
+                    "SELECT result_json, error FROM node_cache WHERE cache_key = %s",
+                    (cache_key,),
+                ).fetchone()
+            if not row:
+                return None, "", ""
+
+            cached_error = row["error"] or ""
+            result = row["result_json"]
+            if not isinstance(result, dict):
+                return None, cached_error, ""
+            return result, cached_error, ""
+        except Exception as e:
+            return None, "", f"get_cache_entry error: {e}"
+
+    def set_cache_entry(
+        self,
+        cache_key: str,
+        node_name: str,
+        input_hash: str,
+        config_hash: str,
+        result: dict,
+        error: str,
+    ) -> str:
+        """Upsert a cached node result."""
+        err = self.set_cache_entries([(cache_key, node_name, input_hash, config_hash, result, error)])
+        return err.replace("set_cache_entries error", "set_cache_entry error", 1)
+
+    def set_cache_entries(self, entries: list[CacheEntry]) -> str:
+        """
+        Upsert many cached node results with one INSERT ... ON CONFLICT.
+
+        Args:
+            entries: List of (cache_key, node_name, input_hash, config_hash, result, error)
+
+        Returns:
+            error: Empty string on success, error message on failure
+        """
+        if not self.pool:
+            return "not connected"
+
+        if not entries:
+            return ""
+
+        try:
+            # ON CONFLICT can't touch the same key twice in one statement; last write wins
+            latest = {entry[0]: entry for entry in entries}
+            values = []
+            params = []
+            for cache_key, node_name, input_hash, config_hash, result, error in latest.values():
+                values.append(sql.SQL("(%s, %s, %s, %s, %s, %s)"))
+                params.extend([cache_key, node_name, input_hash, config_hash, Jsonb(result), error if error else None])
+
+            query = sql.SQL("""
+                INSERT INTO node_cache (cache_key, node_name, input_hash, config_hash, result_json, error)
+                VALUES {}
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    created_at = now(),
+                    result_json = excluded.result_json,
+                    error = excluded.error
+            """).format(sql.SQL(", ").join(values))
+
+            with self.pool.connection() as conn:
+                conn.execute(query, params)
+            return ""
+        except Exception as e:
+            return f"set_cache_entries error: {e}"
+
+    def changes_since(self, cursor: ChangeCursor = 0, limit: int = 1000) -> tuple[list[dict], ChangeCursor, str]:
+        """
+        Read the change log after a cursor (the last seq processed; 0 for the beginning).
+
+        Returns:
+            (changes, next_cursor, error): Changes in seq order, cursor to pass next time, and error
+        """
+        if not self.pool:
+            return [], cursor, "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT seq, row_id, column_name, value_hash, changed_at
+                    FROM changes
+                    WHERE seq > %s
+                    ORDER BY seq
+                    LIMIT %s
+                    """,
+                    (cursor, limit),
+                ).fetchall()
+            changes = [{**row, "changed_at": row["changed_at"].isoformat()} for row in rows]
+            next_cursor = changes[-1]["seq"] if changes else cursor
+            return changes, next_cursor, ""
+        except Exception as e:
+            return [], cursor, f"changes_since error: {e}"
+
+    def latest_change_cursor(self) -> tuple[ChangeCursor, str]:
+        """
+        Get the newest change-log seq (start tailing from "now").
+
+        Returns:
+            (cursor, error): Latest seq (0 if empty) and error message
+        """
+        if not self.pool:
+            return 0, "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                row = conn.execute("SELECT COALESCE(MAX(seq), 0) AS seq FROM changes").fetchone()
+            return row["seq"], ""
+        except Exception as e:
+            return 0, f"latest_change_cursor error: {e}"
+
+    def _data_columns(self, conn) -> list[str]:
+        rows = conn.execute(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = 'leads'
+            ORDER BY ordinal_position
+            """,
+            (self.schema,),
+        ).fetchall()
+        return [row["column_name"] for row in rows if not row["column_name"].startswith("_")]
+
+    def export_to_csv(self, output_path: Optional[Path] = None) -> tuple[list[dict], str]:
+        """
+        Export all rows to CSV format (list of dicts), excluding internal _ columns.
+
+        Returns:
+            (rows, error): List of row dicts (without internal columns) and error message
+        """
+        if not self.pool:
+            return [], "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                columns = self._data_columns(conn)
+                if not columns:
+                    return [], ""
+                query = sql.SQL("SELECT {} FROM leads ORDER BY _id").format(
+                    sql.SQL(", ").join(sql.Identifier(c) for c in columns)
+                )
+                return conn.execute(query).fetchall(), ""
+        except Exception as e:
+            return [], f"export_to_csv error: {e}"
+
+    def copy_to_csv(self, output_path: Path, status: Optional[str] = None) -> tuple[int, str]:
+        """
+        Stream the table straight to a CSV file with COPY ... TO STDOUT.
+
+        Args:
+            output_path: Destination CSV path
+            status: Optional _status filter (e.g. 'completed')
+
+        Returns:
+            (bytes_written, error): Size of the CSV written and error message
+        """
+        if not self.pool:
+            return 0, "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                columns = sql.SQL(", ").join(sql.Identifier(c) for c in self._data_columns(conn))
+                select = sql.SQL("SELECT {} FROM leads").format(columns)
+                if status:
+                    select = sql.SQL("{} WHERE _status = {}").format(select, sql.Literal(status))
+                select = sql.SQL("{} ORDER BY _id").format(select)
+
+                written = 0
+                with conn.cursor() as cursor, open(output_path, "wb") as f:
+                    with cursor.copy(sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER true)").format(select)) as copy:
+                        for chunk in copy:
+                            f.write(chunk)
+                            written += len(chunk)
+            return written, ""
+        except Exception as e:
+            return 0, f"copy_to_csv error: {e}"
+
+    def get_stats(self) -> tuple[dict, str]:
+        """
+        Get database statistics.
+
+        Returns:
+            (stats, error): Dict with stats and error message
+        """
+        if not self.pool:
+            return {}, "not connected"
+
+        try:
+            with self.pool.connection() as conn:
+                rows = conn.execute("SELECT _status, COUNT(*) AS count FROM leads GROUP BY _status").fetchall()
+                status_counts = {row["_status"]: row["count"] for row in rows}
+                total_rows = conn.execute("SELECT COUNT(*) AS count FROM leads").fetchone()["count"]
+                data_cols = self._data_columns(conn)
+
+            return {
+                "total_rows": total_rows,
+                "status_counts": status_counts,
+                "column_count": len(data_cols),
+                "data_columns": data_cols,
+            }, ""
+        except Exception as e:
+            return {}, f"get_stats error: {e}"
+
+    def get_connection_stats(self) -> tuple[dict, str]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            (stats, error): Dict with psycopg_pool stats and error message
+        """
+        if not self.pool:
+            return {}, "not connected"
+        return dict(self.pool.get_stats()), ""
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Sharded SQLite backend for very large lead tables.
+
+Rows are spread over N independent LeadDB files (leads/<lead>/table.shards/
+shard-XX.db), each with its own WAL and writer, so concurrent enrichment
+workers writing rows on different shards don't queue behind one lock.
+ShardedLeadDB implements LeadDBBackend and merges reads across shards, so
+graph_enrich and the other tools work unchanged.
+
+Layout:
+    table.shards/manifest.json   {"shards": N, "version": 1}
+    table.shards/shard-00.db     LeadDB (rows with source index % N == 0)
+    ...
+
+Global row IDs encode the shard: global_id = local_id * N + shard. Executions
+live on shard 0; row executions, change logs and the rest of each row's data
+live on the row's shard; cache entries are routed by a hash of the cache key.
+The change-log cursor is an opaque string of per-shard seqs ("12,40,7").
+
+Usage:
+    # Create an 8-way sharded table and import leads/<lead>/table.csv
+    python db_sharded.py --lead example-leads --shards 8
+
+    # Show per-shard row counts
+    python db_sharded.py --lead example-leads --stats
+
+Error-first pattern: All functions return (result, error) tuples.
+"""
+
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from db import ChangeCursor, LeadDB, LeadDBBackend, RowUpdate
+
+MANIFEST_NAME = "manifest.json"
+MAX_SHARDS = 64
+
+
+def shard_dir_for(db_path: Path) -> Path:
+    """Shard directory for a lead table db path (table.db -> table.shards)."""
+    return Path(db_path).with_suffix(".shards")
+
+
+def is_sharded(db_path: Path) -> bool:
+    """True if a sharded table has been created next to db_path."""
+    return (shard_dir_for(db_path) / MANIFEST_NAME).exists()
+
+
+def create_shards(shard_dir: Path, shard_count: int) -> str:
+    """
+    Write the shard manifest (shard files are created on connect).
+
+    Args:
+        shard_dir: Directory holding the shard files
+        shard_count: Number of shards (1-64)
+
+    Returns:
+        error: Empty string on success, error message on failure
+    """
+    if not 1 <= shard_count <= MAX_SHARDS:
+        return f"shard count must be between 1 and {MAX_SHARDS}"
+
+    manifest_path = Path(shard_dir) / MANIFEST_NAME
+    if manifest_path.exists():
+        return f"shards already exist: {manifest_path}"
+
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps({"shards": shard_count, "version": 1}, indent=2), encoding="utf-8")
+        return ""
+    except Exception as e:
+        return f"create_shards error: {e}"
+
+
+def shard_files(shard_dir: Path) -> tuple[list[Path], str]:
+    """
+    Shard database files listed by a shard manifest, in shard order.
+
+    Returns:
+        (paths, error): shard-XX.db paths and error message
+    """
+    try:
+        manifest = json.loads((Path(shard_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+        return [Path(shard_dir) / f"shard-{i:02d}.db" for i in range(int(manifest["shards"]))], ""
+    except Exception as e:
+        return [], f"read shard manifest error: {e}"
+
+
+class ShardedLeadDB(LeadDBBackend):
+    """Lead table spread over N SQLite shards with a merged query layer."""
+
+    def __init__(self, shard_dir: Path):
+        self.shard_dir = Path(shard_dir)
+        self.shards: list[LeadDB] = []
+        self.shard_count = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._known_columns: set = set()
+        self._columns_lock = Lock()
+
+    def connect(self) -> str:
+        """Read the manifest and connect every shard."""
+        files, err = shard_files(self.shard_dir)
+        if err:
+            return err
+
+        self.shard_count = len(files)
+        self.shards = [LeadDB(path) for path in files]
+        for shard in self.shards:
+            err = shard.connect()
+            if err:
+                self.close()
+                return err
+
+        self._executor = ThreadPoolExecutor(max_workers=self.shard_count, thread_name_prefix="lead-shard")
+        return ""
+
+    def close(self) -> None:
+        """Close every shard and the fan-out pool."""
+        for shard in self.shards:
+            shard.close()
+        self.shards = []
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # ----------------------------------------------------------------------
+    # Routing helpers
+    # ----------------------------------------------------------------------
+
+    def _locate(self, global_id: int) -> tuple[LeadDB, int]:
+        """Map a global ID to (shard, local ID)."""
+        return self.shards[global_id % self.shard_count], global_id // self.shard_count
+
+    def _global_id(self, shard_idx: int, local_id: int) -> int:
+        return local_id * self.shard_count + shard_idx
+
+    def _cache_shard(self, cache_key: str) -> LeadDB:
+        digest = hashlib.blake2b(cache_key.encode("utf-8"), digest_size=8).digest()
+        return self.shards[int.from_bytes(digest, "big") % self.shard_count]
+
+    def _fan_out(self, fn) -> list:
+        """Run fn(shard_idx, shard) on every shard in parallel, results in shard order."""
+        if not self._executor:
+            return [fn(i, shard) for i, shard in enumerate(self.shards)]
+        futures = [self._executor.submit(fn, i, shard) for i, shard in enumerate(self.shards)]
+        return [f.result() for f in futures]
+
+    def _merge_rows(self, results: list[tuple[list[dict], str]], limit: Optional[int] = None) -> tuple[list[dict], str]:
+        """Merge per-shard row lists into source order with global IDs."""
+        per_shard = []
+        for shard_idx, (rows, err) in enumerate(results):
+            if err:
+                return [], f"shard {shard_idx}: {err}"
+            for row in rows:
+                row["_id"] = self._global_id(shard_idx, row["_id"])
+            per_shard.append(rows)
+
+        merged = heapq.merge(*per_shard, key=lambda row: (row.get("_source_row_index") or 0, row["_id"]))
+        rows = list(merged)
+        return (rows[:limit] if limit else rows), ""
+
+    # ----------------------------------------------------------------------
+    # Schema and rows
+    # ----------------------------------------------------------------------
+
+    def init_schema(self) -> str:
+        """Create tables on every shard."""
+        for shard_idx, err in enumerate(self._fan_out(lambda i, shard: shard.init_schema())):
+            if err:
+                return f"shard {shard_idx}: {err}"
+        return ""
+
+    def import_csv(self, csv_rows: list[dict], source_row_indexes: Optional[list[int]] = None) -> tuple[int, str]:
+        """
+        Import CSV rows, assigning row i to shard i % N and importing shards in parallel.
+
+        Args:
+            csv_rows: List of dicts representing CSV rows
+            source_row_indexes: Optional original CSV positions (default: 0..n-1)
+
+        Returns:
+            (count, error): Number of rows imported and error message
+        """
+        if not self.shards:
+            return 0, "not connected"
+
+        if not csv_rows:
+            return 0, ""
+
+        indexes = source_row_indexes or list(range(len(csv_rows)))
+        parts: list[tuple[list[dict], list[int]]] = [([], []) for _ in self.shards]
+        for row, source_idx in zip(csv_rows, indexes):
+            rows, positions = parts[source_idx % self.shard_count]
+            rows.append(row)
+            positions.append(source_idx)
+
+        # Every shard gets every column, even if its slice had none of the rows
+        columns = list(csv_rows[0].keys())
+        for shard_idx, err in enumerate(self._fan_out(lambda i, shard: shard.ensure_columns(columns, "csv"))):
+            if err:
+                return 0, f"shard {shard_idx}: {err}"
+
+        results = self._fan_out(lambda i, shard: shard.import_csv(*parts[i]) if parts[i][0] else (0, ""))
+        total = 0
+        for shard_idx, (count, err) in enumerate(results):
+            if err:
+                return total, f"shard {shard_idx}: {err}"
+            total += count
+        return total, ""
+
+    def get_rows(self, status: Optional[str] = None, limit: Optional[int] = None) -> tuple[list[dict], str]:
+        """Get rows from every shard in source order (optionally by status)."""
+        if not self.shards:
+            return [], "not connected"
+        return self._merge_rows(self._fan_out(lambda i, shard: shard.get_rows(status, limit)), limit)
+
+    def filter_rows(self, where_clause: str) -> tuple[list[dict], str]:
+        """Run a WHERE clause on every shard and merge the matches."""
+        if not self.shards:
+            return [], "not connected"
+        return self._merge_rows(self._fan_out(lambda i, shard: shard.filter_rows(where_clause)))
+
+    def _sync_columns(self, columns: set) -> str:
+        """Add new enrichment columns to every shard so queries see one schema."""
+        with self._columns_lock:
+            missing = sorted(set(columns) - self._known_columns)
+            if not missing:
+                return ""
+            for shard_idx, err in enumerate(self._fan_out(lambda i, shard: shard.ensure_columns(missing, "enrichment"))):
+                if err:
+                    return f"shard {shard_idx}: {err}"
+            self._known_columns.update(missing)
+        return ""
+
+    def update_row(self, row_id: int, updates: dict, status: Optional[str] = None, error: Optional[str] = None) -> str:
+        """Update one row on its shard."""
+        if not self.shards:
+            return "not connected"
+
+        err = self._sync_columns(set(updates))
+        if err:
+            return err
+        shard, local_id = self._locate(row_id)
+        return shard.update_row(local_id, updates, status, error)
+
+    def update_rows(self, row_updates: list[RowUpdate]) -> str:
+        """Update many rows, one transaction per shard, shards in parallel."""
+        if not self.shards:
+            return "not connected"
+
+        if not row_updates:
+            return ""
+
+        err = self._sync_columns({col for _, updates, _, _ in row_updates for col in updates})
+        if err:
+            return err
+
+        batches: list[list[RowUpdate]] = [[] for _ in self.shards]
+        for row_id, updates, status, error in row_updates:
+            batches[row_id % self.shard_count].append((row_id // self.shard_count, updates, status, error))
+
+        results = self._fan_out(lambda i, shard: shard.update_rows(batches[i]))
+        for shard_idx, err in enumerate(results):
+            if err:
+                return f"shard {shard_idx}: {err}"
+        return ""
+
+    # ----------------------------------------------------------------------
+    # Execution tracking and cache
+    # ----------------------------------------------------------------------
+
+    def start_execution(self, workflow_type: str, workflow_name: str, total_rows: int, config: Optional[dict] = None) -> tuple[int, str]:
+        """Record an execution on shard 0."""
+        if not self.shards:
+            return 0, "not connected"
+        return self.shards[0].start_execution(workflow_type, workflow_name, total_rows, config)
+
+    def complete_execution(self, execution_id: int, success_count: int, failed_count: int, output_path: Optional[str] = None) -> str:
+        """Complete an execution on shard 0."""
+        if not self.shards:
+            return "not connected"
+        return self.shards[0].complete_execution(execution_id, success_count, failed_count, output_path)
+
+    def has_completed_row_execution(self, row_id: int, node_name: str, input_hash: str, config_hash: str) -> tuple[bool, str]:
+        if not self.shards:
+            return False, "not connected"
+        shard, local_id = self._locate(row_id)
+        return shard.has_completed_row_execution(local_id, node_name, input_hash, config_hash)
+
+    def start_row_execution(
+        self,
+        execution_id: int,
+        row_id: int,
+        node_name: str,
+        input_hash: str,
+        config_hash: str,
+        cache_hit: bool,
+    ) -> tuple[int, str]:
+        """Insert a row_executions record on the row's shard (ID encodes the shard)."""
+        if not self.shards:
+            return 0, "not connected"
+        shard, local_id = self._locate(row_id)
+        local_exec_id, err = shard.start_row_execution(execution_id, local_id, node_name, input_hash, config_hash, cache_hit)
+        if err:
+            return 0, err
+        return self._global_id(row_id % self.shard_count, local_exec_id), ""
+
+    def complete_row_execution(self, row_execution_id: int, status: str, error: Optional[str]) -> str:
+        if not self.shards:
+            return "not connected"
+        shard, local_id = self._locate(row_execution_id)
+        return shard.complete_row_execution(local_id, status, error)
+
+    def get_cache_entry(self, cache_key: str) -> tuple[Optional[dict], str, str]:
+        if not self.shards:
+            return None, "", "not connected"
+        return self._cache_shard(cache_key).get_cache_entry(cache_key)
+
+    def set_cache_entry(self, cache_key: str, node_name: str, input_hash: str, config_hash: str, result: dict, error: str) -> str:
+        if not self.shards:
+            return "not connected"
+        return self._cache_shard(cache_key).set_cache_entry(cache_key, node_name, input_hash, config_hash, result, error)
+
+    # ----------------------------------------------------------------------
+    # Export, change log, stats
+    # ----------------------------------------------------------------------
+
+    def export_to_csv(self, output_path: Optional[Path] = None) -> tuple[list[dict], str]:
+        """
+        Export all rows in source order (internal columns excluded).
+
+        Args:
+            output_path: Unused (kept for compatibility)
+
+        Returns:
+            (rows, error): List of row dicts (without internal columns) and error message
+        """
+        rows, err = self.get_rows()
+        if err:
+            return [], err
+        return [{k: v for k, v in row.items() if not k.startswith("_")} for row in rows], ""
+
+    def _parse_cursor(self, cursor: ChangeCursor) -> tuple[list[int], str]:
+        if not cursor:
+            return [0] * self.shard_count, ""
+        try:
+            seqs = [int(part) for part in str(cursor).split(",")]
+        except ValueError:
+            return [], f"invalid sharded cursor: {cursor!r}"
+        if len(seqs) != self.shard_count:
+            return [], f"cursor has {len(seqs)} shards, table has {self.shard_count}"
+        return seqs, ""
+
+    def changes_since(self, cursor: ChangeCursor = "", limit: int = 1000) -> tuple[list[dict], ChangeCursor, str]:
+        """
+        Read the merged change log of all shards after a cursor.
+
+        Changes carry global row IDs and a "shard" field, ordered by changed_at.
+
+        Args:
+            cursor: Opaque cursor from a previous call ("" or 0 for the beginning)
+            limit: Maximum number of changes to return
+
+        Returns:
+            (changes, next_cursor, error): Changes, cursor to pass next time, and error
+        """
+        if not self.shards:
+            return [], cursor, "not connected"
+
+        seqs, err = self._parse_cursor(cursor)
+        if err:
+            return [], cursor, err
+
+        results = self._fan_out(lambda i, shard: shard.changes_since(seqs[i], limit))
+        per_shard = []
+        for shard_idx, (changes, _, err) in enumerate(results):
+            if err:
+                return [], cursor, f"shard {shard_idx}: {err}"
+            for change in changes:
+                change["row_id"] = self._global_id(shard_idx, change["row_id"])
+                change["shard"] = shard_idx
+            per_shard.append(changes)
+
+        merged = list(heapq.merge(*per_shard, key=lambda c: (c["changed_at"], c["shard"], c["seq"])))[:limit]
+        for change in merged:
+            seqs[change["shard"]] = change["seq"]
+        return merged, ",".join(str(s) for s in seqs), ""
+
+    def latest_change_cursor(self) -> tuple[ChangeCursor, str]:
+        """Cursor pointing at the newest change on every shard."""
+        if not self.shards:
+            return "", "not connected"
+        seqs = []
+        for shard_idx, (seq, err) in enumerate(self._fan_out(lambda i, shard: shard.latest_change_cursor())):
+            if err:
+                return "", f"shard {shard_idx}: {err}"
+            seqs.append(seq)
+        return ",".join(str(s) for s in seqs), ""
+
+    def get_stats(self) -> tuple[dict, str]:
+        """Combined row/status counts plus per-shard row counts."""
+        if not self.shards:
+            return {}, "not connected"
+
+        stats = {"total_rows": 0, "status_counts": {}, "column_count": 0, "data_columns": [], "shard_rows": []}
+        for shard_idx, (shard_stats, err) in enumerate(self._fan_out(lambda i, shard: shard.get_stats())):
+            if err:
+                return {}, f"shard {shard_idx}: {err}"
+            stats["total_rows"] += shard_stats["total_rows"]
+            stats["shard_rows"].append(shard_stats["total_rows"])
+            for status, count in shard_stats["status_counts"].items():
+                stats["status_counts"][status] = stats["status_counts"].get(status, 0) + count
+            for col in shard_stats["data_columns"]:
+                if col not in stats["data_columns"]:
+                    stats["data_columns"].append(col)
+        stats["column_count"] = len(stats["data_columns"])
+        return stats, ""
+
+    def get_connection_stats(self) -> tuple[dict, str]:
+        """Connection counters summed over shards (max lock wait is the worst shard)."""
+        if not self.shards:
+            return {}, "not connected"
+
+        totals = {"shards": self.shard_count, "reader_connections": 0, "reads": 0, "writes": 0,
+                  "write_wait_seconds": 0.0, "max_write_wait_seconds": 0.0}
+        for shard in self.shards:
+            shard_stats, err = shard.get_connection_stats()
+            if err:
+                return {}, err
+            for key in ("reader_connections", "reads", "writes", "write_wait_seconds"):
+                totals[key] += shard_stats.get(key, 0)
+            totals["max_write_wait_seconds"] = max(totals["max_write_wait_seconds"], shard_stats.get("max_write_wait_seconds", 0.0))
+        return totals, ""
+
+
+def get_lead_path(lead_name: str) -> Path:
+    """Get path to a lead table directory."""
+    return Path(__file__).parent.parent / "leads" / lead_name
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Create or inspect a sharded lead table")
+    parser.add_argument("--lead", required=True, help="Lead table name (directory under leads/)")
+    parser.add_argument("--shards", type=int, help="Create a table with this many shards and import table.csv")
+    parser.add_argument("--stats", action="store_true", help="Show per-shard row counts")
+    args = parser.parse_args()
+
+    lead_path = get_lead_path(args.lead)
+    shard_dir = shard_dir_for(lead_path / "table.db")
+
+    if args.shards:
+        err = create_shards(shard_dir, args.shards)
+        if err:
+            print(f"Error: {err}", file=sys.stderr)
+            return 1
+
+    if not (shard_dir / MANIFEST_NAME).exists():
+        print(f"Error: no sharded table at {shard_dir} (create one with --shards N)", file=sys.stderr)
+        return 1
+
+    db = ShardedLeadDB(shard_dir)
+    err = db.connect() or db.init_schema()
+    if err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 1
+
+    try:
+        if args.shards:
+            csv_path = lead_path / "table.csv"
+            if csv_path.exists():
+                with open(csv_path, "r", newline="", encoding="utf-8") as f:
+                    csv_rows = list(csv.DictReader(f))
+                count, err = db.import_csv(csv_rows)
+                if err:
+                    print(f"Error: {err}", file=sys.stderr)
+                    return 1
+                print(f"Imported {count} rows into {db.shard_count} shards")
+
+        stats, err = db.get_stats()
+        if err:
+            print(f"Error: {err}", file=sys.stderr)
+            return 1
+        print(f"{stats['total_rows']} rows, {stats['column_count']} columns, status {stats['status_counts']}")
+        if args.stats:
+            for shard_idx, count in enumerate(stats["shard_rows"]):
+                print(f"  shard-{shard_idx:02d}: {count} rows")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
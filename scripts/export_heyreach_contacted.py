@@ -12,6 +12,11 @@ from typing import Any, Iterable, Optional
 
 from datagen_sdk import DatagenClient
 
+from heyreach_pager import iter_items
+from heyreach_sync_state import LocalSyncState, advance_marks, fetch_conversations_since
+
+SYNC_SOURCE = "export_heyreach_contacted"
+
 
 def _utc_now_stamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -204,45 +209,21 @@ def _iter_conversations(
     account_ids: list[int],
     max_conversations: Optional[int],
 ) -> Iterable[dict[str, Any]]:
-    limit = 100
-    offset = 0
-    returned = 0
-
-    while True:
-        resp = client.execute_tool(
-            "mcp_Heyreach_get_conversations_v2",
-            {
-                "linkedInAccountIds": account_ids,
-                "campaignIds": [],
-                "seen": None,
-                "limit": limit,
-                "offset": offset,
-                "searchString": "",
-                "leadLinkedInId": None,
-                "leadProfileUrl": None,
-            },
-        )
-        payload = _as_list(resp)[0] if _as_list(resp) else {}
-        if not isinstance(payload, dict):
-            break
-
-        total_count = payload.get("totalCount") if isinstance(payload.get("totalCount"), int) else None
-        items = payload.get("items") if isinstance(payload.get("items"), list) else []
-
-        print(f"[fetch] conversations offset={offset} limit={limit} got={len(items)} total={total_count}")
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-            yield item
-            returned += 1
-            if max_conversations is not None and returned >= max_conversations:
-                return
-
-        if total_count is None:
-            break
-        offset += limit
-        if offset >= total_count:
-            break
+    yield from iter_items(
+        client,
+        "mcp_Heyreach_get_conversations_v2",
+        {
+            "linkedInAccountIds": account_ids,
+            "campaignIds": [],
+            "seen": None,
+            "searchString": "",
+            "leadLinkedInId": None,
+            "leadProfileUrl": None,
+        },
+        max_items=max_conversations,
+        ordered=True,
+        log=print,
+    )
 
 
 def _write_jsonl(path: Path, rows: Iterable[dict[str, Any]]) -> None:
@@ -281,6 +262,16 @@ def main() -> None:
         action="store_true",
         help="If set, exports message bodies in the raw conversations JSONL (can be sensitive).",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only export conversations with activity since the last --incremental run (per-account high-water marks).",
+    )
+    parser.add_argument(
+        "--state-db",
+        default=None,
+        help="SQLite file holding the high-water marks (default: <out-dir>/heyreach_sync_state.db).",
+    )
     args = parser.parse_args()
 
     _ensure_env_loaded()
@@ -304,7 +295,23 @@ def main() -> None:
     conversation_summaries: list[ConversationSummary] = []
     raw_rows: list[dict[str, Any]] = []
 
-    for conv in _iter_conversations(client, account_ids=account_ids, max_conversations=args.max_conversations):
+    sync_state = LocalSyncState(Path(args.state_db) if args.state_db else out_dir / "heyreach_sync_state.db")
+    marks: dict[int, str] = {}
+    if args.incremental:
+        marks, err = sync_state.load(SYNC_SOURCE)
+        if err:
+            raise RuntimeError(err)
+        conversations, err = fetch_conversations_since(
+            client, account_ids, marks, max_conversations=args.max_conversations
+        )
+        if err:
+            raise RuntimeError(err)
+    else:
+        conversations = _iter_conversations(client, account_ids=account_ids, max_conversations=args.max_conversations)
+    seen_conversations: list[dict[str, Any]] = []
+
+    for conv in conversations:
+        seen_conversations.append(conv)
         if args.include_message_bodies:
             raw_rows.append(conv)
         else:
@@ -409,6 +416,8 @@ def main() -> None:
     meta = {
         "generatedAtUtc": stamp,
         "linkedInAccountIds": account_ids,
+        "incremental": args.incremental,
+        "sinceMarks": {str(k): v for k, v in marks.items()},
         "conversations": {
             "totalSummaries": len(conversation_summaries),
             "contactedConversations": len(contacted),
@@ -430,6 +439,13 @@ def main() -> None:
     meta_json.parent.mkdir(parents=True, exist_ok=True)
     meta_json.write_text(json.dumps(meta, indent=2), encoding="utf-8")
 
+    # Record marks only after the export is on disk; a capped run hasn't seen older activity
+    capped = args.max_conversations is not None and len(seen_conversations) >= args.max_conversations
+    if args.incremental and not capped:
+        err = sync_state.save(SYNC_SOURCE, advance_marks(marks, seen_conversations))
+        if err:
+            raise RuntimeError(err)
+
     print("[done] Export written:")
     print(f"  - {meta_json}")
     print(f"  - {contacted_csv}")
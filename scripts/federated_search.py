@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Concurrent fan-out search across several providers (Exa, Linkup, Parallel, ...).
+
+Every (provider, query) pair runs on its own worker thread, and results are
+yielded as each one finishes, so callers can dedupe and save while slower
+providers are still running. Wall time is the slowest provider, not the sum
+of all of them. Each provider has its own timeout: when it runs out, the
+caller gets a timed-out result and moves on. The hung call is abandoned on a
+daemon thread, so it can't block the run or interpreter exit, and its worker
+slot goes to the next queued call.
+
+Usage:
+    from federated_search import SearchProvider, iter_search
+
+    providers = [
+        SearchProvider("Exa", search_exa, timeout=30),
+        SearchProvider("Parallel", search_parallel, timeout=60),
+    ]
+    for result in iter_search(providers, ["Claude Code for GTM", "AI SDRs"]):
+        if result.ok:
+            handle(result.results)
+
+Error-first pattern: provider exceptions and timeouts are reported on the
+ProviderResult (error / timed_out), never raised.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class SearchProvider:
+    """A named search function: search(query) -> provider-specific results."""
+
+    name: str
+    search: Callable[[str], Any]
+    timeout: float = DEFAULT_TIMEOUT_SECONDS
+
+
+@dataclass
+class ProviderResult:
+    """Outcome of one provider call for one query."""
+
+    provider: str
+    query: str
+    results: Any = None
+    error: str = ""
+    seconds: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+def iter_search(
+    providers: Iterable[SearchProvider],
+    queries: Union[str, Iterable[str]],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: Optional[float] = None,
+) -> Iterator[ProviderResult]:
+    """
+    Run every provider for every query concurrently, yielding results as they finish.
+
+    Args:
+        providers: Providers to fan out to
+        queries: One query or a list of queries (a batch of topics runs as one job)
+        max_workers: Max provider calls in flight at once
+        timeout: Override every provider's own timeout (seconds)
+
+    Yields:
+        One ProviderResult per (provider, query), in completion order. Calls
+        past their timeout are yielded with timed_out=True and their late
+        results are dropped.
+    """
+    providers = list(providers)
+    queries = [queries] if isinstance(queries, str) else list(queries)
+    tasks = [(provider, query) for query in queries for provider in providers]
+    if not tasks:
+        return
+
+    done: "queue.Queue[tuple[int, ProviderResult]]" = queue.Queue()
+    waiting = list(range(len(tasks)))
+    # Calls holding a worker slot, by start time. A call that times out gives
+    # its slot back right away, so hung calls can't starve the queued ones.
+    running: dict[int, float] = {}
+    workers = max(1, max_workers)
+
+    def _run(index: int, provider: SearchProvider, query: str, start: float) -> None:
+        try:
+            result = ProviderResult(provider.name, query, results=provider.search(query))
+        except Exception as e:
+            result = ProviderResult(provider.name, query, error=f"{provider.name} search failed: {e}")
+        result.seconds = time.monotonic() - start
+        done.put((index, result))
+
+    def _limit(index: int) -> float:
+        return timeout if timeout is not None else tasks[index][0].timeout
+
+    while waiting or running:
+        while waiting and len(running) < workers:
+            index = waiting.pop(0)
+            provider, query = tasks[index]
+            running[index] = time.monotonic()
+            threading.Thread(
+                target=_run, args=(index, provider, query, running[index]),
+                name=f"search-{provider.name}", daemon=True,
+            ).start()
+
+        now = time.monotonic()
+        for i in sorted(i for i, start in running.items() if start + _limit(i) <= now):
+            provider, query = tasks[i]
+            start = running.pop(i)
+            yield ProviderResult(
+                provider.name, query,
+                error=f"{provider.name} timed out after {_limit(i):g}s",
+                seconds=now - start,
+                timed_out=True,
+            )
+        if waiting and len(running) < workers:
+            continue
+        if not running:
+            break
+
+        wait_for = min(start + _limit(i) - now for i, start in running.items())
+        try:
+            index, result = done.get(timeout=max(0.01, wait_for))
+        except queue.Empty:
+            continue
+        # Late results of calls already reported as timed out are dropped
+        if running.pop(index, None) is not None:
+            yield result
+
+
+def federated_search(
+    providers: Iterable[SearchProvider],
+    queries: Union[str, Iterable[str]],
+    *,
+    on_result: Optional[Callable[[ProviderResult], None]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: Optional[float] = None,
+) -> list[ProviderResult]:
+    """
+    Collect iter_search() into a list, calling on_result as each result arrives.
+
+    Returns:
+        Results in completion order (including failed and timed-out calls)
+    """
+    results = []
+    for result in iter_search(providers, queries, max_workers=max_workers, timeout=timeout):
+        if on_result is not None:
+            on_result(result)
+        results.append(result)
+    return results
@@ -5,12 +5,22 @@ import argparse
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from datagen_sdk import DatagenClient
 
+from neon_client import Json, NeonClient, render
+
+# Safety cap on pages per engagement list
+DEFAULT_MAX_PAGES = 50
+# Rows per multi-row INSERT statement
+DEFAULT_WRITE_BATCH_SIZE = 500
+# Posts fetched concurrently in multi-post mode
+DEFAULT_POST_WORKERS = 4
+
 
 def _load_env_file(path: Path) -> None:
     """Load environment variables from a simple KEY=VALUE file."""
@@ -43,24 +53,6 @@ def _ensure_env_loaded() -> None:
         )
 
 
-def _sql_quote(text: str) -> str:
-    """Escape single quotes for SQL."""
-    return "'" + text.replace("'", "''") + "'"
-
-
-def _sql_text(value: Optional[str]) -> str:
-    """Convert string to SQL, handling NULL."""
-    if value is None:
-        return "NULL"
-    return _sql_quote(value)
-
-
-def _sql_jsonb(value: Any) -> str:
-    """Convert Python object to SQL JSONB."""
-    dumped = json.dumps(value, ensure_ascii=False)
-    return f"{_sql_quote(dumped)}::jsonb"
-
-
 def _clean_linkedin_url(url: str) -> str:
     """
     Clean LinkedIn URL by removing tracking parameters.
@@ -91,37 +83,79 @@ def _extract_activity_id(post_url: str) -> str:
     return match.group(1)
 
 
-def fetch_comments(client: DatagenClient, activity_id: str, post_url: str, exclude_author: Optional[str] = None) -> list[dict]:
+def _iter_engagement_pages(
+    client: DatagenClient,
+    tool: str,
+    item_key: str,
+    activity_id: str,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> Iterator[dict]:
     """
-    Fetch comments using get_linkedin_person_post_comments tool.
+    Yield items from every page of a post comments/reactions tool.
+
+    The first request is the plain {"activity_id": ...} call. Further pages
+    are requested only when the response advertises more (a paginationToken
+    or hasMore), passing the token and next page number back. Stops early if
+    a page brings nothing new.
+    """
+    params: dict[str, Any] = {"activity_id": activity_id}
+    seen: set[str] = set()
+    for page in range(1, max_pages + 1):
+        resp = client.execute_tool(tool, params)
+
+        # Validate response
+        payload = resp if isinstance(resp, dict) else (resp[0] if isinstance(resp, list) and resp else {})
+        if not isinstance(payload, dict):
+            raise RuntimeError(f"Unexpected response format from {tool}")
+
+        items = payload.get(item_key, [])
+        if not isinstance(items, list):
+            items = []
+
+        new_items = 0
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            key = json.dumps(item, sort_keys=True, default=str)
+            if key in seen:
+                continue
+            seen.add(key)
+            new_items += 1
+            yield item
+
+        token = payload.get("paginationToken") or payload.get("pagination_token")
+        if not new_items or not (token or payload.get("hasMore")):
+            return
+        params = {"activity_id": activity_id, "page": page + 1}
+        if token:
+            params["pagination_token"] = token
+
+
+def fetch_comments(
+    client: DatagenClient,
+    activity_id: str,
+    post_url: str,
+    exclude_author: Optional[str] = None,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> list[dict]:
+    """
+    Fetch comments (all pages) using get_linkedin_person_post_comments tool.
     Returns list of engagement records ready for DB insertion.
 
     Args:
         exclude_author: LinkedIn public identifier to exclude (e.g., "jordancrawford")
+        max_pages: Max pages to request
     """
     print(f"  Calling get_linkedin_person_post_comments with activity_id={activity_id}...")
 
-    resp = client.execute_tool(
-        "get_linkedin_person_post_comments",
-        {"activity_id": activity_id}
+    comments = _iter_engagement_pages(
+        client, "get_linkedin_person_post_comments", "comments", activity_id, max_pages
     )
 
-    # Validate response
-    payload = resp if isinstance(resp, dict) else (resp[0] if isinstance(resp, list) and resp else {})
-    if not isinstance(payload, dict):
-        raise RuntimeError("Unexpected response format from get_linkedin_person_post_comments")
-
-    comments = payload.get("comments", [])
-    if not isinstance(comments, list):
-        comments = []
-
     records = []
     excluded_count = 0
 
     for comment in comments:
-        if not isinstance(comment, dict):
-            continue
-
         author = comment.get("author", {})
         if not isinstance(author, dict):
             author = {}
@@ -157,31 +191,24 @@ def fetch_comments(client: DatagenClient, activity_id: str, post_url: str, exclu
     return records
 
 
-def fetch_reactions(client: DatagenClient, activity_id: str, post_url: str) -> list[dict]:
+def fetch_reactions(
+    client: DatagenClient,
+    activity_id: str,
+    post_url: str,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> list[dict]:
     """
-    Fetch reactions using get_linkedin_person_post_reactions tool.
+    Fetch reactions (all pages) using get_linkedin_person_post_reactions tool.
     Returns list of engagement records ready for DB insertion.
     """
     print(f"  Calling get_linkedin_person_post_reactions with activity_id={activity_id}...")
 
-    resp = client.execute_tool(
-        "get_linkedin_person_post_reactions",
-        {"activity_id": activity_id}
+    reactions = _iter_engagement_pages(
+        client, "get_linkedin_person_post_reactions", "reactions", activity_id, max_pages
     )
 
-    payload = resp if isinstance(resp, dict) else (resp[0] if isinstance(resp, list) and resp else {})
-    if not isinstance(payload, dict):
-        raise RuntimeError("Unexpected response format from get_linkedin_person_post_reactions")
-
-    reactions = payload.get("reactions", [])
-    if not isinstance(reactions, list):
-        reactions = []
-
     records = []
     for reaction in reactions:
-        if not isinstance(reaction, dict):
-            continue
-
         author = reaction.get("author", {})
         if not isinstance(author, dict):
             author = {}
@@ -210,28 +237,112 @@ def fetch_reactions(client: DatagenClient, activity_id: str, post_url: str) -> l
     return records
 
 
-def save_to_neon(client: DatagenClient, records: list[dict], post_url: str) -> int:
+def fetch_post_engagement(
+    client: DatagenClient,
+    activity_id: str,
+    post_url: str,
+    types: tuple[str, ...] = ("comments", "reactions"),
+    exclude_author: Optional[str] = None,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> tuple[list[dict], str]:
+    """
+    Fetch comments and reactions for one post concurrently.
+
+    Args:
+        types: Engagement types to fetch ("comments", "reactions")
+
+    Returns:
+        (records, error): Comment records first, then reactions; error names
+        every type that failed (records from the others are still returned)
+    """
+    fetchers = {
+        "comments": lambda: fetch_comments(client, activity_id, post_url, exclude_author, max_pages),
+        "reactions": lambda: fetch_reactions(client, activity_id, post_url, max_pages),
+    }
+    results: dict[str, list[dict]] = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=len(types)) as pool:
+        futures = {pool.submit(fetchers[t]): t for t in types}
+        for future in as_completed(futures):
+            engagement_type = futures[future]
+            try:
+                results[engagement_type] = future.result()
+            except Exception as e:
+                errors.append(f"{engagement_type}: {e}")
+    records = [r for t in types for r in results.get(t, [])]
+    return records, "; ".join(errors)
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _upsert_prospects_sql(rows: list[tuple[str, Optional[str], dict]]) -> str:
+    """Multi-row prospect upsert returning ids; rows must have unique linkedin_urls."""
+    values = ",\n        ".join(
+        render("(%s, %s, 'post_engagement', %s, NOW())", [url, name, Json(profile)])
+        for url, name, profile in rows
+    )
+    return f"""
+    INSERT INTO prospects (linkedin_url, name, discovered_via, profile_data, first_seen_at)
+    VALUES
+        {values}
+    ON CONFLICT (linkedin_url)
+    DO UPDATE SET
+        name = COALESCE(EXCLUDED.name, prospects.name),
+        profile_data = prospects.profile_data || EXCLUDED.profile_data,
+        updated_at = NOW()
+    RETURNING id, linkedin_url;
+    """
+
+
+def _insert_engagements_sql(rows: list[tuple[int, int, str, Optional[str], Optional[str]]]) -> str:
+    """Multi-row engagement insert; existing (prospect, post, type) rows are skipped."""
+    values = ",\n        ".join(render("(%s, %s, %s, %s, %s, NOW())", list(row)) for row in rows)
+    return f"""
+    INSERT INTO engagements (
+        prospect_id,
+        post_id,
+        engage_type,
+        comment,
+        reaction_type,
+        engaged_at
+    ) VALUES
+        {values}
+    ON CONFLICT (prospect_id, post_id, engage_type) DO NOTHING
+    RETURNING id;
+    """
+
+
+def save_to_neon(
+    neon: NeonClient,
+    records: list[dict],
+    post_url: str,
+    batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+) -> int:
     """
     Insert engagement records into new normalized schema.
     Returns number of engagements inserted.
 
+    Writes in bulk: one post upsert, multi-row prospect upserts (RETURNING
+    ids), then multi-row engagement inserts, with each phase grouped into
+    transactions by the Neon client. A post with 2k reactions takes a
+    handful of round trips instead of ~4k.
+
     Schema:
     - prospects: Central contact database
     - linkedin_posts: Posts being tracked
     - engagements: Links prospects to posts with engagement data
     """
-    project_id = "blue-tree-25780810"
-    branch_id = "br-cool-leaf-afau0ra8"
-    database_name = "neondb"
-
     if not records:
         return 0
 
     # Step 1: Upsert the LinkedIn post
     print(f"  Upserting post record...")
-    post_sql = f"""
+    post_sql = """
     INSERT INTO linkedin_posts (post_url, last_scraped_at)
-    VALUES ({_sql_text(post_url)}, NOW())
+    VALUES (%s, NOW())
     ON CONFLICT (post_url)
     DO UPDATE SET
         last_scraped_at = NOW(),
@@ -240,18 +351,7 @@ def save_to_neon(client: DatagenClient, records: list[dict], post_url: str) -> i
     """
 
     try:
-        result = client.execute_tool(
-            "mcp_Neon_run_sql",
-            {
-                "params": {
-                    "projectId": project_id,
-                    "branchId": branch_id,
-                    "databaseName": database_name,
-                    "sql": post_sql
-                }
-            }
-        )
-        post_id = result[0][0].get('id') if result and result[0] else None
+        post_id = neon.query_one(post_sql, [post_url]).get('id')
         if not post_id:
             raise RuntimeError("Failed to get post_id")
         print(f"    ✓ Post ID: {post_id}")
@@ -259,124 +359,92 @@ def save_to_neon(client: DatagenClient, records: list[dict], post_url: str) -> i
         print(f"  Error upserting post: {e}")
         return 0
 
-    # Step 2: Process each engagement
-    inserted = 0
-    for i, record in enumerate(records, 1):
-        profile_enrichment = record.get('profile_enrichment', {})
-        name = profile_enrichment.get('name', 'Unknown')
+    # Step 2a: Upsert all prospects. One row per URL (ON CONFLICT can't touch a
+    # row twice in a statement); an engager who both commented and reacted
+    # gets their profile data merged.
+    prospects: dict[str, tuple[Optional[str], dict]] = {}
+    engagements = []
+    for record in records:
         linkedin_url = record.get('engager_linkedin_url')
-
         if not linkedin_url:
-            print(f"  Skipping {i}/{len(records)}: No LinkedIn URL")
             continue
+        profile_enrichment = record.get('profile_enrichment') or {}
+        name, profile = prospects.get(linkedin_url, (None, {}))
+        prospects[linkedin_url] = (name or profile_enrichment.get('name'), {**profile, **profile_enrichment})
+        engagements.append(record)
+
+    skipped = len(records) - len(engagements)
+    if skipped:
+        print(f"  Skipping {skipped} record(s) with no LinkedIn URL")
+    if not prospects:
+        return 0
 
-        try:
-            # Step 2a: Upsert prospect
-            prospect_sql = f"""
-            INSERT INTO prospects (linkedin_url, name, discovered_via, profile_data, first_seen_at)
-            VALUES (
-                {_sql_text(linkedin_url)},
-                {_sql_text(name)},
-                'post_engagement',
-                {_sql_jsonb(profile_enrichment)},
-                NOW()
-            )
-            ON CONFLICT (linkedin_url)
-            DO UPDATE SET
-                name = COALESCE(EXCLUDED.name, prospects.name),
-                profile_data = prospects.profile_data || EXCLUDED.profile_data,
-                updated_at = NOW()
-            RETURNING id;
-            """
-
-            result = client.execute_tool(
-                "mcp_Neon_run_sql",
-                {
-                    "params": {
-                        "projectId": project_id,
-                        "branchId": branch_id,
-                        "databaseName": database_name,
-                        "sql": prospect_sql
-                    }
-                }
-            )
-
-            prospect_id = result[0][0].get('id') if result and result[0] else None
-            if not prospect_id:
-                print(f"  Warning: Failed to get prospect_id for {i}/{len(records)}")
-                continue
+    prospect_rows = [(url, name, profile) for url, (name, profile) in prospects.items()]
+    try:
+        results = neon.execute_many(
+            _upsert_prospects_sql(chunk) for chunk in _chunks(prospect_rows, batch_size)
+        )
+    except Exception as e:
+        print(f"  Error upserting prospects: {e}")
+        return 0
+    prospect_ids = {row['linkedin_url']: row['id'] for rows in results for row in rows}
+    print(f"    ✓ Upserted {len(prospect_ids)} prospects")
+
+    # Step 2b: Insert all engagements
+    engagement_rows = {}
+    for record in engagements:
+        prospect_id = prospect_ids.get(record['engager_linkedin_url'])
+        if not prospect_id:
+            print(f"  Warning: Failed to get prospect_id for {record['engager_linkedin_url']}")
+            continue
+        key = (prospect_id, record['engage_type'])
+        engagement_rows.setdefault(key, (
+            prospect_id, post_id, record['engage_type'], record.get('comment'), record.get('reaction_type'),
+        ))
 
-            # Step 2b: Insert engagement
-            engagement_sql = f"""
-            INSERT INTO engagements (
-                prospect_id,
-                post_id,
-                engage_type,
-                comment,
-                reaction_type,
-                engaged_at
-            ) VALUES (
-                {prospect_id},
-                {post_id},
-                {_sql_text(record['engage_type'])},
-                {_sql_text(record.get('comment'))},
-                {_sql_text(record.get('reaction_type'))},
-                NOW()
-            )
-            ON CONFLICT (prospect_id, post_id, engage_type) DO NOTHING
-            RETURNING id;
-            """
-
-            result = client.execute_tool(
-                "mcp_Neon_run_sql",
-                {
-                    "params": {
-                        "projectId": project_id,
-                        "branchId": branch_id,
-                        "databaseName": database_name,
-                        "sql": engagement_sql
-                    }
-                }
+    inserted = 0
+    if engagement_rows:
+        try:
+            results = neon.execute_many(
+                _insert_engagements_sql(chunk) for chunk in _chunks(list(engagement_rows.values()), batch_size)
             )
-
-            if result and result[0]:
-                inserted += 1
-                print(f"  Inserted {i}/{len(records)}: {name}")
-            else:
-                print(f"  Skipped {i}/{len(records)}: {name} (duplicate)")
-
+            inserted = sum(len(rows) for rows in results)
         except Exception as e:
-            print(f"  Warning: Failed to process record {i}/{len(records)}: {e}")
-            continue
+            print(f"  Error inserting engagements: {e}")
+    print(f"    ✓ Inserted {inserted} engagements ({len(engagement_rows) - inserted} already recorded)")
 
     # Step 3: Update post stats
-    update_stats_sql = f"""
+    update_stats_sql = """
     UPDATE linkedin_posts
     SET
-        total_comments = (SELECT COUNT(*) FROM engagements WHERE post_id = {post_id} AND engage_type = 'comment'),
-        total_reactions = (SELECT COUNT(*) FROM engagements WHERE post_id = {post_id} AND engage_type = 'reaction'),
+        total_comments = (SELECT COUNT(*) FROM engagements WHERE post_id = %(post_id)s AND engage_type = 'comment'),
+        total_reactions = (SELECT COUNT(*) FROM engagements WHERE post_id = %(post_id)s AND engage_type = 'reaction'),
         updated_at = NOW()
-    WHERE id = {post_id};
+    WHERE id = %(post_id)s;
     """
 
     try:
-        client.execute_tool(
-            "mcp_Neon_run_sql",
-            {
-                "params": {
-                    "projectId": project_id,
-                    "branchId": branch_id,
-                    "databaseName": database_name,
-                    "sql": update_stats_sql
-                }
-            }
-        )
+        neon.execute(update_stats_sql, {"post_id": post_id})
     except Exception as e:
         print(f"  Warning: Failed to update post stats: {e}")
 
     return inserted
 
 
+def _print_dry_run(records: list[dict]) -> None:
+    print("\n[DRY RUN] Would insert the following records:")
+    for i, rec in enumerate(records[:5], 1):
+        name = rec['profile_enrichment'].get('name', 'Unknown')
+        comment_preview = rec.get('comment', '')
+        if comment_preview and len(comment_preview) > 50:
+            comment_preview = comment_preview[:50] + "..."
+        print(f"\n{i}. {rec['engage_type']}: {name}")
+        if comment_preview:
+            print(f"   {comment_preview}")
+    if len(records) > 5:
+        print(f"\n... and {len(records) - 5} more")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Fetch LinkedIn post engagement and save to Neon database",
@@ -387,24 +455,34 @@ Examples:
   python fetch_linkedin_engagement.py --type comments --dry-run \\
     "https://www.linkedin.com/posts/author_text-activity-123-xyz"
 
-  # Fetch and insert comments
-  python fetch_linkedin_engagement.py --type comments \\
+  # Fetch and insert comments and reactions (fetched concurrently)
+  python fetch_linkedin_engagement.py \\
     "https://www.linkedin.com/posts/author_text-activity-123-xyz"
 
   # Fetch and insert reactions
   python fetch_linkedin_engagement.py --type reactions \\
     "https://www.linkedin.com/posts/author_text-activity-123-xyz"
+
+  # Several posts in one job
+  python fetch_linkedin_engagement.py --urls-file posts.txt --workers 4
 """
     )
     parser.add_argument(
-        "post_url",
-        help="LinkedIn post URL (e.g., https://linkedin.com/posts/...activity-123...)"
+        "post_urls",
+        nargs="*",
+        metavar="post_url",
+        help="LinkedIn post URL(s) (e.g., https://linkedin.com/posts/...activity-123...)"
+    )
+    parser.add_argument(
+        "--urls-file",
+        type=Path,
+        help="File with one LinkedIn post URL per line"
     )
     parser.add_argument(
         "--type",
-        choices=["comments", "reactions"],
-        required=True,
-        help="Type of engagement to fetch"
+        choices=["comments", "reactions", "both"],
+        default="both",
+        help="Type of engagement to fetch (default: both)"
     )
     parser.add_argument(
         "--dry-run",
@@ -415,61 +493,90 @@ Examples:
         "--exclude-author",
         help="LinkedIn public identifier of post author to exclude (e.g., 'jordancrawford')"
     )
+    parser.add_argument(
+        "--max-pages",
+        type=int,
+        default=DEFAULT_MAX_PAGES,
+        help=f"Max pages per engagement list (default: {DEFAULT_MAX_PAGES})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_POST_WORKERS,
+        help=f"Posts fetched concurrently (default: {DEFAULT_POST_WORKERS})"
+    )
 
     args = parser.parse_args()
 
+    post_urls = list(args.post_urls)
+    if args.urls_file:
+        post_urls += [line.strip() for line in args.urls_file.read_text().splitlines() if line.strip()]
+    if not post_urls:
+        parser.error("provide at least one post_url or --urls-file")
+    types = ("comments", "reactions") if args.type == "both" else (args.type,)
+
     # Load environment
     _ensure_env_loaded()
     client = DatagenClient()
 
-    # Clean the post URL
-    clean_url = _clean_linkedin_url(args.post_url)
-    if clean_url != args.post_url:
-        print(f"Cleaned URL: {clean_url}")
-
-    # Extract activity ID
-    try:
-        activity_id = _extract_activity_id(clean_url)
-        print(f"Extracted activity ID: {activity_id}")
-    except ValueError as e:
-        print(f"Error: {e}")
-        return
-
-    # Fetch engagement data
-    print(f"Fetching {args.type} for post...")
-    try:
-        if args.type == "comments":
-            records = fetch_comments(client, activity_id, clean_url, args.exclude_author)
-        else:
-            records = fetch_reactions(client, activity_id, clean_url)
-    except Exception as e:
-        print(f"Error fetching {args.type}: {e}")
+    # Clean the post URLs and extract activity IDs
+    posts = {}
+    for post_url in post_urls:
+        clean_url = _clean_linkedin_url(post_url)
+        if clean_url != post_url:
+            print(f"Cleaned URL: {clean_url}")
+        try:
+            activity_id = _extract_activity_id(clean_url)
+            print(f"Extracted activity ID: {activity_id}")
+        except ValueError as e:
+            print(f"Error: {e}")
+            continue
+        posts[clean_url] = activity_id
+    if not posts:
         return
 
-    print(f"Found {len(records)} {args.type}")
+    neon = None if args.dry_run else NeonClient(client)
+    total_found = 0
+    total_inserted = 0
+    failed = 0
+
+    # Fetch posts concurrently; each post is saved as soon as its fetch completes
+    print(f"Fetching {' + '.join(types)} for {len(posts)} post(s)...")
+    with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(posts)))) as pool:
+        futures = {
+            pool.submit(
+                fetch_post_engagement, client, activity_id, clean_url, types, args.exclude_author, args.max_pages
+            ): clean_url
+            for clean_url, activity_id in posts.items()
+        }
+        for future in as_completed(futures):
+            clean_url = futures[future]
+            records, err = future.result()
+            print(f"\n{clean_url}")
+            if err:
+                failed += 1
+                print(f"Error fetching {err}")
+            print(f"Found {len(records)} {' + '.join(types)}")
+            total_found += len(records)
+
+            if len(records) == 0:
+                print("No engagement data found.")
+                continue
 
-    if len(records) == 0:
-        print("No engagement data found. Exiting.")
-        return
+            if args.dry_run:
+                _print_dry_run(records)
+                continue
 
-    if args.dry_run:
-        print("\n[DRY RUN] Would insert the following records:")
-        for i, rec in enumerate(records[:5], 1):
-            name = rec['profile_enrichment'].get('name', 'Unknown')
-            comment_preview = rec.get('comment', '')
-            if comment_preview and len(comment_preview) > 50:
-                comment_preview = comment_preview[:50] + "..."
-            print(f"\n{i}. {rec['engage_type']}: {name}")
-            if comment_preview:
-                print(f"   {comment_preview}")
-        if len(records) > 5:
-            print(f"\n... and {len(records) - 5} more")
-        return
+            # Save to database
+            print("\nSaving to Neon database...")
+            inserted = save_to_neon(neon, records, clean_url)
+            total_inserted += inserted
+            print(f"Successfully inserted {inserted}/{len(records)} records")
 
-    # Save to database
-    print("\nSaving to Neon database...")
-    inserted = save_to_neon(client, records, clean_url)
-    print(f"\nSuccessfully inserted {inserted}/{len(records)} records")
+    if len(posts) > 1:
+        print(f"\nPosts: {len(posts)} ({failed} with fetch errors), records found: {total_found}, inserted: {total_inserted}")
+    if neon is not None:
+        print(neon.format_summary())
 
 
 if __name__ == "__main__":
@@ -13,6 +13,8 @@ Examples:
 Output:
     transcript/{meeting_id}_summary.json
     transcript/{meeting_id}_transcript.json
+
+For many meetings (and YouTube videos) at once, use transcript_ingest.py.
 """
 
 import argparse
@@ -20,6 +22,11 @@ import json
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+SUMMARY_TOOL = "mcp_Fireflies_fireflies_get_summary"
+TRANSCRIPT_TOOL = "mcp_Fireflies_fireflies_get_transcript"
 
 
 def extract_meeting_id(url_or_id: str) -> str:
@@ -37,6 +44,65 @@ def extract_meeting_id(url_or_id: str) -> str:
     return url_or_id
 
 
+def fetch_meeting(client: Any, meeting_id: str, before_call: Optional[Callable[[], None]] = None) -> tuple[Any, Any]:
+    """
+    Fetch a meeting's summary and transcript concurrently.
+
+    Args:
+        client: DatagenClient
+        meeting_id: Fireflies meeting ID
+        before_call: Called before each of the two tool calls (e.g. a rate limiter's acquire)
+
+    Returns:
+        (summary, transcript) as returned by the Fireflies tools
+
+    Raises:
+        Exception: Whatever the failing tool call raised
+    """
+    def call(tool: str) -> Any:
+        if before_call:
+            before_call()
+        return client.execute_tool(tool, {"transcriptId": meeting_id})
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="fireflies") as pool:
+        summary = pool.submit(call, SUMMARY_TOOL)
+        transcript = pool.submit(call, TRANSCRIPT_TOOL)
+        return summary.result(), transcript.result()
+
+
+def parse_meeting_metadata(transcript: Any) -> dict:
+    """Participants, title, date and duration from the transcript's header lines."""
+    metadata = {}
+    if not isinstance(transcript, list) or len(transcript) == 0:
+        return metadata
+    transcript_text = transcript[0] if isinstance(transcript[0], str) else str(transcript[0])
+
+    # Extract participants
+    participants_match = re.search(r"Participants: ([^\n]+)", transcript_text)
+    if participants_match:
+        metadata["participants"] = [p.strip() for p in participants_match.group(1).split(",")]
+
+    # Extract title
+    title_match = re.search(r"Title: ([^\n]+)", transcript_text)
+    if title_match:
+        metadata["title"] = title_match.group(1).strip()
+
+    # Extract date
+    date_match = re.search(r"DateString: ([^\n]+)", transcript_text)
+    if date_match:
+        metadata["date"] = date_match.group(1).strip()
+
+    # Extract duration
+    duration_match = re.search(r"Duration: ([^\n]+)", transcript_text)
+    if duration_match:
+        try:
+            metadata["duration_minutes"] = float(duration_match.group(1).strip())
+        except ValueError:
+            pass
+
+    return metadata
+
+
 def download_meeting(meeting_id: str, output_dir: str = "transcript") -> tuple[dict, str]:
     """
     Download meeting summary and transcript from Fireflies.
@@ -52,17 +118,8 @@ def download_meeting(meeting_id: str, output_dir: str = "transcript") -> tuple[d
     try:
         client = DatagenClient()
 
-        print(f"Fetching summary for {meeting_id}...")
-        summary = client.execute_tool(
-            "mcp_Fireflies_fireflies_get_summary",
-            {"transcriptId": meeting_id}
-        )
-
-        print(f"Fetching transcript for {meeting_id}...")
-        transcript = client.execute_tool(
-            "mcp_Fireflies_fireflies_get_transcript",
-            {"transcriptId": meeting_id}
-        )
+        print(f"Fetching summary and transcript for {meeting_id}...")
+        summary, transcript = fetch_meeting(client, meeting_id)
 
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -89,28 +146,7 @@ def download_meeting(meeting_id: str, output_dir: str = "transcript") -> tuple[d
         }
 
         # Try to extract participant info
-        if isinstance(transcript, list) and len(transcript) > 0:
-            transcript_text = transcript[0] if isinstance(transcript[0], str) else str(transcript[0])
-
-            # Extract participants
-            participants_match = re.search(r"Participants: ([^\n]+)", transcript_text)
-            if participants_match:
-                result["participants"] = [p.strip() for p in participants_match.group(1).split(",")]
-
-            # Extract title
-            title_match = re.search(r"Title: ([^\n]+)", transcript_text)
-            if title_match:
-                result["title"] = title_match.group(1).strip()
-
-            # Extract date
-            date_match = re.search(r"DateString: ([^\n]+)", transcript_text)
-            if date_match:
-                result["date"] = date_match.group(1).strip()
-
-            # Extract duration
-            duration_match = re.search(r"Duration: ([^\n]+)", transcript_text)
-            if duration_match:
-                result["duration_minutes"] = float(duration_match.group(1).strip())
+        result.update(parse_meeting_metadata(transcript))
 
         return result, ""
 
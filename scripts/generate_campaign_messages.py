@@ -2,8 +2,19 @@
 """
 Generate personalized outreach messages for campaign prospects.
 Based on the Lohit template that worked successfully.
+
+The template is compiled once and rendered for every prospect in one pass.
+--personalize additionally rewrites each message with an LLM, concurrently
+and cached per prospect profile (message_renderer.py). Messages are written
+back to the campaign table's message column in one batched update.
+
+Usage:
+    python generate_campaign_messages.py
+    python generate_campaign_messages.py --personalize --workers 16
+    python generate_campaign_messages.py --no-neon
 """
 
+import argparse
 import os
 import sys
 import json
@@ -11,6 +22,16 @@ import csv
 from datetime import datetime, timezone
 from datagen_sdk import DatagenClient
 
+from message_renderer import (
+    DEFAULT_WORKERS,
+    LLMPersonalizer,
+    MessageCache,
+    MessageTemplate,
+    prospect_values,
+    save_messages_to_neon,
+)
+from neon_client import NeonClient
+
 # Verify API key
 DATAGEN_API_KEY = os.getenv("DATAGEN_API_KEY")
 if not DATAGEN_API_KEY:
@@ -34,20 +55,9 @@ Would you be interested in learning Claude Code from us? We're offering free 1:1
 
 Yu-Sheng"""
 
+MESSAGE = MessageTemplate(MESSAGE_TEMPLATE)
 
-def extract_first_name(full_name):
-    """Extract first name from full name, handling emojis."""
-    if not full_name:
-        return "there"
-
-    # Remove common emojis
-    clean_name = full_name.replace("🦾", "").replace("👨‍💻", "").replace("🪄", "").strip()
-
-    # Split and get first part
-    parts = clean_name.split()
-    if parts:
-        return parts[0]
-    return "there"
+neon = NeonClient(client, project_id=PROJECT_ID, branch_id=BRANCH_ID, database_name=DATABASE)
 
 
 def fetch_campaign_prospects():
@@ -70,46 +80,40 @@ def fetch_campaign_prospects():
 
     print(f"Fetching prospects from {CAMPAIGN_TABLE}...")
 
-    result = client.execute_tool(
-        "mcp_Neon_run_sql",
-        {
-            "params": {
-                "projectId": PROJECT_ID,
-                "branchId": BRANCH_ID,
-                "databaseName": DATABASE,
-                "sql": query
-            }
-        }
-    )
+    prospects = neon.query(query)
+    print(f"✅ Found {len(prospects)} pending prospects\n")
+    return prospects
 
-    # Parse result - it returns array of arrays
-    if result and len(result) > 0:
-        prospects = result[0]  # Get first element which contains the results
-        print(f"✅ Found {len(prospects)} pending prospects\n")
-        return prospects
 
-    return []
+def generate_messages(prospects, personalizer=None):
+    """Generate personalized messages for all prospects."""
 
+    values = [prospect_values(p) for p in prospects]
+    texts = MESSAGE.render_many(values)
 
-def generate_messages(prospects):
-    """Generate personalized messages for all prospects."""
+    if personalizer is not None:
+        print(f"Personalizing {len(texts)} messages with {personalizer.model}...")
+        texts, errors = personalizer.personalize_many(prospects, texts)
+        for error in errors[:10]:
+            print(f"   ⚠️  {error}")
+        if errors:
+            print(f"   {len(errors)} prospect(s) kept the template message\n")
 
+    generated_at = datetime.now(timezone.utc).isoformat()
     messages = []
 
-    for prospect in prospects:
-        first_name = extract_first_name(prospect.get("name", ""))
-
+    for prospect, value, text in zip(prospects, values, texts):
         message_data = {
             "prospect_id": prospect.get("prospect_id"),
             "campaign_entry_id": prospect.get("campaign_entry_id"),
             "name": prospect.get("name"),
-            "first_name": first_name,
+            "first_name": value["first_name"],
             "linkedin_url": prospect.get("linkedin_url"),
             "headline": prospect.get("headline", ""),
             "company": prospect.get("company", ""),
             "comment_text": prospect.get("comment_text", ""),
-            "message": MESSAGE_TEMPLATE.format(first_name=first_name),
-            "generated_at": datetime.now(timezone.utc).isoformat()
+            "message": text,
+            "generated_at": generated_at
         }
 
         messages.append(message_data)
@@ -188,6 +192,14 @@ def print_preview(messages, limit=5):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate outreach messages for campaign prospects")
+    parser.add_argument("--personalize", action="store_true",
+                        help="Rewrite each message with an LLM (cached per prospect profile)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent LLM calls with --personalize (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--no-neon", action="store_true", help="Don't write messages back to the campaign table")
+    args = parser.parse_args()
+
     print("="*80)
     print("CAMPAIGN MESSAGE GENERATOR")
     print("="*80)
@@ -204,7 +216,18 @@ def main():
 
     # Generate messages
     print("Generating personalized messages...")
-    messages = generate_messages(prospects)
+    personalizer = LLMPersonalizer(cache=MessageCache(), workers=args.workers) if args.personalize else None
+    messages = generate_messages(prospects, personalizer)
+
+    # Write back to the campaign table (one transaction per Neon batch)
+    if not args.no_neon:
+        saved, err = save_messages_to_neon(
+            neon, CAMPAIGN_TABLE, ((m["campaign_entry_id"], m["message"]) for m in messages)
+        )
+        if err:
+            print(f"⚠️  {err} ({saved} messages were saved before the failure)")
+        else:
+            print(f"✅ Saved {saved} messages to {CAMPAIGN_TABLE}.message")
 
     # Create timestamp for filenames
     timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
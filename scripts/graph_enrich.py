@@ -31,12 +31,13 @@ import importlib
 import hashlib
 import json
 import sys
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 # Import database module
-from db import LeadDB
+from db import CacheEntry, LeadDBBackend, open_lead_db
 
 # Rich terminal UI (optional but recommended)
 try:
@@ -138,6 +139,89 @@ def _hash_config(node) -> str:
     return _sha256(_stable_json(_node_config_for_hash(node)))
 
 
+def _format_connection_stats(db: LeadDBBackend) -> str:
+    stats, err = db.get_connection_stats()
+    if err:
+        return err
+    if "reader_connections" not in stats:
+        # psycopg_pool stats (Postgres backend); counters are omitted while zero
+        return (
+            f"{stats.get('pool_size', 0)} pooled, {stats.get('requests_num', 0)} requests "
+            f"(waited {stats.get('requests_wait_ms', 0)}ms)"
+        )
+    return (
+        f"{stats['reader_connections']} readers, {stats['reads']} reads, "
+        f"{stats['writes']} writes (max lock wait {stats['max_write_wait_seconds'] * 1000:.1f}ms)"
+    )
+
+
+# Finished rows are written in batches of this size (or after this many seconds)
+WRITE_BATCH_SIZE = 50
+WRITE_BATCH_SECONDS = 2.0
+
+
+class RowWriter:
+    """
+    Write-behind buffer for finished rows of a batch run.
+
+    Row updates go to the backend in one update_rows call per batch, and
+    node results in one set_cache_entries call, instead of several round
+    trips per row. A row execution is completed only after its row has
+    been written, so rows lost in an interrupted run are redone on resume.
+    Not thread-safe: call from the thread collecting worker results.
+    """
+
+    def __init__(self, db: LeadDBBackend, batch_size: int = WRITE_BATCH_SIZE, max_delay: float = WRITE_BATCH_SECONDS):
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+        self._rows: list[tuple[int, dict, str, str, int]] = []
+        self._cache: list[CacheEntry] = []
+        self._last_flush = time.monotonic()
+
+    def add(
+        self,
+        row_id: int,
+        updates: dict,
+        status: str,
+        error: str,
+        row_exec_id: int,
+        cache_entry: CacheEntry = None,
+    ) -> list[tuple[int, str]]:
+        """Buffer a finished row; returns flush() results when the batch is full or due."""
+        self._rows.append((row_id, updates, status, error, row_exec_id))
+        if cache_entry is not None:
+            self._cache.append(cache_entry)
+        if len(self._rows) >= self.batch_size or time.monotonic() - self._last_flush >= self.max_delay:
+            return self.flush()
+        return []
+
+    def flush(self) -> list[tuple[int, str]]:
+        """
+        Write all buffered rows.
+
+        Returns:
+            (row_id, error) per written row; error covers the node error and
+            any write failure
+        """
+        rows, self._rows = self._rows, []
+        cache, self._cache = self._cache, []
+        self._last_flush = time.monotonic()
+
+        # A failed cache write only costs a recompute later, as with set_cache_entry
+        if cache:
+            self.db.set_cache_entries(cache)
+        if not rows:
+            return []
+
+        db_err = self.db.update_rows([(row_id, updates, status, error) for row_id, updates, status, error, _ in rows])
+        results = []
+        for row_id, _, status, error, row_exec_id in rows:
+            complete_err = self.db.complete_row_execution(row_exec_id, status, error or db_err)
+            results.append((row_id, error or db_err or complete_err))
+        return results
+
+
 def _should_overwrite(existing_value, overwrite: bool) -> bool:
     if overwrite:
         return True
@@ -158,22 +242,27 @@ def get_lead_path(lead_name: str) -> Path:
     return get_leads_dir() / lead_name
 
 
-def init_lead_db(lead_name: str, csv_path: Path) -> tuple[LeadDB, str]:
+def init_lead_db(lead_name: str, csv_path: Path) -> tuple[LeadDBBackend, str]:
     """
     Initialize lead database from CSV.
     Auto-imports CSV on first run if DB is empty.
 
+    Uses leads/<lead>/table.db, or the Postgres/Neon database in LEAD_DB_URL
+    when it is set.
+
     Args:
         lead_name: Name of the lead table
         csv_path: Path to source CSV file
 
     Returns:
-        (db, error): LeadDB instance and error message
+        (db, error): Database backend instance and error message
     """
     lead_path = get_lead_path(lead_name)
     db_path = lead_path / "table.db"
 
-    db = LeadDB(db_path)
+    db, err = open_lead_db(db_path)
+    if err:
+        return None, err
     err = db.connect()
     if err:
         return None, err
@@ -1194,7 +1283,8 @@ def run_batch(
     node_name = graph_name
     config_hash = _sha256(_stable_json({"_node": node_name, "_config": config or {}, "_class": f"{graph.__class__.__module__}.{graph.__class__.__name__}"}))
 
-    # Process function with DB updates
+    # Process function: computes the row; the main thread writes it via RowWriter.
+    # Returns (row_id, pending write or None, error).
     def process_row(row):
         row_id = row["_id"]
 
@@ -1204,9 +1294,9 @@ def run_batch(
         if skip_existing and not overwrite:
             already_done, done_err = db.has_completed_row_execution(row_id, node_name, input_hash, config_hash)
             if done_err:
-                return row_id, {}, done_err
+                return row_id, None, done_err
             if already_done:
-                return row_id, {}, ""
+                return row_id, None, ""
 
         cache_hit = False
         cache_k = _cache_key(node_name, input_hash, config_hash)
@@ -1222,15 +1312,16 @@ def run_batch(
 
         row_exec_id, exec_err = db.start_row_execution(execution_id, row_id, node_name, input_hash, config_hash, cache_hit)
         if exec_err:
-            return row_id, {}, exec_err
+            return row_id, None, exec_err
 
+        cache_entry = None
         if cache_hit:
             result = cached_result or {}
             err = ""
         else:
             result, err = graph(row)
             if use_cache:
-                db.set_cache_entry(cache_k, node_name, input_hash, config_hash, result if not err else {}, err)
+                cache_entry = (cache_k, node_name, input_hash, config_hash, result if not err else {}, err)
 
         updates = {}
         if not err:
@@ -1238,16 +1329,32 @@ def run_batch(
                 if _should_overwrite(row.get(k), overwrite):
                     updates[k] = v
 
-        # Update DB immediately (transactional)
         status = "completed" if not err else "failed"
-        db_err = db.update_row(row_id, updates, status=status, error=err)
-
-        complete_err = db.complete_row_execution(row_exec_id, status, err or db_err)
-        return row_id, updates, err or db_err or complete_err
+        return row_id, (updates, status, err, row_exec_id, cache_entry), err
 
     success = 0
     failed = 0
     start_time = datetime.now()
+    writer = RowWriter(db)
+
+    def collect(future) -> None:
+        """Count a finished row (or the rows its write flushed)."""
+        nonlocal success, failed
+        row_id, pending, err = future.result()
+        finished = [(row_id, err)] if pending is None else writer.add(row_id, *pending)
+        for _, row_err in finished:
+            if row_err:
+                failed += 1
+            else:
+                success += 1
+
+    def flush_remaining() -> None:
+        nonlocal success, failed
+        for _, row_err in writer.flush():
+            if row_err:
+                failed += 1
+            else:
+                success += 1
 
     # Process with ThreadPoolExecutor
     if RICH_AVAILABLE:
@@ -1266,30 +1373,23 @@ def run_batch(
                 futures = {executor.submit(process_row, row): row["_id"] for row in rows}
 
                 for future in as_completed(futures):
-                    row_id, result, err = future.result()
-                    if err:
-                        failed += 1
-                    else:
-                        success += 1
-
+                    collect(future)
                     progress.update(
                         task,
                         advance=1,
                         description=f"[cyan]Enriching ([green]{success}[/green] OK / [red]{failed}[/red] err)"
                     )
+            flush_remaining()
+            progress.update(task, description=f"[cyan]Enriching ([green]{success}[/green] OK / [red]{failed}[/red] err)")
     else:
         with ThreadPoolExecutor(max_workers=parallel) as executor:
             futures = {executor.submit(process_row, row): row["_id"] for row in rows}
 
             for i, future in enumerate(as_completed(futures)):
-                row_id, result, err = future.result()
-                if err:
-                    failed += 1
-                else:
-                    success += 1
-
+                collect(future)
                 if (i + 1) % 10 == 0:
                     print(f"  Processed {i + 1}/{total}...")
+        flush_remaining()
 
     elapsed = (datetime.now() - start_time).total_seconds()
 
@@ -1308,7 +1408,8 @@ def run_batch(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         out_path = lead_path / f"table_enriched_{graph_name}_{timestamp}.csv"
 
-    export_rows, err = db.export_to_csv(out_path)
+    # Streamed straight to the file (COPY on Postgres)
+    _, err = db.copy_to_csv(out_path)
     if err:
         if RICH_AVAILABLE:
             console.print(f"[red]Export error: {err}[/red]")
@@ -1316,10 +1417,6 @@ def run_batch(
             print(f"Export error: {err}")
         return False
 
-    # Get column names (excluding internal _ columns)
-    fieldnames = [k for k in export_rows[0].keys() if not k.startswith('_')] if export_rows else []
-    save_csv(out_path, export_rows, fieldnames)
-
     # Summary
     if RICH_AVAILABLE:
         console.print()
@@ -1335,6 +1432,7 @@ def run_batch(
         summary.add_row("New Columns", ", ".join(graph.output_cols))
         summary.add_row("Time Elapsed", f"{elapsed:.1f}s")
         summary.add_row("Throughput", f"{total/elapsed:.1f} rows/sec")
+        summary.add_row("DB Connections", _format_connection_stats(db))
         summary.add_row("Output File", str(out_path))
 
         console.print(summary)
@@ -1593,7 +1691,8 @@ def run_workflow_batch(
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         out_path = lead_path / f"table_enriched_{workflow_name}_{timestamp}.csv"
 
-    export_rows, err = db.export_to_csv(out_path)
+    # Streamed straight to the file (COPY on Postgres)
+    _, err = db.copy_to_csv(out_path)
     if err:
         if RICH_AVAILABLE:
             console.print(f"[red]Export error: {err}[/red]")
@@ -1601,10 +1700,6 @@ def run_workflow_batch(
             print(f"Export error: {err}")
         return False
 
-    # Get column names (excluding internal _ columns)
-    fieldnames = [k for k in export_rows[0].keys() if not k.startswith('_')] if export_rows else []
-    save_csv(out_path, export_rows, fieldnames)
-
     # Summary
     if RICH_AVAILABLE:
         console.print()
@@ -1620,6 +1715,7 @@ def run_workflow_batch(
         summary.add_row("New Columns", ", ".join(all_output_cols[:5]) + ("..." if len(all_output_cols) > 5 else ""))
         summary.add_row("Time Elapsed", f"{elapsed:.1f}s")
         summary.add_row("Throughput", f"{total/elapsed:.1f} rows/sec")
+        summary.add_row("DB Connections", _format_connection_stats(db))
         summary.add_row("Output File", str(out_path))
 
         console.print(summary)
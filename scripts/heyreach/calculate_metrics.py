@@ -4,7 +4,8 @@ Calculate campaign metrics from conversations.
 
 Step 3 of the HeyReach report pipeline.
 Reads: /tmp/heyreach-{date}/campaigns.json
-       /tmp/heyreach-{date}/conversations/{campaign_id}.json
+       /tmp/heyreach-{date}/conversations/{campaign_id}.jsonl (streamed; .jsonl.gz
+       and legacy .json also accepted)
 Outputs: /tmp/heyreach-{date}/metrics.json
 
 Usage:
@@ -17,6 +18,12 @@ import json
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
+
+from jsonl_io import find_dataset, read_jsonl
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from meeting_signals import messages_have_meeting_signal
 
 
 # Performance benchmarks
@@ -25,14 +32,6 @@ BENCHMARKS = {
     "meeting": {"low": 3, "high": 7},
 }
 
-# Keywords indicating meeting bookings
-MEETING_KEYWORDS = [
-    "book", "calendar", "meeting", "schedule", "call",
-    "zoom", "calendly", "available", "time slot",
-    "appointment", "confirm", "yes please", "let's talk",
-]
-
-
 def get_output_dir() -> Path:
     """Get today's output directory."""
     date_str = datetime.now().strftime("%Y-%m-%d")
@@ -53,30 +52,18 @@ def load_campaigns(input_dir: Path) -> tuple[list[dict], str]:
         return [], f"Failed to load campaigns.json: {e}"
 
 
-def load_conversations(input_dir: Path, campaign_id: int) -> tuple[list[dict], str]:
-    """Load conversations for a campaign."""
-    conversations_path = input_dir / "conversations" / f"{campaign_id}.json"
+def load_conversations(input_dir: Path, campaign_id: int) -> tuple[Iterator[dict], str]:
+    """Open a campaign's conversations for streaming (empty if none were fetched)."""
+    conversations_path = find_dataset(input_dir / "conversations", str(campaign_id))
 
-    if not conversations_path.exists():
-        return [], ""  # Not an error, just no conversations
-
-    try:
-        conversations = json.loads(conversations_path.read_text())
-        return conversations, ""
-    except Exception as e:
-        return [], f"Failed to load conversations for {campaign_id}: {e}"
+    if not conversations_path:
+        return iter(()), ""  # Not an error, just no conversations
 
+    return read_jsonl(conversations_path), ""
 
-def analyze_conversations(conversations: list[dict]) -> dict:
-    """Analyze conversations to extract engagement metrics."""
-    if not conversations:
-        return {
-            "replies": 0,
-            "meetings_detected": 0,
-            "avg_messages_per_reply": 0,
-            "total_messages": 0,
-        }
 
+def analyze_conversations(conversations: Iterable[dict]) -> dict:
+    """Analyze conversations (single pass, so a stream works) to extract engagement metrics."""
     replied_convos = 0
     meeting_detected = 0
     total_messages_in_replied = 0
@@ -93,12 +80,7 @@ def analyze_conversations(conversations: list[dict]) -> dict:
             total_messages_in_replied += len(messages)
 
         # Detect meeting keywords in messages
-        all_text = " ".join(
-            msg.get("body", "").lower()
-            for msg in messages
-            if msg.get("body")
-        )
-        if any(kw in all_text for kw in MEETING_KEYWORDS):
+        if messages_have_meeting_signal(messages):
             meeting_detected += 1
 
     avg_messages_per_reply = (
@@ -253,9 +235,13 @@ def main() -> int:
         conversations, err = load_conversations(input_dir, campaign_id)
         if err:
             print(f"  WARNING: {err}")
-            conversations = []
+            conversations = iter(())
 
-        analytics = analyze_conversations(conversations)
+        try:
+            analytics = analyze_conversations(conversations)
+        except Exception as e:
+            print(f"  WARNING: Failed to read conversations for {campaign_id}: {e}")
+            analytics = analyze_conversations(())
         metrics = calculate_campaign_metrics(campaign, analytics)
         campaign_metrics.append(metrics)
 
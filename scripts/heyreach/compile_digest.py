@@ -3,7 +3,8 @@
 Compile conversation data into a structured digest for Claude analysis.
 
 Step 3 of the conversation summary pipeline.
-Reads: /tmp/heyreach-summary-{date}/conversations.json
+Reads: /tmp/heyreach-summary-{date}/conversations.jsonl (streamed; .jsonl.gz,
+       legacy conversations.json, or stdin via --conversations -)
        /tmp/heyreach-summary-{date}/threads/ (optional, used if available)
 Outputs: /tmp/heyreach-summary-{date}/digest.json
 
@@ -11,6 +12,7 @@ Usage:
     python compile_digest.py
     python compile_digest.py --input-dir /tmp/heyreach-summary-2026-02-13
     python compile_digest.py --days 14
+    python fetch_recent_conversations.py --stdout | python compile_digest.py --conversations -
 """
 
 import argparse
@@ -19,26 +21,10 @@ import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-MEETING_KEYWORDS = [
-    "book",
-    "calendar",
-    "meeting",
-    "schedule",
-    "call",
-    "zoom",
-    "calendly",
-    "available",
-    "time slot",
-    "appointment",
-    "confirm",
-    "let's talk",
-    "lets talk",
-    "demo",
-    "walkthrough",
-    "15 min",
-    "30 min",
-    "quick chat",
-]
+from jsonl_io import find_dataset, read_jsonl
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from meeting_signals import messages_have_meeting_signal
 
 
 def get_output_dir() -> Path:
@@ -58,12 +44,6 @@ def parse_date(date_str: str) -> datetime | None:
         return None
 
 
-def has_meeting_signal(text: str) -> bool:
-    """Check if message text contains meeting-related keywords."""
-    lower = text.lower()
-    return any(kw in lower for kw in MEETING_KEYWORDS)
-
-
 def extract_person_info(conversation: dict) -> dict:
     """Extract person name and details from conversation data."""
     # HeyReach API returns correspondentProfile with lead info
@@ -181,7 +161,7 @@ def process_conversation(
     my_msgs = [m for m in display_messages if m["sender"] == "ME"]
 
     # Check for meeting signals in correspondent messages
-    meeting_signal = any(has_meeting_signal(m["body"]) for m in correspondent_msgs)
+    meeting_signal = messages_have_meeting_signal(correspondent_msgs)
 
     # Last activity date
     all_dates = [m["_parsed_date"] for m in messages if m["_parsed_date"]]
@@ -208,17 +188,19 @@ def main() -> int:
     parser.add_argument(
         "--days", type=int, default=14, help="Look back N days (default: 14)"
     )
+    parser.add_argument(
+        "--conversations", type=str, help="Conversations JSONL path, or - for stdin (default: from --input-dir)"
+    )
     args = parser.parse_args()
 
     input_dir = Path(args.input_dir) if args.input_dir else get_output_dir()
-    conversations_path = input_dir / "conversations.json"
+    conversations_path = args.conversations or find_dataset(input_dir, "conversations")
 
-    if not conversations_path.exists():
-        print(f"ERROR: {conversations_path} not found", file=sys.stderr)
+    if not conversations_path:
+        print(f"ERROR: conversations.jsonl not found in {input_dir}", file=sys.stderr)
         return 1
 
-    conversations = json.loads(conversations_path.read_text())
-    print(f"Loaded {len(conversations)} conversations")
+    conversations = read_jsonl(conversations_path)
 
     cutoff = datetime.now() - timedelta(days=args.days)
     threads_dir = input_dir / "threads" if (input_dir / "threads").exists() else None
@@ -266,11 +248,13 @@ def main() -> int:
     }
 
     # Save digest
+    input_dir.mkdir(parents=True, exist_ok=True)
     digest_path = input_dir / "digest.json"
     digest_path.write_text(json.dumps(digest, indent=2, ensure_ascii=False))
 
     print(f"\nDigest compiled:")
     print(f"  Period: {digest['period']['start']} to {digest['period']['end']}")
+    print(f"  Loaded: {len(digest_entries) + skipped} conversations")
     print(f"  Conversations: {len(digest_entries)} ({skipped} skipped - no recent activity)")
     print(f"  With replies: {len(with_replies)}")
     print(f"  Meeting signals: {digest['summary']['meeting_signals']}")
@@ -4,24 +4,38 @@ Fetch HeyReach conversations for campaigns.
 
 Step 2 of the HeyReach report pipeline.
 Reads: /tmp/heyreach-{date}/campaigns.json
-Outputs: /tmp/heyreach-{date}/conversations/{campaign_id}.json
+Outputs: /tmp/heyreach-{date}/conversations/{campaign_id}.jsonl[.gz]
+
+Each campaign is paged fully and several campaigns are fetched at once.
+Pages are streamed straight to the campaign's JSONL file, which appears
+(atomically) as soon as the campaign finishes, so calculate_metrics.py can
+start on early campaigns. Counts and checksums go to manifest.json.
 
 Usage:
     python fetch_conversations.py
     python fetch_conversations.py --input-dir /tmp/heyreach-2026-01-10
     python fetch_conversations.py --campaign-ids 291852,210501
+    python fetch_conversations.py --workers 8
+    python fetch_conversations.py --gzip
 """
 
 import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from dotenv import load_dotenv
 from datagen_sdk import DatagenClient
 
+from jsonl_io import dataset_path, find_dataset, write_jsonl
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from heyreach_pager import iter_items
+
 
 def get_output_dir() -> Path:
     """Get today's output directory."""
@@ -47,66 +61,47 @@ def load_campaigns(input_dir: Path) -> tuple[list[dict], str]:
         return [], f"Failed to load campaigns.json: {e}"
 
 
-def fetch_conversations_for_campaign(
+def iter_campaign_conversations(
     client: DatagenClient,
     campaign_id: int,
     account_ids: list[int] | None = None,
-) -> tuple[list[dict], str]:
+) -> Iterator[dict]:
     """
-    Fetch conversations for a single campaign.
+    Stream all conversations for a single campaign (every page).
 
-    Returns (conversations, error). Check error first.
+    Raises heyreach_pager.PageFetchError if a page keeps failing.
     """
-    try:
-        result = client.execute_tool(
-            "mcp_Heyreach_get_conversations_v2",
-            {
-                "linkedInAccountIds": account_ids or [],
-                "campaignIds": [campaign_id],
-                "limit": 100,
-                "offset": 0,
-                "searchString": "",
-                "seen": None,
-                "leadLinkedInId": None,
-                "leadProfileUrl": None,
-            }
-        )
-
-        # Parse response
-        if isinstance(result, list) and len(result) > 0:
-            conversations = result[0].get("items", []) if isinstance(result[0], dict) else result
-        elif isinstance(result, dict):
-            conversations = result.get("items", result.get("conversations", []))
-        else:
-            conversations = []
-
-        return conversations, ""
-
-    except Exception as e:
-        return [], f"fetch_conversations failed for campaign {campaign_id}: {e}"
+    yield from iter_items(
+        client,
+        "mcp_Heyreach_get_conversations_v2",
+        {
+            "linkedInAccountIds": account_ids or [],
+            "campaignIds": [campaign_id],
+            "searchString": "",
+            "seen": None,
+            "leadLinkedInId": None,
+            "leadProfileUrl": None,
+        },
+        ordered=True,
+    )
 
 
 def save_conversations(
-    conversations: list[dict],
+    conversations: Iterable[dict],
     campaign_id: int,
     output_dir: Path,
-) -> tuple[Path, str]:
+    compress: bool = False,
+) -> tuple[Path, int, str]:
     """
-    Save conversations to JSON file.
+    Stream conversations to conversations/{campaign_id}.jsonl[.gz].
 
-    Returns (output_path, error). Check error first.
+    Returns (output_path, count, error). Check error first.
     """
-    try:
-        conversations_dir = output_dir / "conversations"
-        conversations_dir.mkdir(parents=True, exist_ok=True)
-
-        output_path = conversations_dir / f"{campaign_id}.json"
-        output_path.write_text(json.dumps(conversations, indent=2, ensure_ascii=False))
-
-        return output_path, ""
-
-    except Exception as e:
-        return Path(), f"save_conversations failed: {e}"
+    output_path = dataset_path(output_dir / "conversations", str(campaign_id), compress=compress)
+    count, err = write_jsonl(output_path, conversations)
+    if err:
+        return Path(), 0, f"save_conversations failed: {err}"
+    return output_path, count, ""
 
 
 def main() -> int:
@@ -114,6 +109,8 @@ def main() -> int:
     parser.add_argument("--input-dir", type=str, help="Input directory with campaigns.json")
     parser.add_argument("--campaign-ids", type=str, help="Override: comma-separated campaign IDs to fetch")
     parser.add_argument("--skip-existing", action="store_true", help="Skip campaigns with existing conversation files")
+    parser.add_argument("--workers", type=int, default=4, help="Campaigns fetched in parallel (default: 4)")
+    parser.add_argument("--gzip", action="store_true", help="Write gzipped JSONL files")
 
     args = parser.parse_args()
 
@@ -154,29 +151,32 @@ def main() -> int:
 
     print(f"\nFetching conversations for {len(campaign_ids)} campaigns...")
 
+    pending_ids = []
     for campaign_id in campaign_ids:
         # Skip if exists and flag set
-        existing_file = conversations_dir / f"{campaign_id}.json"
-        if args.skip_existing and existing_file.exists():
+        if args.skip_existing and find_dataset(conversations_dir, str(campaign_id)):
             print(f"  {campaign_id}: skipped (already exists)")
             continue
-
-        conversations, err = fetch_conversations_for_campaign(client, campaign_id)
-
-        if err:
-            print(f"  {campaign_id}: ERROR - {err}")
-            errors.append((campaign_id, err))
-            continue
-
-        output_path, err = save_conversations(conversations, campaign_id, output_dir)
-
-        if err:
-            print(f"  {campaign_id}: ERROR - {err}")
-            errors.append((campaign_id, err))
-            continue
-
-        total_conversations += len(conversations)
-        print(f"  {campaign_id}: {len(conversations)} conversations")
+        pending_ids.append(campaign_id)
+
+    def fetch_and_save(campaign_id: int) -> tuple[int, str]:
+        conversations = iter_campaign_conversations(client, campaign_id)
+        _, count, err = save_conversations(conversations, campaign_id, output_dir, compress=args.gzip)
+        return count, err
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(fetch_and_save, campaign_id): campaign_id for campaign_id in pending_ids}
+        for future in as_completed(futures):
+            campaign_id = futures[future]
+            count, err = future.result()
+
+            if err:
+                print(f"  {campaign_id}: ERROR - {err}")
+                errors.append((campaign_id, err))
+                continue
+
+            total_conversations += count
+            print(f"  {campaign_id}: {count} conversations")
 
     # Summary
     print(f"\nConversations fetched: {total_conversations}")
@@ -3,27 +3,37 @@
 Fetch HeyReach conversations for all LinkedIn accounts.
 
 Step 1 of the conversation summary pipeline.
-Fetches all conversations by account (NOT by campaign - campaignIds filter
+Fetches conversations by account (NOT by campaign - campaignIds filter
 causes HeyReach API timeouts). Campaign tagging happens in compile_digest.
+Paging stops once an account reaches conversations whose last message is
+older than --days, so the fetch scales with recent activity.
 
-Outputs: /tmp/heyreach-summary-{date}/conversations.json
+Outputs: /tmp/heyreach-summary-{date}/conversations.jsonl (one conversation
+per line, streamed as pages arrive; recorded in manifest.json)
 
 Usage:
     python fetch_recent_conversations.py
     python fetch_recent_conversations.py --days 14
     python fetch_recent_conversations.py --output-dir /tmp/heyreach-summary-2026-02-13
+    python fetch_recent_conversations.py --gzip
+    python fetch_recent_conversations.py --stdout | python compile_digest.py --conversations -
 """
 
 import argparse
-import json
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterator
 
 from dotenv import load_dotenv
 from datagen_sdk import DatagenClient
 
+from jsonl_io import dataset_path, write_jsonl
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from heyreach_sync_state import iter_conversations_since
+
 
 def get_output_dir() -> Path:
     date_str = datetime.now().strftime("%Y-%m-%d")
@@ -59,53 +69,21 @@ def fetch_account_ids(client: DatagenClient) -> tuple[list[int], str]:
         return [], f"fetch_account_ids failed: {e}"
 
 
-def fetch_conversations(
+def iter_recent_conversations(
     client: DatagenClient,
     account_ids: list[int],
-) -> tuple[list[dict], int, str]:
+    days: int,
+    log=print,
+) -> Iterator[dict]:
     """
-    Fetch all conversations for given accounts with pagination.
+    Stream conversations with activity in the last N days, newest first.
     Does NOT filter by campaignIds (causes HeyReach API timeouts).
 
-    Returns (conversations, total_count, error). Check error first.
+    Raises on API errors (write_jsonl reports them as an error string).
     """
-    try:
-        all_conversations = []
-        total_count = 0
-        offset = 0
-
-        while True:
-            result = client.execute_tool(
-                "mcp_Heyreach_get_conversations_v2",
-                {
-                    "linkedInAccountIds": account_ids,
-                    "campaignIds": [],
-                    "limit": 100,
-                    "offset": offset,
-                },
-            )
-
-            if isinstance(result, list) and len(result) > 0:
-                page = result[0] if isinstance(result[0], dict) else {}
-                items = page.get("items", result)
-                total_count = page.get("totalCount", total_count)
-            elif isinstance(result, dict):
-                items = result.get("items", [])
-                total_count = result.get("totalCount", total_count)
-            else:
-                items = []
-
-            all_conversations.extend(items)
-            print(f"  Fetched {len(all_conversations)}/{total_count} conversations...")
-
-            if len(items) < 100:
-                break
-            offset += 100
-
-        return all_conversations, total_count, ""
-
-    except Exception as e:
-        return [], 0, f"fetch_conversations failed: {e}"
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    marks = {account_id: cutoff for account_id in account_ids}
+    yield from iter_conversations_since(client, account_ids, marks, log=lambda msg: log(f"  {msg}"))
 
 
 def main() -> int:
@@ -116,8 +94,14 @@ def main() -> int:
         "--days", type=int, default=14, help="Look back N days (default: 14)"
     )
     parser.add_argument("--output-dir", type=str, help="Override output directory")
+    parser.add_argument("--gzip", action="store_true", help="Write conversations.jsonl.gz")
+    parser.add_argument("--stdout", action="store_true", help="Write JSONL to stdout (progress goes to stderr)")
     args = parser.parse_args()
 
+    # Keep stdout clean for the data when piping
+    def log(msg: str = "") -> None:
+        print(msg, file=sys.stderr if args.stdout else sys.stdout)
+
     env_path = Path(__file__).parent.parent.parent / ".env"
     load_dotenv(env_path)
 
@@ -126,41 +110,37 @@ def main() -> int:
         return 1
 
     output_dir = Path(args.output_dir) if args.output_dir else get_output_dir()
-    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = "-" if args.stdout else dataset_path(output_dir, "conversations", compress=args.gzip)
 
     client = DatagenClient()
 
     # Step 1: Get account IDs
-    print("Fetching LinkedIn accounts...")
+    log("Fetching LinkedIn accounts...")
     account_ids, err = fetch_account_ids(client)
     if err:
         print(f"ERROR: {err}", file=sys.stderr)
         return 1
-    print(f"  Found {len(account_ids)} accounts: {account_ids}")
+    log(f"  Found {len(account_ids)} accounts: {account_ids}")
+
+    # Step 2: Stream conversations to disk as pages arrive (no campaign filter - it causes timeouts)
+    log("\nFetching conversations...")
+    totals = {"with_replies": 0}
+
+    def counted(conversations: Iterator[dict]) -> Iterator[dict]:
+        for conv in conversations:
+            if any(m.get("sender") == "CORRESPONDENT" for m in conv.get("messages", [])):
+                totals["with_replies"] += 1
+            yield conv
 
-    # Step 2: Fetch ALL conversations (no campaign filter - it causes timeouts)
-    print("\nFetching conversations...")
-    all_conversations, total_count, err = fetch_conversations(client, account_ids)
+    count, err = write_jsonl(output_path, counted(iter_recent_conversations(client, account_ids, args.days, log)))
     if err:
         print(f"ERROR: {err}", file=sys.stderr)
         return 1
 
-    # Save all conversations
-    output_path = output_dir / "conversations.json"
-    output_path.write_text(
-        json.dumps(all_conversations, indent=2, ensure_ascii=False)
-    )
-
     # Summary
-    total_with_replies = sum(
-        1
-        for c in all_conversations
-        if any(m.get("sender") == "CORRESPONDENT" for m in c.get("messages", []))
-    )
-
-    print(f"\nTotal conversations: {len(all_conversations)}")
-    print(f"With replies: {total_with_replies}")
-    print(f"Output: {output_path}")
+    log(f"\nTotal conversations: {count}")
+    log(f"With replies: {totals['with_replies']}")
+    log(f"Output: {'stdout' if args.stdout else output_path}")
 
     return 0
 
@@ -3,10 +3,11 @@
 Fetch full message threads for conversations with replies.
 
 Step 2 (optional) of the conversation summary pipeline.
-Reads: /tmp/heyreach-summary-{date}/conversations.json
+Reads: /tmp/heyreach-summary-{date}/conversations.jsonl (streamed; .jsonl.gz
+       and legacy conversations.json also accepted)
 Outputs: /tmp/heyreach-summary-{date}/threads/{conversation_id}.json
 
-Use this when conversations.json has truncated messages or missing content.
+Use this when conversations have truncated messages or missing content.
 If conversations already have full messages, skip this step.
 
 Usage:
@@ -21,30 +22,29 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
 
 from dotenv import load_dotenv
 from datagen_sdk import DatagenClient
 
+from jsonl_io import find_dataset, read_jsonl
+
 
 def get_output_dir() -> Path:
     date_str = datetime.now().strftime("%Y-%m-%d")
     return Path(f"/tmp/heyreach-summary-{date_str}")
 
 
-def load_conversations(input_dir: Path) -> tuple[list[dict], str]:
+def load_conversations(input_dir: Path) -> tuple[Iterator[dict], str]:
     """
-    Load conversations from JSON.
+    Open the conversations dataset for streaming.
 
     Returns (conversations, error). Check error first.
     """
-    path = input_dir / "conversations.json"
-    if not path.exists():
-        return [], f"conversations.json not found in {input_dir}"
-
-    try:
-        return json.loads(path.read_text()), ""
-    except Exception as e:
-        return [], f"Failed to load conversations.json: {e}"
+    path = find_dataset(input_dir, "conversations")
+    if not path:
+        return iter(()), f"conversations.jsonl not found in {input_dir}"
+    return read_jsonl(path), ""
 
 
 def has_replies(conversation: dict) -> bool:
@@ -107,19 +107,19 @@ def main() -> int:
         print(f"ERROR: {err}", file=sys.stderr)
         return 1
 
-    # Filter to conversations with replies
-    reply_conversations = [c for c in conversations if has_replies(c)]
-    print(f"Conversations with replies: {len(reply_conversations)}/{len(conversations)}")
-
-    if not reply_conversations:
-        print("No conversations with replies. Nothing to fetch.")
-        return 0
-
     client = DatagenClient()
     fetched = 0
     errors = []
+    total = 0
+    with_replies = 0
+
+    # Stream conversations; only those with replies need a full thread
+    for conv in conversations:
+        total += 1
+        if not has_replies(conv):
+            continue
+        with_replies += 1
 
-    for conv in reply_conversations:
         conversation_id = conv.get("conversationId", conv.get("id", ""))
         account_id = conv.get("accountId", conv.get("account_id", 0))
 
@@ -147,7 +147,8 @@ def main() -> int:
         print(f"  {conversation_id}: {msg_count} messages")
         fetched += 1
 
-    print(f"\nThreads fetched: {fetched}")
+    print(f"\nConversations with replies: {with_replies}/{total}")
+    print(f"Threads fetched: {fetched}")
     print(f"Output: {threads_dir}")
 
     if errors:
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Streaming JSONL datasets for the HeyReach pipelines.
+
+Conversation data moves between steps as line-delimited JSON (one record per
+line) so every step can stream it in constant memory:
+
+    conversations.jsonl[.gz]              (summary pipeline)
+    conversations/{campaign_id}.jsonl[.gz] (report pipeline)
+
+- write_jsonl: writes records from any iterable; ".gz" paths are gzipped,
+  "-" writes to stdout (for pipes). Files are written to a temp name and
+  renamed, so readers never see a partial dataset.
+- read_jsonl: generator over records; ".gz" aware, "-" reads stdin, and
+  legacy pretty-printed JSON arrays (*.json) are still accepted.
+- manifest.json in the dataset directory records count, sha256 (of the
+  uncompressed JSONL) and size for every dataset written.
+
+Error-first pattern: functions return (result, error) tuples; read_jsonl is
+a generator and raises on malformed input.
+"""
+
+import gzip
+import hashlib
+import json
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+MANIFEST_NAME = "manifest.json"
+
+_manifest_lock = threading.Lock()
+
+PathLike = Union[str, Path]
+
+
+def find_dataset(directory: Path, stem: str) -> Optional[Path]:
+    """
+    Locate stem.jsonl.gz, stem.jsonl or legacy stem.json in directory.
+
+    When more than one exists (e.g. a run switched --gzip), the most
+    recently written wins, so a stale copy never hides newer data; ties go
+    to .jsonl.gz, then .jsonl.
+    """
+    suffixes = (".jsonl.gz", ".jsonl", ".json")
+    found = []
+    for rank, suffix in enumerate(suffixes):
+        path = Path(directory) / f"{stem}{suffix}"
+        try:
+            found.append((path.stat().st_mtime_ns, -rank, path))
+        except FileNotFoundError:
+            continue
+    return max(found)[2] if found else None
+
+
+def dataset_path(directory: Path, stem: str, compress: bool = False) -> Path:
+    """Path a step should write stem to (stem.jsonl or stem.jsonl.gz)."""
+    return Path(directory) / f"{stem}.jsonl{'.gz' if compress else ''}"
+
+
+def _open_text(path: Path, mode: str, compress: Optional[bool] = None):
+    if compress if compress is not None else path.name.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def read_jsonl(path: PathLike) -> Iterator[dict]:
+    """
+    Stream records from a JSONL dataset ("-" for stdin).
+
+    Legacy *.json files holding a JSON array are loaded whole and yielded.
+    """
+    if str(path) == "-":
+        for line in sys.stdin:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    path = Path(path)
+    if path.suffix == ".json":
+        records = json.loads(path.read_text(encoding="utf-8"))
+        yield from (records if isinstance(records, list) else [records])
+        return
+
+    with _open_text(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_jsonl(path: PathLike, records: Iterable[dict], manifest: bool = True) -> tuple[int, str]:
+    """
+    Stream records to a JSONL dataset ("-" for stdout).
+
+    Args:
+        path: Output path (.jsonl or .jsonl.gz) or "-"
+        records: Any iterable of JSON-serializable dicts (consumed once)
+        manifest: Record count/checksum in the directory's manifest.json
+
+    Returns:
+        (count, error): Records written and error message
+    """
+    count = 0
+    digest = hashlib.sha256()
+
+    if str(path) == "-":
+        try:
+            for record in records:
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+            sys.stdout.flush()
+            return count, ""
+        except Exception as e:
+            return count, f"write_jsonl failed for stdout: {e}"
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _open_text(tmp_path, "w", compress=path.name.endswith(".gz")) as f:
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False) + "\n"
+                f.write(line)
+                digest.update(line.encode("utf-8"))
+                count += 1
+        tmp_path.replace(path)
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return count, f"write_jsonl failed for {path}: {e}"
+
+    if manifest:
+        err = record_in_manifest(path, count, digest.hexdigest())
+        if err:
+            return count, err
+    return count, ""
+
+
+def _manifest_root(path: Path) -> Path:
+    # conversations/{id}.jsonl is recorded in the run directory's manifest
+    return path.parent.parent if path.parent.name == "conversations" else path.parent
+
+
+def load_manifest(directory: Path) -> dict:
+    """Load manifest.json from a run directory ({} if missing)."""
+    manifest_path = Path(directory) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {"datasets": {}}
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except Exception:
+        return {"datasets": {}}
+
+
+def record_in_manifest(path: Path, count: int, sha256: str) -> str:
+    """Add/replace a dataset entry in the run directory's manifest.json."""
+    root = _manifest_root(Path(path))
+    try:
+        with _manifest_lock:
+            manifest = load_manifest(root)
+            manifest.setdefault("datasets", {})[str(Path(path).relative_to(root))] = {
+                "count": count,
+                "sha256": sha256,
+                "bytes": Path(path).stat().st_size,
+                "written_at": datetime.now(timezone.utc).isoformat(),
+            }
+            manifest_path = root / MANIFEST_NAME
+            tmp_path = manifest_path.with_name(MANIFEST_NAME + ".tmp")
+            tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(manifest_path)
+        return ""
+    except Exception as e:
+        return f"record_in_manifest failed for {path}: {e}"
+
+
+def verify_dataset(path: Path) -> tuple[bool, str]:
+    """
+    Check a dataset against its manifest entry (count and sha256).
+
+    Returns (ok, error). Datasets without a manifest entry are reported as errors.
+    """
+    path = Path(path)
+    root = _manifest_root(path)
+    entry = load_manifest(root).get("datasets", {}).get(str(path.relative_to(root)))
+    if not entry:
+        return False, f"{path} not in manifest"
+
+    try:
+        digest = hashlib.sha256()
+        count = 0
+        with _open_text(path, "r") as f:
+            for line in f:
+                digest.update(line.encode("utf-8"))
+                count += 1
+    except Exception as e:
+        return False, f"verify failed for {path}: {e}"
+
+    if count != entry["count"] or digest.hexdigest() != entry["sha256"]:
+        return False, f"{path} does not match manifest (count {count} vs {entry['count']})"
+    return True, ""
@@ -21,6 +21,8 @@ from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 from datagen_sdk import DatagenClient
 
+from meeting_signals import messages_have_meeting_signal
+
 # Load environment variables
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
@@ -142,14 +144,6 @@ def analyze_conversations(conversations: List[Dict[str, Any]]) -> Dict[str, Any]
     meeting_booked = 0
     total_messages_in_replied_convos = 0
 
-    # Keywords that indicate meeting booking (crude detection)
-    # TODO: Improve with webhook tracking or better NLP
-    meeting_keywords = [
-        "book", "calendar", "meeting", "schedule", "call",
-        "zoom", "calendly", "available", "time slot",
-        "appointment", "confirm", "yes please", "let's talk"
-    ]
-
     for conv in conversations:
         messages = conv.get("messages", [])
 
@@ -159,9 +153,9 @@ def analyze_conversations(conversations: List[Dict[str, Any]]) -> Dict[str, Any]
             replied_convos += 1
             total_messages_in_replied_convos += len(messages)
 
-        # Check for meeting bookings in message content
-        all_text = " ".join(msg.get("body", "").lower() for msg in messages if msg.get("body"))
-        if any(keyword in all_text for keyword in meeting_keywords):
+        # Check for meeting bookings in message content (crude keyword detection)
+        # TODO: Improve with webhook tracking or better NLP
+        if messages_have_meeting_signal(messages):
             meeting_booked += 1
 
     # Calculate average messages per replied lead (engagement depth)
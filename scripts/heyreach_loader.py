@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Chunked, parallel, resumable lead loading into HeyReach lists (via DataGen).
+
+add_leads_to_list_v2 accepts up to 100 leads per call. load_leads splits the
+leads into chunks of that size and sends them on a bounded thread pool. All
+calls share one rate limiter (heyreach_pager.get_rate_limiter). A call that
+raises is retried with exponential backoff.
+
+Every lead HeyReach acknowledges is recorded in a local SQLite ledger, keyed
+by (list_id, normalized profile URL). A rerun only sends leads that are not
+in the ledger yet, so an interrupted load picks up where it stopped. The
+ledger also remembers which list was created for a list name, so a rerun
+adds to the same list instead of creating a new one.
+
+HeyReach reports only counts per call (added / updated / failed), not which
+leads failed. When a chunk reports failures it is split in half and both
+halves are resent (adds are upserts, so resending the good leads is
+harmless), until the failing leads are isolated one per call. Only those
+leads are left out of the ledger. Leads the split call did add come back as
+"updated" when resent; they are still counted as added.
+
+Usage:
+    from heyreach_loader import LeadLedger, load_leads
+
+    ledger = LeadLedger(DEFAULT_LEDGER_PATH)
+    result, err = load_leads(client, list_id, leads, ledger=ledger, workers=4)
+    print(result.format_summary())
+
+Error-first pattern: load_leads returns (result, error).
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlparse
+
+from heyreach_pager import get_rate_limiter
+
+ADD_LEADS_TOOL = "mcp_Heyreach_add_leads_to_list_v2"
+# add_leads_to_list_v2 rejects more leads than this per call
+MAX_LEADS_PER_REQUEST = 100
+
+DEFAULT_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+DEFAULT_RETRIES = 3
+DEFAULT_LEDGER_PATH = Path(__file__).parent.parent / "data" / "heyreach" / "lead_ledger.db"
+
+
+def lead_key(lead: dict) -> str:
+    """Ledger key of a lead: its LinkedIn profile URL, lowercased, without query or trailing slash."""
+    url = (lead.get("profileUrl") or "").strip()
+    if not url:
+        return ""
+    parsed = urlparse(url)
+    if parsed.netloc:
+        url = f"{parsed.netloc}{parsed.path}"
+    return url.rstrip("/").lower().removeprefix("www.")
+
+
+class LeadLedger:
+    """Leads acknowledged per HeyReach list, plus list ids by name, in a SQLite file."""
+
+    def __init__(self, db_path: Path = DEFAULT_LEDGER_PATH):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS heyreach_lists (
+                    list_name TEXT PRIMARY KEY,
+                    list_id TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS heyreach_lead_ledger (
+                    list_id TEXT NOT NULL,
+                    lead_key TEXT NOT NULL,
+                    acked_at TEXT NOT NULL,
+                    PRIMARY KEY (list_id, lead_key)
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def get_list_id(self, list_name: str) -> tuple[Optional[Any], str]:
+        """List id previously created for list_name (None if never created)."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT list_id FROM heyreach_lists WHERE list_name = ?", (list_name,)
+                ).fetchone()
+            if not row:
+                return None, ""
+            # HeyReach list ids are integers; keep them that way for tool params
+            return (int(row[0]) if row[0].isdigit() else row[0]), ""
+        except sqlite3.Error as e:
+            return None, f"Failed to read ledger: {e}"
+
+    def save_list_id(self, list_name: str, list_id: Any) -> str:
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO heyreach_lists (list_name, list_id, created_at) VALUES (?, ?, ?)",
+                    (list_name, str(list_id), datetime.now(timezone.utc).isoformat()),
+                )
+                conn.commit()
+            return ""
+        except sqlite3.Error as e:
+            return f"Failed to write ledger: {e}"
+
+    def acked(self, list_id: Any) -> tuple[set[str], str]:
+        """Lead keys already acknowledged for list_id."""
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT lead_key FROM heyreach_lead_ledger WHERE list_id = ?", (str(list_id),)
+                ).fetchall()
+            return {r[0] for r in rows}, ""
+        except sqlite3.Error as e:
+            return set(), f"Failed to read ledger: {e}"
+
+    def mark(self, list_id: Any, keys: Iterable[str]) -> str:
+        """Record acknowledged lead keys (committed immediately)."""
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.executemany(
+                    "INSERT OR IGNORE INTO heyreach_lead_ledger (list_id, lead_key, acked_at) VALUES (?, ?, ?)",
+                    [(str(list_id), key, now) for key in keys],
+                )
+                conn.commit()
+            return ""
+        except sqlite3.Error as e:
+            return f"Failed to write ledger: {e}"
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load_leads() call."""
+
+    total: int = 0
+    skipped: int = 0
+    acked: int = 0
+    added: int = 0
+    updated: int = 0
+    failed: int = 0
+    calls: int = 0
+    seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+    def format_summary(self) -> str:
+        return (
+            f"total={self.total} already_loaded={self.skipped} acked={self.acked} "
+            f"added={self.added} updated={self.updated} failed={self.failed} "
+            f"calls={self.calls} time={self.seconds:.1f}s"
+        )
+
+
+def _parse_counts(resp: Any) -> Optional[dict]:
+    payload = resp[0] if isinstance(resp, list) and resp else resp
+    if not isinstance(payload, dict):
+        return None
+    return {k: int(payload.get(k) or 0) for k in ("addedCount", "updatedCount", "failedCount")}
+
+
+def load_leads(
+    client: Any,
+    list_id: Any,
+    leads: list[dict],
+    *,
+    ledger: Optional[LeadLedger] = None,
+    chunk_size: int = MAX_LEADS_PER_REQUEST,
+    workers: int = DEFAULT_WORKERS,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    retries: int = DEFAULT_RETRIES,
+    backoff_seconds: float = 1.0,
+    log: Optional[Callable[[str], None]] = None,
+) -> tuple[LoadResult, str]:
+    """
+    Add leads to a HeyReach list in parallel chunks, skipping leads already in the ledger.
+
+    Args:
+        client: DatagenClient
+        list_id: HeyReach list id
+        leads: HeyReach lead dicts (profileUrl, firstName, ..., customUserFields)
+        ledger: Acknowledgement ledger (None loads everything, unrecorded)
+        chunk_size: Leads per call (capped at MAX_LEADS_PER_REQUEST)
+        workers: Calls in flight at once
+        requests_per_second: Rate limit shared by all HeyReach calls in the process
+        retries: Retries per call when the tool raises
+        backoff_seconds: Base of the exponential backoff between retries
+        log: Optional progress printer, called once per chunk
+
+    Returns:
+        (LoadResult, error): error is set if the ledger could not be read or
+        any lead failed
+    """
+    start = time.monotonic()
+    result = LoadResult(total=len(leads))
+
+    # One entry per lead key; leads without a profile URL can't be added
+    pending: dict[str, dict] = {}
+    for lead in leads:
+        key = lead_key(lead)
+        if not key:
+            result.failed += 1
+            result.errors.append(f"Lead without profileUrl: {lead.get('firstName', '')} {lead.get('lastName', '')}")
+        else:
+            pending.setdefault(key, lead)
+
+    done: set[str] = set()
+    if ledger is not None:
+        done, err = ledger.acked(list_id)
+        if err:
+            return result, err
+    todo = [(key, lead) for key, lead in pending.items() if key not in done]
+    result.skipped = len(pending) - len(todo)
+
+    size = max(1, min(chunk_size, MAX_LEADS_PER_REQUEST))
+    chunks = [todo[i:i + size] for i in range(0, len(todo), size)]
+    limiter = get_rate_limiter("heyreach", requests_per_second)
+
+    def _call(chunk: list[tuple[str, dict]]) -> tuple[Optional[dict], str]:
+        last_error = ""
+        for attempt in range(retries + 1):
+            limiter.acquire()
+            try:
+                counts = _parse_counts(client.execute_tool(
+                    ADD_LEADS_TOOL, {"listId": list_id, "leads": [lead for _, lead in chunk]}
+                ))
+                if counts is not None:
+                    return counts, ""
+                last_error = "unexpected response"
+            except Exception as e:
+                last_error = str(e)[:200]
+            if attempt < retries:
+                time.sleep(backoff_seconds * (2 ** attempt))
+        return None, last_error
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks) or 1)), thread_name_prefix="heyreach-add")
+    # chunk -> leads its split ancestors added but that were resent ([count],
+    # shared by all halves of one original chunk; None if never split)
+    in_flight: dict[Future, tuple[list[tuple[str, dict]], Optional[list[int]]]] = {
+        executor.submit(_call, chunk): (chunk, None) for chunk in chunks
+    }
+    try:
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk, added_earlier = in_flight.pop(future)
+                counts, err = future.result()
+                result.calls += 1
+                if counts is None:
+                    result.failed += len(chunk)
+                    result.errors.append(f"{len(chunk)} leads not added: {err}")
+                    if log:
+                        log(f"[add] {len(chunk)} leads failed: {err}")
+                    continue
+
+                if counts["failedCount"] and len(chunk) > 1:
+                    # Unknown which leads failed: resend both halves to narrow it down.
+                    # Only the halves' counts are used; the leads this call added
+                    # come back as updated and are moved back to added below.
+                    added_earlier = added_earlier or [0]
+                    added_earlier[0] += counts["addedCount"]
+                    middle = len(chunk) // 2
+                    for half in (chunk[:middle], chunk[middle:]):
+                        in_flight[executor.submit(_call, half)] = (half, added_earlier)
+                    if log:
+                        log(f"[add] {counts['failedCount']} of {len(chunk)} failed, retrying in halves")
+                    continue
+
+                if counts["failedCount"]:
+                    # A single lead: nothing was added or updated
+                    result.failed += 1
+                    result.errors.append(f"HeyReach rejected lead {chunk[0][0]}")
+                else:
+                    readded = min(counts["updatedCount"], added_earlier[0]) if added_earlier else 0
+                    if readded:
+                        added_earlier[0] -= readded
+                    result.added += counts["addedCount"] + readded
+                    result.updated += counts["updatedCount"] - readded
+                    result.acked += len(chunk)
+                    if ledger is not None:
+                        err = ledger.mark(list_id, (key for key, _ in chunk))
+                        if err:
+                            result.errors.append(err)
+                if log:
+                    log(f"[add] {len(chunk)} leads: added={counts['addedCount']} "
+                        f"updated={counts['updatedCount']} failed={counts['failedCount']}")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    result.seconds = time.monotonic() - start
+    if result.failed:
+        return result, f"{result.failed} of {result.total} leads were not added"
+    return result, ""
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Concurrent offset pagination for HeyReach list endpoints (via DataGen).
+
+HeyReach list tools (get_conversations_v2, get_leads_from_campaign, ...) take
+limit/offset and report totalCount. iter_items fetches the first page, then
+fans the remaining offsets out over a bounded thread pool and yields items as
+pages arrive. Requests for the same account share a rate limiter, and each
+page is retried on its own with exponential backoff, so one flaky page doesn't
+restart the whole pull.
+
+Usage:
+    from heyreach_pager import iter_items
+
+    for item in iter_items(client, "mcp_Heyreach_get_conversations_v2", {
+        "linkedInAccountIds": account_ids, "campaignIds": [],
+    }):
+        ...
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, Optional
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+DEFAULT_RETRIES = 3
+
+
+class PageFetchError(RuntimeError):
+    """A page still failed after all retries."""
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across threads."""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND) -> RateLimiter:
+    """Process-wide limiter for a key (e.g. one HeyReach account set)."""
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = RateLimiter(requests_per_second)
+            _limiters[key] = limiter
+        return limiter
+
+
+def _rate_key(params: dict) -> str:
+    account_ids = params.get("linkedInAccountIds") or []
+    return "accounts:" + ",".join(str(a) for a in sorted(account_ids)) if account_ids else "heyreach"
+
+
+def _parse_page(resp: Any) -> tuple[list[dict], Optional[int]]:
+    payload = resp[0] if isinstance(resp, list) and resp else resp
+    if not isinstance(payload, dict):
+        return [], None
+    items = payload.get("items") if isinstance(payload.get("items"), list) else []
+    total_count = payload.get("totalCount") if isinstance(payload.get("totalCount"), int) else None
+    return [i for i in items if isinstance(i, dict)], total_count
+
+
+def fetch_page(
+    client: Any,
+    tool: str,
+    params: dict,
+    *,
+    offset: int,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    limiter: Optional[RateLimiter] = None,
+    retries: int = DEFAULT_RETRIES,
+    backoff_seconds: float = 1.0,
+) -> tuple[list[dict], Optional[int]]:
+    """
+    Fetch one page, retrying with exponential backoff.
+
+    Returns:
+        (items, total_count): Page items and totalCount (None if not reported)
+
+    Raises:
+        PageFetchError: The page failed on every attempt
+    """
+    last_error: Optional[Exception] = None
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.acquire()
+        try:
+            resp = client.execute_tool(tool, {**params, "limit": page_size, "offset": offset})
+            return _parse_page(resp)
+        except Exception as e:
+            last_error = e
+            if attempt < retries:
+                time.sleep(backoff_seconds * (2 ** attempt))
+    raise PageFetchError(f"{tool} offset={offset} failed after {retries + 1} attempts: {last_error}")
+
+
+def iter_items(
+    client: Any,
+    tool: str,
+    params: dict,
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_workers: int = DEFAULT_WORKERS,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    rate_key: Optional[str] = None,
+    retries: int = DEFAULT_RETRIES,
+    max_items: Optional[int] = None,
+    ordered: bool = False,
+    log: Optional[Callable[[str], None]] = None,
+) -> Iterator[dict]:
+    """
+    Yield every item of a paginated HeyReach tool, fetching pages concurrently.
+
+    Args:
+        client: DatagenClient
+        tool: Tool name, e.g. "mcp_Heyreach_get_conversations_v2"
+        params: Tool params without limit/offset
+        page_size: Items per request
+        max_workers: Concurrent page requests after the first page
+        requests_per_second: Rate limit shared by all pulls with the same rate_key
+        rate_key: Limiter key (default: the request's linkedInAccountIds)
+        retries: Retries per page before giving up
+        max_items: Stop after this many items
+        ordered: Yield pages in offset order instead of arrival order
+        log: Optional progress printer, called once per page
+
+    Raises:
+        PageFetchError: A page failed on every attempt
+    """
+    limiter = get_rate_limiter(rate_key or _rate_key(params), requests_per_second)
+
+    def _fetch(offset: int) -> tuple[list[dict], Optional[int]]:
+        return fetch_page(client, tool, params, offset=offset, page_size=page_size, limiter=limiter, retries=retries)
+
+    yielded = 0
+    items, total_count = _fetch(0)
+    if log:
+        log(f"[fetch] {tool} offset=0 got={len(items)} total={total_count}")
+    for item in items:
+        yield item
+        yielded += 1
+        if max_items is not None and yielded >= max_items:
+            return
+
+    if total_count is None:
+        # No totalCount to fan out on: keep paging until a short page
+        offset = page_size
+        while len(items) == page_size:
+            items, _ = _fetch(offset)
+            if log:
+                log(f"[fetch] {tool} offset={offset} got={len(items)}")
+            for item in items:
+                yield item
+                yielded += 1
+                if max_items is not None and yielded >= max_items:
+                    return
+            offset += page_size
+        return
+
+    offsets = list(range(page_size, total_count, page_size))
+    if max_items is not None:
+        needed_pages = -(-(max_items - yielded) // page_size)
+        offsets = offsets[:needed_pages]
+    if not offsets:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(offsets))), thread_name_prefix="heyreach-page")
+    pending: dict[Future, int] = {executor.submit(_fetch, offset): offset for offset in offsets}
+    ready: dict[int, list[dict]] = {}
+    next_offset_idx = 0
+    try:
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                offset = pending.pop(future)
+                page_items, _ = future.result()
+                if log:
+                    log(f"[fetch] {tool} offset={offset} got={len(page_items)} total={total_count}")
+                ready[offset] = page_items
+
+            if ordered:
+                batches = []
+                while next_offset_idx < len(offsets) and offsets[next_offset_idx] in ready:
+                    batches.append(ready.pop(offsets[next_offset_idx]))
+                    next_offset_idx += 1
+            else:
+                batches = list(ready.values())
+                ready.clear()
+
+            for page_items in batches:
+                for item in page_items:
+                    yield item
+                    yielded += 1
+                    if max_items is not None and yielded >= max_items:
+                        return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+High-water marks for incremental HeyReach conversation syncs.
+
+HeyReach lists conversations newest-first by lastMessageAt. Each sync stores
+the newest lastMessageAt it has seen per LinkedIn account, and the next run
+pages each account only until it reaches conversations at or before that
+mark, so a nightly sync costs pages proportional to new activity instead of
+total history.
+
+State lives in a small table keyed by (source, linked_in_account_id):
+- LocalSyncState: SQLite file (exports, local pipelines)
+- NeonSyncState: public.heyreach_sync_state via neon_client.NeonClient
+
+Error-first pattern: All functions return (result, error) tuples.
+"""
+
+import sqlite3
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from neon_client import NeonClient, render
+
+# account_id -> newest lastMessageAt (HeyReach ISO string, e.g. "2025-12-21T03:35:49.335Z")
+Marks = dict[int, str]
+
+
+def parse_message_time(value: Any) -> Optional[datetime]:
+    """Parse a HeyReach timestamp ("...Z" or offset); None if missing/invalid."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def is_newer(value: Optional[str], mark: Optional[str]) -> bool:
+    """True if value is strictly after mark (unknown timestamps count as newer)."""
+    value_dt = parse_message_time(value)
+    mark_dt = parse_message_time(mark)
+    if value_dt is None or mark_dt is None:
+        return True
+    return value_dt > mark_dt
+
+
+def advance_marks(marks: Marks, conversations: list[dict]) -> Marks:
+    """Return marks moved forward to the newest lastMessageAt per account in conversations."""
+    advanced = dict(marks)
+    for conv in conversations:
+        account_id = conv.get("linkedInAccountId")
+        last_message_at = conv.get("lastMessageAt")
+        if not isinstance(account_id, int) or parse_message_time(last_message_at) is None:
+            continue
+        current = advanced.get(account_id)
+        if current is None or is_newer(last_message_at, current):
+            advanced[account_id] = last_message_at
+    return advanced
+
+
+class SyncStateStore(ABC):
+    """Per-account high-water marks for one or more sync sources."""
+
+    @abstractmethod
+    def load(self, source: str) -> tuple[Marks, str]: ...
+
+    @abstractmethod
+    def save(self, source: str, marks: Marks) -> str: ...
+
+
+class LocalSyncState(SyncStateStore):
+    """Sync state in a local SQLite file."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS heyreach_sync_state (
+                source TEXT NOT NULL,
+                linked_in_account_id INTEGER NOT NULL,
+                last_message_at TEXT NOT NULL,
+                updated_at TEXT DEFAULT (datetime('now')),
+                PRIMARY KEY (source, linked_in_account_id)
+            )
+        """)
+        return conn
+
+    def load(self, source: str) -> tuple[Marks, str]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT linked_in_account_id, last_message_at FROM heyreach_sync_state WHERE source = ?",
+                    (source,),
+                ).fetchall()
+            return {account_id: last_message_at for account_id, last_message_at in rows}, ""
+        except Exception as e:
+            return {}, f"load sync state error: {e}"
+
+    def save(self, source: str, marks: Marks) -> str:
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO heyreach_sync_state (source, linked_in_account_id, last_message_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (source, linked_in_account_id) DO UPDATE SET
+                        last_message_at = excluded.last_message_at,
+                        updated_at = datetime('now')
+                    """,
+                    [(source, account_id, last_message_at) for account_id, last_message_at in marks.items()],
+                )
+            return ""
+        except Exception as e:
+            return f"save sync state error: {e}"
+
+
+class NeonSyncState(SyncStateStore):
+    """Sync state in public.heyreach_sync_state on Neon (via neon_client.NeonClient)."""
+
+    def __init__(self, neon: NeonClient):
+        self.neon = neon
+        self._schema_ready = False
+
+    def _ensure_schema(self) -> None:
+        if self._schema_ready:
+            return
+        self.neon.execute("""
+CREATE TABLE IF NOT EXISTS public.heyreach_sync_state (
+  source text NOT NULL,
+  linked_in_account_id integer NOT NULL,
+  last_message_at text NOT NULL,
+  updated_at timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY (source, linked_in_account_id)
+);
+""".strip())
+        self._schema_ready = True
+
+    def load(self, source: str) -> tuple[Marks, str]:
+        try:
+            self._ensure_schema()
+            rows = self.neon.query(
+                "SELECT linked_in_account_id, last_message_at FROM public.heyreach_sync_state WHERE source = %s;",
+                [source],
+            )
+            marks: Marks = {}
+            for row in rows:
+                if isinstance(row.get("linked_in_account_id"), int):
+                    marks[row["linked_in_account_id"]] = str(row.get("last_message_at") or "")
+            return {k: v for k, v in marks.items() if v}, ""
+        except Exception as e:
+            return {}, f"load sync state error: {e}"
+
+    def save(self, source: str, marks: Marks) -> str:
+        if not marks:
+            return ""
+        try:
+            self._ensure_schema()
+            values = ",\n".join(
+                render("(%s, %s, %s, now())", [source, int(account_id), last_message_at])
+                for account_id, last_message_at in marks.items()
+            )
+            self.neon.execute(f"""
+INSERT INTO public.heyreach_sync_state (source, linked_in_account_id, last_message_at, updated_at)
+VALUES
+{values}
+ON CONFLICT (source, linked_in_account_id) DO UPDATE SET
+  last_message_at = EXCLUDED.last_message_at,
+  updated_at = now();
+""".strip())
+            return ""
+        except Exception as e:
+            return f"save sync state error: {e}"
+
+
+def iter_conversations_since(
+    client: Any,
+    account_ids: list[int],
+    marks: Marks,
+    *,
+    page_size: int = 100,
+    max_conversations: Optional[int] = None,
+    log: Callable[[str], None] = print,
+) -> Iterator[dict]:
+    """
+    Stream conversations newer than each account's mark, newest first.
+
+    Pages each account separately and stops at the first page that reaches a
+    conversation at or before the account's mark. Accounts without a mark are
+    paged fully.
+
+    Args:
+        client: DatagenClient
+        account_ids: HeyReach LinkedIn account IDs
+        marks: account_id -> lastMessageAt already synced
+        page_size: Conversations per request
+        max_conversations: Optional overall cap (for testing)
+        log: Progress printer
+
+    Raises:
+        Whatever the client raises for a failed request
+    """
+    returned = 0
+    for account_id in account_ids:
+        mark = marks.get(account_id)
+        offset = 0
+        fetched = 0
+        while True:
+            resp = client.execute_tool(
+                "mcp_Heyreach_get_conversations_v2",
+                {
+                    "linkedInAccountIds": [account_id],
+                    "campaignIds": [],
+                    "seen": None,
+                    "limit": page_size,
+                    "offset": offset,
+                    "searchString": "",
+                    "leadLinkedInId": None,
+                    "leadProfileUrl": None,
+                },
+            )
+            payload = resp[0] if isinstance(resp, list) and resp else resp
+            if not isinstance(payload, dict):
+                break
+            total_count = payload.get("totalCount") if isinstance(payload.get("totalCount"), int) else None
+            items = [i for i in payload.get("items") or [] if isinstance(i, dict)]
+
+            reached_mark = False
+            for item in items:
+                if mark and not is_newer(item.get("lastMessageAt"), mark):
+                    reached_mark = True
+                    continue
+                item.setdefault("linkedInAccountId", account_id)
+                yield item
+                fetched += 1
+                returned += 1
+                if max_conversations is not None and returned >= max_conversations:
+                    log(f"[fetch] account={account_id} new={fetched} (hit max_conversations)")
+                    return
+
+            offset += page_size
+            if reached_mark or len(items) < page_size or (total_count is not None and offset >= total_count):
+                break
+
+        log(f"[fetch] account={account_id} since={mark or 'beginning'} new={fetched} pages={offset // page_size}")
+
+
+def fetch_conversations_since(
+    client: Any,
+    account_ids: list[int],
+    marks: Marks,
+    *,
+    page_size: int = 100,
+    max_conversations: Optional[int] = None,
+    log: Callable[[str], None] = print,
+) -> tuple[list[dict], str]:
+    """
+    Fetch conversations newer than each account's mark (see iter_conversations_since).
+
+    Returns:
+        (conversations, error): New/changed conversation dicts and error message
+    """
+    conversations: list[dict] = []
+    try:
+        for item in iter_conversations_since(
+            client, account_ids, marks, page_size=page_size, max_conversations=max_conversations, log=log
+        ):
+            conversations.append(item)
+        return conversations, ""
+    except Exception as e:
+        return conversations, f"fetch_conversations_since error: {e}"
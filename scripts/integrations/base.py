@@ -72,6 +72,22 @@ class Integration(ABC):
         """Human-readable description of what this integration does."""
         return self.__doc__ or "No description"
 
+    def prefetch(self, rows: list[dict]) -> str:
+        """
+        Optional bulk-load phase run once before enriching rows.
+
+        Integrations that would otherwise repeat the same API call per row
+        override this to pull their data up front; _enrich then answers from
+        the prefetched data. Default: no-op.
+
+        Args:
+            rows: All rows about to be enriched
+
+        Returns:
+            error string ("" for success); on error rows fall back to per-row calls
+        """
+        return ""
+
     @abstractmethod
     def _enrich(self, row: dict) -> tuple[dict, str]:
         """
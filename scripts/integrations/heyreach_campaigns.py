@@ -5,6 +5,7 @@ Enriches leads with HeyReach campaign history and contact timeline.
 """
 
 from .base import Integration
+from .heyreach_index import get_shared_index
 from datetime import datetime
 
 
@@ -19,14 +20,30 @@ class HeyReachCampaigns(Integration):
         "heyreach_last_campaign_status"
     ]
 
+    def __init__(self):
+        super().__init__()
+        self._index = None
+
+    def prefetch(self, rows: list[dict]) -> str:
+        """Pull every campaign's leads once instead of one lookup per row."""
+        index = get_shared_index(self.client)
+        err = index.load_campaigns()
+        if err:
+            return err
+        self._index = index
+        return ""
+
     def _enrich(self, row: dict) -> tuple[dict, str]:
-        # Get all campaigns for this lead
-        result = self.client.execute_tool(
-            "mcp_Heyreach_get_campaigns_for_lead",
-            {"linkedInProfileUrl": row["linkedin_url"]}
-        )
+        if self._index is not None:
+            campaigns = self._index.campaigns_for(row["linkedin_url"])
+        else:
+            # Get all campaigns for this lead
+            result = self.client.execute_tool(
+                "mcp_Heyreach_get_campaigns_for_lead",
+                {"linkedInProfileUrl": row["linkedin_url"]}
+            )
 
-        campaigns = result.get("items", [])
+            campaigns = result.get("items", [])
 
         if not campaigns:
             return {
@@ -64,3 +81,4 @@ _instance = HeyReachCampaigns()
 INPUT_COLS = _instance.input_cols
 OUTPUT_COLS = _instance.output_cols
 enrich = _instance.enrich
+prefetch = _instance.prefetch
@@ -5,6 +5,8 @@ Enriches leads with HeyReach conversation and engagement metrics.
 """
 
 from .base import Integration
+from .heyreach_index import get_shared_index
+from meeting_signals import messages_have_meeting_signal
 from datetime import datetime
 
 
@@ -20,21 +22,37 @@ class HeyReachEngagement(Integration):
         "heyreach_messages_received"
     ]
 
+    def __init__(self):
+        super().__init__()
+        self._index = None
+
+    def prefetch(self, rows: list[dict]) -> str:
+        """Pull all conversations once instead of one call per row."""
+        index = get_shared_index(self.client)
+        err = index.load_conversations()
+        if err:
+            return err
+        self._index = index
+        return ""
+
     def _enrich(self, row: dict) -> tuple[dict, str]:
-        # Get all conversations for this lead
-        result = self.client.execute_tool(
-            "mcp_Heyreach_get_conversations_v2",
-            {
-                "linkedInAccountIds": [],  # All accounts
-                "campaignIds": [],         # All campaigns
-                "leadProfileUrl": row["linkedin_url"],
-                "searchString": "",
-                "limit": 100,
-                "offset": 0
-            }
-        )
-
-        conversations = result.get("items", [])
+        if self._index is not None:
+            conversations = self._index.conversations_for(row["linkedin_url"])
+        else:
+            # Get all conversations for this lead
+            result = self.client.execute_tool(
+                "mcp_Heyreach_get_conversations_v2",
+                {
+                    "linkedInAccountIds": [],  # All accounts
+                    "campaignIds": [],         # All campaigns
+                    "leadProfileUrl": row["linkedin_url"],
+                    "searchString": "",
+                    "limit": 100,
+                    "offset": 0
+                }
+            )
+
+            conversations = result.get("items", [])
 
         # Aggregate metrics
         total_conversations = len(conversations)
@@ -43,14 +61,10 @@ class HeyReachEngagement(Integration):
         messages_sent = 0
         messages_received = 0
 
-        meeting_keywords = ["book", "calendar", "meeting", "schedule", "call",
-                           "zoom", "calendly", "available", "time slot", "appointment"]
-
         for conv in conversations:
             messages = conv.get("messages", [])
 
             for msg in messages:
-                body = msg.get("body", "").lower()
                 sender = msg.get("sender")
                 sent_at = msg.get("sentAt")
 
@@ -64,9 +78,10 @@ class HeyReachEngagement(Integration):
                         if not last_reply_date or reply_date > last_reply_date:
                             last_reply_date = reply_date
 
-                    # Check for meeting booking
-                    if any(keyword in body for keyword in meeting_keywords):
-                        meeting_booked = True
+            # Check for meeting booking in their replies
+            if not meeting_booked:
+                replies = (m for m in messages if m.get("sender") != "ME")
+                meeting_booked = messages_have_meeting_signal(replies)
 
         return {
             "heyreach_conversations_count": total_conversations,
@@ -82,3 +97,4 @@ _instance = HeyReachEngagement()
 INPUT_COLS = _instance.input_cols
 OUTPUT_COLS = _instance.output_cols
 enrich = _instance.enrich
+prefetch = _instance.prefetch
@@ -0,0 +1,179 @@
+"""
+Prefetched HeyReach data shared by the per-row HeyReach integrations.
+
+Without prefetch, heyreach_engagement, heyreach_campaigns and heyreach_network
+make one or more API calls per lead row over the same underlying data. With
+prefetch, each dataset is pulled once through paginated bulk fetches and
+indexed in memory by normalized LinkedIn profile URL; row lookups are then
+dictionary hits.
+
+Datasets are loaded on demand, so an engagement-only run never pulls
+campaign leads:
+- conversations: all conversations (get_conversations_v2)
+- campaigns: every campaign's leads (get_all_campaigns + get_leads_from_campaign)
+- network: each sender's connections (get_my_network_for_sender)
+
+Usage:
+    index = get_shared_index(client)
+    err = index.load_conversations()
+    conversations = index.conversations_for(row["linkedin_url"])
+
+Error-first pattern: load_* methods return an error string ("" on success).
+"""
+
+import threading
+from typing import Any, Callable, Optional
+from urllib.parse import urlsplit
+
+from heyreach_pager import iter_items
+
+
+def normalize_profile_url(url: Any) -> str:
+    """
+    Canonical form of a LinkedIn profile URL for matching.
+
+    Drops scheme, "www.", query string, fragment and trailing slash, and
+    lowercases, so "https://www.linkedin.com/in/Jane-Doe/?utm=x" and
+    "linkedin.com/in/jane-doe" map to the same key.
+    """
+    if not isinstance(url, str) or not url.strip():
+        return ""
+    text = url.strip()
+    if "://" not in text:
+        text = "https://" + text
+    parts = urlsplit(text)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parts.path.rstrip('/')}".lower()
+
+
+class HeyReachIndex:
+    """In-memory HeyReach datasets keyed by normalized profile URL."""
+
+    def __init__(self, client: Any, *, log: Callable[[str], None] = print):
+        self.client = client
+        self.log = log
+        self._lock = threading.Lock()
+        self._conversations: Optional[dict[str, list[dict]]] = None
+        self._campaigns: Optional[dict[str, list[dict]]] = None
+        self._networks: dict[int, dict[str, dict]] = {}
+
+    @property
+    def has_conversations(self) -> bool:
+        return self._conversations is not None
+
+    @property
+    def has_campaigns(self) -> bool:
+        return self._campaigns is not None
+
+    def has_network(self, sender_id: int) -> bool:
+        return sender_id in self._networks
+
+    def load_conversations(self) -> str:
+        """Pull every conversation once and group by lead profile URL."""
+        with self._lock:
+            if self._conversations is not None:
+                return ""
+            by_url: dict[str, list[dict]] = {}
+            count = 0
+            try:
+                for conv in iter_items(
+                    self.client,
+                    "mcp_Heyreach_get_conversations_v2",
+                    {
+                        "linkedInAccountIds": [],
+                        "campaignIds": [],
+                        "searchString": "",
+                        "leadProfileUrl": None,
+                    },
+                ):
+                    profile = conv.get("correspondentProfile")
+                    key = normalize_profile_url(profile.get("profileUrl") if isinstance(profile, dict) else None)
+                    if key:
+                        by_url.setdefault(key, []).append(conv)
+                        count += 1
+            except Exception as e:
+                return f"prefetch conversations error: {e}"
+            self._conversations = by_url
+            self.log(f"[prefetch] conversations={count} leads={len(by_url)}")
+            return ""
+
+    def load_campaigns(self) -> str:
+        """Pull every campaign's lead list once and map leads to their campaigns."""
+        with self._lock:
+            if self._campaigns is not None:
+                return ""
+            by_url: dict[str, list[dict]] = {}
+            try:
+                campaigns = list(iter_items(
+                    self.client,
+                    "mcp_Heyreach_get_all_campaigns",
+                    {"statuses": [], "accountIds": [], "keyword": ""},
+                ))
+                for campaign in campaigns:
+                    campaign_id = campaign.get("id")
+                    if not isinstance(campaign_id, int):
+                        continue
+                    for lead in iter_items(
+                        self.client,
+                        "mcp_Heyreach_get_leads_from_campaign",
+                        {"campaignId": campaign_id, "timeFrom": None, "timeTo": None, "timeFilter": None},
+                        rate_key=f"campaign:{campaign_id}",
+                    ):
+                        key = normalize_profile_url(lead.get("profileUrl"))
+                        if key:
+                            by_url.setdefault(key, []).append(campaign)
+            except Exception as e:
+                return f"prefetch campaigns error: {e}"
+
+            # Newest campaign first, matching get_campaigns_for_lead
+            for lead_campaigns in by_url.values():
+                lead_campaigns.sort(key=lambda c: c.get("creationTime") or "", reverse=True)
+            self._campaigns = by_url
+            self.log(f"[prefetch] campaigns={len(campaigns)} leads={len(by_url)}")
+            return ""
+
+    def load_network(self, sender_id: int) -> str:
+        """Pull a sender's full network once and index it by profile URL."""
+        with self._lock:
+            if sender_id in self._networks:
+                return ""
+            by_url: dict[str, dict] = {}
+            try:
+                for connection in iter_items(
+                    self.client,
+                    "mcp_Heyreach_get_my_network_for_sender",
+                    {"senderId": sender_id},
+                    rate_key=f"sender:{sender_id}",
+                ):
+                    key = normalize_profile_url(connection.get("profileUrl"))
+                    if key:
+                        by_url[key] = connection
+            except Exception as e:
+                return f"prefetch network error (sender {sender_id}): {e}"
+            self._networks[sender_id] = by_url
+            self.log(f"[prefetch] sender={sender_id} connections={len(by_url)}")
+            return ""
+
+    def conversations_for(self, profile_url: str) -> list[dict]:
+        return (self._conversations or {}).get(normalize_profile_url(profile_url), [])
+
+    def campaigns_for(self, profile_url: str) -> list[dict]:
+        return (self._campaigns or {}).get(normalize_profile_url(profile_url), [])
+
+    def connection_for(self, sender_id: int, profile_url: str) -> Optional[dict]:
+        return self._networks.get(sender_id, {}).get(normalize_profile_url(profile_url))
+
+
+_shared_index: Optional[HeyReachIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_index(client: Any) -> HeyReachIndex:
+    """Process-wide index, so all HeyReach integrations in a run share one prefetch."""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = HeyReachIndex(client)
+        return _shared_index
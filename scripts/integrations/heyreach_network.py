@@ -4,7 +4,21 @@ Integration: HeyReach Network Data
 Enriches leads with network relationship data (connections, mutual connections).
 """
 
+from typing import Optional
+
 from .base import Integration
+from .heyreach_index import get_shared_index, normalize_profile_url
+
+
+def _parse_sender_id(value) -> Optional[int]:
+    """HeyReach sender IDs are integers; CSV cells may hold "123", "123.0" or junk."""
+    try:
+        number = float(str(value).strip())
+    except ValueError:
+        return None
+    if not number.is_integer():
+        return None
+    return int(number)
 
 
 class HeyReachNetwork(Integration):
@@ -17,31 +31,65 @@ class HeyReachNetwork(Integration):
         "heyreach_mutual_connections_count"
     ]
 
-    def _enrich(self, row: dict) -> tuple[dict, str]:
-        # Get sender's network
-        result = self.client.execute_tool(
-            "mcp_Heyreach_get_my_network_for_sender",
-            {
-                "senderId": int(row["heyreach_sender_id"]),
-                "limit": 1000,
-                "offset": 0
-            }
-        )
-
-        network = result.get("items", [])
+    def __init__(self):
+        super().__init__()
+        self._index = None
 
-        # Check if lead is in network
+    def prefetch(self, rows: list[dict]) -> str:
+        """Pull each distinct sender's full network once instead of per row."""
+        index = get_shared_index(self.client)
+        sender_ids = set()
+        invalid = set()
+        for r in rows:
+            raw = str(r.get("heyreach_sender_id") or "").strip()
+            if not raw:
+                continue
+            sender_id = _parse_sender_id(raw)
+            if sender_id is None:
+                invalid.add(raw)
+            else:
+                sender_ids.add(sender_id)
+        if invalid:
+            # Those rows fail individually in _enrich; the rest still prefetch
+            index.log(f"[prefetch] skipping invalid heyreach_sender_id values: {', '.join(sorted(invalid))}")
+        for sender_id in sorted(sender_ids):
+            err = index.load_network(sender_id)
+            if err:
+                return err
+        self._index = index
+        return ""
+
+    def _enrich(self, row: dict) -> tuple[dict, str]:
+        sender_id = _parse_sender_id(row["heyreach_sender_id"])
+        if sender_id is None:
+            return {}, f"invalid heyreach_sender_id: {row['heyreach_sender_id']!r}"
         lead_url = row["linkedin_url"]
         is_connection = False
         connection_degree = 3  # Assume 3rd+ degree by default
         mutual_count = 0
 
-        for connection in network:
-            if connection.get("profileUrl") == lead_url:
-                is_connection = True
-                connection_degree = 1
-                mutual_count = connection.get("mutualConnectionsCount", 0)
-                break
+        if self._index is not None and self._index.has_network(sender_id):
+            match = self._index.connection_for(sender_id, lead_url)
+        else:
+            # Get sender's network
+            result = self.client.execute_tool(
+                "mcp_Heyreach_get_my_network_for_sender",
+                {
+                    "senderId": sender_id,
+                    "limit": 1000,
+                    "offset": 0
+                }
+            )
+
+            network = result.get("items", [])
+            lead_key = normalize_profile_url(lead_url)
+            match = next((c for c in network if normalize_profile_url(c.get("profileUrl")) == lead_key), None)
+
+        # Check if lead is in network
+        if match is not None:
+            is_connection = True
+            connection_degree = 1
+            mutual_count = match.get("mutualConnectionsCount", 0)
 
         # If not direct connection, check if 2nd degree (has mutual connections)
         if not is_connection:
@@ -61,3 +109,4 @@ _instance = HeyReachNetwork()
 INPUT_COLS = _instance.input_cols
 OUTPUT_COLS = _instance.output_cols
 enrich = _instance.enrich
+prefetch = _instance.prefetch
@@ -4,19 +4,46 @@ LinkedIn Prospect Monitoring Script
 
 Fetches recent LinkedIn posts from a list of prospects and analyzes them for
 DataGen relevance. Generates a structured markdown report.
+
+Runs are incremental: profiles are fetched concurrently under a shared rate
+limit, and a local SQLite state DB keeps the newest activityDate seen per
+prospect. Only posts newer than that mark are scored and reported. On the
+first run (or with --full) the --days lookback window applies instead.
+
+Usage:
+    python scripts/linkedin_prospect_monitor.py \
+        --prospects data/monitor_linkedin_persons.csv \
+        --output-dir data/linkedin-monitoring --workers 8 --rps 4
 """
 
+import argparse
 import csv
 import json
 import os
-from datetime import datetime, timedelta
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datagen_sdk import DatagenClient
 
+from heyreach_pager import RateLimiter
+from primitives.score_posts import KeywordTiers
+
 
 # Initialize DataGen client
 client = DatagenClient()
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PROSPECTS_CSV = REPO_ROOT / "data" / "monitor_linkedin_persons.csv"
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "data" / "linkedin-monitoring"
+STATE_DB_NAME = "monitor_state.db"
+DEFAULT_WORKERS = 8
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_LOOKBACK_DAYS = 7
+# Cap on names listed under "No Recent Activity" (thousands of quiet prospects are noise)
+MAX_QUIET_PROSPECTS_LISTED = 50
+
 
 def load_prospects(csv_path: str) -> Tuple[List[Dict], str]:
     """Load prospects from CSV file.
@@ -40,12 +67,70 @@ def load_prospects(csv_path: str) -> Tuple[List[Dict], str]:
         return [], f"Failed to load prospects: {e}"
 
 
-def fetch_person_posts(linkedin_url: str) -> Tuple[Optional[Dict], str]:
+def prospect_key(linkedin_url: str) -> str:
+    """State key for a prospect: lowercased profile URL without trailing slash."""
+    return linkedin_url.strip().rstrip('/').lower()
+
+
+class MonitorState:
+    """Newest activityDate seen per prospect, in a local SQLite file."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS prospect_monitor_state (
+                prospect_key TEXT PRIMARY KEY,
+                newest_activity_date TEXT NOT NULL,
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        return conn
+
+    def load(self) -> Tuple[Dict[str, str], str]:
+        """Returns: (prospect_key -> newest activityDate, error_message)"""
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT prospect_key, newest_activity_date FROM prospect_monitor_state"
+                ).fetchall()
+            return dict(rows), ""
+        except Exception as e:
+            return {}, f"Failed to load monitor state: {e}"
+
+    def save(self, marks: Dict[str, str]) -> str:
+        """Upsert marks. Returns: error_message"""
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO prospect_monitor_state (prospect_key, newest_activity_date)
+                    VALUES (?, ?)
+                    ON CONFLICT (prospect_key) DO UPDATE SET
+                        newest_activity_date = excluded.newest_activity_date,
+                        updated_at = datetime('now')
+                    """,
+                    list(marks.items()),
+                )
+            return ""
+        except Exception as e:
+            return f"Failed to save monitor state: {e}"
+
+
+def fetch_person_posts(linkedin_url: str, limiter: Optional[RateLimiter] = None) -> Tuple[Optional[Dict], str]:
     """Fetch posts for a LinkedIn profile.
 
+    Args:
+        limiter: Shared rate limiter when fetching concurrently
+
     Returns: (posts_data, error_message)
     """
     try:
+        if limiter is not None:
+            limiter.acquire()
         result = client.execute_tool(
             "get_linkedin_person_posts",
             {"linkedin_url": linkedin_url}
@@ -55,8 +140,20 @@ def fetch_person_posts(linkedin_url: str) -> Tuple[Optional[Dict], str]:
         return None, f"Failed to fetch posts: {e}"
 
 
-def filter_recent_posts(posts_data: Optional[Dict], days: int = 7) -> List[Dict]:
-    """Filter posts to only those from the last N days (Central Time).
+def parse_activity_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a post activityDate (ISO, with or without timezone) as aware UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # If no timezone info, assume UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def filter_recent_posts(posts_data: Optional[Dict], days: int = DEFAULT_LOOKBACK_DAYS) -> List[Dict]:
+    """Filter posts to only those from the last N days.
 
     Args:
         posts_data: Result from get_linkedin_person_posts
@@ -64,82 +161,143 @@ def filter_recent_posts(posts_data: Optional[Dict], days: int = 7) -> List[Dict]
 
     Returns: List of recent posts
     """
+    posts, _ = select_new_posts(posts_data, None, days=days)
+    return posts
+
+
+def select_new_posts(
+    posts_data: Optional[Dict],
+    mark: Optional[str],
+    days: int = DEFAULT_LOOKBACK_DAYS,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Pick posts not seen by a previous run.
+
+    Args:
+        posts_data: Result from get_linkedin_person_posts
+        mark: Newest activityDate seen for this prospect (None = never seen)
+        days: Lookback window when there is no mark
+
+    Returns: (new_posts, newest_activity_date) - the newest date across all
+        returned posts (or the old mark if nothing newer), for the next run
+    """
     if not posts_data or not posts_data.get('posts'):
-        return []
+        return [], mark
 
-    # Calculate cutoff date (7 days ago from today in Central Time)
-    # Today is 2026-01-23, so cutoff is 2026-01-16
-    # Make cutoff_date timezone-aware (UTC)
-    from datetime import timezone
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    mark_date = parse_activity_date(mark)
+    cutoff_date = mark_date or datetime.now(timezone.utc) - timedelta(days=days)
 
-    recent_posts = []
+    new_posts = []
+    newest_date, newest = mark_date, mark
     for post in posts_data['posts']:
-        if not post.get('activityDate'):
+        post_date_str = post.get('activityDate')
+        post_date = parse_activity_date(post_date_str)
+        if post_date is None:
+            if post_date_str:
+                print(f"Warning: Could not parse date '{post_date_str}'")
             continue
+        if newest_date is None or post_date > newest_date:
+            newest_date, newest = post_date, post_date_str
+        # A marked prospect's post must be strictly newer than the mark
+        if post_date > cutoff_date or (mark_date is None and post_date == cutoff_date):
+            new_posts.append(post)
 
-        # Parse ISO datetime string
-        post_date_str = post['activityDate']
-        try:
-            # Handle ISO format with timezone
-            if 'T' in post_date_str:
-                post_date = datetime.fromisoformat(post_date_str.replace('Z', '+00:00'))
-            else:
-                post_date = datetime.fromisoformat(post_date_str)
-                # If no timezone info, assume UTC
-                if post_date.tzinfo is None:
-                    post_date = post_date.replace(tzinfo=timezone.utc)
+    return new_posts, newest
 
-            if post_date >= cutoff_date:
-                recent_posts.append(post)
-        except Exception as e:
-            print(f"Warning: Could not parse date '{post_date_str}': {e}")
-            continue
 
-    return recent_posts
+def monitor_prospect(
+    prospect: Dict,
+    mark: Optional[str],
+    limiter: Optional[RateLimiter] = None,
+    days: int = DEFAULT_LOOKBACK_DAYS,
+) -> Dict:
+    """Fetch one prospect's posts, keep the new ones and score them.
+
+    Returns: result dict (name, linkedin_url, posts, error, newest_activity_date)
+    """
+    posts_data, err = fetch_person_posts(prospect['linkedin_url'], limiter)
+    if err:
+        return {
+            'name': prospect['name'],
+            'linkedin_url': prospect['linkedin_url'],
+            'posts': [],
+            'error': err,
+            'newest_activity_date': mark,
+        }
+
+    new_posts, newest = select_new_posts(posts_data, mark, days=days)
+
+    # Score each new post for relevance
+    score_posts_relevance(new_posts)
+
+    return {
+        'name': prospect['name'],
+        'linkedin_url': prospect['linkedin_url'],
+        'posts': new_posts,
+        'error': None,
+        'newest_activity_date': newest,
+    }
 
 
-def score_relevance(post: Dict) -> Tuple[str, str, str]:
-    """Analyze a post for DataGen relevance.
+def monitor_prospects(
+    prospects: List[Dict],
+    marks: Dict[str, str],
+    workers: int = DEFAULT_WORKERS,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    days: int = DEFAULT_LOOKBACK_DAYS,
+) -> List[Dict]:
+    """Monitor prospects concurrently under one rate limit.
 
-    Returns: (relevance_score, why_relevant, outreach_angle)
+    Returns: results in prospect order
     """
-    text = post.get('text', '').lower()
-
+    limiter = RateLimiter(requests_per_second)
+    results: List[Optional[Dict]] = [None] * len(prospects)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(monitor_prospect, prospect, marks.get(prospect_key(prospect['linkedin_url'])), limiter, days): i
+            for i, prospect in enumerate(prospects)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            result = future.result()
+            results[i] = result
+            status = f"✗ {result['error']}" if result['error'] else f"✓ {len(result['posts'])} new posts"
+            print(f"  [{done}/{len(prospects)}] {result['name']}... {status}")
+    return results
+
+
+# DataGen relevance keywords, first matching tier wins
+DATAGEN_KEYWORD_TIERS = KeywordTiers({
     # High relevance keywords
-    high_keywords = [
+    "High": [
         'data automation', 'ai agent', 'workflow automation', 'crm data',
         'data quality', 'lead enrichment', 'prospecting', 'python',
         'data pipeline', 'manual data', 'data hygiene'
-    ]
-
+    ],
     # Medium relevance keywords
-    medium_keywords = [
+    "Medium": [
         'sales automation', 'marketing automation', 'revops', 'gtm',
         'data integration', 'tool stack', 'sales ops', 'sales operations'
-    ]
-
+    ],
     # Low relevance keywords
-    low_keywords = [
+    "Low": [
         'ai', 'automation', 'technology', 'saas', 'b2b', 'sales', 'marketing'
-    ]
+    ],
+})
 
-    # Check for keyword matches
-    high_matches = [kw for kw in high_keywords if kw in text]
-    medium_matches = [kw for kw in medium_keywords if kw in text]
-    low_matches = [kw for kw in low_keywords if kw in text]
 
-    if high_matches:
+def describe_relevance(tier: str, matches: List[str]) -> Tuple[str, str, str]:
+    """Turn a keyword tier match into (relevance_score, why_relevant, outreach_angle)."""
+    if tier == "High":
         relevance = "High"
-        why = f"Directly discusses DataGen-relevant topics: {', '.join(high_matches)}"
-        angle = f"Reference their post about {high_matches[0]} and show how DataGen addresses this"
-    elif medium_matches:
+        why = f"Directly discusses DataGen-relevant topics: {', '.join(matches)}"
+        angle = f"Reference their post about {matches[0]} and show how DataGen addresses this"
+    elif tier == "Medium":
         relevance = "Medium"
-        why = f"Adjacent to DataGen value prop: {', '.join(medium_matches)}"
-        angle = f"Connect their interest in {medium_matches[0]} to DataGen's capabilities"
-    elif low_matches:
+        why = f"Adjacent to DataGen value prop: {', '.join(matches)}"
+        angle = f"Connect their interest in {matches[0]} to DataGen's capabilities"
+    elif tier == "Low":
         relevance = "Low"
-        why = f"Tangentially related: {', '.join(low_matches)}"
+        why = f"Tangentially related: {', '.join(matches)}"
         angle = "General conversation starter about AI/automation trends"
     else:
         relevance = "Low"
@@ -149,12 +307,38 @@ def score_relevance(post: Dict) -> Tuple[str, str, str]:
     return relevance, why, angle
 
 
-def generate_report(prospects: List[Dict], results: List[Dict], output_path: str) -> Tuple[bool, str]:
+def score_relevance(post: Dict) -> Tuple[str, str, str]:
+    """Analyze a post for DataGen relevance.
+
+    Returns: (relevance_score, why_relevant, outreach_angle)
+    """
+    return describe_relevance(*DATAGEN_KEYWORD_TIERS.classify(post.get('text', '')))
+
+
+def score_posts_relevance(posts: List[Dict]) -> None:
+    """Set relevance, why_relevant and outreach_angle on every post (one batch pass)."""
+    tiers = DATAGEN_KEYWORD_TIERS.classify_batch(post.get('text', '') for post in posts)
+    for post, (tier, matches) in zip(posts, tiers):
+        post['relevance'], post['why_relevant'], post['outreach_angle'] = describe_relevance(tier, matches)
+
+
+def generate_report(
+    prospects: List[Dict],
+    results: List[Dict],
+    output_path: str,
+    report_date: Optional[datetime] = None,
+) -> Tuple[bool, str]:
     """Generate markdown report.
 
+    Args:
+        report_date: Date shown in the report (default: today)
+
     Returns: (success, error_message)
     """
     try:
+        report_date = report_date or datetime.now(timezone.utc)
+        day = report_date.strftime("%Y-%m-%d")
+
         # Calculate summary stats
         total_prospects = len(prospects)
         total_posts = sum(len(r['posts']) for r in results)
@@ -191,17 +375,17 @@ def generate_report(prospects: List[Dict], results: List[Dict], output_path: str
         # Generate report content
         report_lines = [
             "---",
-            f'title: "LinkedIn Prospect Activity - 2026-01-23"',
+            f'title: "LinkedIn Prospect Activity - {day}"',
             'description: "Daily monitoring of prospect LinkedIn posts"',
             'category: "linkedin"',
             'tags: ["prospect-monitoring", "linkedin", "competitive-intelligence"]',
-            'created: 2026-01-23',
-            'updated: 2026-01-23',
+            f'created: {day}',
+            f'updated: {day}',
             'status: "active"',
             'priority: "medium"',
             "---",
             "",
-            "# LinkedIn Prospect Activity - January 23, 2026",
+            f"# LinkedIn Prospect Activity - {report_date.strftime('%B %d, %Y')}",
             "",
             "## Summary",
             f"- **Total Prospects Monitored**: {total_prospects}",
@@ -242,8 +426,10 @@ def generate_report(prospects: List[Dict], results: List[Dict], output_path: str
                 "## Prospects with No Recent Activity",
                 ""
             ])
-            for name in no_activity:
+            for name in no_activity[:MAX_QUIET_PROSPECTS_LISTED]:
                 report_lines.append(f"- {name}")
+            if len(no_activity) > MAX_QUIET_PROSPECTS_LISTED:
+                report_lines.append(f"- ... and {len(no_activity) - MAX_QUIET_PROSPECTS_LISTED} more")
             report_lines.append("")
 
         # Recommendations
@@ -261,6 +447,7 @@ def generate_report(prospects: List[Dict], results: List[Dict], output_path: str
             report_lines.append(f"3. **Monitor**: Track {len(no_activity)} quiet prospects for future activity")
 
         # Write report
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'w') as f:
             f.write('\n'.join(report_lines))
 
@@ -354,12 +541,31 @@ def extract_topic(text: str) -> str:
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Monitor prospects' LinkedIn posts for DataGen relevance")
+    parser.add_argument("--prospects", type=Path, default=DEFAULT_PROSPECTS_CSV,
+                        help="Prospects CSV (linkedin_url, first_name, last_name)")
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR,
+                        help="Report directory (report: YYYY-MM-DD-prospect-activity.md)")
+    parser.add_argument("--output", type=Path, help="Exact report path (overrides --output-dir)")
+    parser.add_argument("--state-db", type=Path,
+                        help=f"State DB with the newest post seen per prospect (default: <output-dir>/{STATE_DB_NAME})")
+    parser.add_argument("--days", type=int, default=DEFAULT_LOOKBACK_DAYS,
+                        help="Lookback window for prospects without state (default: 7)")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore saved state and report every post in the lookback window")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent profile fetches")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help="Max profile fetches per second across workers")
+    args = parser.parse_args()
+
     print("LinkedIn Prospect Monitoring Script")
     print("=" * 50)
 
     # Paths
-    csv_path = "/Users/yu-shengkuo/projects/datagendev/agent-native-prototype/data/monitor_linkedin_persons.csv"
-    output_path = "/Users/yu-shengkuo/projects/datagendev/agent-native-prototype/data/linkedin-monitoring/2026-01-23-prospect-activity.md"
+    csv_path = args.prospects
+    today = datetime.now(timezone.utc)
+    output_path = args.output or args.output_dir / f"{today.strftime('%Y-%m-%d')}-prospect-activity.md"
+    state = MonitorState(args.state_db or args.output_dir / STATE_DB_NAME)
 
     # Step 1: Load prospects
     print(f"\nStep 1: Loading prospects from {csv_path}")
@@ -369,63 +575,50 @@ def main():
         return
     print(f"✓ Loaded {len(prospects)} prospects")
 
-    # Step 2: Fetch posts for each prospect
-    print("\nStep 2: Fetching LinkedIn posts...")
-    results = []
-
-    for i, prospect in enumerate(prospects, 1):
-        print(f"  [{i}/{len(prospects)}] {prospect['name']}...", end=" ")
-
-        posts_data, err = fetch_person_posts(prospect['linkedin_url'])
+    marks: Dict[str, str] = {}
+    if not args.full:
+        marks, err = state.load()
         if err:
-            print(f"✗ {err}")
-            results.append({
-                'name': prospect['name'],
-                'linkedin_url': prospect['linkedin_url'],
-                'posts': [],
-                'error': err
-            })
-            continue
-
-        # Filter to recent posts (last 7 days)
-        recent_posts = filter_recent_posts(posts_data, days=7)
-        print(f"✓ Found {len(recent_posts)} recent posts")
+            print(f"ERROR: {err}")
+            return
+        print(f"✓ State: {len(marks)} prospects seen before ({state.db_path})")
 
-        # Score each post for relevance
-        scored_posts = []
-        for post in recent_posts:
-            relevance, why_relevant, outreach_angle = score_relevance(post)
-            post['relevance'] = relevance
-            post['why_relevant'] = why_relevant
-            post['outreach_angle'] = outreach_angle
-            scored_posts.append(post)
-
-        results.append({
-            'name': prospect['name'],
-            'linkedin_url': prospect['linkedin_url'],
-            'posts': scored_posts,
-            'error': None
-        })
+    # Step 2: Fetch posts concurrently; only posts newer than each prospect's mark are scored
+    print(f"\nStep 2: Fetching LinkedIn posts ({args.workers} workers, {args.rps:g}/s)...")
+    results = monitor_prospects(prospects, marks, workers=args.workers, requests_per_second=args.rps, days=args.days)
 
     # Step 3: Generate report
     print(f"\nStep 3: Generating report...")
-    success, err = generate_report(prospects, results, output_path)
+    success, err = generate_report(prospects, results, str(output_path), report_date=today)
     if err:
         print(f"ERROR: {err}")
         return
 
     print(f"✓ Report generated: {output_path}")
 
+    # Advance marks only once the report holds the new posts
+    new_marks = {
+        prospect_key(r['linkedin_url']): r['newest_activity_date']
+        for r in results
+        if not r['error'] and r['newest_activity_date']
+        and r['newest_activity_date'] != marks.get(prospect_key(r['linkedin_url']))
+    }
+    err = state.save(new_marks)
+    if err:
+        print(f"WARNING: {err}")
+
     # Summary
     total_posts = sum(len(r['posts']) for r in results)
     high_relevance_count = sum(1 for r in results for p in r['posts'] if p.get('relevance') == 'High')
     medium_relevance_count = sum(1 for r in results for p in r['posts'] if p.get('relevance') == 'Medium')
+    error_count = sum(1 for r in results if r['error'])
 
     print("\n" + "=" * 50)
     print("SUMMARY")
     print("=" * 50)
     print(f"Total prospects monitored: {len(prospects)}")
-    print(f"Total posts found: {total_posts}")
+    print(f"Fetch errors: {error_count}")
+    print(f"New posts found: {total_posts}")
     print(f"High relevance posts: {high_relevance_count}")
     print(f"Medium relevance posts: {medium_relevance_count}")
     print(f"\nNext step: Review {output_path} for insights and outreach opportunities")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Meeting-signal detection shared by the HeyReach analytics scripts.
+
+One keyword list and one compiled matcher for every place that flags a
+conversation as "meeting booked / meeting likely" (campaign reports, the
+summary digest, the engagement integration), so their numbers agree.
+
+The keywords are folded into a single case-insensitive alternation regex, so
+a text is scanned once regardless of how many keywords there are, instead of
+once per keyword. Matching is substring-based, as before ("call" also
+matches "callback").
+
+Usage:
+    from meeting_signals import has_meeting_signal, messages_have_meeting_signal
+
+    has_meeting_signal("Happy to book a call")              # True
+    messages_have_meeting_signal(conv["messages"])          # any message body
+    MEETING_MATCHER.search_many([body1, body2, ...])        # [bool, ...]
+"""
+
+import re
+from typing import Iterable, Optional
+
+# Union of the lists previously kept in calculate_metrics, compile_digest,
+# heyreach_campaign_report and the heyreach_engagement integration.
+MEETING_KEYWORDS: tuple[str, ...] = (
+    "book",
+    "calendar",
+    "meeting",
+    "schedule",
+    "call",
+    "zoom",
+    "calendly",
+    "available",
+    "time slot",
+    "appointment",
+    "confirm",
+    "yes please",
+    "let's talk",
+    "lets talk",
+    "demo",
+    "walkthrough",
+    "15 min",
+    "30 min",
+    "quick chat",
+)
+
+
+class KeywordMatcher:
+    """Case-insensitive substring matcher for a fixed keyword list."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+        if not self.keywords:
+            raise ValueError("KeywordMatcher needs at least one keyword")
+        # Longest first so find_all reports "time slot" rather than a shorter prefix
+        alternation = "|".join(re.escape(k) for k in sorted(self.keywords, key=len, reverse=True))
+        self._pattern = re.compile(alternation, re.IGNORECASE)
+
+    def search(self, text: Optional[str]) -> bool:
+        """True if text contains any keyword."""
+        return bool(text) and self._pattern.search(text) is not None
+
+    def search_many(self, texts: Iterable[Optional[str]]) -> list[bool]:
+        """search() over a batch of texts."""
+        search = self._pattern.search
+        return [bool(t) and search(t) is not None for t in texts]
+
+    def search_any(self, texts: Iterable[Optional[str]]) -> bool:
+        """True if any text contains a keyword (one scan over the joined texts)."""
+        # Newline-joined: no keyword contains "\n", so matches can't span texts
+        return self._pattern.search("\n".join(t for t in texts if isinstance(t, str))) is not None
+
+    def find_all(self, text: Optional[str]) -> list[str]:
+        """Distinct keywords found in text, lowercased, in order of first match."""
+        if not text:
+            return []
+        return list(dict.fromkeys(m.group(0).lower() for m in self._pattern.finditer(text)))
+
+
+MEETING_MATCHER = KeywordMatcher(MEETING_KEYWORDS)
+
+
+def has_meeting_signal(text: Optional[str]) -> bool:
+    """Check if message text contains meeting-related keywords."""
+    return MEETING_MATCHER.search(text)
+
+
+def messages_have_meeting_signal(messages: Iterable[dict], sender: Optional[str] = None) -> bool:
+    """
+    Check a conversation's messages for meeting keywords.
+
+    Args:
+        messages: HeyReach message dicts (uses "body" and "sender")
+        sender: Only consider messages from this sender (e.g. "CORRESPONDENT")
+
+    Returns:
+        True if any considered message body contains a keyword
+    """
+    return MEETING_MATCHER.search_any(
+        m.get("body") for m in messages
+        if isinstance(m, dict) and (sender is None or m.get("sender") == sender)
+    )
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Message rendering for campaign scripts: compiled templates, concurrent LLM
+personalization with a cache, and one batched Neon write-back.
+
+- MessageTemplate parses a str.format-style template once into a %-format
+  string plus its field order. render_many() builds one column per field
+  and renders every prospect in a single pass, without re-parsing the
+  template per prospect.
+- extract_first_name / clean_name strip emoji and pictographs from LinkedIn
+  display names with one precompiled regex (any emoji, not only a few
+  hardcoded ones).
+- LLMPersonalizer rewrites the rendered messages concurrently on a thread
+  pool. Results are cached in SQLite, keyed by a hash of the prospect's
+  profile fields, the base message, the model and the instructions. Reruns
+  only call the LLM for new or changed prospects. The OpenAI SDK is
+  optional: without it (or without OPENAI_API_KEY), personalization
+  reports an error and callers keep the template message.
+- save_messages_to_neon writes every message back to the campaign table in
+  multi-row UPDATE ... FROM (VALUES ...) statements, sent in one
+  transaction.
+
+Usage:
+    from message_renderer import MessageTemplate, prospect_values, save_messages_to_neon
+
+    template = MessageTemplate("Hi {first_name}, ...")
+    messages = template.render_many([prospect_values(p) for p in prospects])
+    updated, err = save_messages_to_neon(neon, CAMPAIGN_TABLE, zip(entry_ids, messages))
+
+Error-first pattern: functions that can fail return (result, error).
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+
+from neon_client import NeonClient, NeonSQLError, render
+
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_WORKERS = 8
+DEFAULT_RETRIES = 2
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "messages" / "message_cache.db"
+DEFAULT_UPDATE_CHUNK_SIZE = 1000
+
+# Prospect fields that make up the personalization cache key
+PROFILE_FIELDS = ("name", "linkedin_url", "headline", "company", "comment_text")
+
+DEFAULT_INSTRUCTIONS = """You personalize LinkedIn outreach messages.
+Rewrite the message below for this prospect, using their headline, company
+and comment only where it reads naturally. Keep the same offer, tone, length
+and sign-off. Do not invent facts. Reply with the message text only."""
+
+# Emoji, pictographs, dingbats, flags, joiners and variation selectors that
+# show up in LinkedIn display names ("🦾", "👨‍💻", "🪄", ...)
+_NAME_DECORATION_RE = re.compile(
+    "["
+    "\U0001F000-\U0001FAFF"
+    "\u2600-\u27BF"
+    "\u2B00-\u2BFF"
+    "\u200D\uFE0E\uFE0F"
+    "\U000E0000-\U000E007F"
+    "]+"
+)
+
+
+def clean_name(full_name: Optional[str]) -> str:
+    """Display name without emoji decorations, whitespace collapsed."""
+    if not full_name:
+        return ""
+    return " ".join(_NAME_DECORATION_RE.sub(" ", full_name).split())
+
+
+def extract_first_name(full_name: Optional[str], default: str = "there") -> str:
+    """Extract first name from full name, handling emojis."""
+    parts = clean_name(full_name).split(" ", 1)
+    return parts[0] or default
+
+
+def split_name(full_name: Optional[str]) -> tuple[str, str]:
+    """(first, last) from a display name; last is everything after the first word."""
+    parts = clean_name(full_name).split(" ", 1)
+    return parts[0], parts[1] if len(parts) > 1 else ""
+
+
+def prospect_values(prospect: Mapping[str, Any]) -> dict:
+    """Template values for a prospect: its fields plus first_name."""
+    values = dict(prospect)
+    values["first_name"] = extract_first_name(prospect.get("name"))
+    return values
+
+
+class MessageTemplate:
+    """A str.format-style template ({field} placeholders), parsed once."""
+
+    def __init__(self, template: str):
+        self.template = template
+        format_parts = []
+        order = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            format_parts.append(literal.replace("%", "%%"))
+            if field_name is None:
+                continue
+            if not field_name.isidentifier() or format_spec or conversion:
+                raise ValueError(f"unsupported placeholder {{{field_name}}}: use plain {{name}} fields")
+            format_parts.append("%s")
+            order.append(field_name)
+        self._format = "".join(format_parts)
+        self._order = tuple(order)
+        self.fields = tuple(dict.fromkeys(order))
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Render one message (None renders as empty; a missing field raises KeyError)."""
+        return self._format % tuple("" if values[f] is None else values[f] for f in self._order)
+
+    def render_many(self, rows: Sequence[Mapping[str, Any]]) -> list[str]:
+        """Render a message per row in one pass over per-field columns."""
+        if not self._order:
+            return [self._format % () for _ in rows]
+        columns = {
+            f: ["" if row[f] is None else row[f] for row in rows]
+            for f in self.fields
+        }
+        fmt = self._format
+        return [fmt % values for values in zip(*(columns[f] for f in self._order))]
+
+
+def profile_hash(prospect: Mapping[str, Any], fields: Sequence[str] = PROFILE_FIELDS) -> str:
+    """Hash of the prospect fields that drive personalization."""
+    profile = {f: prospect.get(f) for f in fields}
+    canonical = json.dumps(profile, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MessageCache:
+    """Personalized messages by cache key, in a SQLite file (safe across threads)."""
+
+    def __init__(self, db_path: Path = DEFAULT_CACHE_PATH):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS message_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    message TEXT NOT NULL,
+                    model TEXT,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            self._conn.commit()
+        return self._conn
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, str]:
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, str] = {}
+        with self._lock:
+            conn = self._connect()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(conn.execute(
+                    f"SELECT cache_key, message FROM message_cache WHERE cache_key IN ({placeholders})", chunk
+                ).fetchall())
+        return found
+
+    def put(self, key: str, message: str, model: str = "") -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO message_cache (cache_key, message, model, created_at) VALUES (?, ?, ?, ?)",
+                (key, message, model, datetime.now(timezone.utc).isoformat()),
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class LLMPersonalizer:
+    """Concurrent, cached LLM rewrites of rendered template messages."""
+
+    def __init__(
+        self,
+        *,
+        model: str = DEFAULT_MODEL,
+        instructions: str = DEFAULT_INSTRUCTIONS,
+        cache: Optional[MessageCache] = None,
+        workers: int = DEFAULT_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        complete: Optional[Callable[[str, str], str]] = None,
+    ):
+        """
+        Initialize LLMPersonalizer.
+
+        Args:
+            model: Chat model name
+            instructions: System prompt for the rewrite
+            cache: Message cache (None disables caching)
+            workers: LLM calls in flight at once
+            retries: Retries per prospect when the call raises
+            complete: Custom completion function complete(system, user) -> text
+                (default: OpenAI chat completions, needs OPENAI_API_KEY)
+        """
+        self.model = model
+        self.instructions = instructions
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.retries = retries
+        self._complete = complete
+        self._openai = None
+
+    def _default_complete(self, system: str, user: str) -> str:
+        if self._openai is None:
+            self._openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        response = self._openai.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+        )
+        return response.choices[0].message.content or ""
+
+    def available(self) -> tuple[bool, str]:
+        """Whether personalization can run (custom complete, or OpenAI SDK + key)."""
+        if self._complete is not None:
+            return True, ""
+        if not OPENAI_AVAILABLE:
+            return False, "openai package not installed"
+        if not os.getenv("OPENAI_API_KEY"):
+            return False, "OPENAI_API_KEY not set in .env"
+        return True, ""
+
+    def cache_key(self, prospect: Mapping[str, Any], base_message: str) -> str:
+        parts = [self.model, self.instructions, base_message, profile_hash(prospect)]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _prompt(prospect: Mapping[str, Any], base_message: str) -> str:
+        comment = (prospect.get("comment_text") or "")[:500]
+        return (
+            f"Prospect: {prospect.get('name') or ''}\n"
+            f"Headline: {prospect.get('headline') or ''}\n"
+            f"Company: {prospect.get('company') or ''}\n"
+            f"Their comment: {comment}\n\n"
+            f"Message:\n{base_message}"
+        )
+
+    def _personalize_one(self, prospect: Mapping[str, Any], base_message: str) -> tuple[str, str]:
+        complete = self._complete or self._default_complete
+        last_error = ""
+        for _ in range(self.retries + 1):
+            try:
+                text = complete(self.instructions, self._prompt(prospect, base_message)).strip()
+                if text:
+                    return text, ""
+                last_error = "empty completion"
+            except Exception as e:
+                last_error = str(e)[:200]
+        return "", last_error
+
+    def personalize_many(
+        self,
+        prospects: Sequence[Mapping[str, Any]],
+        base_messages: Sequence[str],
+    ) -> tuple[list[str], list[str]]:
+        """
+        Personalize every base message, from cache where possible.
+
+        Returns:
+            (messages, errors): messages align with prospects; a prospect whose
+            LLM call failed keeps its base message and gets an entry in errors
+        """
+        messages = list(base_messages)
+        ok, err = self.available()
+        if not ok:
+            return messages, [f"personalization skipped: {err}"]
+
+        keys = [self.cache_key(p, m) for p, m in zip(prospects, base_messages)]
+        cached = self.cache.get_many(keys) if self.cache is not None else {}
+
+        # One LLM call per distinct key (identical prospects share a result)
+        todo: dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if key in cached:
+                messages[i] = cached[key]
+            else:
+                todo.setdefault(key, i)
+
+        errors = []
+        results: dict[str, str] = {}
+        if todo:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(todo)), thread_name_prefix="personalize") as pool:
+                futures = {
+                    key: pool.submit(self._personalize_one, prospects[i], base_messages[i])
+                    for key, i in todo.items()
+                }
+                for key, future in futures.items():
+                    text, call_err = future.result()
+                    if call_err:
+                        name = prospects[todo[key]].get("name") or prospects[todo[key]].get("linkedin_url")
+                        errors.append(f"{name}: {call_err}")
+                        continue
+                    results[key] = text
+                    if self.cache is not None:
+                        self.cache.put(key, text, self.model)
+
+        for i, key in enumerate(keys):
+            if key in results:
+                messages[i] = results[key]
+        return messages, errors
+
+
+def message_update_sql(table: str, rows: Sequence[tuple[Any, str]], id_column: str = "id") -> str:
+    """One multi-row UPDATE setting message (and message_generated_at) by id."""
+    values = ",\n        ".join(render("(%s, %s)", [row_id, message]) for row_id, message in rows)
+    return f"""
+    UPDATE {table} AS t
+    SET message = v.message,
+        message_generated_at = NOW()
+    FROM (VALUES
+        {values}
+    ) AS v(id, message)
+    WHERE t.{id_column} = v.id;
+    """
+
+
+def save_messages_to_neon(
+    neon: NeonClient,
+    table: str,
+    rows: Iterable[tuple[Any, str]],
+    *,
+    id_column: str = "id",
+    chunk_size: int = DEFAULT_UPDATE_CHUNK_SIZE,
+) -> tuple[int, str]:
+    """
+    Write generated messages to a campaign table.
+
+    Adds message / message_generated_at columns if the table lacks them,
+    then updates rows with multi-row UPDATE ... FROM (VALUES ...) statements
+    of up to chunk_size rows each. Statements go through
+    NeonClient.execute_many, which commits one transaction per batch
+    (batch_max_statements / batch_max_chars), so a large write can span
+    several transactions. Each UPDATE applies fully or not at all; after a
+    failure, batches that already committed stay written.
+
+    Args:
+        neon: NeonClient
+        table: Campaign table name
+        rows: (row id, message) pairs
+        id_column: Column the ids refer to
+        chunk_size: Rows per UPDATE statement
+
+    Returns:
+        (rows_written, error): rows_written counts rows actually committed,
+        also when error is set
+    """
+    rows = [(row_id, message) for row_id, message in rows if row_id is not None]
+    if not rows:
+        return 0, ""
+    statements = [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS message TEXT, "
+        f"ADD COLUMN IF NOT EXISTS message_generated_at TIMESTAMPTZ"
+    ]
+    statements += [
+        message_update_sql(table, rows[start:start + chunk_size], id_column)
+        for start in range(0, len(rows), chunk_size)
+    ]
+    # Rows per statement (the ALTER writes none)
+    statement_rows = [0] + [len(rows[start:start + chunk_size]) for start in range(0, len(rows), chunk_size)]
+    try:
+        neon.execute_many(statements)
+    except NeonSQLError as e:
+        return sum(statement_rows[:e.committed]), f"Failed to save messages to {table}: {e}"
+    return len(rows), ""
@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+Shared Neon SQL client for scripts that talk to Neon through DataGen MCP tools.
+
+Replaces the per-script `_run_sql` wrappers and hand-built `_sql_quote` /
+`_sql_jsonb` literals:
+
+- Parameter binding: %s / %(name)s placeholders are rendered client-side as
+  typed SQL literals (the MCP tools only accept SQL text), so values never
+  need manual quoting. Use Json / Array / Identifier / Raw for explicit types.
+- Batching: execute_many() and batch() group statements into one transaction
+  per round trip (mcp_Neon_run_sql_transaction), chunked by statement count
+  and SQL size. try_execute_many() reruns a failed chunk statement by
+  statement, so one bad row doesn't fail the rest.
+- Retries: transient failures (timeouts, dropped connections, 429/5xx) are
+  retried with exponential backoff and full jitter. Writes are only retried
+  when the request provably never ran (connection refused, rate limited),
+  since a timed-out write may have committed; pass retry=True for
+  idempotent writes (upserts, UPDATE ... SET to fixed values).
+- Metrics: latency, statement count and attempts are recorded per round trip
+  (summary(), format_summary()).
+- Local stand-in: set NEON_LOCAL_DSN=postgresql://... (or pass
+  LocalPostgresClient) to run the same calls against a local Postgres, e.g.
+  in tests. Requires psycopg 3 (optional dependency).
+
+Usage:
+    from neon_client import NeonClient, Json
+
+    neon = NeonClient()
+    rows = neon.query("SELECT id FROM campaigns WHERE name = %s", [name])
+
+    with neon.batch() as batch:
+        for row in rows_to_update:
+            batch.add("UPDATE t SET data = %s WHERE id = %s", [Json(row.data), row.id])
+
+    print(neon.format_summary())
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Mapping, Optional, Sequence, Union
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    PSYCOPG_AVAILABLE = True
+except ImportError:
+    PSYCOPG_AVAILABLE = False
+
+
+DEFAULT_PROJECT_ID = "blue-tree-25780810"
+DEFAULT_BRANCH_ID = "br-cool-leaf-afau0ra8"
+DEFAULT_DATABASE = "neondb"
+
+RUN_SQL_TOOL = "mcp_Neon_run_sql"
+RUN_SQL_TRANSACTION_TOOL = "mcp_Neon_run_sql_transaction"
+
+DEFAULT_RETRIES = 3
+DEFAULT_BATCH_MAX_STATEMENTS = 100
+DEFAULT_BATCH_MAX_CHARS = 1_000_000
+
+Params = Optional[Union[Sequence[Any], Mapping[str, Any]]]
+Statement = Union[str, tuple[str, Params]]
+
+
+class NeonSQLError(RuntimeError):
+    """A Neon call failed (after retries, for transient errors)."""
+
+    # Set by execute_many: statements committed (in earlier chunks) before the failure
+    committed: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Parameter binding
+# ---------------------------------------------------------------------------
+
+class Json:
+    """Bind a value as jsonb."""
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class Array:
+    """Bind a sequence as a typed Postgres array (e.g. Array(ids, "bigint"))."""
+
+    def __init__(self, values: Iterable[Any], element_type: str = "text"):
+        self.values = list(values)
+        self.element_type = element_type
+
+
+class Identifier:
+    """Bind a (possibly schema-qualified) table or column name."""
+
+    def __init__(self, *parts: str):
+        self.parts = parts
+
+
+class Raw:
+    """Insert SQL text verbatim (already-rendered fragments, e.g. VALUES lists)."""
+
+    def __init__(self, sql: str):
+        self.sql = sql
+
+
+def quote_text(text: str) -> str:
+    """Quote a string as a SQL literal."""
+    return "'" + text.replace("'", "''") + "'"
+
+
+def sql_literal(value: Any) -> str:
+    """
+    Render a Python value as a SQL literal.
+
+    None -> NULL, bool -> TRUE/FALSE, numbers as-is, str quoted,
+    datetime/date -> timestamptz/date, dict -> jsonb, list/tuple -> ARRAY,
+    plus the Json / Array / Identifier / Raw wrappers.
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, Raw):
+        return value.sql
+    if isinstance(value, Identifier):
+        return ".".join('"' + p.replace('"', '""') + '"' for p in value.parts)
+    if isinstance(value, Json):
+        return f"{quote_text(json.dumps(value.value, ensure_ascii=False, default=str))}::jsonb"
+    if isinstance(value, Array):
+        return f"ARRAY[{', '.join(sql_literal(v) for v in value.values)}]::{value.element_type}[]"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if value != value or value in (float("inf"), float("-inf")):
+            return f"'{value}'::float8"
+        return repr(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return f"{quote_text(value.isoformat())}::timestamptz"
+    if isinstance(value, date):
+        return f"{quote_text(value.isoformat())}::date"
+    if isinstance(value, dict):
+        return sql_literal(Json(value))
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return "'{}'"
+        return f"ARRAY[{', '.join(sql_literal(v) for v in value)}]"
+    return quote_text(str(value))
+
+
+_PLACEHOLDER_RE = re.compile(r"%(?:\((\w+)\))?s|%%")
+
+
+def render(sql: str, params: Params = None) -> str:
+    """
+    Bind params into sql (psycopg-style placeholders).
+
+    Positional: "... WHERE id = %s", [42]. Named: "... WHERE id = %(id)s",
+    {"id": 42}. With params, a literal % must be written %%; without params
+    the SQL is returned unchanged.
+
+    Raises:
+        ValueError: Placeholder/param count or names don't match
+    """
+    if params is None:
+        return sql
+
+    positional = not isinstance(params, Mapping)
+    values = iter(params) if positional else None
+    used = 0
+
+    def _substitute(match: "re.Match[str]") -> str:
+        nonlocal used
+        if match.group(0) == "%%":
+            return "%"
+        name = match.group(1)
+        if positional:
+            if name is not None:
+                raise ValueError(f"named placeholder %({name})s used with positional params")
+            try:
+                value = next(values)
+            except StopIteration:
+                raise ValueError("not enough params for placeholders") from None
+        else:
+            if name is None:
+                raise ValueError("positional placeholder %s used with named params")
+            if name not in params:
+                raise ValueError(f"missing param: {name}")
+            value = params[name]
+        used += 1
+        return sql_literal(value)
+
+    rendered = _PLACEHOLDER_RE.sub(_substitute, sql)
+    if positional and used != len(params):
+        raise ValueError(f"{len(params)} params for {used} placeholders")
+    return rendered
+
+
+def _render_statement(statement: Statement) -> str:
+    if isinstance(statement, tuple):
+        sql, params = statement
+        return render(sql, params)
+    return statement
+
+
+# ---------------------------------------------------------------------------
+# Results, retries and metrics
+# ---------------------------------------------------------------------------
+
+def result_rows(result: Any) -> list[dict]:
+    """
+    Rows of a single-statement result.
+
+    The MCP tool answers either [[row, ...]] (per-statement) or [row, ...];
+    both are accepted.
+    """
+    if isinstance(result, dict):
+        rows = result.get("rows")
+        return [r for r in rows if isinstance(r, dict)] if isinstance(rows, list) else []
+    if not isinstance(result, list) or not result:
+        return []
+    if isinstance(result[0], list):
+        return [r for r in result[0] if isinstance(r, dict)]
+    return [r for r in result if isinstance(r, dict)]
+
+
+def _transaction_rows(result: Any, count: int) -> list[list[dict]]:
+    """Per-statement rows of a transaction result (padded to count)."""
+    per_statement: list[list[dict]] = []
+    if isinstance(result, list) and result and all(isinstance(r, list) for r in result):
+        per_statement = [[row for row in r if isinstance(row, dict)] for r in result]
+    elif result:
+        per_statement = [result_rows(result)]
+    return (per_statement + [[] for _ in range(count)])[:count]
+
+
+_TRANSIENT_RE = re.compile(
+    r"timeout|timed out|temporar|connection (?:reset|refused|closed|aborted)|"
+    r"too many (?:requests|connections)|rate limit|\b(?:429|502|503|504)\b|"
+    r"unavailable|econnreset|server closed",
+    re.IGNORECASE,
+)
+
+
+# Transient errors raised before the statement reached the database
+_UNSENT_RE = re.compile(
+    r"connection refused|too many (?:requests|connections)|rate limit|\b429\b",
+    re.IGNORECASE,
+)
+
+_READ_ONLY_RE = re.compile(r"^\s*(?:SELECT|SHOW|EXPLAIN)\b", re.IGNORECASE)
+
+
+def is_transient(error: BaseException) -> bool:
+    """True for errors worth retrying (network/timeouts/rate limits), not SQL errors."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return bool(_TRANSIENT_RE.search(str(error)))
+
+
+def is_unsent(error: BaseException) -> bool:
+    """True for transient errors where the statement provably never ran (safe to resend writes)."""
+    if isinstance(error, ConnectionRefusedError):
+        return True
+    return bool(_UNSENT_RE.search(str(error)))
+
+
+def is_read_only(sql: str) -> bool:
+    """True for statements that can't change data (SELECT / SHOW / EXPLAIN)."""
+    return bool(_READ_ONLY_RE.match(sql))
+
+
+@dataclass(frozen=True)
+class CallMetric:
+    """One round trip to Neon."""
+    tool: str
+    statements: int
+    seconds: float
+    attempts: int
+    ok: bool
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class NeonClient:
+    """Neon SQL over DataGen MCP tools with binding, batching, retries and metrics."""
+
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        project_id: str = DEFAULT_PROJECT_ID,
+        branch_id: Optional[str] = DEFAULT_BRANCH_ID,
+        database_name: str = DEFAULT_DATABASE,
+        retries: int = DEFAULT_RETRIES,
+        backoff_seconds: float = 0.5,
+        max_backoff_seconds: float = 8.0,
+        batch_max_statements: int = DEFAULT_BATCH_MAX_STATEMENTS,
+        batch_max_chars: int = DEFAULT_BATCH_MAX_CHARS,
+    ):
+        """
+        Initialize NeonClient.
+
+        Args:
+            client: DatagenClient (or LocalPostgresClient). Default: a
+                LocalPostgresClient if NEON_LOCAL_DSN is set, else DatagenClient()
+            project_id: Neon project
+            branch_id: Neon branch (None = project default branch)
+            database_name: Neon database
+            retries: Retries per round trip for transient errors
+            backoff_seconds: Base backoff (doubles per attempt, full jitter)
+            max_backoff_seconds: Backoff cap
+            batch_max_statements: Statements per transaction round trip
+            batch_max_chars: SQL characters per transaction round trip
+        """
+        self._client = client
+        self.project_id = project_id
+        self.branch_id = branch_id
+        self.database_name = database_name
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.batch_max_statements = batch_max_statements
+        self.batch_max_chars = batch_max_chars
+        self._metrics: list[CallMetric] = []
+        self._metrics_lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            local_dsn = os.getenv("NEON_LOCAL_DSN")
+            if local_dsn:
+                self._client = LocalPostgresClient(local_dsn)
+            else:
+                from datagen_sdk import DatagenClient
+                self._client = DatagenClient()
+        return self._client
+
+    def _params(self, **extra: Any) -> dict:
+        params = {"projectId": self.project_id, "databaseName": self.database_name, **extra}
+        if self.branch_id:
+            params["branchId"] = self.branch_id
+        return {"params": params}
+
+    def _call(self, tool: str, payload: dict, statements: int, retry: Optional[bool], read_only: bool = False) -> Any:
+        """
+        Run one tool call with retries.
+
+        retry=None retries every transient error for read-only calls, but
+        only unsent ones (is_unsent) for writes: a write that timed out may
+        have committed, and resending it could apply it twice.
+        """
+        attempts = 0
+        started = time.monotonic()
+        max_attempts = (self.retries if retry is not False else 0) + 1
+        resend_ambiguous = retry is True or read_only
+        while True:
+            attempts += 1
+            try:
+                result = self.client.execute_tool(tool, payload)
+                self._record(CallMetric(tool, statements, time.monotonic() - started, attempts, True))
+                return result
+            except Exception as e:
+                retryable = is_transient(e) and (resend_ambiguous or is_unsent(e))
+                if attempts >= max_attempts or not retryable:
+                    self._record(CallMetric(tool, statements, time.monotonic() - started, attempts, False))
+                    raise NeonSQLError(f"{tool} failed after {attempts} attempt(s): {e}") from e
+                cap = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** (attempts - 1)))
+                time.sleep(random.uniform(0, cap))
+
+    def _record(self, metric: CallMetric) -> None:
+        with self._metrics_lock:
+            self._metrics.append(metric)
+
+    def execute(self, sql: str, params: Params = None, *, retry: Optional[bool] = None) -> Any:
+        """
+        Run one SQL statement and return the raw tool result.
+
+        Args:
+            sql: SQL text with optional %s / %(name)s placeholders
+            params: Values to bind
+            retry: None (default) retries transient failures of reads, and of
+                writes only when they never reached the database. True also
+                resends writes after ambiguous failures (timeouts), for
+                idempotent statements. False never retries.
+
+        Raises:
+            NeonSQLError: The call failed
+        """
+        rendered = render(sql, params)
+        return self._call(RUN_SQL_TOOL, self._params(sql=rendered), 1, retry, is_read_only(rendered))
+
+    def query(self, sql: str, params: Params = None, *, retry: Optional[bool] = None) -> list[dict]:
+        """Run one statement and return its rows."""
+        return result_rows(self.execute(sql, params, retry=retry))
+
+    def query_one(self, sql: str, params: Params = None, *, retry: Optional[bool] = None) -> dict:
+        """Run one statement and return its first row ({} if none)."""
+        rows = self.query(sql, params, retry=retry)
+        return rows[0] if rows else {}
+
+    def execute_many(self, statements: Iterable[Statement], *, retry: Optional[bool] = None) -> list[list[dict]]:
+        """
+        Run statements in as few round trips as possible.
+
+        Statements are grouped into chunks (batch_max_statements /
+        batch_max_chars); each chunk runs as one transaction, so a chunk
+        either applies fully or not at all.
+
+        Args:
+            statements: SQL strings or (sql, params) tuples
+            retry: Retry policy, as for execute()
+
+        Returns:
+            Rows per statement, in order
+
+        Raises:
+            NeonSQLError: A chunk failed (earlier chunks stay committed; the
+                error's .committed is how many statements they held)
+        """
+        results: list[list[dict]] = []
+        for chunk in self._chunks(_render_statement(s) for s in statements):
+            try:
+                results.extend(self._run_chunk(chunk, retry))
+            except NeonSQLError as e:
+                e.committed = len(results)
+                raise
+        return results
+
+    def try_execute_many(self, statements: Iterable[Statement], *, retry: Optional[bool] = None) -> dict[int, str]:
+        """
+        Like execute_many, but a failed chunk is rerun one statement at a time.
+
+        One bad row then only fails itself instead of its whole chunk, and
+        chunks that committed before the failure are still counted as done.
+
+        Args:
+            statements: SQL strings or (sql, params) tuples
+            retry: Retry policy, as for execute()
+
+        Returns:
+            Error message per failed statement, keyed by its index (empty if all ran)
+        """
+        failed: dict[int, str] = {}
+        offset = 0
+        for chunk in self._chunks(_render_statement(s) for s in statements):
+            try:
+                self._run_chunk(chunk, retry)
+            except NeonSQLError:
+                for i, sql in enumerate(chunk):
+                    try:
+                        self._run_chunk([sql], retry)
+                    except NeonSQLError as e:
+                        failed[offset + i] = str(e)
+            offset += len(chunk)
+        return failed
+
+    def _chunks(self, rendered: Iterable[str]) -> Iterable[list[str]]:
+        """Group rendered statements into transaction-sized chunks."""
+        chunk: list[str] = []
+        chunk_chars = 0
+        for sql in rendered:
+            if chunk and (len(chunk) >= self.batch_max_statements or chunk_chars + len(sql) > self.batch_max_chars):
+                yield chunk
+                chunk, chunk_chars = [], 0
+            chunk.append(sql)
+            chunk_chars += len(sql)
+        if chunk:
+            yield chunk
+
+    def _run_chunk(self, chunk: list[str], retry: Optional[bool]) -> list[list[dict]]:
+        read_only = all(is_read_only(sql) for sql in chunk)
+        if len(chunk) == 1:
+            return [result_rows(self._call(RUN_SQL_TOOL, self._params(sql=chunk[0]), 1, retry, read_only))]
+        result = self._call(
+            RUN_SQL_TRANSACTION_TOOL, self._params(sqlStatements=chunk), len(chunk), retry, read_only
+        )
+        return _transaction_rows(result, len(chunk))
+
+    def batch(self, *, retry: Optional[bool] = None) -> "NeonBatch":
+        """Collect statements and flush them in transaction-sized round trips (context manager)."""
+        return NeonBatch(self, retry=retry)
+
+    def summary(self) -> dict:
+        """Latency and volume metrics over all round trips so far."""
+        with self._metrics_lock:
+            metrics = list(self._metrics)
+        latencies = sorted(m.seconds for m in metrics)
+        return {
+            "calls": len(metrics),
+            "statements": sum(m.statements for m in metrics),
+            "errors": sum(1 for m in metrics if not m.ok),
+            "retries": sum(m.attempts - 1 for m in metrics),
+            "total_seconds": round(sum(latencies), 3),
+            "p50_seconds": round(_percentile(latencies, 50), 3),
+            "p95_seconds": round(_percentile(latencies, 95), 3),
+            "max_seconds": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    def format_summary(self) -> str:
+        """One-line metrics summary for script output."""
+        s = self.summary()
+        return (
+            f"Neon: {s['calls']} calls, {s['statements']} statements, {s['errors']} errors, "
+            f"{s['retries']} retries, {s['total_seconds']:.2f}s total "
+            f"(p50 {s['p50_seconds']:.2f}s, p95 {s['p95_seconds']:.2f}s)"
+        )
+
+
+class NeonBatch:
+    """Pending statements of a NeonClient, flushed as transactions."""
+
+    def __init__(self, neon: NeonClient, *, retry: Optional[bool] = None):
+        self.neon = neon
+        self.retry = retry
+        self.results: list[list[dict]] = []
+        self._pending: list[str] = []
+        self._pending_chars = 0
+
+    def add(self, sql: str, params: Params = None) -> None:
+        """Queue a statement; flushes automatically when a round trip is full."""
+        rendered = render(sql, params)
+        if self._pending and (
+            len(self._pending) >= self.neon.batch_max_statements
+            or self._pending_chars + len(rendered) > self.neon.batch_max_chars
+        ):
+            self.flush()
+        self._pending.append(rendered)
+        self._pending_chars += len(rendered)
+
+    def flush(self) -> None:
+        """Run all queued statements now (rows are appended to .results)."""
+        if not self._pending:
+            return
+        pending, self._pending, self._pending_chars = self._pending, [], 0
+        self.results.extend(self.neon.execute_many(pending, retry=self.retry))
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __enter__(self) -> "NeonBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self._pending.clear()
+
+
+# ---------------------------------------------------------------------------
+# Local stand-in
+# ---------------------------------------------------------------------------
+
+class LocalPostgresClient:
+    """
+    DatagenClient stand-in that runs the Neon MCP SQL tools on a local Postgres.
+
+    Results mimic the MCP shapes ([rows] for run_sql, [rows, ...] for
+    run_sql_transaction) with JSON-style values, so scripts and tests behave
+    the same as against Neon.
+    """
+
+    def __init__(self, dsn: str):
+        if not PSYCOPG_AVAILABLE:
+            raise RuntimeError("psycopg is not installed (pip install 'psycopg[binary]')")
+        self.dsn = dsn
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg.connect(self.dsn, autocommit=True, row_factory=dict_row)
+        return self._conn
+
+    @staticmethod
+    def _fetch(cursor) -> list[dict]:
+        rows = cursor.fetchall() if cursor.description else []
+        return json.loads(json.dumps(rows, default=str))
+
+    def execute_tool(self, tool: str, payload: dict) -> Any:
+        params = payload.get("params", payload)
+        with self._lock:
+            conn = self._connection()
+            if tool == RUN_SQL_TOOL:
+                return [self._fetch(conn.execute(params["sql"]))]
+            if tool == RUN_SQL_TRANSACTION_TOOL:
+                with conn.transaction():
+                    return [self._fetch(conn.execute(sql)) for sql in params["sqlStatements"]]
+        raise ValueError(f"LocalPostgresClient does not support tool {tool}")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
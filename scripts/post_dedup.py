@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Duplicate and near-duplicate detection for LinkedIn posts from search providers.
+
+The same post comes back from different providers under different URL forms
+(/posts/<slug>-activity-<id>-xxxx vs /feed/update/urn:li:activity:<id>), and
+reposts share text under different URLs. PostDeduper catches these with
+three checks, cheapest first:
+
+1. Normalized URL (exact match).
+2. Activity ID extracted from the URL (same post, different URL form).
+3. MinHash over word shingles of headline + excerpt, looked up in a small
+   in-memory LSH index (banded signatures). Candidates are confirmed by
+   estimated Jaccard similarity >= threshold.
+
+Everything is in memory and pure Python. An index holds one search run's
+posts (tens to hundreds).
+
+Usage:
+    from post_dedup import PostDeduper
+
+    deduper = PostDeduper()
+    for post in posts:
+        is_new, reason = deduper.add(post)   # reason: "", "missing_url", "url", "activity_id", "near_duplicate"
+"""
+
+import random
+import re
+import zlib
+from typing import Any, Hashable, Iterable, Optional
+from urllib.parse import unquote, urlparse
+
+# urn:li:activity:123, urn:li:share:123, urn:li:ugcPost:123 (also URL-encoded)
+_URN_RE = re.compile(r"urn:li:(?:activity|share|ugcPost):(\d+)", re.IGNORECASE)
+# /posts/jane-doe_topic-activity-1234567890123456789-AbCd
+_ACTIVITY_SLUG_RE = re.compile(r"activity-(\d+)")
+_URL_RE = re.compile(r"https?://\S+")
+_WORD_RE = re.compile(r"\w+")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_SHINGLE_WORDS = 3
+DEFAULT_MIN_WORDS = 8
+
+
+def normalize_post_url(url: str) -> str:
+    """Normalize LinkedIn post URLs for exact-match deduplication."""
+    if not url or "linkedin.com" not in url:
+        return url
+
+    # Remove query parameters, fragments and trailing slashes
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}".rstrip("/")
+
+
+def extract_post_id(url: str) -> str:
+    """
+    Extract the LinkedIn activity ID from any post URL form.
+
+    Handles /posts/...-activity-<id>-..., /feed/update/urn:li:activity:<id>
+    and share / ugcPost URNs (plain or URL-encoded).
+
+    Returns:
+        Activity ID digits, or "" if the URL carries none
+    """
+    if not url:
+        return ""
+    text = unquote(url)
+    match = _URN_RE.search(text) or _ACTIVITY_SLUG_RE.search(text)
+    return match.group(1) if match else ""
+
+
+def post_text(post: dict) -> str:
+    """Comparable text of a post: headline + excerpt, lowercased, URLs and punctuation dropped."""
+    text = f"{post.get('headline') or ''} {post.get('excerpt') or ''}".lower()
+    return " ".join(_WORD_RE.findall(_URL_RE.sub(" ", text)))
+
+
+class MinHashLSH:
+    """MinHash signatures plus a banded LSH index for near-duplicate lookup."""
+
+    def __init__(
+        self,
+        *,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        threshold: float = DEFAULT_THRESHOLD,
+        shingle_words: int = DEFAULT_SHINGLE_WORDS,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_words = shingle_words
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: list[dict[tuple, list[Hashable]]] = [{} for _ in range(bands)]
+        self._signatures: dict[Hashable, tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def shingles(self, text: str) -> set[int]:
+        """Hashed word n-grams of already-normalized text."""
+        words = text.split()
+        n = self.shingle_words
+        if len(words) <= n:
+            return {zlib.crc32(" ".join(words).encode("utf-8"))} if words else set()
+        return {zlib.crc32(" ".join(words[i:i + n]).encode("utf-8")) for i in range(len(words) - n + 1)}
+
+    def signature(self, text: str) -> tuple[int, ...]:
+        """MinHash signature of text (empty tuple for empty text)."""
+        hashes = self.shingles(text)
+        if not hashes:
+            return ()
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._perms
+        )
+
+    @staticmethod
+    def similarity(sig_a: tuple[int, ...], sig_b: tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+    def _band_keys(self, signature: tuple[int, ...]) -> Iterable[tuple[int, tuple]]:
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature[start:start + self.rows]
+
+    def query(self, signature: tuple[int, ...]) -> Optional[tuple[Hashable, float]]:
+        """Most similar indexed key at or above threshold, as (key, similarity)."""
+        if not signature:
+            return None
+        candidates = {
+            key
+            for band, band_key in self._band_keys(signature)
+            for key in self._buckets[band].get(band_key, ())
+        }
+        best = None
+        for key in candidates:
+            score = self.similarity(signature, self._signatures[key])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (key, score)
+        return best
+
+    def add(self, key: Hashable, signature: tuple[int, ...]) -> None:
+        """Index a signature under key."""
+        if not signature:
+            return
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+
+class PostDeduper:
+    """Incremental dedup of posts by URL, activity ID and near-duplicate text."""
+
+    def __init__(
+        self,
+        *,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_words: int = DEFAULT_MIN_WORDS,
+        lsh: Optional[MinHashLSH] = None,
+    ):
+        """
+        Initialize PostDeduper.
+
+        Args:
+            threshold: Estimated Jaccard similarity at which texts count as duplicates
+            min_words: Posts with less text skip the near-duplicate check
+                (short headlines like "LinkedIn" would collide)
+            lsh: Custom MinHashLSH index (overrides threshold)
+        """
+        self.min_words = min_words
+        self.lsh = lsh or MinHashLSH(threshold=threshold)
+        self.posts: list[dict] = []
+        self._urls: set[str] = set()
+        self._activity_ids: set[str] = set()
+        self.stats = {"kept": 0, "missing_url": 0, "url": 0, "activity_id": 0, "near_duplicate": 0}
+
+    def add(self, post: dict) -> tuple[bool, str]:
+        """
+        Keep post unless it duplicates one already kept.
+
+        Normalizes post["post_url"] in place.
+
+        Returns:
+            (is_new, reason): reason is "" for kept posts, "missing_url" for
+            posts without a URL (dropped), otherwise the check that caught the
+            duplicate ("url", "activity_id", "near_duplicate")
+        """
+        url = normalize_post_url(post.get("post_url", ""))
+        if not url:
+            self.stats["missing_url"] += 1
+            return False, "missing_url"
+        post["post_url"] = url
+
+        reason = ""
+        activity_id = extract_post_id(url)
+        if url in self._urls:
+            reason = "url"
+        elif activity_id and activity_id in self._activity_ids:
+            reason = "activity_id"
+
+        signature: tuple[int, ...] = ()
+        if not reason:
+            text = post_text(post)
+            if len(text.split()) >= self.min_words:
+                signature = self.lsh.signature(text)
+                if self.lsh.query(signature) is not None:
+                    reason = "near_duplicate"
+
+        if reason:
+            self.stats[reason] += 1
+            return False, reason
+
+        self._urls.add(url)
+        if activity_id:
+            self._activity_ids.add(activity_id)
+        self.lsh.add(len(self.posts), signature)
+        self.posts.append(post)
+        self.stats["kept"] += 1
+        return True, ""
+
+    def add_many(self, posts: Iterable[dict]) -> list[dict]:
+        """add() each post; returns the ones kept."""
+        return [post for post in posts if self.add(post)[0]]
+
+    def format_stats(self) -> str:
+        s = self.stats
+        return (
+            f"kept={s['kept']} duplicate_url={s['url']} "
+            f"same_activity={s['activity_id']} near_duplicate={s['near_duplicate']} missing_url={s['missing_url']}"
+        )
@@ -6,16 +6,20 @@ Searches for LinkedIn posts using Exa, Linkup, and Parallel Search in parallel,
 ranks results by relevance, and saves top posts to the database.
 """
 
+import argparse
 import os
 import sys
-import json
-from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any
-from urllib.parse import urlparse, parse_qs
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 from datagen_sdk import DatagenClient
 
+from federated_search import SearchProvider, iter_search
+from neon_client import Json, NeonClient
+from post_dedup import PostDeduper, normalize_post_url as normalize_linkedin_url
+from primitives.score_posts import RelevanceScorer
+
 # Load environment variables from ../.env
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
@@ -33,92 +37,34 @@ client = DatagenClient()
 # Database configuration
 PROJECT_ID = "blue-tree-25780810"
 DATABASE = "neondb"
+neon = NeonClient(client, project_id=PROJECT_ID, branch_id=None, database_name=DATABASE)
 
 # Configuration
 RELEVANCE_THRESHOLD = 40  # Lowered from 60 since we don't have engagement data from search
 MAX_RESULTS_TO_SAVE = 15
+SEARCH_TIMEOUT_SECONDS = 60
 
 
-def normalize_linkedin_url(url: str) -> str:
-    """Normalize LinkedIn post URLs for deduplication."""
-    if not url or "linkedin.com" not in url:
-        return url
-
-    # Remove query parameters and fragments
-    parsed = urlparse(url)
-    base_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-
-    # Remove trailing slashes
-    return base_url.rstrip("/")
-
+def calculate_relevance_score(post: Dict[str, Any], query: str) -> int:
+    """Calculate relevance score (0-100) for a post (prefer score_posts_batch for many)."""
+    return RelevanceScorer(query).score(post)
 
-def extract_post_id(url: str) -> str:
-    """Extract LinkedIn post activity ID from URL."""
-    if "activity-" in url:
-        parts = url.split("activity-")
-        if len(parts) > 1:
-            return parts[1].split("-")[0].split("/")[0].split("?")[0]
-    return ""
 
+def score_posts_batch(posts: List[Dict[str, Any]], query: str) -> None:
+    """
+    Set relevance_score (0-100) on every post.
 
-def calculate_relevance_score(post: Dict[str, Any], query: str) -> int:
-    """Calculate relevance score (0-100) for a post."""
-    score = 0
-
-    # Freshness (30 points)
-    if post.get("publish_date"):
-        try:
-            post_date = datetime.fromisoformat(post["publish_date"].replace("Z", "+00:00"))
-            days_old = (datetime.now(timezone.utc) - post_date).days
-
-            if days_old <= 7:
-                score += 30
-            elif days_old <= 30:
-                score += 20
-            elif days_old <= 90:
-                score += 10
-            else:
-                score += 5
-        except:
-            score += 5
-    else:
-        score += 5
-
-    # Engagement (30 points)
-    engagement = post.get("engagement_count", 0)
-    if engagement >= 50:
-        score += 30
-    elif engagement >= 20:
-        score += 20
-    elif engagement >= 5:
-        score += 15
-    else:
-        score += 10
-
-    # LinkedIn Specificity (20 points)
-    url = post.get("post_url", "")
-    if "linkedin.com/posts/" in url:
-        score += 20
-    elif "linkedin.com" in url:
-        score += 10
-
-    # Topic Relevance (20 points)
-    query_terms = query.lower().split()
-    content = (
-        post.get("headline", "") + " " +
-        post.get("excerpt", "") + " " +
-        post.get("author_name", "")
-    ).lower()
-
-    matches = sum(1 for term in query_terms if term in content)
-    if matches >= len(query_terms):
-        score += 20
-    elif matches >= len(query_terms) / 2:
-        score += 10
-    else:
-        score += 5
+    Posts carrying a "query" key (set per search) are scored against that
+    query. Each distinct query is compiled once and scored in one batch pass.
 
-    return min(score, 100)
+    Scoring: freshness 30, engagement 30, LinkedIn specificity 20, topic 20.
+    """
+    by_query: Dict[str, List[Dict[str, Any]]] = {}
+    for post in posts:
+        by_query.setdefault(post.pop("query", query), []).append(post)
+    for post_query, group in by_query.items():
+        for post, score in zip(group, RelevanceScorer(post_query).score_batch(group)):
+            post["relevance_score"] = score
 
 
 def search_exa(query: str) -> List[Dict[str, Any]]:
@@ -213,21 +159,34 @@ def search_parallel(query: str) -> List[Dict[str, Any]]:
         return []
 
 
-def aggregate_and_deduplicate(all_posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Aggregate results and remove duplicates."""
-    seen_urls = set()
-    unique_posts = []
+SEARCH_PROVIDERS = [
+    SearchProvider("Exa", search_exa, timeout=SEARCH_TIMEOUT_SECONDS),
+    SearchProvider("Linkup", search_linkup, timeout=SEARCH_TIMEOUT_SECONDS),
+    SearchProvider("Parallel", search_parallel, timeout=SEARCH_TIMEOUT_SECONDS),
+]
+
 
-    for post in all_posts:
-        url = post.get("post_url", "")
-        normalized_url = normalize_linkedin_url(url)
+def aggregate_and_deduplicate(
+    all_posts: List[Dict[str, Any]],
+    deduper: Optional[PostDeduper] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate results and remove duplicates.
 
-        if normalized_url and normalized_url not in seen_urls:
-            seen_urls.add(normalized_url)
-            post["post_url"] = normalized_url
-            unique_posts.append(post)
+    Drops exact URL repeats, other URL forms of the same activity ID, and
+    near-duplicate text (reposts) via PostDeduper.
 
-    return unique_posts
+    Args:
+        all_posts: Posts from one or more providers
+        deduper: Posts already kept; pass the same deduper across calls to
+            dedupe provider results incrementally as they arrive
+
+    Returns:
+        Posts not seen before, with post_url normalized
+    """
+    if deduper is None:
+        deduper = PostDeduper()
+    return deduper.add_many(all_posts)
 
 
 def ensure_table_exists():
@@ -251,42 +210,19 @@ def ensure_table_exists():
       updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
     )"""
 
-    try:
-        client.execute_tool(
-            "mcp_Neon_run_sql",
-            {
-                "params": {
-                    "projectId": PROJECT_ID,
-                    "databaseName": DATABASE,
-                    "sql": create_table_sql
-                }
-            }
-        )
-        print("✅ Table created/verified")
-    except Exception as e:
-        print(f"⚠️  Table check: {e}")
-
-    # Create indexes separately
+    # Indexes
     indexes = [
         "CREATE INDEX IF NOT EXISTS idx_linkedin_posts_url ON linkedin_posts_tracker(post_url)",
         "CREATE INDEX IF NOT EXISTS idx_linkedin_posts_date ON linkedin_posts_tracker(publish_date DESC)",
         "CREATE INDEX IF NOT EXISTS idx_linkedin_posts_score ON linkedin_posts_tracker(relevance_score DESC)"
     ]
 
-    for idx_sql in indexes:
-        try:
-            client.execute_tool(
-                "mcp_Neon_run_sql",
-                {
-                    "params": {
-                        "projectId": PROJECT_ID,
-                        "databaseName": DATABASE,
-                        "sql": idx_sql
-                    }
-                }
-            )
-        except:
-            pass  # Indexes might already exist
+    # Table and indexes in one round trip
+    try:
+        neon.execute_many([create_table_sql, *indexes])
+        print("✅ Table created/verified")
+    except Exception as e:
+        print(f"⚠️  Table check: {e}")
 
 
 def save_posts_to_db(posts: List[Dict[str, Any]]) -> int:
@@ -296,75 +232,64 @@ def save_posts_to_db(posts: List[Dict[str, Any]]) -> int:
 
     print(f"\n💾 Saving {len(posts)} posts to database...")
 
-    saved_count = 0
-    failed_count = 0
-
+    statements = []
     for post in posts:
-        try:
-            # Extract topic tags from query
-            topic_tags = json.dumps(["Claude AI", "GTM"])
-
-            # Parse date
-            publish_date = post.get("publish_date", "")
-            if publish_date:
-                try:
-                    date_obj = datetime.fromisoformat(publish_date.replace("Z", "+00:00"))
-                    publish_date = date_obj.strftime("%Y-%m-%d")
-                except:
-                    publish_date = None
-            else:
+        # Parse date
+        publish_date = post.get("publish_date", "")
+        if publish_date:
+            try:
+                date_obj = datetime.fromisoformat(publish_date.replace("Z", "+00:00"))
+                publish_date = date_obj.strftime("%Y-%m-%d")
+            except:
                 publish_date = None
+        else:
+            publish_date = None
+
+        sql = """
+        INSERT INTO linkedin_posts_tracker (
+          post_url,
+          author_name,
+          author_profile,
+          headline,
+          publish_date,
+          engagement_count,
+          excerpt,
+          topic_tags,
+          source_tool,
+          relevance_score
+        ) VALUES (%s, %s, %s, %s, %s::date, %s, %s, %s, %s, %s)
+        ON CONFLICT (post_url)
+        DO UPDATE SET
+          engagement_count = EXCLUDED.engagement_count,
+          relevance_score = EXCLUDED.relevance_score,
+          updated_at = NOW();
+        """
+        statements.append((sql, [
+            post.get("post_url", ""),
+            post.get("author_name", ""),
+            post.get("author_profile", ""),
+            post.get("headline", ""),
+            publish_date,
+            post.get("engagement_count", 0),
+            post.get("excerpt", "")[:500],
+            # Topic tags from query
+            Json(["Claude AI", "GTM"]),
+            post.get("source_tool", ""),
+            post.get("relevance_score", 0),
+        ]))
+
+    # One transaction per chunk; a failed chunk is retried post by post so a
+    # single bad row doesn't drop the rest
+    failed = neon.try_execute_many(statements)
+    for i, row_error in sorted(failed.items()):
+        print(f"   ❌ Failed: {posts[i].get('headline', 'Untitled')[:60]}... - {row_error}")
 
-            # Build insert query
-            sql = f"""
-            INSERT INTO linkedin_posts_tracker (
-              post_url,
-              author_name,
-              author_profile,
-              headline,
-              publish_date,
-              engagement_count,
-              excerpt,
-              topic_tags,
-              source_tool,
-              relevance_score
-            ) VALUES (
-              '{post.get("post_url", "").replace("'", "''")}',
-              '{post.get("author_name", "").replace("'", "''")}',
-              '{post.get("author_profile", "").replace("'", "''")}',
-              '{post.get("headline", "").replace("'", "''")}',
-              {f"'{publish_date}'" if publish_date else "NULL"},
-              {post.get("engagement_count", 0)},
-              '{post.get("excerpt", "")[:500].replace("'", "''")}',
-              '{topic_tags}'::jsonb,
-              '{post.get("source_tool", "")}',
-              {post.get("relevance_score", 0)}
-            )
-            ON CONFLICT (post_url)
-            DO UPDATE SET
-              engagement_count = EXCLUDED.engagement_count,
-              relevance_score = EXCLUDED.relevance_score,
-              updated_at = NOW();
-            """
-
-            client.execute_tool(
-                "mcp_Neon_run_sql",
-                {
-                    "params": {
-                        "projectId": PROJECT_ID,
-                        "databaseName": DATABASE,
-                        "sql": sql
-                    }
-                }
-            )
-
+    saved_count = 0
+    for i, post in enumerate(posts):
+        if i not in failed:
             saved_count += 1
             print(f"   ✅ {saved_count}. {post.get('headline', 'Untitled')[:60]}...")
 
-        except Exception as e:
-            failed_count += 1
-            print(f"   ❌ Failed: {post.get('headline', 'Untitled')[:60]}... - {e}")
-
     return saved_count
 
 
@@ -404,36 +329,52 @@ def generate_summary(query: str, all_posts: List[Dict[str, Any]], saved_posts: L
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python post_search_agent.py <search_query>")
-        print("\nExample:")
-        print("  python post_search_agent.py 'Claude Code for GTM'")
+    parser = argparse.ArgumentParser(
+        description="Search LinkedIn posts across Exa, Linkup and Parallel, score them and save the best.",
+        epilog="Example: python post_search_agent.py 'Claude Code for GTM' --query 'AI SDR workflows'",
+    )
+    parser.add_argument("query", nargs="*", help="Search query (words are joined)")
+    parser.add_argument("--query", dest="extra_queries", action="append", default=[],
+                        help="Additional query; repeat to run a batch of topics as one job")
+    parser.add_argument("--queries-file", type=Path, help="File with one query per line")
+    parser.add_argument("--timeout", type=float, default=SEARCH_TIMEOUT_SECONDS,
+                        help=f"Per-provider timeout in seconds (default: {SEARCH_TIMEOUT_SECONDS})")
+    args = parser.parse_args()
+
+    queries = ([" ".join(args.query)] if args.query else []) + args.extra_queries
+    if args.queries_file:
+        queries += [line.strip() for line in args.queries_file.read_text().splitlines() if line.strip()]
+    if not queries:
+        parser.print_help()
         sys.exit(1)
-
-    query = " ".join(sys.argv[1:])
+    query = "; ".join(queries)
 
     print("="*80)
     print("LINKEDIN POST SEARCH AGENT")
     print("="*80)
     print(f"\nQuery: {query}\n")
 
-    # Step 1: Parallel search
+    # Step 1 + 2: Parallel search, deduplicating each provider's posts as they arrive
     print("🚀 Starting parallel search across all tools...\n")
 
-    exa_results = search_exa(query)
-    linkup_results = search_linkup(query)
-    parallel_results = search_parallel(query)
-
-    # Step 2: Aggregate and deduplicate
-    all_posts = exa_results + linkup_results + parallel_results
-    unique_posts = aggregate_and_deduplicate(all_posts)
-
-    print(f"\n📋 Aggregated {len(unique_posts)} unique posts")
-
-    # Step 3: Calculate relevance scores
+    deduper = PostDeduper()
+    unique_posts = []
+    for result in iter_search(SEARCH_PROVIDERS, queries, timeout=args.timeout):
+        if not result.ok:
+            print(f"❌ {result.error}")
+            continue
+        for post in result.results:
+            post["query"] = result.query
+        new_posts = aggregate_and_deduplicate(result.results, deduper)
+        unique_posts.extend(new_posts)
+        print(f"   ⏱️  {result.provider} ({result.seconds:.1f}s): {len(new_posts)} new posts")
+
+    print(f"\n📋 Aggregated {len(unique_posts)} unique posts ({deduper.format_stats()})")
+
+    # Step 3: Calculate relevance scores (against the query that found each post)
     print("\n⚖️  Calculating relevance scores...")
+    score_posts_batch(unique_posts, query)
     for post in unique_posts:
-        post["relevance_score"] = calculate_relevance_score(post, query)
         print(f"   - Score {post['relevance_score']}: {post.get('headline', 'Untitled')[:60]}...")
 
     # Sort by score
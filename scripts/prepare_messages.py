@@ -2,8 +2,19 @@
 """
 Generate personalized outreach messages for campaign prospects.
 Uses messaging templates and prospect comment context.
+
+Templates are compiled once and rendered for all prospects in one pass;
+--personalize rewrites each message with an LLM (concurrent, cached per
+prospect profile). Messages are written back to the campaign table in one
+batched update.
+
+Usage:
+    python prepare_messages.py
+    python prepare_messages.py --personalize --workers 16
+    python prepare_messages.py --no-neon
 """
 
+import argparse
 import os
 import sys
 import json
@@ -11,6 +22,16 @@ from datetime import datetime
 from dotenv import load_dotenv
 from datagen_sdk import DatagenClient
 
+from message_renderer import (
+    DEFAULT_WORKERS,
+    LLMPersonalizer,
+    MessageCache,
+    MessageTemplate,
+    prospect_values,
+    save_messages_to_neon,
+)
+from neon_client import NeonClient
+
 # Load environment variables
 load_dotenv("../.env")
 
@@ -21,6 +42,7 @@ if not os.getenv("DATAGEN_API_KEY"):
 
 # Initialize DataGen client
 client = DatagenClient()
+neon = NeonClient(client)
 
 # Campaign to generate messages for
 CAMPAIGN_TABLE = "campaign_jordan_crawford_gtm_session_link_requests"
@@ -42,6 +64,22 @@ Building tools to make it even faster. Looking for people to try it and give fee
 I've got a setup that does it in minutes. Want to see how it works and tell me what's missing?""",
 ]
 
+# Use the "honest exchange" version since we saw the link request comment
+MESSAGE = MessageTemplate(SPEED_WITH_EXCHANGE[0])
+
+# Context note for internal use
+CONTEXT_NOTE = MessageTemplate("""
+--- CONTEXT FOR THIS PROSPECT ---
+Name: {name}
+Headline: {headline}
+Company: {company}
+Comment: {comment_snippet}
+Urgency: {urgency_level}
+LinkedIn: {linkedin_url}
+---
+""")
+
+
 def get_campaign_prospects():
     """Fetch all pending prospects from the campaign with their comments."""
 
@@ -64,71 +102,51 @@ def get_campaign_prospects():
 
     print(f"Fetching prospects from {CAMPAIGN_TABLE}...")
 
-    result = client.execute_tool(
-        "mcp_Neon_execute_sql",
-        {
-            "project_id": "blue-tree-25780810",
-            "branch_id": "br-cool-leaf-afau0ra8",
-            "database": "neondb",
-            "query": query
-        }
-    )
-
-    return result.get("results", [])
-
-
-def extract_first_name(full_name):
-    """Extract first name from full name."""
-    if not full_name:
-        return "there"
+    return neon.query(query)
 
-    # Remove common emojis and split
-    clean_name = full_name.replace("🦾", "").replace("👨‍💻", "").strip()
-    first = clean_name.split()[0] if clean_name else "there"
-    return first
 
+def generate_messages(prospects, personalizer=None):
+    """Generate personalized messages for all prospects based on their data."""
 
-def generate_message_for_prospect(prospect):
-    """Generate personalized message based on prospect data."""
+    values = []
+    for prospect in prospects:
+        value = prospect_values(prospect)
+        comment = prospect.get("comment_text") or ""
+        value["comment_snippet"] = f"{comment[:100]}{'...' if len(comment) > 100 else ''}"
+        for key in ("name", "headline", "company", "urgency_level", "linkedin_url"):
+            value.setdefault(key, None)
+        values.append(value)
 
-    first_name = extract_first_name(prospect.get("name", ""))
-    comment = prospect.get("comment_text", "")
-    headline = prospect.get("headline", "")
-    company = prospect.get("company", "")
+    texts = MESSAGE.render_many(values)
+    context_notes = CONTEXT_NOTE.render_many(values)
 
-    # Select template based on context
-    # Use the "honest exchange" version since we saw the link request comment
-    template = SPEED_WITH_EXCHANGE[0]  # First honest exchange template
+    if personalizer is not None:
+        print(f"Personalizing {len(texts)} messages with {personalizer.model}...")
+        texts, errors = personalizer.personalize_many(prospects, texts)
+        for error in errors[:10]:
+            print(f"   {error}")
+        if errors:
+            print(f"   {len(errors)} prospect(s) kept the template message")
 
-    # Format the message
-    message = template.format(first_name=first_name)
-
-    # Add context-aware note for internal use
-    context_note = f"""
---- CONTEXT FOR THIS PROSPECT ---
-Name: {prospect.get('name')}
-Headline: {headline}
-Company: {company}
-Comment: {comment[:100]}{'...' if len(comment) > 100 else ''}
-Urgency: {prospect.get('urgency_level')}
-LinkedIn: {prospect.get('linkedin_url')}
----
-"""
+    generated_at = datetime.utcnow().isoformat()
 
-    return {
-        "prospect_id": prospect.get("prospect_id"),
-        "campaign_entry_id": prospect.get("campaign_entry_id"),
-        "name": prospect.get("name"),
-        "first_name": first_name,
-        "linkedin_url": prospect.get("linkedin_url"),
-        "headline": headline,
-        "company": company,
-        "comment": comment,
-        "urgency_level": prospect.get("urgency_level"),
-        "message": message,
-        "context_note": context_note,
-        "generated_at": datetime.utcnow().isoformat()
-    }
+    return [
+        {
+            "prospect_id": prospect.get("prospect_id"),
+            "campaign_entry_id": prospect.get("campaign_entry_id"),
+            "name": prospect.get("name"),
+            "first_name": value["first_name"],
+            "linkedin_url": prospect.get("linkedin_url"),
+            "headline": prospect.get("headline", ""),
+            "company": prospect.get("company", ""),
+            "comment": prospect.get("comment_text", ""),
+            "urgency_level": prospect.get("urgency_level"),
+            "message": text,
+            "context_note": context_note,
+            "generated_at": generated_at
+        }
+        for prospect, value, text, context_note in zip(prospects, values, texts, context_notes)
+    ]
 
 
 def save_messages(messages, output_file):
@@ -163,6 +181,14 @@ def print_summary(messages):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate outreach messages for campaign prospects")
+    parser.add_argument("--personalize", action="store_true",
+                        help="Rewrite each message with an LLM (cached per prospect profile)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Concurrent LLM calls with --personalize (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--no-neon", action="store_true", help="Don't write messages back to the campaign table")
+    args = parser.parse_args()
+
     print("="*80)
     print("CAMPAIGN MESSAGE GENERATOR")
     print("="*80)
@@ -181,7 +207,18 @@ def main():
 
     # Generate messages
     print("Generating personalized messages...")
-    messages = [generate_message_for_prospect(p) for p in prospects]
+    personalizer = LLMPersonalizer(cache=MessageCache(), workers=args.workers) if args.personalize else None
+    messages = generate_messages(prospects, personalizer)
+
+    # Write back to the campaign table (one transaction per Neon batch)
+    if not args.no_neon:
+        saved, err = save_messages_to_neon(
+            neon, CAMPAIGN_TABLE, ((m["campaign_entry_id"], m["message"]) for m in messages)
+        )
+        if err:
+            print(f"Warning: {err} ({saved} messages were saved before the failure)")
+        else:
+            print(f"Saved {saved} messages to {CAMPAIGN_TABLE}.message")
 
     # Save to file
     output_file = f"../linkedin-messages/campaign_messages_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
@@ -22,6 +22,7 @@ Available Primitives:
     - filter_by: Filter array by keywords
     - aggregate: Aggregate array into metrics
     - firecrawl_scrape: Scrape web page content using Firecrawl
+    - score_posts: Score posts for relevance (query terms, keyword tiers, weights)
 """
 
 from .base import Primitive, Graph, PRIMITIVES, register_primitive, get_client
@@ -35,6 +36,7 @@ from .linkedin_search import linkedin_search, LinkedInSearch
 from .filter_by import filter_by, FilterBy
 from .aggregate import aggregate, Aggregate
 from .firecrawl_scrape import firecrawl_scrape, FirecrawlScrape
+from .score_posts import score_posts, ScorePosts
 
 __all__ = [
     # Base classes
@@ -53,6 +55,7 @@ __all__ = [
     "filter_by",
     "aggregate",
     "firecrawl_scrape",
+    "score_posts",
 
     # Primitive classes (for subclassing)
     "WebResearch",
@@ -63,6 +66,7 @@ __all__ = [
     "FilterBy",
     "Aggregate",
     "FirecrawlScrape",
+    "ScorePosts",
 ]
 
 
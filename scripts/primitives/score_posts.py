@@ -0,0 +1,327 @@
+"""
+Primitive: Score Posts
+
+Score an array of posts for relevance to a query and/or keyword tiers.
+Generic scoring - field names, weights and keywords all come from inputs.
+
+The query and keyword tiers are compiled once (RelevanceScorer,
+KeywordTiers), then posts are scored in batch passes over columns (days
+old, engagement, URL, text). Tier lookups over the numeric columns run in
+numpy when it is installed (optional dependency), else in plain Python.
+The results are the same either way.
+
+This is a TRUE primitive - no hardcoded keywords; callers bring their own.
+
+Scripts use the engine directly:
+    from primitives.score_posts import RelevanceScorer, KeywordTiers
+
+    scores = RelevanceScorer("claude code gtm").score_batch(posts)
+    tiers = KeywordTiers({"High": [...], "Medium": [...]}).classify_batch(texts)
+"""
+
+import re
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timezone
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from .base import Primitive, register_primitive
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class ScoringWeights:
+    """Points per scoring component (defaults total 100)."""
+
+    # (max_days_old, points), checked in order; undated/older posts get freshness_default
+    freshness: tuple[tuple[int, int], ...] = ((7, 30), (30, 20), (90, 10))
+    freshness_default: int = 5
+    # (min_engagement, points), checked in order
+    engagement: tuple[tuple[int, int], ...] = ((50, 30), (20, 20), (5, 15))
+    engagement_default: int = 10
+    # LinkedIn specificity: /posts/ URLs vs any other linkedin.com URL
+    linkedin_post: int = 20
+    linkedin_other: int = 10
+    # Topic: all query terms present / at least half / fewer
+    topic_all: int = 20
+    topic_half: int = 10
+    topic_default: int = 5
+    max_score: int = 100
+
+    @classmethod
+    def from_dict(cls, overrides: Optional[Mapping[str, Any]]) -> "ScoringWeights":
+        """Defaults with overrides applied (tier lists may be given as lists of pairs)."""
+        if not overrides:
+            return cls()
+        known = {f.name for f in fields(cls)}
+        unknown = set(overrides) - known
+        if unknown:
+            raise ValueError(f"unknown weight(s): {', '.join(sorted(unknown))}")
+        values = {
+            key: tuple(tuple(pair) for pair in value) if key in ("freshness", "engagement") else value
+            for key, value in overrides.items()
+        }
+        return replace(cls(), **values)
+
+
+@dataclass(frozen=True)
+class PostFields:
+    """Where each scoring input lives on a post dict."""
+
+    date: str = "publish_date"
+    # Summed when several (e.g. reactionsCount + commentsCount)
+    engagement: tuple[str, ...] = ("engagement_count",)
+    # Joined for topic matching
+    text: tuple[str, ...] = ("headline", "excerpt", "author_name")
+    url: str = "post_url"
+
+    @classmethod
+    def from_dict(cls, overrides: Optional[Mapping[str, Any]]) -> "PostFields":
+        if not overrides:
+            return cls()
+        values = {
+            key: tuple(value) if isinstance(value, (list, tuple)) else value
+            for key, value in overrides.items()
+        }
+        for key in ("engagement", "text"):
+            if isinstance(values.get(key), str):
+                values[key] = (values[key],)
+        return replace(cls(), **values)
+
+
+def _days_old(value: Any, now: datetime, cache: dict) -> Optional[float]:
+    """Whole days between an ISO date string and now (None if missing/unparseable)."""
+    if not value or not isinstance(value, str):
+        return None
+    if value in cache:
+        return cache[value]
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        days = float((now - parsed).days)
+    except ValueError:
+        days = None
+    cache[value] = days
+    return days
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class RelevanceScorer:
+    """Query compiled once, then posts scored 0..max_score in batch column passes."""
+
+    def __init__(
+        self,
+        query: str = "",
+        *,
+        weights: Optional[ScoringWeights] = None,
+        fields: Optional[PostFields] = None,
+    ):
+        self.query = query
+        self.weights = weights or ScoringWeights()
+        self.fields = fields or PostFields()
+        # Terms keep duplicates, so "ai ai" needs both to count as "all terms"
+        self.terms = tuple(query.lower().split())
+        self._unique_terms = tuple(dict.fromkeys(self.terms))
+        self._term_counts = {t: self.terms.count(t) for t in self._unique_terms}
+
+    def _topic_matches(self, text: str) -> int:
+        return sum(self._term_counts[t] for t in self._unique_terms if t in text)
+
+    def _columns(self, posts: Sequence[dict], now: datetime) -> tuple[list, list, list, list]:
+        f = self.fields
+        cache: dict = {}
+        days = [_days_old(p.get(f.date), now, cache) for p in posts]
+        engagement = [sum(_as_int(p.get(k)) for k in f.engagement) for p in posts]
+        urls = [p.get(f.url) or "" for p in posts]
+        texts = [" ".join(str(p.get(k) or "") for k in f.text).lower() for p in posts]
+        return days, engagement, urls, texts
+
+    def score_batch(self, posts: Sequence[dict], now: Optional[datetime] = None) -> list[int]:
+        """
+        Score posts.
+
+        Args:
+            posts: Post dicts (fields per self.fields)
+            now: Reference time for freshness (default: current UTC time)
+
+        Returns:
+            Scores, in input order
+        """
+        if not posts:
+            return []
+        w = self.weights
+        days, engagement, urls, texts = self._columns(posts, now or datetime.now(timezone.utc))
+
+        specificity = [
+            w.linkedin_post if "linkedin.com/posts/" in url else w.linkedin_other if "linkedin.com" in url else 0
+            for url in urls
+        ]
+        n_terms = len(self.terms)
+        matches = [self._topic_matches(text) for text in texts] if n_terms else [0] * len(texts)
+
+        if NUMPY_AVAILABLE:
+            return self._combine_numpy(days, engagement, specificity, matches, n_terms)
+
+        def freshness(d: Optional[float]) -> int:
+            if d is None:
+                return w.freshness_default
+            return next((points for max_days, points in w.freshness if d <= max_days), w.freshness_default)
+
+        def engaged(count: int) -> int:
+            return next((points for min_count, points in w.engagement if count >= min_count), w.engagement_default)
+
+        def topic(m: int) -> int:
+            return w.topic_all if m >= n_terms else w.topic_half if m >= n_terms / 2 else w.topic_default
+
+        return [
+            min(freshness(d) + engaged(e) + s + topic(m), w.max_score)
+            for d, e, s, m in zip(days, engagement, specificity, matches)
+        ]
+
+    def _combine_numpy(self, days, engagement, specificity, matches, n_terms) -> list[int]:
+        w = self.weights
+        days_arr = np.array([np.nan if d is None else d for d in days], dtype=np.float64)
+        eng_arr = np.asarray(engagement, dtype=np.int64)
+        match_arr = np.asarray(matches, dtype=np.int64)
+
+        # NaN days compare False everywhere, so undated posts fall to the default
+        with np.errstate(invalid="ignore"):
+            freshness = np.select(
+                [days_arr <= max_days for max_days, _ in w.freshness],
+                [points for _, points in w.freshness],
+                default=w.freshness_default,
+            )
+        engaged = np.select(
+            [eng_arr >= min_count for min_count, _ in w.engagement],
+            [points for _, points in w.engagement],
+            default=w.engagement_default,
+        )
+        topic = np.select(
+            [match_arr >= n_terms, match_arr >= n_terms / 2],
+            [w.topic_all, w.topic_half],
+            default=w.topic_default,
+        )
+        total = freshness + engaged + np.asarray(specificity, dtype=np.int64) + topic
+        return np.minimum(total, w.max_score).astype(int).tolist()
+
+    def score(self, post: dict, now: Optional[datetime] = None) -> int:
+        """Score one post (prefer score_batch for many)."""
+        return self.score_batch([post], now)[0]
+
+
+class KeywordTiers:
+    """
+    Ordered keyword tiers (e.g. High / Medium / Low), compiled once.
+
+    A text belongs to the first tier with any keyword in it (case-insensitive
+    substring match). One regex scan per tier decides membership; the
+    matched keywords are listed, in tier order, only for texts that match.
+    """
+
+    def __init__(self, tiers: Mapping[str, Iterable[str]]):
+        self.tiers = [(name, tuple(k.lower() for k in keywords if k)) for name, keywords in tiers.items()]
+        self._patterns = [
+            re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+            if keywords else None
+            for _, keywords in self.tiers
+        ]
+
+    def classify(self, text: Optional[str]) -> tuple[str, list[str]]:
+        """
+        Returns:
+            (tier_name, matched_keywords), or ("", []) if no tier matches
+        """
+        lowered = (text or "").lower()
+        for (name, keywords), pattern in zip(self.tiers, self._patterns):
+            if pattern is not None and pattern.search(lowered):
+                return name, [k for k in keywords if k in lowered]
+        return "", []
+
+    def classify_batch(self, texts: Iterable[Optional[str]]) -> list[tuple[str, list[str]]]:
+        return [self.classify(text) for text in texts]
+
+
+@register_primitive
+class ScorePosts(Primitive):
+    """Score posts for relevance to a query and/or keyword tiers."""
+
+    name = "score_posts"
+    description = "Score an array of posts for relevance (freshness, engagement, topic, keyword tiers)"
+
+    input_schema = {
+        "items": {
+            "type": "array",
+            "description": "Array of post objects to score",
+            "required": True
+        },
+        "query": {
+            "type": "string",
+            "description": "Topic query; its terms are matched against the text fields",
+            "required": False
+        },
+        "keyword_tiers": {
+            "type": "object",
+            "description": "Ordered {tier_name: [keywords]} (e.g., High/Medium/Low); first matching tier wins",
+            "required": False
+        },
+        "weights": {
+            "type": "object",
+            "description": "ScoringWeights overrides (e.g., {\"topic_all\": 40, \"freshness\": [[3, 30], [14, 15]]})",
+            "required": False
+        },
+        "fields": {
+            "type": "object",
+            "description": "Field names: date, engagement (list), text (list), url (default: post search layout)",
+            "required": False
+        }
+    }
+
+    output_schema = {
+        "scored": {
+            "type": "array",
+            "description": "Items with relevance_score (and relevance_tier / relevance_keywords with keyword_tiers)"
+        },
+        "scored_count": {
+            "type": "integer",
+            "description": "Number of items scored"
+        }
+    }
+
+    def run(self, **inputs) -> tuple[dict, str]:
+        items = inputs["items"] or []
+        try:
+            scorer = RelevanceScorer(
+                inputs.get("query") or "",
+                weights=ScoringWeights.from_dict(inputs.get("weights")),
+                fields=PostFields.from_dict(inputs.get("fields")),
+            )
+        except (TypeError, ValueError) as e:
+            return {}, f"invalid scoring config: {e}"
+
+        scored = [dict(item) for item in items]
+        for item, score in zip(scored, scorer.score_batch(scored)):
+            item["relevance_score"] = score
+
+        if inputs.get("keyword_tiers"):
+            tiers = KeywordTiers(inputs["keyword_tiers"])
+            texts = (" ".join(str(item.get(k) or "") for k in scorer.fields.text) for item in scored)
+            for item, (tier, keywords) in zip(scored, tiers.classify_batch(texts)):
+                item["relevance_tier"] = tier
+                item["relevance_keywords"] = keywords
+
+        return {"scored": scored, "scored_count": len(scored)}, ""
+
+
+# Module-level instance for convenient imports
+score_posts = ScorePosts()
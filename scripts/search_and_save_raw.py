@@ -6,6 +6,7 @@ Searches for LinkedIn posts using Exa, Linkup, and Parallel Search in parallel,
 saves raw results and creates clean normalized markdown for manual review.
 """
 
+import argparse
 import os
 import sys
 import json
@@ -15,6 +16,8 @@ from pathlib import Path
 from dotenv import load_dotenv
 from datagen_sdk import DatagenClient
 
+from federated_search import SearchProvider, iter_search
+
 # Load environment variables from ../.env
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
@@ -33,6 +36,8 @@ client = DatagenClient()
 RESULTS_DIR = Path(__file__).parent.parent / "search-results" / "linkedin-posts"
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 
+SEARCH_TIMEOUT_SECONDS = 60
+
 
 def search_exa(query: str) -> Dict[str, Any]:
     """Search using Exa."""
@@ -90,12 +95,23 @@ def search_parallel(query: str) -> Dict[str, Any]:
         return {"tool": "Parallel", "query": query, "error": str(e)}
 
 
-def save_raw_json(data: Dict[str, Any], timestamp: str):
+SEARCH_PROVIDERS = [
+    SearchProvider("Exa", search_exa, timeout=SEARCH_TIMEOUT_SECONDS),
+    SearchProvider("Linkup", search_linkup, timeout=SEARCH_TIMEOUT_SECONDS),
+    SearchProvider("Parallel", search_parallel, timeout=SEARCH_TIMEOUT_SECONDS),
+]
+
+# Markdown sections keep this order regardless of which tool finished first
+TOOL_ORDER = [provider.name for provider in SEARCH_PROVIDERS]
+
+
+def save_raw_json(data: Dict[str, Any], timestamp: str) -> Path:
     """Save raw JSON results."""
     filename = RESULTS_DIR / f"raw_{data['tool'].lower()}_{timestamp}.json"
     with open(filename, 'w') as f:
         json.dump(data, f, indent=2)
     print(f"   💾 Saved: {filename.name}")
+    return filename
 
 
 def parse_and_normalize(all_results: List[Dict[str, Any]], query: str, timestamp: str) -> str:
@@ -198,44 +214,57 @@ def parse_and_normalize(all_results: List[Dict[str, Any]], query: str, timestamp
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python search_and_save_raw.py <search_query>")
-        print("\nExample:")
-        print("  python search_and_save_raw.py 'Claude Code for GTM'")
+    parser = argparse.ArgumentParser(
+        description="Search LinkedIn posts across Exa, Linkup and Parallel and save raw + normalized results.",
+        epilog="Example: python search_and_save_raw.py 'Claude Code for GTM' --query 'AI SDR workflows'",
+    )
+    parser.add_argument("query", nargs="*", help="Search query (words are joined)")
+    parser.add_argument("--query", dest="extra_queries", action="append", default=[],
+                        help="Additional query; repeat to run a batch of topics as one job")
+    parser.add_argument("--timeout", type=float, default=SEARCH_TIMEOUT_SECONDS,
+                        help=f"Per-provider timeout in seconds (default: {SEARCH_TIMEOUT_SECONDS})")
+    args = parser.parse_args()
+
+    queries = ([" ".join(args.query)] if args.query else []) + args.extra_queries
+    if not queries:
+        parser.print_help()
         sys.exit(1)
 
-    query = " ".join(sys.argv[1:])
     timestamp = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+    # One file set per query; a single query keeps the plain timestamp names
+    stamps = {q: timestamp if len(queries) == 1 else f"{timestamp}_{i}" for i, q in enumerate(queries, 1)}
 
     print("="*80)
     print("LINKEDIN POST SEARCH - SAVE RAW RESULTS")
     print("="*80)
-    print(f"\nQuery: {query}")
+    for q in queries:
+        print(f"\nQuery: {q}")
     print(f"Output: {RESULTS_DIR}\n")
 
-    # Step 1: Search all tools in parallel
+    # Step 1 + 2: Search all tools in parallel, saving raw JSON as each finishes
     print("🚀 Starting parallel search...\n")
 
-    exa_result = search_exa(query)
-    linkup_result = search_linkup(query)
-    parallel_result = search_parallel(query)
-
-    all_results = [exa_result, linkup_result, parallel_result]
-
-    # Step 2: Save raw JSON
-    print("\n💾 Saving raw JSON results...")
-    for result in all_results:
-        save_raw_json(result, timestamp)
+    results_by_query: Dict[str, List[Dict[str, Any]]] = {q: [] for q in queries}
+    files_created = []
+    for result in iter_search(SEARCH_PROVIDERS, queries, timeout=args.timeout):
+        data = result.results if result.ok else {"tool": result.provider, "query": result.query, "error": result.error}
+        if not result.ok:
+            print(f"❌ {result.error}")
+        results_by_query[result.query].append(data)
+        files_created.append(save_raw_json(data, stamps[result.query]).name)
 
     # Step 3: Create normalized markdown
     print("\n📝 Creating normalized markdown...")
-    markdown = parse_and_normalize(all_results, query, timestamp)
+    for q in queries:
+        all_results = sorted(results_by_query[q], key=lambda r: TOOL_ORDER.index(r["tool"]))
+        markdown = parse_and_normalize(all_results, q, stamps[q])
 
-    md_filename = RESULTS_DIR / f"normalized_{timestamp}.md"
-    with open(md_filename, 'w') as f:
-        f.write(markdown)
+        md_filename = RESULTS_DIR / f"normalized_{stamps[q]}.md"
+        with open(md_filename, 'w') as f:
+            f.write(markdown)
+        files_created.append(md_filename.name)
 
-    print(f"   ✅ Saved: {md_filename.name}")
+        print(f"   ✅ Saved: {md_filename.name}")
 
     # Summary
     print("\n" + "="*80)
@@ -243,11 +272,9 @@ def main():
     print("="*80)
     print(f"\n📂 Results saved to: {RESULTS_DIR}")
     print(f"\n📄 Files created:")
-    print(f"   - raw_exa_{timestamp}.json")
-    print(f"   - raw_linkup_{timestamp}.json")
-    print(f"   - raw_parallel_{timestamp}.json")
-    print(f"   - normalized_{timestamp}.md")
-    print(f"\n💡 Next step: Review normalized_{timestamp}.md")
+    for name in files_created:
+        print(f"   - {name}")
+    print(f"\n💡 Next step: Review {', '.join(f'normalized_{stamps[q]}.md' for q in queries)}")
     print("="*80 + "\n")
 
 
@@ -2,20 +2,47 @@
 """
 Send leads to Clay table via webhook.
 
+Batches are sent concurrently over one pooled connection, with the batch
+size adapting to Clay's latency and 413/429 responses (see clay_sender.py).
+Acknowledged rows are checkpointed in leads/<list>/clay_state.db, so rerunning
+an interrupted send resumes where it stopped instead of sending duplicates.
+
+Sends are incremental: the same file remembers a hash of each row Clay has
+acknowledged for this webhook. Only new rows and rows whose columns changed
+since the last successful send go out. Use --full to resend every row.
+
 Usage:
     python send_to_clay.py --lead-list gtm-engineers-series-a --webhook-url https://api.clay.com/webhooks/...
     python send_to_clay.py --lead-list gtm-engineers-series-a --webhook-url https://api.clay.com/webhooks/... --dry-run
+    python send_to_clay.py --lead-list gtm-engineers-series-a --webhook-url ... --concurrency 16 --max-batch-size 1000
+    python send_to_clay.py --lead-list gtm-engineers-series-a --webhook-url ... --full
 """
 
 import sys
-import json
-import time
 import argparse
 import sqlite3
 import csv
-import httpx
 from pathlib import Path
 from typing import Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from clay_sender import (
+    CHECKPOINT_DB_NAME,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_TARGET_LATENCY,
+    ClayCheckpoint,
+    plan_send,
+    row_id,
+    sanitize_row,
+    send_rows,
+)
+from db_sharded import ShardedLeadDB, is_sharded, shard_dir_for
+from snapshot import NUMPY_AVAILABLE, LeadSnapshot, default_snapshot_path
+
+LEADS_DIR = Path(__file__).parent.parent / "leads"
+# Plain-http stubs on these hosts are accepted for local testing
+LOCAL_HOSTS = ("localhost", "127.0.0.1")
 
 def load_leads_from_csv(csv_path: Path) -> Tuple[list[dict], str]:
     """Load leads from CSV file."""
@@ -32,10 +59,30 @@ def load_leads_from_csv(csv_path: Path) -> Tuple[list[dict], str]:
 
 
 def load_leads_from_db(db_path: Path) -> Tuple[list[dict], str]:
-    """Load leads from SQLite database (completed rows only)."""
-    if not db_path.exists():
+    """Load leads from SQLite database, single-file or sharded (completed rows only)."""
+    sharded = is_sharded(db_path)
+    if not sharded and not db_path.exists():
         return [], f"Database file not found: {db_path}"
 
+    # Reuse an up-to-date columnar snapshot instead of re-reading the table
+    if NUMPY_AVAILABLE:
+        snap, err = LeadSnapshot.open(default_snapshot_path(db_path))
+        if not err and "_status" in snap.columns and not snap.is_stale(db_path):
+            return snap.rows(snap.indices(snap.equals("_status", "completed"))), ""
+
+    if sharded:
+        db = ShardedLeadDB(shard_dir_for(db_path))
+        err = db.connect()
+        if err:
+            return [], f"Failed to read database: {err}"
+        try:
+            rows, err = db.get_rows(status="completed")
+        finally:
+            db.close()
+        if err:
+            return [], f"Failed to read database: {err}"
+        return rows, ""
+
     try:
         conn = sqlite3.connect(db_path)
         conn.row_factory = sqlite3.Row
@@ -53,14 +100,14 @@ def load_leads_from_db(db_path: Path) -> Tuple[list[dict], str]:
 
 def load_leads(lead_list_name: str) -> Tuple[list[dict], str]:
     """Load leads from either CSV or SQLite database."""
-    lead_path = Path(__file__).parent.parent / "leads" / lead_list_name
+    lead_path = LEADS_DIR / lead_list_name
 
     if not lead_path.exists():
         return [], f"Lead list not found: {lead_list_name}"
 
-    # Try SQLite first
+    # Try SQLite first (table.db or table.shards/)
     db_path = lead_path / "table.db"
-    if db_path.exists():
+    if db_path.exists() or is_sharded(db_path):
         return load_leads_from_db(db_path)
 
     # Fallback to CSV
@@ -71,81 +118,14 @@ def load_leads(lead_list_name: str) -> Tuple[list[dict], str]:
     return [], f"No table.db or table.csv found in {lead_path}"
 
 
-def sanitize_row(row: dict) -> dict:
-    """Convert row to JSON-serializable format."""
-    result = {}
-    for key, value in row.items():
-        if value is None:
-            result[key] = None
-        elif isinstance(value, (str, int, float, bool)):
-            result[key] = value
-        else:
-            # Convert to string for non-JSON types
-            result[key] = str(value)
-    return result
-
-
-def send_batch(webhook_url: str, rows: list[dict], batch_num: int, max_retries: int = 3) -> Tuple[int, list[str]]:
-    """
-    Send a batch of rows to Clay webhook.
-
-    Returns: (successful_count, error_messages)
-    """
-    successful = 0
-    errors = []
-
-    for attempt in range(max_retries):
-        try:
-            # Prepare payload: Clay expects array of objects
-            payload = [sanitize_row(row) for row in rows]
-
-            # Send to webhook
-            response = httpx.post(
-                webhook_url,
-                json=payload,
-                timeout=30.0,
-                headers={"Content-Type": "application/json"}
-            )
-
-            if response.status_code in (200, 201, 202):
-                successful = len(rows)
-                return successful, []
-            else:
-                error_msg = f"HTTP {response.status_code}: {response.text[:100]}"
-                errors.append(error_msg)
-
-                # Retry on server errors (5xx)
-                if response.status_code >= 500 and attempt < max_retries - 1:
-                    wait_time = 2 ** attempt  # Exponential backoff
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    break
-
-        except httpx.TimeoutException:
-            error_msg = "Request timeout"
-            errors.append(error_msg)
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
-                continue
-            break
-
-        except Exception as e:
-            error_msg = f"Request failed: {str(e)[:100]}"
-            errors.append(error_msg)
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
-                continue
-            break
-
-    return successful, errors
-
-
 def validate_webhook_url(webhook_url: str) -> Tuple[bool, str]:
     """Validate webhook URL format."""
     if not webhook_url:
         return False, "Webhook URL is required"
 
+    if urlparse(webhook_url).hostname in LOCAL_HOSTS:
+        return True, ""
+
     if not webhook_url.startswith("https://"):
         return False, "Webhook URL must start with https://"
 
@@ -159,9 +139,20 @@ def main():
     parser = argparse.ArgumentParser(description="Send leads to Clay table via webhook")
     parser.add_argument("--lead-list", required=True, help="Lead list name (e.g., gtm-engineers-series-a)")
     parser.add_argument("--webhook-url", required=True, help="Clay table webhook URL")
-    parser.add_argument("--batch-size", type=int, default=10, help="Rows per batch (default: 10)")
+    parser.add_argument("--batch-size", type=int, default=10, help="Starting rows per batch (default: 10)")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help=f"Upper bound for adaptive batch size (default: {DEFAULT_MAX_BATCH_SIZE})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Batches in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--target-latency", type=float, default=DEFAULT_TARGET_LATENCY,
+                        help=f"Seconds per batch above which batches shrink (default: {DEFAULT_TARGET_LATENCY:g})")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the checkpoint of an interrupted send and start over")
+    parser.add_argument("--full", action="store_true",
+                        help="Send every row, not just rows changed since the last successful send")
     parser.add_argument("--dry-run", action="store_true", help="Preview without sending")
-    parser.add_argument("--max-retries", type=int, default=3, help="Retry failed batches (default: 3)")
+    parser.add_argument("--max-retries", type=int, default=3,
+                        help="Attempts per batch, including the first (default: 3)")
 
     args = parser.parse_args()
 
@@ -197,45 +188,67 @@ def main():
             print(f"  {i}. {identifier}")
         print()
 
-    if args.dry_run:
-        print(f"Ready to send {len(leads)} rows in batches of {args.batch_size}.")
-        print("\nUse --dry-run=false to actually send data, or remove --dry-run flag.")
-        return 0
-
-    # Send in batches
-    print(f"Sending in batches of {args.batch_size}...\n")
-
-    total_sent = 0
-    total_failed = 0
-    batch_num = 1
-
-    for i in range(0, len(leads), args.batch_size):
-        batch = leads[i:i + args.batch_size]
-        start_row = i + 1
-        end_row = min(i + args.batch_size, len(leads))
-
-        sent, errors = send_batch(args.webhook_url, batch, batch_num, args.max_retries)
-
-        if errors:
-            status = f"✗ FAILED: {errors[0]}"
-            total_failed += len(batch) - sent
-        else:
-            status = "✓ SUCCESS"
-
-        print(f"Batch {batch_num} (rows {start_row}-{end_row}): {status}")
-
-        total_sent += sent
-        batch_num += 1
-
-        # Small delay between batches
-        if i + args.batch_size < len(leads):
-            time.sleep(0.5)
+    checkpoint = ClayCheckpoint(LEADS_DIR / args.lead_list / CHECKPOINT_DB_NAME, args.webhook_url)
+    try:
+        if args.restart and not args.dry_run:
+            err = checkpoint.clear()
+            if err:
+                print(f"Warning: {err}", file=sys.stderr)
+        plan = plan_send([(row_id(row), sanitize_row(row)) for row in leads], checkpoint, incremental=not args.full)
+        for err in plan.errors:
+            print(f"Warning: {err}", file=sys.stderr)
+        if plan.unchanged:
+            print(f"Unchanged since last send: {plan.unchanged} rows will be skipped (use --full to resend them)")
+        if plan.skipped:
+            print(f"Resuming: {plan.skipped} rows already acknowledged by this webhook will be skipped "
+                  f"(use --restart to resend them)")
+        if plan.unchanged or plan.skipped:
+            print()
+
+        if not plan.to_send:
+            print("Nothing to send: Clay already has every row.")
+            return 0
+
+        if args.dry_run:
+            print(f"Ready to send {len(plan.to_send)} rows starting at batches of {args.batch_size} "
+                  f"({args.concurrency} in flight).")
+            print("\nUse --dry-run=false to actually send data, or remove --dry-run flag.")
+            return 0
+
+        # Send batches concurrently
+        print(f"Sending with {args.concurrency} concurrent batches, starting at {args.batch_size} rows...\n")
+
+        def report(batch_num: int, rows: int, error: str) -> None:
+            status = f"✗ FAILED: {error}" if error else "✓ SUCCESS"
+            print(f"Batch {batch_num} ({rows} rows): {status}")
+
+        result = send_rows(
+            args.webhook_url,
+            leads,
+            checkpoint=checkpoint,
+            incremental=not args.full,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            max_batch_size=args.max_batch_size,
+            target_latency=args.target_latency,
+            max_retries=args.max_retries,
+            on_batch=report,
+        )
+    finally:
+        checkpoint.close()
+
+    # Rows acknowledged earlier (unchanged, or by the resumed send) count as delivered
+    total_sent = result.sent + result.skipped + result.unchanged
+    total_failed = result.failed
 
     # Summary
     print(f"\nSummary:")
     print(f"  Total rows: {len(leads)}")
-    print(f"  Sent: {total_sent} ✓")
+    print(f"  Sent: {result.sent} ✓")
+    if result.unchanged or result.skipped:
+        print(f"  Already in Clay: {result.unchanged + result.skipped}")
     print(f"  Failed: {total_failed} ✗")
+    print(f"  Stats: {result.format_summary()}")
     success_rate = (total_sent / len(leads) * 100) if leads else 0
     print(f"  Success rate: {success_rate:.1f}%")
 
@@ -5,9 +5,14 @@ Show Enrichment Workflow - Visual pipeline display
 Displays the enrichment pipeline with statistics, showing which integrations ran,
 success rates, and data flow.
 
+Accepts an enriched CSV, a lead table database (table.db or table.shards/) or
+a snapshot directory; databases are analyzed through their memory-mapped
+columnar snapshot.
+
 Usage:
     python show_enrichment_workflow.py <csv_file>
     python show_enrichment_workflow.py lead-list/gtm-influencers_enriched.csv
+    python show_enrichment_workflow.py leads/yc-f25/table.db
 """
 
 import argparse
@@ -24,6 +29,8 @@ from rich import box
 from rich.layout import Layout
 from rich.text import Text
 
+from snapshot import NUMPY_AVAILABLE, is_snapshot_source, open_lead_snapshot
+
 console = Console()
 
 
@@ -92,14 +99,39 @@ def calculate_integration_stats(rows: List[Dict], integration: str, columns: Lis
     }
 
 
+def calculate_integration_stats_snapshot(snap, integration: str, columns: List[str]) -> Dict:
+    """Calculate statistics for an integration from a columnar snapshot."""
+
+    total = snap.row_count
+    has_data = ~snap.all_rows()
+    for col in columns:
+        has_data |= snap.truthy(col)
+    populated = int(has_data.sum())
+
+    return {
+        "total": total,
+        "populated": populated,
+        "empty": total - populated,
+        "success_rate": (populated / total * 100) if total > 0 else 0,
+        "columns": columns
+    }
+
+
 def show_workflow(filepath: str):
     """Display enrichment workflow visualization."""
 
     console.print("\n")
 
-    # Load data
+    # Load data (databases go through the columnar snapshot)
+    snap = None
     with console.status("[cyan]Analyzing enrichment workflow...", spinner="dots"):
-        rows, headers, err = load_csv(filepath)
+        if NUMPY_AVAILABLE and is_snapshot_source(Path(filepath)):
+            snap, err = open_lead_snapshot(Path(filepath))
+            headers = snap.columns if snap else []
+            row_count = snap.row_count if snap else 0
+        else:
+            rows, headers, err = load_csv(filepath)
+            row_count = len(rows)
         if err:
             console.print(f"\n[red]❌ {err}[/red]\n")
             sys.exit(1)
@@ -114,7 +146,10 @@ def show_workflow(filepath: str):
     # Calculate stats
     stats = {}
     for integration, columns in integrations.items():
-        stats[integration] = calculate_integration_stats(rows, integration, columns)
+        if snap:
+            stats[integration] = calculate_integration_stats_snapshot(snap, integration, columns)
+        else:
+            stats[integration] = calculate_integration_stats(rows, integration, columns)
 
     # Show header
     console.rule("[bold blue]ENRICHMENT WORKFLOW[/bold blue]", style="blue")
@@ -125,7 +160,7 @@ def show_workflow(filepath: str):
     info_table.add_column("Key", style="cyan")
     info_table.add_column("Value", style="white")
     info_table.add_row("File", filepath)
-    info_table.add_row("Total Rows", str(len(rows)))
+    info_table.add_row("Total Rows", str(row_count))
     info_table.add_row("Integrations Detected", str(len(integrations)))
     info_table.add_row("Total Columns", str(len(headers)))
 
@@ -210,7 +245,7 @@ def show_workflow(filepath: str):
                 integration_branch.add(f"└─ {col}")
 
     output_branch = tree.add("📤 [bold green]Enriched CSV[/bold green]")
-    output_branch.add(f"✓ {len(rows)} rows enriched")
+    output_branch.add(f"✓ {row_count} rows enriched")
     output_branch.add(f"✓ {sum(len(cols) for cols in integrations.values())} new columns added")
 
     console.print(tree)
@@ -250,7 +285,7 @@ def show_workflow(filepath: str):
 
     # Overall summary
     total_populated = sum(s["populated"] for s in stats.values())
-    total_possible = len(stats) * len(rows)
+    total_possible = len(stats) * row_count
     overall_rate = (total_populated / total_possible * 100) if total_possible > 0 else 0
 
     summary_table = Table(box=box.SIMPLE, show_header=False, padding=(0, 2))
@@ -258,7 +293,7 @@ def show_workflow(filepath: str):
     summary_table.add_column("Value", style="white")
 
     summary_table.add_row("Overall Success Rate", f"{overall_rate:.1f}%")
-    summary_table.add_row("Total Integration Runs", str(len(stats) * len(rows)))
+    summary_table.add_row("Total Integration Runs", str(len(stats) * row_count))
     summary_table.add_row("Successful Runs", str(total_populated))
     summary_table.add_row("Failed/Empty Runs", str(total_possible - total_populated))
 
@@ -268,7 +303,7 @@ def show_workflow(filepath: str):
 
 def main():
     parser = argparse.ArgumentParser(description="Enrichment workflow visualizer")
-    parser.add_argument("file", help="Path to enriched CSV file")
+    parser.add_argument("file", help="Path to enriched CSV file, table.db or snapshot directory")
 
     args = parser.parse_args()
 
@@ -4,8 +4,15 @@ Show Table - Interactive CSV table viewer
 
 Displays enriched lead data in an interactive terminal table with sorting, filtering, and pagination.
 
+Accepts a CSV file, a lead table database (table.db, or a sharded
+table.shards/) or a snapshot directory. Databases are read through a
+memory-mapped columnar snapshot (rebuilt when the database changes), so
+filters and column stats run vectorized and only the displayed rows are
+decoded.
+
 Usage:
     python show_table.py <csv_file>
+    python show_table.py leads/yc-f25/table.db --filter "_status=completed"
     python show_table.py lead-list/gtm-influencers_enriched.csv
     python show_table.py lead-list/gtm-influencers_enriched.csv --columns name,headline,follower_count
     python show_table.py lead-list/gtm-influencers_enriched.csv --filter "follower_count>10000"
@@ -22,6 +29,8 @@ from rich.table import Table
 from rich.panel import Panel
 from rich import box
 
+from snapshot import NUMPY_AVAILABLE, is_snapshot_source, open_lead_snapshot
+
 console = Console()
 
 
@@ -71,6 +80,83 @@ def truncate_value(value: str, max_len: int = 30) -> str:
     return value
 
 
+def show_snapshot_table(
+    filepath: str,
+    columns: List[str] = None,
+    limit: int = 50,
+    filter_expr: str = None,
+    show_stats: bool = True
+):
+    """Display a lead table database or snapshot directory via its columnar snapshot."""
+
+    console.print("\n")
+    with console.status("[cyan]Opening snapshot...", spinner="dots"):
+        snap, err = open_lead_snapshot(Path(filepath))
+        if err:
+            console.print(f"\n[red]❌ {err}[/red]\n")
+            sys.exit(1)
+
+    mask = snap.all_rows()
+    if filter_expr:
+        filtered, err = snap.filter(filter_expr)
+        if err:
+            console.print(f"[yellow]⚠️  Filter error: {err}[/yellow]")
+        else:
+            mask = filtered
+    indices = snap.indices(mask)
+
+    # Internal columns (_id, _status, ...) are hidden unless asked for
+    headers = snap.columns
+    display_cols = columns if columns else [c for c in headers if not c.startswith("_")]
+
+    info_table = Table(box=box.SIMPLE, show_header=False, padding=(0, 2))
+    info_table.add_column("Key", style="cyan")
+    info_table.add_column("Value", style="white")
+    info_table.add_row("File", filepath)
+    info_table.add_row("Total Rows", str(len(indices)))
+    info_table.add_row("Total Columns", str(len(headers)))
+    info_table.add_row("Displaying Columns", str(len(display_cols)))
+    if filter_expr:
+        info_table.add_row("Filter", filter_expr)
+
+    console.print(Panel(info_table, title="[bold blue]Lead Table View[/bold blue]", border_style="blue"))
+    console.print()
+
+    if show_stats:
+        stats_table = Table(box=box.ROUNDED, show_header=True, header_style="bold cyan")
+        stats_table.add_column("Column", style="cyan")
+        stats_table.add_column("Populated", style="green")
+        stats_table.add_column("Empty", style="red")
+        stats_table.add_column("Fill Rate", style="yellow")
+
+        for col in display_cols:
+            if col not in headers:
+                continue
+            col_stats = snap.aggregate(col, mask)
+            populated = col_stats["filled"]
+            empty = col_stats["rows"] - populated
+            fill_rate = (populated / col_stats["rows"] * 100) if col_stats["rows"] > 0 else 0
+            stats_table.add_row(col, str(populated), str(empty), f"{fill_rate:.1f}%")
+
+        console.print(stats_table)
+        console.print()
+
+    data_table = Table(box=box.SIMPLE_HEAD, show_header=True, header_style="bold magenta")
+    for col in display_cols:
+        data_table.add_column(col, overflow="fold")
+
+    for row in snap.rows(indices[:limit], display_cols):
+        values = [truncate_value(str(row.get(col) if row.get(col) is not None else "")) for col in display_cols]
+        data_table.add_row(*values)
+
+    console.print(data_table)
+
+    if len(indices) > limit:
+        console.print(f"\n[yellow]Showing first {limit} of {len(indices)} rows. Use --limit to show more.[/yellow]")
+
+    console.print()
+
+
 def show_table(
     filepath: str,
     columns: List[str] = None,
@@ -80,6 +166,9 @@ def show_table(
 ):
     """Display CSV data as a rich table."""
 
+    if NUMPY_AVAILABLE and is_snapshot_source(Path(filepath)):
+        return show_snapshot_table(filepath, columns, limit, filter_expr, show_stats)
+
     # Load data
     console.print("\n")
     with console.status("[cyan]Loading data...", spinner="dots"):
@@ -154,7 +243,7 @@ def show_table(
 
 def main():
     parser = argparse.ArgumentParser(description="Interactive CSV table viewer")
-    parser.add_argument("file", help="Path to CSV file")
+    parser.add_argument("file", help="Path to CSV file, table.db or snapshot directory")
     parser.add_argument("--columns", help="Comma-separated list of columns to display (default: all)")
     parser.add_argument("--limit", type=int, default=50, help="Number of rows to display (default: 50)")
     parser.add_argument("--filter", help="Filter expression (e.g., 'follower_count>10000')")
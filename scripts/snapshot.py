@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Columnar snapshots of lead tables.
+
+A snapshot is a directory holding one set of files per column, written once
+from SQLite and read back through mmap, so opening a million-row table costs
+a manifest read and queries only touch the pages they need:
+
+    snapshot.json                manifest (row count, columns, source, created_at)
+    c<n>.offsets.npy  int64[n+1] byte offsets into c<n>.data.bin
+    c<n>.data.bin     uint8      UTF-8 bytes of every value, concatenated
+    c<n>.num.npy      float64[n] numeric view of the value (NaN if not a number)
+    c<n>.key.npy      uint64[n]  hash of the normalized value (stripped, lowercased)
+    c<n>.filled.npy   bool[n]    value is non-null and non-blank
+    c<n>.null.npy     bool[n]    value is NULL
+    c<n>.kind.npy     uint8[n]   SQLite storage class (KIND_TEXT / KIND_INTEGER / KIND_REAL)
+
+Filters, sorts and aggregates run as NumPy operations over these arrays;
+only the rows actually displayed are decoded back into dicts. Decoded values
+keep their SQLite type (int / float / str), so rows read from a snapshot
+equal rows read with SELECT.
+
+Requires numpy (optional dependency: callers check NUMPY_AVAILABLE and fall
+back to their row-at-a-time path).
+
+Error-first pattern: All functions return (result, error) tuples.
+"""
+
+import hashlib
+import heapq
+import json
+import shutil
+import sqlite3
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+MANIFEST_NAME = "snapshot.json"
+SNAPSHOT_VERSION = 2
+FETCH_CHUNK_SIZE = 10000
+
+# SQLite storage class per value (typeof()), so values decode to the same types SELECT returns
+KIND_TEXT = 0
+KIND_INTEGER = 1
+KIND_REAL = 2
+_KINDS = {"integer": KIND_INTEGER, "real": KIND_REAL}
+
+# Ordered so multi-character operators are matched before their prefixes
+FILTER_OPERATORS = (">=", "<=", "!=", ">", "<", "=")
+
+
+def _quote_ident(identifier: str) -> str:
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+def normalized_key(value: str) -> int:
+    """64-bit hash of a value after strip + lowercase (used for equality filters)."""
+    digest = hashlib.blake2b(value.strip().lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def default_snapshot_path(db_path: Path) -> Path:
+    """Snapshot directory that sits next to a table.db (table.snapshot/)."""
+    return Path(db_path).with_suffix(".snapshot")
+
+
+def _column_values(conn: sqlite3.Connection, table_q: str, name: str, shard_schemas: list[str]):
+    """
+    Iterate (text, typeof, raw) for one column in snapshot row order.
+
+    Without shards: rowid order. With shards: each shard is read in rowid
+    order and the streams are merged by (_source_row_index, global _id), as
+    ShardedLeadDB.get_rows() does; _id is rewritten to the global ID
+    (local_id * N + shard). Rows are pulled from the cursors lazily.
+    """
+    name_q = _quote_ident(name)
+    if not shard_schemas:
+        return iter(conn.execute(f"SELECT CAST({name_q} AS TEXT), typeof({name_q}), {name_q} FROM {table_q} ORDER BY rowid"))
+
+    n = len(shard_schemas)
+    streams = []
+    for i, schema in enumerate(shard_schemas):
+        global_id = f"(_id * {n} + {i})"
+        expr = global_id if name == "_id" else name_q
+        streams.append(conn.execute(
+            f"SELECT COALESCE(_source_row_index, 0), {global_id}, CAST({expr} AS TEXT), typeof({expr}), {expr} "
+            f"FROM {_quote_ident(schema)}.{table_q} ORDER BY rowid"
+        ))
+    return (row[2:] for row in heapq.merge(*streams, key=lambda row: (row[0], row[1])))
+
+
+def write_snapshot(
+    conn: sqlite3.Connection,
+    output_dir: Path,
+    table: str = "leads",
+    source: Optional[str] = None,
+    created_at: Optional[str] = None,
+    shard_schemas: Optional[list[str]] = None,
+) -> tuple[dict, str]:
+    """
+    Write a columnar snapshot of an SQLite table.
+
+    Columns are streamed one at a time in rowid order, so memory use is bounded
+    by FETCH_CHUNK_SIZE rather than by table size. The snapshot is built in a
+    temporary directory and swapped in at the end.
+
+    Args:
+        conn: SQLite connection (a read-only connection is enough)
+        output_dir: Snapshot directory to (re)create
+        table: Table to snapshot
+        source: Optional source description recorded in the manifest
+        created_at: Time the source was read (default: now, before reading)
+        shard_schemas: Attached shard databases holding `table` (in shard
+            order); their rows are merged into one snapshot without copying
+
+    Returns:
+        (manifest, error): Manifest dict and error message
+    """
+    if not NUMPY_AVAILABLE:
+        return {}, "snapshot requires numpy (pip install numpy)"
+
+    output_dir = Path(output_dir)
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    # Stamped before reading: writes that land during the build are newer
+    # than created_at, so is_stale() reports them
+    created_at = created_at or datetime.now().isoformat()
+    own_transaction = not conn.in_transaction
+
+    try:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+        # One read transaction, so every column comes from the same version of the table
+        if own_transaction:
+            conn.execute("BEGIN")
+
+        table_q = _quote_ident(table)
+        shard_schemas = shard_schemas or []
+        sources = [f"{_quote_ident(schema)}.{table_q}" for schema in shard_schemas] or [table_q]
+        pragma_prefix = f"{_quote_ident(shard_schemas[0])}." if shard_schemas else ""
+        columns_info = conn.execute(f"PRAGMA {pragma_prefix}table_info({table_q})").fetchall()
+        if not columns_info:
+            return {}, f"table not found: {table}"
+
+        row_count = sum(conn.execute(f"SELECT COUNT(*) FROM {src}").fetchone()[0] for src in sources)
+
+        columns = []
+        for idx, info in enumerate(columns_info):
+            name, decl_type = info[1], (info[2] or "").upper()
+            prefix = f"c{idx}"
+            col_type = "integer" if "INT" in decl_type else "text"
+
+            offsets = np.lib.format.open_memmap(tmp_dir / f"{prefix}.offsets.npy", mode="w+", dtype=np.int64, shape=(row_count + 1,))
+            num = np.lib.format.open_memmap(tmp_dir / f"{prefix}.num.npy", mode="w+", dtype=np.float64, shape=(row_count,))
+            key = np.lib.format.open_memmap(tmp_dir / f"{prefix}.key.npy", mode="w+", dtype=np.uint64, shape=(row_count,))
+            filled = np.lib.format.open_memmap(tmp_dir / f"{prefix}.filled.npy", mode="w+", dtype=np.bool_, shape=(row_count,))
+            null = np.lib.format.open_memmap(tmp_dir / f"{prefix}.null.npy", mode="w+", dtype=np.bool_, shape=(row_count,))
+            kind = np.lib.format.open_memmap(tmp_dir / f"{prefix}.kind.npy", mode="w+", dtype=np.uint8, shape=(row_count,))
+
+            offsets[0] = 0
+            position = 0
+            i = 0
+            column_values = _column_values(conn, table_q, name, shard_schemas)
+            with open(tmp_dir / f"{prefix}.data.bin", "wb") as data_file:
+                while True:
+                    chunk = list(islice(column_values, FETCH_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    n = len(chunk)
+                    if i + n > row_count:
+                        return {}, f"table {table} changed while writing snapshot"
+
+                    values = [row[0] for row in chunk]
+                    encoded = [b"" if v is None else v.encode("utf-8") for v in values]
+                    data_file.write(b"".join(encoded))
+
+                    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=n)
+                    offsets[i + 1:i + n + 1] = position + np.cumsum(lengths)
+                    position += int(lengths.sum())
+
+                    null[i:i + n] = [v is None for v in values]
+                    filled[i:i + n] = [bool(v and v.strip()) for v in values]
+                    kind[i:i + n] = [_KINDS.get(row[1], KIND_TEXT) for row in chunk]
+                    # REALs keep their exact float (their TEXT cast rounds to 15 digits)
+                    num[i:i + n] = [float(row[2]) if row[1] == "real" else _to_float(row[0]) for row in chunk]
+                    key[i:i + n] = np.fromiter((normalized_key(v or "") for v in values), dtype=np.uint64, count=n)
+                    i += n
+
+            if i != row_count:
+                return {}, f"table {table} changed while writing snapshot"
+
+            for arr in (offsets, num, key, filled, null, kind):
+                arr.flush()
+            del offsets, num, key, filled, null, kind
+
+            columns.append({"name": name, "file": prefix, "type": col_type, "bytes": position})
+
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "table": table,
+            "source": source or "",
+            "row_count": row_count,
+            "columns": columns,
+            "created_at": created_at,
+        }
+        with open(tmp_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+        tmp_dir.rename(output_dir)
+        return manifest, ""
+    except Exception as e:
+        return {}, f"write_snapshot error: {e}"
+    finally:
+        if own_transaction and conn.in_transaction:
+            conn.rollback()
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class _Column:
+    """Lazily mmapped arrays for one snapshot column."""
+
+    def __init__(self, base: Path, meta: dict):
+        self.name = meta["name"]
+        self.type = meta.get("type", "text")
+        prefix = base / meta["file"]
+        self.offsets = np.load(f"{prefix}.offsets.npy", mmap_mode="r")
+        self.num = np.load(f"{prefix}.num.npy", mmap_mode="r")
+        self.key = np.load(f"{prefix}.key.npy", mmap_mode="r")
+        self.filled = np.load(f"{prefix}.filled.npy", mmap_mode="r")
+        self.null = np.load(f"{prefix}.null.npy", mmap_mode="r")
+        self.kind = np.load(f"{prefix}.kind.npy", mmap_mode="r")
+        data_path = Path(f"{prefix}.data.bin")
+        if data_path.stat().st_size > 0:
+            self.data = np.memmap(data_path, dtype=np.uint8, mode="r")
+        else:
+            self.data = np.zeros(0, dtype=np.uint8)
+
+    def text(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def value(self, i: int):
+        """Value of row i with its SQLite type (None, int, float or str)."""
+        if self.null[i]:
+            return None
+        kind = self.kind[i]
+        if kind == KIND_INTEGER:
+            return int(self.text(i))
+        if kind == KIND_REAL:
+            return float(self.num[i])
+        return self.text(i)
+
+
+class LeadSnapshot:
+    """Read-only, mmap-backed view of a snapshot directory."""
+
+    def __init__(self, path: Path, manifest: dict):
+        self.path = Path(path)
+        self.manifest = manifest
+        self.row_count: int = manifest["row_count"]
+        self.columns: list[str] = [c["name"] for c in manifest["columns"]]
+        self._meta = {c["name"]: c for c in manifest["columns"]}
+        self._cache: dict[str, _Column] = {}
+
+    @classmethod
+    def open(cls, path: Path) -> tuple[Optional["LeadSnapshot"], str]:
+        """
+        Open a snapshot directory.
+
+        Returns:
+            (snapshot, error): LeadSnapshot and error message
+        """
+        if not NUMPY_AVAILABLE:
+            return None, "snapshot requires numpy (pip install numpy)"
+
+        manifest_path = Path(path) / MANIFEST_NAME
+        if not manifest_path.exists():
+            return None, f"snapshot not found: {path}"
+
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != SNAPSHOT_VERSION:
+                return None, f"unsupported snapshot version: {manifest.get('version')}"
+            return cls(path, manifest), ""
+        except Exception as e:
+            return None, f"open snapshot error: {e}"
+
+    def is_stale(self, db_path: Path) -> bool:
+        """True if the database (or its WAL, or any shard of it) was modified after this snapshot."""
+        created = datetime.fromisoformat(self.manifest["created_at"]).timestamp()
+        for db_file in _source_files(db_path):
+            if db_file.exists() and db_file.stat().st_mtime > created:
+                return True
+            # Read-only openers create an empty WAL; only one holding frames means writes
+            wal = Path(str(db_file) + "-wal")
+            if wal.exists() and wal.stat().st_size > 0 and wal.stat().st_mtime > created:
+                return True
+        return False
+
+    def _column(self, name: str) -> _Column:
+        if name not in self._cache:
+            if name not in self._meta:
+                raise KeyError(f"unknown column: {name}")
+            self._cache[name] = _Column(self.path, self._meta[name])
+        return self._cache[name]
+
+    def all_rows(self):
+        """Mask selecting every row."""
+        return np.ones(self.row_count, dtype=np.bool_)
+
+    def indices(self, mask):
+        """Row indices selected by a boolean mask."""
+        return np.flatnonzero(mask)
+
+    def filled(self, name: str):
+        """Boolean mask: value is non-null and non-blank."""
+        return np.asarray(self._column(name).filled)
+
+    def numeric(self, name: str):
+        """Float view of a column (NaN where the value is not a number)."""
+        return np.asarray(self._column(name).num)
+
+    def iequals(self, name: str, value: str):
+        """Boolean mask: normalized value equals `value` (case-insensitive, stripped)."""
+        return np.asarray(self._column(name).key) == np.uint64(normalized_key(value))
+
+    def equals(self, name: str, value: str):
+        """Boolean mask: value equals `value` exactly, like SQL `=` (NULL never matches)."""
+        col = self._column(name)
+        target = np.frombuffer(value.encode("utf-8"), dtype=np.uint8)
+        # The normalized key narrows down the candidates; their bytes decide
+        candidates = np.flatnonzero(self.iequals(name, value) & ~np.asarray(col.null))
+        starts = np.asarray(col.offsets[candidates])
+        same_length = (np.asarray(col.offsets[candidates + 1]) - starts) == target.size
+        candidates, starts = candidates[same_length], starts[same_length]
+
+        mask = np.zeros(self.row_count, dtype=np.bool_)
+        if not target.size:
+            mask[candidates] = True
+            return mask
+        span = np.arange(target.size)
+        for i in range(0, candidates.size, FETCH_CHUNK_SIZE):
+            chunk = slice(i, i + FETCH_CHUNK_SIZE)
+            matched = (col.data[starts[chunk, None] + span] == target).all(axis=1)
+            mask[candidates[chunk][matched]] = True
+        return mask
+
+    def truthy(self, name: str):
+        """Boolean mask: filled and not a falsy literal ("0", "false")."""
+        col = self._column(name)
+        falsy = (col.key == np.uint64(normalized_key("0"))) | (col.key == np.uint64(normalized_key("false")))
+        return np.asarray(col.filled) & ~falsy
+
+    def filter(self, expr: str) -> tuple[object, str]:
+        """
+        Evaluate a simple filter expression: column>value, column<value,
+        column>=value, column<=value, column=value, column!=value.
+
+        Numeric comparisons exclude non-numeric values; equality is
+        case-insensitive.
+
+        Returns:
+            (mask, error): Boolean mask and error message
+        """
+        if not expr:
+            return self.all_rows(), ""
+
+        for op in FILTER_OPERATORS:
+            if op in expr:
+                col, val = (part.strip() for part in expr.split(op, 1))
+                break
+        else:
+            return self.all_rows(), f"invalid filter: {expr}"
+
+        if col not in self._meta:
+            return self.all_rows(), f"unknown column: {col}"
+
+        try:
+            if op == "=":
+                return self.iequals(col, val), ""
+            if op == "!=":
+                return ~self.iequals(col, val), ""
+
+            threshold = float(val)
+            num = self.numeric(col)
+            with np.errstate(invalid="ignore"):
+                if op == ">":
+                    return num > threshold, ""
+                if op == "<":
+                    return num < threshold, ""
+                if op == ">=":
+                    return num >= threshold, ""
+                return num <= threshold, ""
+        except ValueError:
+            return self.all_rows(), f"non-numeric value in filter: {expr}"
+
+    def sort(self, name: str, mask=None, descending: bool = False):
+        """
+        Row indices ordered by a column's numeric value (non-numeric rows last).
+
+        Args:
+            name: Column to sort by
+            mask: Optional boolean mask restricting the rows returned
+            descending: Sort largest first
+        """
+        indices = self.indices(mask) if mask is not None else np.arange(self.row_count)
+        values = self.numeric(name)[indices]
+        sort_values = -values if descending else values
+        order = np.argsort(sort_values, kind="stable")  # NaN sorts to the end
+        return indices[order]
+
+    def aggregate(self, name: str, mask=None) -> dict:
+        """Count, fill and numeric summary stats of a column over the masked rows."""
+        if mask is None:
+            mask = self.all_rows()
+        filled = self.filled(name)[mask]
+        num = self.numeric(name)[mask]
+        numeric = num[~np.isnan(num)]
+        stats = {
+            "rows": int(mask.sum()),
+            "filled": int(filled.sum()),
+            "numeric": int(numeric.size),
+        }
+        if numeric.size:
+            stats.update({
+                "sum": float(numeric.sum()),
+                "mean": float(numeric.mean()),
+                "min": float(numeric.min()),
+                "max": float(numeric.max()),
+            })
+        return stats
+
+    def rows(self, indices, columns: Optional[list[str]] = None) -> list[dict]:
+        """Decode the given row indices into dicts (only the requested columns)."""
+        names = columns or self.columns
+        cols = [self._column(n) for n in names if n in self._meta]
+        return [{c.name: c.value(int(i)) for c in cols} for i in indices]
+
+
+def _source_files(db_path: Path) -> list[Path]:
+    """SQLite files holding a lead table: its shards if it is sharded, else table.db."""
+    from db_sharded import is_sharded, shard_dir_for, shard_files
+
+    if is_sharded(db_path):
+        files, err = shard_files(shard_dir_for(db_path))
+        if not err:
+            return files
+    return [Path(db_path)]
+
+
+def _attach_shards(db_path: Path) -> tuple[Optional[sqlite3.Connection], list[str], str]:
+    """
+    Connection with every shard of a sharded table attached read-only.
+
+    The main database is empty; write_snapshot(shard_schemas=...) reads the
+    shards directly, so no merged copy of the table is built.
+
+    Returns:
+        (conn, shard_schemas, error)
+    """
+    from db_sharded import shard_dir_for, shard_files
+
+    files, err = shard_files(shard_dir_for(db_path))
+    if err:
+        return None, [], err
+    try:
+        # URI mode, so the shards can be attached with ?mode=ro
+        conn = sqlite3.connect("file::memory:", uri=True)
+        schemas = []
+        for i, db_file in enumerate(files):
+            conn.execute(f"ATTACH DATABASE ? AS shard{i}", (db_file.resolve().as_uri() + "?mode=ro",))
+            schemas.append(f"shard{i}")
+        return conn, schemas, ""
+    except Exception as e:
+        return None, [], f"attach shards error: {e}"
+
+
+def is_snapshot_source(path: Path) -> bool:
+    """True if `path` is a SQLite lead table (table.db or table.shards) or a snapshot directory."""
+    path = Path(path)
+    return path.suffix in (".db", ".shards") or (path / MANIFEST_NAME).exists()
+
+
+def open_lead_snapshot(path: Path, refresh: bool = True) -> tuple[Optional[LeadSnapshot], str]:
+    """
+    Open a snapshot for a table.db (rebuilding it when stale) or a snapshot directory.
+
+    A sharded table (table.shards/ next to table.db) is snapshotted as one
+    table, in source order with global row IDs.
+
+    Args:
+        path: Path to table.db, table.shards or a snapshot directory
+        refresh: Rebuild the snapshot if the database changed since it was written
+
+    Returns:
+        (snapshot, error): LeadSnapshot and error message
+    """
+    from db_sharded import is_sharded
+
+    path = Path(path)
+    if path.suffix == ".shards":
+        path = path.with_suffix(".db")
+    elif path.suffix != ".db":
+        return LeadSnapshot.open(path)
+
+    snapshot_path = default_snapshot_path(path)
+    snap, err = LeadSnapshot.open(snapshot_path)
+    if not err and not (refresh and snap.is_stale(path)):
+        return snap, ""
+
+    created_at = datetime.now().isoformat()
+    shard_schemas: list[str] = []
+    if is_sharded(path):
+        conn, shard_schemas, err = _attach_shards(path)
+        if err:
+            return None, err
+    elif not path.exists():
+        return None, f"Database file not found: {path}"
+    else:
+        # Read-only connection: never checkpoints, so it can't bump the db mtime
+        try:
+            conn = sqlite3.connect(path.resolve().as_uri() + "?mode=ro", uri=True)
+        except Exception as e:
+            return None, f"connect error: {e}"
+    try:
+        _, err = write_snapshot(conn, snapshot_path, source=str(path), created_at=created_at, shard_schemas=shard_schemas)
+    finally:
+        conn.close()
+    if err:
+        return None, err
+    return LeadSnapshot.open(snapshot_path)
@@ -7,23 +7,36 @@ campaigns and updates the corresponding Neon campaign tables.
 
 Supports:
 - Single campaign sync (--campaign-id)
-- Multi-campaign sync (--all)
+- Multi-campaign sync (--all), optionally in parallel (--workers N)
 - Dry-run mode (--dry-run)
+
+Each campaign is reconciled set-based: HeyReach lead/conversation state is
+staged in bounded chunks (RECONCILE_CHUNK_ROWS leads per statement) and joined
+to the campaign table, so Neon round trips scale with chunks, not prospects.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import io
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from datagen_sdk import DatagenClient
 
+from heyreach_pager import iter_items
+from neon_client import NeonClient, render
+
+# Staged leads per reconcile statement (keeps each statement's size bounded)
+RECONCILE_CHUNK_ROWS = 500
+
 
 def _utc_now_stamp() -> str:
     """Get current UTC timestamp in ISO format."""
@@ -61,43 +74,6 @@ def _ensure_env_loaded() -> None:
         )
 
 
-def _sql_quote(text: str) -> str:
-    """Escape single quotes for SQL."""
-    return "'" + text.replace("'", "''") + "'"
-
-
-def _sql_text(value: Optional[str]) -> str:
-    """Convert string to SQL text literal or NULL."""
-    if value is None:
-        return "NULL"
-    return _sql_quote(value)
-
-
-def _sql_int(value: Optional[int]) -> str:
-    """Convert int to SQL literal or NULL."""
-    if value is None:
-        return "NULL"
-    return str(int(value))
-
-
-def _sql_bool(value: bool) -> str:
-    """Convert bool to SQL literal."""
-    return "TRUE" if value else "FALSE"
-
-
-def _sql_timestamptz(value: Optional[str]) -> str:
-    """Convert ISO timestamp string to SQL timestamptz literal or NULL."""
-    if not value:
-        return "NULL"
-    return f"{_sql_quote(value)}::timestamptz"
-
-
-def _sql_jsonb(value: Any) -> str:
-    """Convert Python object to SQL jsonb literal."""
-    dumped = json.dumps(value, ensure_ascii=False)
-    return f"{_sql_quote(dumped)}::jsonb"
-
-
 @dataclass(frozen=True)
 class NeonCampaign:
     """Represents a campaign record from Neon database."""
@@ -136,51 +112,19 @@ class HeyReachConversation:
     messages: list[dict[str, Any]]
 
 
-@dataclass(frozen=True)
-class SyncResult:
-    """Result of syncing a single prospect."""
-    prospect_id: int
-    linkedin_url: str
-    status_updated: bool
-    old_status: Optional[str]
-    new_status: Optional[str]
-    contacted_at: Optional[str]
-    responded_at: Optional[str]
-
-
-def _run_sql(client: DatagenClient, *, project_id: str, branch_id: str, database_name: str, sql: str) -> Any:
-    """Execute SQL query against Neon database."""
-    return client.execute_tool(
-        "mcp_Neon_run_sql",
-        {"sql": sql, "projectId": project_id, "databaseName": database_name},
-    )
-
-
-def _fetch_neon_campaign(
-    client: DatagenClient,
-    *,
-    project_id: str,
-    branch_id: str,
-    database_name: str,
-    campaign_id: int,
-) -> Optional[NeonCampaign]:
+def _fetch_neon_campaign(neon: NeonClient, *, campaign_id: int) -> Optional[NeonCampaign]:
     """Fetch campaign record from Neon database."""
-    sql = f"""
+    row = neon.query_one(
+        """
 SELECT id, name, table_name, heyreach_campaign_id, total_prospects, contacted, responded
 FROM campaigns
-WHERE id = {campaign_id};
-""".strip()
-
-    result = _run_sql(client, project_id=project_id, branch_id=branch_id, database_name=database_name, sql=sql)
-
-    if not result or not isinstance(result, list) or len(result) == 0:
-        return None
-
-    rows = result[0] if isinstance(result[0], list) else []
-    if not rows:
+WHERE id = %s;
+""".strip(),
+        [campaign_id],
+    )
+    if not row:
         return None
 
-    row = rows[0]
     return NeonCampaign(
         id=row.get("id"),
         name=row.get("name"),
@@ -192,27 +136,14 @@ WHERE id = {campaign_id};
     )
 
 
-def _fetch_all_neon_campaigns(
-    client: DatagenClient,
-    *,
-    project_id: str,
-    branch_id: str,
-    database_name: str,
-) -> list[NeonCampaign]:
+def _fetch_all_neon_campaigns(neon: NeonClient) -> list[NeonCampaign]:
     """Fetch all campaigns with heyreach_campaign_id set."""
-    sql = """
+    rows = neon.query("""
 SELECT id, name, table_name, heyreach_campaign_id, total_prospects, contacted, responded
 FROM campaigns
 WHERE heyreach_campaign_id IS NOT NULL
 ORDER BY id;
-""".strip()
-
-    result = _run_sql(client, project_id=project_id, branch_id=branch_id, database_name=database_name, sql=sql)
-
-    if not result or not isinstance(result, list) or len(result) == 0:
-        return []
-
-    rows = result[0] if isinstance(result[0], list) else []
+""".strip())
     campaigns = []
 
     for row in rows:
@@ -235,58 +166,37 @@ def _fetch_heyreach_campaign_leads(
     heyreach_campaign_id: int,
 ) -> list[HeyReachLead]:
     """Fetch all leads from a HeyReach campaign with pagination."""
-    offset = 0
-    limit = 100
     leads: list[HeyReachLead] = []
 
     print(f"📊 Fetching HeyReach campaign leads (campaign_id={heyreach_campaign_id})...")
 
-    while True:
-        resp = client.execute_tool(
-            "mcp_Heyreach_get_leads_from_campaign",
-            {
-                "campaignId": heyreach_campaign_id,
-                "limit": limit,
-                "offset": offset,
-                "timeFrom": None,
-                "timeTo": None,
-                "timeFilter": None,
-            },
-        )
-
-        payload = resp[0] if isinstance(resp, list) and resp else {}
-        if not isinstance(payload, dict):
-            break
-
-        total_count = payload.get("totalCount") if isinstance(payload.get("totalCount"), int) else None
-        items = payload.get("items") if isinstance(payload.get("items"), list) else []
-
-        print(f"   Fetched {len(items)} leads (offset={offset}, total={total_count})")
-
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-
-            profile_url = item.get("profileUrl")
-            if not profile_url or not isinstance(profile_url, str):
-                continue
-
-            leads.append(HeyReachLead(
-                profile_url=profile_url,
-                linkedin_id=item.get("linkedinId") if isinstance(item.get("linkedinId"), str) else None,
-                first_name=item.get("firstName") if isinstance(item.get("firstName"), str) else None,
-                last_name=item.get("lastName") if isinstance(item.get("lastName"), str) else None,
-                headline=item.get("position") if isinstance(item.get("position"), str) else None,
-                company=item.get("companyName") if isinstance(item.get("companyName"), str) else None,
-                status=item.get("status", "unknown"),
-                raw=item,
-            ))
+    items = iter_items(
+        client,
+        "mcp_Heyreach_get_leads_from_campaign",
+        {
+            "campaignId": heyreach_campaign_id,
+            "timeFrom": None,
+            "timeTo": None,
+            "timeFilter": None,
+        },
+        rate_key=f"campaign:{heyreach_campaign_id}",
+        log=lambda msg: print(f"   {msg}"),
+    )
+    for item in items:
+        profile_url = item.get("profileUrl")
+        if not profile_url or not isinstance(profile_url, str):
+            continue
 
-        if total_count is None:
-            break
-        offset += limit
-        if offset >= total_count:
-            break
+        leads.append(HeyReachLead(
+            profile_url=profile_url,
+            linkedin_id=item.get("linkedinId") if isinstance(item.get("linkedinId"), str) else None,
+            first_name=item.get("firstName") if isinstance(item.get("firstName"), str) else None,
+            last_name=item.get("lastName") if isinstance(item.get("lastName"), str) else None,
+            headline=item.get("position") if isinstance(item.get("position"), str) else None,
+            company=item.get("companyName") if isinstance(item.get("companyName"), str) else None,
+            status=item.get("status", "unknown"),
+            raw=item,
+        ))
 
     print(f"✅ Found {len(leads)} leads in HeyReach campaign\n")
     return leads
@@ -330,144 +240,238 @@ def _fetch_heyreach_conversations(
 
     Returns dict mapping lead_profile_url → HeyReachConversation.
     """
-    offset = 0
-    limit = 100
     conversations: dict[str, HeyReachConversation] = {}
 
     print(f"📨 Fetching HeyReach conversations (campaign_id={heyreach_campaign_id})...")
 
-    while True:
-        resp = client.execute_tool(
-            "mcp_Heyreach_get_conversations_v2",
-            {
-                "linkedInAccountIds": linkedin_account_ids,
-                "campaignIds": [heyreach_campaign_id],
-                "seen": None,
-                "limit": limit,
-                "offset": offset,
-                "searchString": "",
-                "leadLinkedInId": None,
-                "leadProfileUrl": None,
-            },
-        )
-
-        payload = resp[0] if isinstance(resp, list) and resp else {}
-        if not isinstance(payload, dict):
-            break
-
-        total_count = payload.get("totalCount") if isinstance(payload.get("totalCount"), int) else None
-        items = payload.get("items") if isinstance(payload.get("items"), list) else []
+    items = iter_items(
+        client,
+        "mcp_Heyreach_get_conversations_v2",
+        {
+            "linkedInAccountIds": linkedin_account_ids,
+            "campaignIds": [heyreach_campaign_id],
+            "seen": None,
+            "searchString": "",
+            "leadLinkedInId": None,
+            "leadProfileUrl": None,
+        },
+        ordered=True,
+        log=lambda msg: print(f"   {msg}"),
+    )
+    for item in items:
+        correspondent = item.get("correspondentProfile") if isinstance(item.get("correspondentProfile"), dict) else {}
+        lead_profile_url = correspondent.get("profileUrl")
+        if not lead_profile_url or not isinstance(lead_profile_url, str):
+            continue
 
-        print(f"   Fetched {len(items)} conversations (offset={offset}, total={total_count})")
+        messages = item.get("messages") if isinstance(item.get("messages"), list) else []
 
-        for item in items:
-            if not isinstance(item, dict):
-                continue
+        # Count outbound/inbound and find first timestamps
+        outbound_count = 0
+        inbound_count = 0
+        first_outbound_at: Optional[str] = None
+        first_inbound_at: Optional[str] = None
 
-            correspondent = item.get("correspondentProfile") if isinstance(item.get("correspondentProfile"), dict) else {}
-            lead_profile_url = correspondent.get("profileUrl")
-            if not lead_profile_url or not isinstance(lead_profile_url, str):
+        for msg in messages:
+            if not isinstance(msg, dict):
                 continue
 
-            messages = item.get("messages") if isinstance(item.get("messages"), list) else []
-
-            # Count outbound/inbound and find first timestamps
-            outbound_count = 0
-            inbound_count = 0
-            first_outbound_at: Optional[str] = None
-            first_inbound_at: Optional[str] = None
-
-            for msg in messages:
-                if not isinstance(msg, dict):
-                    continue
-
-                sender = msg.get("sender")
-                sent_at = msg.get("sentAt") if isinstance(msg.get("sentAt"), str) else None
-
-                if sender == "ME":
-                    outbound_count += 1
-                    if sent_at and (first_outbound_at is None or sent_at < first_outbound_at):
-                        first_outbound_at = sent_at
-                elif sender == "CORRESPONDENT":
-                    inbound_count += 1
-                    if sent_at and (first_inbound_at is None or sent_at < first_inbound_at):
-                        first_inbound_at = sent_at
-
-            conversations[lead_profile_url] = HeyReachConversation(
-                conversation_id=str(item.get("id", "")),
-                lead_profile_url=lead_profile_url,
-                has_outbound=outbound_count > 0,
-                outbound_count=outbound_count,
-                inbound_count=inbound_count,
-                first_outbound_at=first_outbound_at,
-                first_inbound_at=first_inbound_at,
-                messages=[m for m in messages if isinstance(m, dict)],
-            )
-
-        if total_count is None:
-            break
-        offset += limit
-        if offset >= total_count:
-            break
+            sender = msg.get("sender")
+            sent_at = msg.get("sentAt") if isinstance(msg.get("sentAt"), str) else None
+
+            if sender == "ME":
+                outbound_count += 1
+                if sent_at and (first_outbound_at is None or sent_at < first_outbound_at):
+                    first_outbound_at = sent_at
+            elif sender == "CORRESPONDENT":
+                inbound_count += 1
+                if sent_at and (first_inbound_at is None or sent_at < first_inbound_at):
+                    first_inbound_at = sent_at
+
+        conversations[lead_profile_url] = HeyReachConversation(
+            conversation_id=str(item.get("id", "")),
+            lead_profile_url=lead_profile_url,
+            has_outbound=outbound_count > 0,
+            outbound_count=outbound_count,
+            inbound_count=inbound_count,
+            first_outbound_at=first_outbound_at,
+            first_inbound_at=first_inbound_at,
+            messages=[m for m in messages if isinstance(m, dict)],
+        )
 
     print(f"✅ Found {len(conversations)} conversations\n")
     return conversations
 
 
-def _fetch_campaign_prospects(
-    client: DatagenClient,
-    *,
-    project_id: str,
-    branch_id: str,
-    database_name: str,
-    campaign_table: str,
-) -> dict[str, dict[str, Any]]:
+class HeyReachCache:
     """
-    Fetch prospects from campaign table.
+    Per-run cache of HeyReach fetches shared by concurrent campaign syncs.
 
-    Returns dict mapping linkedin_url → prospect data.
+    Account IDs are fetched once; leads and conversations are fetched once per
+    HeyReach campaign even when several Neon campaigns point at it. Concurrent
+    requests for the same key wait for the first fetch instead of repeating it.
     """
-    sql = f"""
-SELECT
-    ct.id as campaign_entry_id,
-    ct.status as current_status,
-    ct.contacted_at,
-    ct.responded_at,
-    p.id as prospect_id,
-    p.linkedin_url,
-    p.name
-FROM {campaign_table} ct
-JOIN prospects p ON p.id = ct.prospect_id
-ORDER BY ct.id;
-""".strip()
 
-    result = _run_sql(client, project_id=project_id, branch_id=branch_id, database_name=database_name, sql=sql)
+    def __init__(self, client: DatagenClient):
+        self.client = client
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple, threading.Lock] = {}
+        self._values: dict[tuple, Any] = {}
+
+    def _memo(self, key: tuple, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._values:
+                self._values[key] = fetch()
+            return self._values[key]
+
+    def account_ids(self) -> list[int]:
+        return self._memo(("accounts",), lambda: _get_all_linked_in_account_ids(self.client))
+
+    def leads(self, heyreach_campaign_id: int) -> list[HeyReachLead]:
+        return self._memo(
+            ("leads", heyreach_campaign_id),
+            lambda: _fetch_heyreach_campaign_leads(self.client, heyreach_campaign_id=heyreach_campaign_id),
+        )
 
-    prospects_map: dict[str, dict[str, Any]] = {}
+    def conversations(self, heyreach_campaign_id: int, linkedin_account_ids: list[int]) -> dict[str, HeyReachConversation]:
+        return self._memo(
+            ("conversations", heyreach_campaign_id, tuple(linkedin_account_ids)),
+            lambda: _fetch_heyreach_conversations(
+                self.client,
+                heyreach_campaign_id=heyreach_campaign_id,
+                linkedin_account_ids=linkedin_account_ids,
+            ),
+        )
 
-    if result and isinstance(result, list) and len(result) > 0:
-        rows = result[0] if isinstance(result[0], list) else []
-        for row in rows:
-            linkedin_url = row.get("linkedin_url")
-            if linkedin_url:
-                prospects_map[linkedin_url] = row
 
-    return prospects_map
+def _staged_row_sql(profile_url: str, conversation: Optional[HeyReachConversation]) -> str:
+    """One VALUES row of HeyReach state for a lead (typed, so NULLs are unambiguous)."""
+    if conversation is None:
+        return render("(%s, FALSE, 0, NULL::timestamptz, NULL::timestamptz)", [profile_url])
+    return render(
+        "(%s, %s, %s, %s::timestamptz, %s::timestamptz)",
+        [
+            profile_url,
+            conversation.has_outbound,
+            int(conversation.inbound_count),
+            conversation.first_outbound_at or None,
+            conversation.first_inbound_at or None,
+        ],
+    )
+
+
+def _reconcile_campaign_sql(campaign_table: str, staged_rows: list[str], *, apply: bool) -> str:
+    """
+    Set-based status reconciliation for one campaign table.
+
+    Stages HeyReach lead/conversation state as a VALUES table, joins it to the
+    campaign table through prospects.linkedin_url, and computes each entry's
+    new status and timestamps in SQL:
+    - outbound + inbound messages -> 'responded'
+    - outbound only -> 'contacted'
+    - otherwise the current status is kept
+    contacted_at/responded_at take the first outbound/inbound message time when
+    HeyReach has one. Only rows that actually change are written.
+
+    Args:
+        campaign_table: Neon campaign table name
+        staged_rows: Rows from _staged_row_sql
+        apply: Run the UPDATE (False = count what would change, for --dry-run)
+
+    Returns:
+        SQL returning one row: matched, status_updates, contacted_updates, responded_updates
+    """
+    values = ",\n  ".join(staged_rows)
+    if apply:
+        tail = f"""
+updated AS (
+  UPDATE {campaign_table} AS ct
+  SET
+    status = c.new_status,
+    contacted_at = c.new_contacted_at,
+    responded_at = c.new_responded_at
+  FROM changed AS c
+  WHERE ct.id = c.id
+  RETURNING c.status_changed, c.contacted_changed, c.responded_changed
+)"""
+    else:
+        tail = """
+updated AS (
+  SELECT status_changed, contacted_changed, responded_changed FROM changed
+)"""
+    return f"""
+WITH staged (profile_url, has_outbound, inbound_count, first_outbound_at, first_inbound_at) AS (
+  VALUES
+  {values}
+),
+matched AS (
+  SELECT
+    ct.id,
+    s.profile_url,
+    CASE
+      WHEN s.has_outbound AND s.inbound_count > 0 THEN 'responded'
+      WHEN s.has_outbound THEN 'contacted'
+      ELSE ct.status
+    END AS new_status,
+    COALESCE(s.first_outbound_at, ct.contacted_at) AS new_contacted_at,
+    COALESCE(s.first_inbound_at, ct.responded_at) AS new_responded_at,
+    ct.status,
+    ct.contacted_at,
+    ct.responded_at
+  FROM {campaign_table} AS ct
+  JOIN prospects AS p ON p.id = ct.prospect_id
+  JOIN staged AS s ON s.profile_url = p.linkedin_url
+),
+changed AS (
+  SELECT
+    id,
+    new_status,
+    new_contacted_at,
+    new_responded_at,
+    new_status IS DISTINCT FROM status AS status_changed,
+    new_contacted_at IS DISTINCT FROM contacted_at AS contacted_changed,
+    new_responded_at IS DISTINCT FROM responded_at AS responded_changed
+  FROM matched
+  WHERE new_status IS DISTINCT FROM status
+     OR new_contacted_at IS DISTINCT FROM contacted_at
+     OR new_responded_at IS DISTINCT FROM responded_at
+),{tail}
+SELECT
+  (SELECT COUNT(DISTINCT profile_url) FROM matched)::int AS matched,
+  COUNT(*) FILTER (WHERE status_changed)::int AS status_updates,
+  COUNT(*) FILTER (WHERE contacted_changed)::int AS contacted_updates,
+  COUNT(*) FILTER (WHERE responded_changed)::int AS responded_updates
+FROM updated;
+""".strip()
 
 
 def sync_campaign(
     client: DatagenClient,
     *,
+    neon: NeonClient,
     campaign: NeonCampaign,
-    project_id: str,
-    branch_id: str,
-    database_name: str,
     heyreach_campaign_id_override: Optional[int],
     dry_run: bool,
+    linkedin_account_ids: Optional[list[int]] = None,
+    cache: Optional[HeyReachCache] = None,
 ) -> dict[str, Any]:
     """
     Sync a single campaign from HeyReach to Neon.
 
+    HeyReach state is reconciled against the campaign table with set-based
+    statements (see _reconcile_campaign_sql), one per RECONCILE_CHUNK_ROWS
+    staged leads, so Neon round trips grow with the chunk count rather than
+    per prospect. Chunks commit independently; reconciliation is idempotent,
+    so a rerun after a failed chunk finishes the job.
+
+    Args:
+        linkedin_account_ids: HeyReach account IDs (fetched if not given; pass
+            them in when syncing several campaigns so they're fetched once)
+        cache: Shared HeyReach fetch cache (one per run when syncing several
+            campaigns; a private one is used if not given)
+
     Returns sync statistics.
     """
     # Determine which HeyReach campaign ID to use
@@ -485,186 +489,199 @@ def sync_campaign(
     print()
 
     # Fetch HeyReach data
-    linkedin_account_ids = _get_all_linked_in_account_ids(client)
+    cache = cache or HeyReachCache(client)
+    if linkedin_account_ids is None:
+        linkedin_account_ids = cache.account_ids()
     if not linkedin_account_ids:
         print("⚠️  No LinkedIn accounts found in HeyReach")
 
-    leads = _fetch_heyreach_campaign_leads(client, heyreach_campaign_id=heyreach_campaign_id)
-    conversations = _fetch_heyreach_conversations(
-        client,
-        heyreach_campaign_id=heyreach_campaign_id,
-        linkedin_account_ids=linkedin_account_ids,
-    )
-
-    # Fetch Neon prospects
-    print(f"🔍 Fetching prospects from {campaign.table_name}...")
-    prospects = _fetch_campaign_prospects(
-        client,
-        project_id=project_id,
-        branch_id=branch_id,
-        database_name=database_name,
-        campaign_table=campaign.table_name,
-    )
-    print(f"✅ Found {len(prospects)} prospects in campaign table\n")
+    leads = cache.leads(heyreach_campaign_id)
+    conversations = cache.conversations(heyreach_campaign_id, linkedin_account_ids)
 
-    # Match and update
-    print("🔄 Matching HeyReach data to Neon prospects...")
-    matched = 0
-    unmatched = 0
-    updates: list[SyncResult] = []
-
-    # If we have leads, use them; otherwise use conversations
+    # Stage HeyReach state per lead (leads are the source; fall back to conversations)
     if leads:
-        # Use leads as the source
-        for lead in leads:
-            prospect = prospects.get(lead.profile_url)
-
-            if not prospect:
-                unmatched += 1
-                continue
-
-            matched += 1
-
-            # Get conversation data if available
-            conversation = conversations.get(lead.profile_url)
-
-            # Determine new status
-            old_status = prospect.get("current_status")
-            new_status = old_status
-
-            # Update status based on conversation activity
-            if conversation and conversation.has_outbound:
-                new_status = "contacted"
-                if conversation.inbound_count > 0:
-                    new_status = "responded"
-            elif old_status == "pending":
-                # Keep as pending if no conversation
-                new_status = "pending"
-
-            # Get timestamps
-            contacted_at = conversation.first_outbound_at if conversation else None
-            responded_at = conversation.first_inbound_at if conversation else None
-
-            updates.append(SyncResult(
-                prospect_id=prospect["prospect_id"],
-                linkedin_url=lead.profile_url,
-                status_updated=(new_status != old_status),
-                old_status=old_status,
-                new_status=new_status,
-                contacted_at=contacted_at,
-                responded_at=responded_at,
-            ))
-
-        print(f"✅ Matched {matched}/{len(leads)} leads ({unmatched} unmatched)\n")
+        staged = {lead.profile_url: conversations.get(lead.profile_url) for lead in leads}
+        source_label = "leads"
     else:
-        # No pending leads, use conversations instead
         print("ℹ️  No pending leads found, using conversations...")
-        for profile_url, conversation in conversations.items():
-            prospect = prospects.get(profile_url)
-
-            if not prospect:
-                unmatched += 1
-                continue
-
-            matched += 1
-
-            # Determine new status
-            old_status = prospect.get("current_status")
-            new_status = old_status
-
-            # Update status based on conversation activity
-            if conversation.has_outbound:
-                new_status = "contacted"
-                if conversation.inbound_count > 0:
-                    new_status = "responded"
-
-            # Get timestamps
-            contacted_at = conversation.first_outbound_at if conversation else None
-            responded_at = conversation.first_inbound_at if conversation else None
+        staged = dict(conversations)
+        source_label = "conversations"
 
-            updates.append(SyncResult(
-                prospect_id=prospect["prospect_id"],
-                linkedin_url=profile_url,
-                status_updated=(new_status != old_status),
-                old_status=old_status,
-                new_status=new_status,
-                contacted_at=contacted_at,
-                responded_at=responded_at,
-            ))
-
-        print(f"✅ Matched {matched}/{len(conversations)} conversations ({unmatched} unmatched)\n")
-
-    # Apply updates
-    if not dry_run and updates:
-        print(f"📝 Updating {len(updates)} prospects in {campaign.table_name}...")
+    stats = {
+        "campaign_id": campaign.id,
+        "leads_processed": len(leads),
+        "matched": 0,
+        "unmatched": len(staged),
+        "status_updates": 0,
+        "contacted_updates": 0,
+        "responded_updates": 0,
+    }
+    if not staged:
+        print("ℹ️  Nothing to reconcile\n")
+        return stats
 
-        status_updates = 0
-        contacted_updates = 0
-        responded_updates = 0
+    # Reconcile in bounded chunks (staged URLs are distinct, so chunk counts add up)
+    if dry_run:
+        print(f"🔍 DRY RUN: Previewing {len(staged)} {source_label} against {campaign.table_name}...")
+    else:
+        print(f"🔄 Reconciling {len(staged)} {source_label} against {campaign.table_name}...")
+    staged_rows = [_staged_row_sql(url, conv) for url, conv in staged.items()]
+    totals = {"matched": 0, "status_updates": 0, "contacted_updates": 0, "responded_updates": 0}
+    for start in range(0, len(staged_rows), RECONCILE_CHUNK_ROWS):
+        sql = _reconcile_campaign_sql(
+            campaign.table_name,
+            staged_rows[start:start + RECONCILE_CHUNK_ROWS],
+            apply=not dry_run,
+        )
+        row = neon.query_one(sql)
+        for key in totals:
+            totals[key] += int(row.get(key) or 0)
+
+    matched = totals["matched"]
+    stats.update(unmatched=len(staged) - matched, **totals)
+    print(f"✅ Matched {matched}/{len(staged)} {source_label} ({stats['unmatched']} unmatched)")
+    prefix = "Would apply" if dry_run else "Applied"
+    print(f"   {prefix} status updates: {stats['status_updates']}")
+    print(f"   {prefix} contacted timestamps: {stats['contacted_updates']}")
+    print(f"   {prefix} response timestamps: {stats['responded_updates']}\n")
+
+    if not dry_run and matched:
+        # Update campaigns table metrics
+        print("📊 Updating campaigns table metrics...")
+        neon.execute(f"""
+UPDATE campaigns
+SET
+    contacted = (SELECT COUNT(*) FROM {campaign.table_name} WHERE contacted_at IS NOT NULL),
+    responded = (SELECT COUNT(*) FROM {campaign.table_name} WHERE responded_at IS NOT NULL),
+    last_synced_at = now()
+WHERE id = %s;
+""".strip(), [campaign.id])
+        print("   ✅ Updated campaign metrics\n")
 
-        for update in updates:
-            # Build UPDATE statement
-            set_clauses = []
+    return stats
 
-            if update.status_updated and update.new_status:
-                set_clauses.append(f"status = {_sql_text(update.new_status)}")
-                status_updates += 1
 
-            if update.contacted_at:
-                set_clauses.append(f"contacted_at = {_sql_timestamptz(update.contacted_at)}")
-                contacted_updates += 1
+class _ThreadBufferedStdout:
+    """
+    sys.stdout proxy that buffers writes per thread on request.
 
-            if update.responded_at:
-                set_clauses.append(f"responded_at = {_sql_timestamptz(update.responded_at)}")
-                responded_updates += 1
+    Parallel campaign syncs capture their progress output and print it as one
+    block when the campaign finishes, so logs from different campaigns don't
+    interleave. Threads that never call capture() write straight through.
+    """
 
-            if not set_clauses:
-                continue
+    def __init__(self, target: Any):
+        self._target = target
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
 
-            update_sql = f"""
-UPDATE {campaign.table_name}
-SET {', '.join(set_clauses)}
-WHERE prospect_id = {update.prospect_id};
-""".strip()
+    def capture(self) -> None:
+        self._local.buffer = io.StringIO()
 
-            _run_sql(client, project_id=project_id, branch_id=branch_id, database_name=database_name, sql=update_sql)
+    def release(self) -> None:
+        buffer = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        if buffer is not None:
+            with self._write_lock:
+                self._target.write(buffer.getvalue())
+                self._target.flush()
 
-        print(f"   ✅ Status updates: {status_updates}")
-        print(f"   ✅ Contacted timestamps: {contacted_updates}")
-        print(f"   ✅ Response timestamps: {responded_updates}\n")
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            return buffer.write(text)
+        with self._write_lock:
+            return self._target.write(text)
 
-        # Update campaigns table metrics
-        print("📊 Updating campaigns table metrics...")
-        metrics_sql = f"""
-UPDATE campaigns
-SET
-    contacted = (SELECT COUNT(*) FROM {campaign.table_name} WHERE contacted_at IS NOT NULL),
-    responded = (SELECT COUNT(*) FROM {campaign.table_name} WHERE responded_at IS NOT NULL),
-    last_synced_at = now()
-WHERE id = {campaign.id};
-""".strip()
+    def flush(self) -> None:
+        if getattr(self._local, "buffer", None) is None:
+            self._target.flush()
 
-        _run_sql(client, project_id=project_id, branch_id=branch_id, database_name=database_name, sql=metrics_sql)
-        print("   ✅ Updated campaign metrics\n")
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
 
-    elif dry_run:
-        print(f"🔍 DRY RUN: Would update {len(updates)} prospects")
-        status_updates = sum(1 for u in updates if u.status_updated)
-        contacted_updates = sum(1 for u in updates if u.contacted_at)
-        responded_updates = sum(1 for u in updates if u.responded_at)
-        print(f"   - Status updates: {status_updates}")
-        print(f"   - Contacted timestamps: {contacted_updates}")
-        print(f"   - Response timestamps: {responded_updates}\n")
 
-    return {
-        "campaign_id": campaign.id,
-        "leads_processed": len(leads),
-        "matched": matched,
-        "unmatched": unmatched,
-        "status_updates": sum(1 for u in updates if u.status_updated),
-        "contacted_updates": sum(1 for u in updates if u.contacted_at),
-        "responded_updates": sum(1 for u in updates if u.responded_at),
-    }
+def sync_campaigns(
+    client: DatagenClient,
+    campaigns: list[NeonCampaign],
+    *,
+    workers: int = 1,
+    **sync_kwargs: Any,
+) -> list[dict[str, Any]]:
+    """
+    Sync several campaigns, up to `workers` at a time.
+
+    Campaigns are isolated: each one writes its own statements and a failure
+    in one (HeyReach or Neon error) is recorded in its stats without stopping
+    the others. HeyReach account IDs and fetches are shared through one
+    HeyReachCache.
+
+    Args:
+        client: DatagenClient
+        campaigns: Neon campaigns to sync
+        workers: Campaigns synced concurrently (1 = sequential)
+        **sync_kwargs: Passed to sync_campaign (neon, dry_run, ...)
+
+    Returns:
+        Stats per campaign in input order, each with "seconds" and, on
+        failure, "error"
+    """
+    cache = HeyReachCache(client)
+    linkedin_account_ids = cache.account_ids()
+    parallel = workers > 1 and len(campaigns) > 1
+    stdout = _ThreadBufferedStdout(sys.stdout) if parallel else None
+
+    def _run(campaign: NeonCampaign) -> dict[str, Any]:
+        if stdout:
+            stdout.capture()
+        started = time.monotonic()
+        try:
+            stats = sync_campaign(
+                client,
+                campaign=campaign,
+                linkedin_account_ids=linkedin_account_ids,
+                cache=cache,
+                **sync_kwargs,
+            )
+        except Exception as e:
+            print(f"❌ Campaign {campaign.id} ({campaign.name}) failed: {e}\n")
+            stats = {"campaign_id": campaign.id, "error": str(e)}
+        finally:
+            if stdout:
+                stdout.release()
+        stats["seconds"] = round(time.monotonic() - started, 1)
+        return stats
+
+    if not parallel:
+        return [_run(campaign) for campaign in campaigns]
+
+    original_stdout = sys.stdout
+    sys.stdout = stdout
+    try:
+        results: dict[int, dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=min(workers, len(campaigns)), thread_name_prefix="campaign-sync") as executor:
+            futures = {executor.submit(_run, campaign): i for i, campaign in enumerate(campaigns)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+    finally:
+        sys.stdout = original_stdout
+    return [results[i] for i in range(len(campaigns))]
+
+
+def _print_summary_table(campaigns: list[NeonCampaign], all_stats: list[dict[str, Any]]) -> None:
+    """Per-campaign results and timing."""
+    header = f"{'Campaign':<36} {'Matched':>8} {'Status':>7} {'Contact':>8} {'Respond':>8} {'Secs':>7}  Result"
+    print(header)
+    print("-" * len(header))
+    for campaign, stats in zip(campaigns, all_stats):
+        name = f"{campaign.id} {campaign.name}"[:36]
+        result = f"error: {str(stats['error']).splitlines()[0]}"[:60] if stats.get("error") else "ok"
+        print(
+            f"{name:<36} {stats.get('matched', 0):>8} {stats.get('status_updates', 0):>7} "
+            f"{stats.get('contacted_updates', 0):>8} {stats.get('responded_updates', 0):>8} "
+            f"{stats.get('seconds', 0):>7.1f}  {result}"
+        )
+    print("-" * len(header))
 
 
 def main() -> None:
@@ -679,6 +696,7 @@ def main() -> None:
     parser.add_argument("--heyreach-campaign-id", type=int, help="HeyReach campaign ID override")
     parser.add_argument("--all", action="store_true", help="Sync all campaigns with heyreach_campaign_id set")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without updating database")
+    parser.add_argument("--workers", type=int, default=1, help="Campaigns to sync concurrently with --all (default: 1)")
 
     args = parser.parse_args()
 
@@ -691,6 +709,12 @@ def main() -> None:
 
     _ensure_env_loaded()
     client = DatagenClient(timeout=120)  # 120 second timeout for slow SQL queries
+    neon = NeonClient(
+        client,
+        project_id=args.neon_project_id,
+        branch_id=args.neon_branch_id,
+        database_name=args.neon_database,
+    )
 
     print("\n" + "="*80)
     print("HEYREACH CAMPAIGN SYNC")
@@ -704,22 +728,11 @@ def main() -> None:
 
     if args.all:
         print("📊 Fetching all campaigns with HeyReach integration...")
-        campaigns_to_sync = _fetch_all_neon_campaigns(
-            client,
-            project_id=args.neon_project_id,
-            branch_id=args.neon_branch_id,
-            database_name=args.neon_database,
-        )
+        campaigns_to_sync = _fetch_all_neon_campaigns(neon)
         print(f"✅ Found {len(campaigns_to_sync)} campaigns to sync\n")
     else:
         print(f"📊 Fetching campaign {args.campaign_id}...")
-        campaign = _fetch_neon_campaign(
-            client,
-            project_id=args.neon_project_id,
-            branch_id=args.neon_branch_id,
-            database_name=args.neon_database,
-            campaign_id=args.campaign_id,
-        )
+        campaign = _fetch_neon_campaign(neon, campaign_id=args.campaign_id)
         if not campaign:
             print(f"❌ Campaign {args.campaign_id} not found in Neon database")
             sys.exit(1)
@@ -730,28 +743,32 @@ def main() -> None:
         print("❌ No campaigns to sync")
         sys.exit(0)
 
-    # Sync each campaign
-    all_stats = []
-    for campaign in campaigns_to_sync:
-        stats = sync_campaign(
-            client,
-            campaign=campaign,
-            project_id=args.neon_project_id,
-            branch_id=args.neon_branch_id,
-            database_name=args.neon_database,
-            heyreach_campaign_id_override=args.heyreach_campaign_id,
-            dry_run=args.dry_run,
-        )
-        all_stats.append(stats)
+    # Sync campaigns (account IDs and HeyReach fetches are shared across the run)
+    started = time.monotonic()
+    all_stats = sync_campaigns(
+        client,
+        campaigns_to_sync,
+        workers=max(1, args.workers),
+        neon=neon,
+        heyreach_campaign_id_override=args.heyreach_campaign_id,
+        dry_run=args.dry_run,
+    )
+    failed = [stats for stats in all_stats if stats.get("error")]
 
     # Print summary
     print("\n" + "="*80)
     print("SYNC SUMMARY")
     print("="*80)
-    print(f"Campaigns Synced: {len(campaigns_to_sync)}")
+    _print_summary_table(campaigns_to_sync, all_stats)
+    print(f"Campaigns Synced: {len(campaigns_to_sync) - len(failed)}/{len(campaigns_to_sync)}")
+    print(f"Elapsed: {time.monotonic() - started:.1f}s (workers={max(1, args.workers)})")
+    print(neon.format_summary())
     print(f"Timestamp: {_utc_now_stamp()}")
     print("="*80 + "\n")
 
+    if failed:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -11,6 +10,12 @@ from typing import Any, Optional
 
 from datagen_sdk import DatagenClient
 
+from heyreach_pager import iter_items
+from heyreach_sync_state import NeonSyncState, advance_marks, fetch_conversations_since
+from neon_client import Array, Json, NeonClient, render
+
+SYNC_SOURCE = "sync_heyreach_to_neon"
+
 
 def _utc_now_stamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -46,38 +51,6 @@ def _ensure_env_loaded() -> None:
         )
 
 
-def _sql_quote(text: str) -> str:
-    return "'" + text.replace("'", "''") + "'"
-
-
-def _sql_text(value: Optional[str]) -> str:
-    if value is None:
-        return "NULL"
-    return _sql_quote(value)
-
-
-def _sql_int(value: Optional[int]) -> str:
-    if value is None:
-        return "NULL"
-    return str(int(value))
-
-
-def _sql_bool(value: bool) -> str:
-    return "TRUE" if value else "FALSE"
-
-
-def _sql_timestamptz(value: Optional[str]) -> str:
-    if not value:
-        return "NULL"
-    # Accept HeyReach style "...Z"; store as timestamptz.
-    return f"{_sql_quote(value)}::timestamptz"
-
-
-def _sql_jsonb(value: Any) -> str:
-    dumped = json.dumps(value, ensure_ascii=False)
-    return f"{_sql_quote(dumped)}::jsonb"
-
-
 @dataclass(frozen=True)
 class Conversation:
     conversation_id: str
@@ -140,77 +113,63 @@ def _get_all_linked_in_account_ids(client: DatagenClient) -> list[int]:
     return sorted(set(ids))
 
 
+def _parse_conversation(item: Any) -> Optional[Conversation]:
+    if not isinstance(item, dict):
+        return None
+    conv_id = str(item.get("id") or "")
+    if not conv_id:
+        return None
+    linked_in_account_id = item.get("linkedInAccountId")
+    if not isinstance(linked_in_account_id, int):
+        linked_in_account_id = None
+    correspondent = item.get("correspondentProfile") if isinstance(item.get("correspondentProfile"), dict) else {}
+    messages = item.get("messages") if isinstance(item.get("messages"), list) else []
+    last_message_at = item.get("lastMessageAt") if isinstance(item.get("lastMessageAt"), str) else None
+    last_message_sender = item.get("lastMessageSender") if isinstance(item.get("lastMessageSender"), str) else None
+    total_messages = item.get("totalMessages") if isinstance(item.get("totalMessages"), int) else None
+
+    return Conversation(
+        conversation_id=conv_id,
+        linked_in_account_id=linked_in_account_id,
+        last_message_at=last_message_at,
+        last_message_sender=last_message_sender,
+        total_messages=total_messages,
+        correspondent_profile=correspondent,
+        messages=[m for m in messages if isinstance(m, dict)],
+        raw=item,
+    )
+
+
 def _fetch_all_conversations(
     client: DatagenClient,
     *,
     linked_in_account_ids: list[int],
     max_conversations: Optional[int],
 ) -> list[Conversation]:
-    offset = 0
-    limit = 100
     conversations: list[Conversation] = []
-
-    while True:
-        resp = client.execute_tool(
-            "mcp_Heyreach_get_conversations_v2",
-            {
-                "linkedInAccountIds": linked_in_account_ids,
-                "campaignIds": [],
-                "seen": None,
-                "limit": limit,
-                "offset": offset,
-                "searchString": "",
-                "leadLinkedInId": None,
-                "leadProfileUrl": None,
-            },
-        )
-        payload = resp[0] if isinstance(resp, list) and resp else {}
-        if not isinstance(payload, dict):
-            break
-        total_count = payload.get("totalCount") if isinstance(payload.get("totalCount"), int) else None
-        items = payload.get("items") if isinstance(payload.get("items"), list) else []
-        print(f"[fetch] conversations offset={offset} limit={limit} got={len(items)} total={total_count}")
-
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-            conv_id = str(item.get("id") or "")
-            if not conv_id:
-                continue
-            linked_in_account_id = item.get("linkedInAccountId")
-            if not isinstance(linked_in_account_id, int):
-                linked_in_account_id = None
-            correspondent = item.get("correspondentProfile") if isinstance(item.get("correspondentProfile"), dict) else {}
-            messages = item.get("messages") if isinstance(item.get("messages"), list) else []
-            last_message_at = item.get("lastMessageAt") if isinstance(item.get("lastMessageAt"), str) else None
-            last_message_sender = item.get("lastMessageSender") if isinstance(item.get("lastMessageSender"), str) else None
-            total_messages = item.get("totalMessages") if isinstance(item.get("totalMessages"), int) else None
-
-            conversations.append(
-                Conversation(
-                    conversation_id=conv_id,
-                    linked_in_account_id=linked_in_account_id,
-                    last_message_at=last_message_at,
-                    last_message_sender=last_message_sender,
-                    total_messages=total_messages,
-                    correspondent_profile=correspondent,
-                    messages=[m for m in messages if isinstance(m, dict)],
-                    raw=item,
-                )
-            )
-            if max_conversations is not None and len(conversations) >= max_conversations:
-                return conversations
-
-        if total_count is None:
-            break
-        offset += limit
-        if offset >= total_count:
-            break
-
+    items = iter_items(
+        client,
+        "mcp_Heyreach_get_conversations_v2",
+        {
+            "linkedInAccountIds": linked_in_account_ids,
+            "campaignIds": [],
+            "seen": None,
+            "searchString": "",
+            "leadLinkedInId": None,
+            "leadProfileUrl": None,
+        },
+        max_items=max_conversations,
+        ordered=True,
+        log=print,
+    )
+    for item in items:
+        conv = _parse_conversation(item)
+        if conv is not None:
+            conversations.append(conv)
     return conversations
 
 
-def _ensure_neon_schema(client: DatagenClient, *, project_id: str, branch_id: str, database_name: str) -> None:
+def _ensure_neon_schema(neon: NeonClient) -> None:
     statements = [
         """
 CREATE TABLE IF NOT EXISTS public.heyreach_conversations (
@@ -239,14 +198,37 @@ CREATE TABLE IF NOT EXISTS public.heyreach_conversations (
         "CREATE INDEX IF NOT EXISTS idx_heyreach_conversations_lead_profile_url ON public.heyreach_conversations (lead_profile_url);",
         "CREATE INDEX IF NOT EXISTS idx_heyreach_conversations_last_message_at ON public.heyreach_conversations (last_message_at DESC);",
     ]
-    for sql in statements:
-        client.execute_tool(
-            "mcp_Neon_run_sql",
-            {"params": {"projectId": project_id, "branchId": branch_id, "databaseName": database_name, "sql": sql}},
-        )
+    neon.execute_many(statements)
+
+
+_CONVERSATION_COLUMNS = (
+    "conversation_id",
+    "linked_in_account_id",
+    "lead_profile_url",
+    "lead_linkedin_id",
+    "lead_first_name",
+    "lead_last_name",
+    "lead_headline",
+    "lead_location",
+    "lead_company_name",
+    "lead_position",
+    "has_outbound",
+    "outbound_count",
+    "inbound_count",
+    "last_message_at",
+    "last_message_sender",
+    "total_messages",
+    "messages",
+    "raw",
+    "updated_at",
+)
+
+# Statement budget per mcp_Neon_run_sql round trip
+DEFAULT_BATCH_MAX_CHARS = 2_000_000
+DEFAULT_BATCH_MAX_ROWS = 1000
 
 
-def _upsert_conversation_sql(conv: Conversation) -> str:
+def _conversation_values_sql(conv: Conversation) -> str:
     outbound_count, inbound_count = conv.counts()
     corr = conv.correspondent_profile
 
@@ -254,94 +236,102 @@ def _upsert_conversation_sql(conv: Conversation) -> str:
         v = corr.get(key)
         return v if isinstance(v, str) and v else None
 
-    sql = f"""
+    values = [
+        conv.conversation_id,
+        conv.linked_in_account_id,
+        conv.lead_profile_url,
+        conv.lead_linkedin_id,
+        _get_str("firstName"),
+        _get_str("lastName"),
+        _get_str("headline"),
+        _get_str("location"),
+        _get_str("companyName"),
+        _get_str("position"),
+        outbound_count > 0,
+        outbound_count,
+        inbound_count,
+        conv.last_message_at or None,
+        conv.last_message_sender,
+        conv.total_messages,
+        Json(conv.messages),
+        Json(conv.raw),
+    ]
+    # last_message_at is a HeyReach "...Z" string; stored as timestamptz
+    return render("(" + "%s, " * 13 + "%s::timestamptz, %s, %s, %s, %s, now())", values)
+
+
+def _upsert_conversations_sql(values_rows: list[str]) -> str:
+    """Multi-row upsert; values_rows come from _conversation_values_sql with unique conversation_ids."""
+    columns = ",\n  ".join(_CONVERSATION_COLUMNS)
+    updates = ",\n  ".join(
+        f"{col} = EXCLUDED.{col}" for col in _CONVERSATION_COLUMNS if col not in ("conversation_id", "updated_at")
+    )
+    values = ",\n".join(values_rows)
+    return f"""
 INSERT INTO public.heyreach_conversations (
-  conversation_id,
-  linked_in_account_id,
-  lead_profile_url,
-  lead_linkedin_id,
-  lead_first_name,
-  lead_last_name,
-  lead_headline,
-  lead_location,
-  lead_company_name,
-  lead_position,
-  has_outbound,
-  outbound_count,
-  inbound_count,
-  last_message_at,
-  last_message_sender,
-  total_messages,
-  messages,
-  raw,
-  updated_at
-) VALUES (
-  {_sql_text(conv.conversation_id)},
-  {_sql_int(conv.linked_in_account_id)},
-  {_sql_text(conv.lead_profile_url)},
-  {_sql_text(conv.lead_linkedin_id)},
-  {_sql_text(_get_str('firstName'))},
-  {_sql_text(_get_str('lastName'))},
-  {_sql_text(_get_str('headline'))},
-  {_sql_text(_get_str('location'))},
-  {_sql_text(_get_str('companyName'))},
-  {_sql_text(_get_str('position'))},
-  {_sql_bool(outbound_count > 0)},
-  {_sql_int(outbound_count)},
-  {_sql_int(inbound_count)},
-  {_sql_timestamptz(conv.last_message_at)},
-  {_sql_text(conv.last_message_sender)},
-  {_sql_int(conv.total_messages)},
-  {_sql_jsonb(conv.messages)},
-  {_sql_jsonb(conv.raw)},
-  now()
-)
+  {columns}
+) VALUES
+{values}
 ON CONFLICT (conversation_id) DO UPDATE SET
-  linked_in_account_id = EXCLUDED.linked_in_account_id,
-  lead_profile_url = EXCLUDED.lead_profile_url,
-  lead_linkedin_id = EXCLUDED.lead_linkedin_id,
-  lead_first_name = EXCLUDED.lead_first_name,
-  lead_last_name = EXCLUDED.lead_last_name,
-  lead_headline = EXCLUDED.lead_headline,
-  lead_location = EXCLUDED.lead_location,
-  lead_company_name = EXCLUDED.lead_company_name,
-  lead_position = EXCLUDED.lead_position,
-  has_outbound = EXCLUDED.has_outbound,
-  outbound_count = EXCLUDED.outbound_count,
-  inbound_count = EXCLUDED.inbound_count,
-  last_message_at = EXCLUDED.last_message_at,
-  last_message_sender = EXCLUDED.last_message_sender,
-  total_messages = EXCLUDED.total_messages,
-  messages = EXCLUDED.messages,
-  raw = EXCLUDED.raw,
+  {updates},
   updated_at = now();
 """.strip()
-    return sql
 
 
-def _update_linkedin_outreach_threads_sql(conv: Conversation) -> Optional[str]:
-    if not conv.lead_profile_url:
-        return None
-    outbound_count, inbound_count = conv.counts()
-    if outbound_count == 0:
-        return None
-    # We treat "responded" as having any correspondent messages in the thread.
-    responded = inbound_count > 0
-    return f"""
-UPDATE public.linkedin_outreach
-SET
-  messages_sent = {_sql_jsonb(conv.messages)},
-  if_respond = {_sql_bool(responded)},
-  updated_at = now()
-WHERE engager_linkedin_url = {_sql_text(conv.lead_profile_url)};
-""".strip()
+def _chunk_by_length(parts: list[str], *, max_chars: int, max_rows: int) -> list[list[str]]:
+    """Group SQL fragments so each statement stays under max_chars and max_rows (oversized parts go alone)."""
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    current_chars = 0
+    for part in parts:
+        if current and (current_chars + len(part) > max_chars or len(current) >= max_rows):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(part)
+        current_chars += len(part) + 2
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _unique_by_conversation_id(conversations: list[Conversation]) -> list[Conversation]:
+    # ON CONFLICT can't touch the same row twice in one statement; keep the last copy of each ID.
+    by_id: dict[str, Conversation] = {}
+    for conv in conversations:
+        by_id.pop(conv.conversation_id, None)
+        by_id[conv.conversation_id] = conv
+    return list(by_id.values())
 
 
-def _run_sql(client: DatagenClient, *, project_id: str, branch_id: str, database_name: str, sql: str) -> Any:
-    return client.execute_tool(
-        "mcp_Neon_run_sql",
-        {"params": {"projectId": project_id, "branchId": branch_id, "databaseName": database_name, "sql": sql}},
-    )
+def _backfill_linkedin_outreach_sql(conversation_ids: list[str]) -> str:
+    """
+    Set-based backfill of linkedin_outreach from already-upserted conversations.
+
+    Joins on lead profile URL; when a lead has several contacted threads, the most
+    recent one wins. "Responded" means the thread has any correspondent messages.
+    """
+    id_array = render("%s", [Array(conversation_ids, "text")])
+    return f"""
+WITH updated AS (
+  UPDATE public.linkedin_outreach AS lo
+  SET
+    messages_sent = hc.messages,
+    if_respond = hc.inbound_count > 0,
+    updated_at = now()
+  FROM (
+    SELECT DISTINCT ON (lead_profile_url) lead_profile_url, messages, inbound_count
+    FROM public.heyreach_conversations
+    WHERE conversation_id = ANY({id_array})
+      AND lead_profile_url IS NOT NULL
+      AND outbound_count > 0
+    ORDER BY lead_profile_url, last_message_at DESC NULLS LAST
+  ) AS hc
+  WHERE lo.engager_linkedin_url = hc.lead_profile_url
+  RETURNING 1
+)
+SELECT COUNT(*)::int AS updated FROM updated;
+""".strip()
 
 
 def main() -> None:
@@ -358,57 +348,96 @@ def main() -> None:
         action="store_true",
         help="If set, update public.linkedin_outreach.messages_sent where engager_linkedin_url matches lead profile URL.",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the saved high-water marks and re-sync every conversation.",
+    )
+    parser.add_argument(
+        "--batch-max-chars",
+        type=int,
+        default=DEFAULT_BATCH_MAX_CHARS,
+        help="Max SQL statement size per Neon round trip (default: 2,000,000 chars).",
+    )
+    parser.add_argument(
+        "--batch-max-rows",
+        type=int,
+        default=DEFAULT_BATCH_MAX_ROWS,
+        help="Max conversations per upsert statement (default: 1000).",
+    )
     args = parser.parse_args()
 
     _ensure_env_loaded()
     client = DatagenClient()
+    neon = NeonClient(
+        client,
+        project_id=args.neon_project_id,
+        branch_id=args.neon_branch_id,
+        database_name=args.neon_database,
+        batch_max_chars=args.batch_max_chars,
+    )
 
     account_ids = _get_all_linked_in_account_ids(client)
     if not account_ids:
         raise RuntimeError("No HeyReach LinkedIn accounts found. Check HeyReach connection in DataGen.")
     print(f"[accounts] linkedInAccountIds={account_ids}")
 
-    conversations = _fetch_all_conversations(
-        client, linked_in_account_ids=account_ids, max_conversations=args.max_conversations
-    )
+    sync_state = NeonSyncState(neon)
+    if args.full:
+        marks = {}
+        conversations = _fetch_all_conversations(
+            client, linked_in_account_ids=account_ids, max_conversations=args.max_conversations
+        )
+    else:
+        marks, err = sync_state.load(SYNC_SOURCE)
+        if err:
+            raise RuntimeError(err)
+        items, err = fetch_conversations_since(
+            client, account_ids, marks, max_conversations=args.max_conversations
+        )
+        if err:
+            raise RuntimeError(err)
+        conversations = [c for c in (_parse_conversation(item) for item in items) if c is not None]
+    # A capped run hasn't seen everything older than its newest conversation
+    capped = args.max_conversations is not None and len(conversations) >= args.max_conversations
+    new_marks = advance_marks(marks, [c.raw for c in conversations])
     if args.only_contacted:
         conversations = [c for c in conversations if c.has_outbound()]
     print(f"[sync] conversations_to_sync={len(conversations)}")
 
-    _ensure_neon_schema(client, project_id=args.neon_project_id, branch_id=args.neon_branch_id, database_name=args.neon_database)
+    _ensure_neon_schema(neon)
     print("[neon] ensured schema public.heyreach_conversations")
 
-    upserted = 0
-    outreach_updates_attempted = 0
+    conversations = _unique_by_conversation_id(conversations)
+    upsert_batches = _chunk_by_length(
+        [_conversation_values_sql(c) for c in conversations],
+        max_chars=args.batch_max_chars,
+        max_rows=args.batch_max_rows,
+    )
 
-    for conv in conversations:
-        _run_sql(
-            client,
-            project_id=args.neon_project_id,
-            branch_id=args.neon_branch_id,
-            database_name=args.neon_database,
-            sql=_upsert_conversation_sql(conv),
-        )
-        upserted += 1
-
-        if args.backfill_linkedin_outreach:
-            update_sql = _update_linkedin_outreach_threads_sql(conv)
-            if update_sql:
-                _run_sql(
-                    client,
-                    project_id=args.neon_project_id,
-                    branch_id=args.neon_branch_id,
-                    database_name=args.neon_database,
-                    sql=update_sql,
-                )
-                outreach_updates_attempted += 1
-
-    stats_rows = _run_sql(
-        client,
-        project_id=args.neon_project_id,
-        branch_id=args.neon_branch_id,
-        database_name=args.neon_database,
-        sql="""
+    # Upsert statements are grouped into transactions by the Neon client
+    neon.execute_many(_upsert_conversations_sql(batch) for batch in upsert_batches)
+    upserted = len(conversations)
+    print(f"[neon] upserted {upserted} conversations in {len(upsert_batches)} statements")
+
+    outreach_updates = 0
+    backfill_batches: list[list[str]] = []
+    if args.backfill_linkedin_outreach:
+        contacted_ids = [c.conversation_id for c in conversations if c.lead_profile_url and c.has_outbound()]
+        # IDs are short, so this is almost always a single statement
+        backfill_batches = _chunk_by_length(contacted_ids, max_chars=args.batch_max_chars, max_rows=50_000)
+        results = neon.execute_many(_backfill_linkedin_outreach_sql(batch) for batch in backfill_batches)
+        outreach_updates = sum(int(rows[0].get("updated") or 0) for rows in results if rows)
+        print(f"[neon] backfilled linkedin_outreach rows={outreach_updates}")
+
+    if not capped and new_marks != marks:
+        err = sync_state.save(SYNC_SOURCE, new_marks)
+        if err:
+            raise RuntimeError(err)
+        print(f"[state] high-water marks={new_marks}")
+
+    stats_row = neon.query_one(
+        """
 SELECT
   (SELECT COUNT(*)::int FROM public.heyreach_conversations) AS heyreach_conversations,
   (SELECT COUNT(*)::int FROM public.heyreach_conversations WHERE has_outbound) AS heyreach_contacted_conversations,
@@ -418,8 +447,9 @@ SELECT
     )
 
     stamp = _utc_now_stamp()
-    print(f"[done] upserted={upserted} outreach_updates_attempted={outreach_updates_attempted} stamp={stamp}")
-    print(f"[done] neon_stats={stats_rows}")
+    print(f"[done] upserted={upserted} outreach_updates={outreach_updates} stamp={stamp}")
+    print(f"[done] neon_stats={stats_row}")
+    print(f"[done] {neon.format_summary()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tail the change log of a lead table.
+
+Prints one JSON line per change (seq, row_id, column_name, value_hash,
+changed_at); column_name "*" marks a newly imported row. Consumers that keep
+a cursor file only ever see changes they haven't processed yet.
+
+Usage:
+    # Everything logged so far
+    python tail_changes.py --lead example-leads
+
+    # Stream new changes as they are committed
+    python tail_changes.py --lead example-leads --from-now --follow
+
+    # Resume from (and keep updating) a consumer cursor
+    python tail_changes.py --lead example-leads --cursor-file /tmp/clay.cursor --follow
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from db import ChangeCursor, LeadDB, open_lead_db
+
+
+def get_lead_path(lead_name: str) -> Path:
+    """Get path to a lead table directory."""
+    return Path(__file__).parent.parent / "leads" / lead_name
+
+
+def parse_cursor(text: str) -> ChangeCursor:
+    """Plain seq for single-file tables; sharded tables use opaque "12,40,7" cursors."""
+    text = text.strip()
+    return int(text) if text.isdigit() else text
+
+
+def read_cursor(cursor_file: Path) -> tuple[ChangeCursor, str]:
+    """Read a saved cursor (0 if the file doesn't exist yet)."""
+    if not cursor_file.exists():
+        return 0, ""
+    try:
+        return parse_cursor(cursor_file.read_text(encoding="utf-8")) or 0, ""
+    except Exception as e:
+        return 0, f"read cursor error: {e}"
+
+
+def write_cursor(cursor_file: Path, cursor: ChangeCursor) -> str:
+    """Persist a cursor atomically."""
+    try:
+        tmp_path = cursor_file.with_name(cursor_file.name + ".tmp")
+        tmp_path.write_text(str(cursor), encoding="utf-8")
+        tmp_path.replace(cursor_file)
+        return ""
+    except Exception as e:
+        return f"write cursor error: {e}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tail the change log of a lead table")
+    parser.add_argument("--lead", required=True, help="Lead table name (directory under leads/)")
+    parser.add_argument("--since", type=parse_cursor, default=None, help="Start after this cursor (default: 0)")
+    parser.add_argument("--from-now", action="store_true", help="Skip existing changes, only show new ones")
+    parser.add_argument("--cursor-file", help="Read the start cursor from, and save progress to, this file")
+    parser.add_argument("--follow", "-f", action="store_true", help="Keep polling for new changes")
+    parser.add_argument("--interval", type=float, default=0.25, help="Polling interval in seconds (default: 0.25)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Changes fetched per poll (default: 1000)")
+    args = parser.parse_args()
+
+    db_path = get_lead_path(args.lead) / "table.db"
+    db, err = open_lead_db(db_path)
+    if err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 1
+    if isinstance(db, LeadDB) and not db_path.exists():
+        print(f"Error: Database file not found: {db_path}", file=sys.stderr)
+        return 1
+
+    err = db.connect() or db.init_schema()
+    if err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 1
+
+    cursor_file = Path(args.cursor_file) if args.cursor_file else None
+    if args.since is not None:
+        cursor = args.since
+    elif args.from_now:
+        cursor, err = db.latest_change_cursor()
+    elif cursor_file:
+        cursor, err = read_cursor(cursor_file)
+    else:
+        cursor = 0
+    if err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 1
+
+    try:
+        while True:
+            changes, cursor, err = db.changes_since(cursor, args.batch_size)
+            if err:
+                print(f"Error: {err}", file=sys.stderr)
+                return 1
+
+            for change in changes:
+                print(json.dumps(change, default=str), flush=True)
+
+            if changes and cursor_file:
+                err = write_cursor(cursor_file, cursor)
+                if err:
+                    print(f"Error: {err}", file=sys.stderr)
+                    return 1
+
+            if len(changes) == args.batch_size:
+                continue  # Drain the backlog before sleeping
+            if not args.follow:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Batch transcript ingester for Fireflies meetings and YouTube videos.
+
+Takes any mix of Fireflies meeting IDs / URLs and YouTube URLs / video IDs,
+fetches them concurrently, and writes one normalized JSON transcript per
+item as each fetch completes:
+
+    transcript/fireflies/{meeting_id}.json
+    transcript/youtube/{video_id}.json
+
+Every file carries a content_hash of its normalized content. An item is
+skipped when its file already exists and its content still matches its
+hash. A partial or hand-edited file is fetched again. With --refresh,
+everything is fetched again, but a file is only rewritten when the content
+hash changed.
+
+Normalized transcript:
+    source, id, url, title, date, duration_minutes, participants,
+    segments [{speaker, text, start, duration}], text, summary,
+    content_hash, fetched_at
+
+Usage:
+    python scripts/transcript_ingest.py 01KB8EFR4YVD6TVS4B2XZV3S5N https://youtu.be/dQw4w9WgXcQ
+    python scripts/transcript_ingest.py --file ids.txt --workers 8
+    python scripts/transcript_ingest.py --file ids.txt --refresh --json
+
+YouTube needs youtube-transcript-api (optional dependency); Fireflies goes
+through DataGen (DATAGEN_API_KEY).
+
+Error-first pattern: functions return (result, error) tuples.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from fireflies_download import extract_meeting_id, fetch_meeting, parse_meeting_metadata
+from heyreach_pager import RateLimiter
+
+try:
+    from youtube_transcript_api import YouTubeTranscriptApi
+    YOUTUBE_TRANSCRIPT_AVAILABLE = True
+except ImportError:
+    YOUTUBE_TRANSCRIPT_AVAILABLE = False
+
+DEFAULT_OUTPUT_DIR = "transcript"
+DEFAULT_WORKERS = 8
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_LANGUAGES = ("en", "en-US", "en-GB")
+
+# Fields left out of the content hash (they change on every fetch)
+_UNHASHED_FIELDS = ("content_hash", "fetched_at")
+
+# Fireflies meeting IDs are ULIDs: 26 chars of Crockford base32
+_FIREFLIES_ID_RE = re.compile(r"^[0-9A-HJKMNP-TV-Z]{26}$")
+_YOUTUBE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+# "Speaker Name: what they said" lines in Fireflies transcripts
+_SENTENCE_RE = re.compile(r"^([^:\n]{1,80}): (.+)$")
+_HEADER_RE = re.compile(r"^(Id|Title|DateString|Privacy|Speakers|Participants|Duration|Organizer Email): ?(.*)$")
+
+
+@dataclass(frozen=True)
+class TranscriptItem:
+    """One thing to ingest: source ("fireflies" / "youtube") and its ID."""
+
+    source: str
+    item_id: str
+    # What the user passed in (URL or ID); not part of the item's identity
+    ref: str = field(default="", compare=False)
+
+    def path(self, output_dir: Path) -> Path:
+        return Path(output_dir) / self.source / f"{self.item_id}.json"
+
+
+def extract_video_id(url: str) -> str:
+    """Extract video ID from various YouTube URL formats"""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().removeprefix("www.").removeprefix("m.")
+    video_id = None
+
+    # youtu.be/VIDEO_ID
+    if host == "youtu.be":
+        video_id = parsed.path[1:].split("/")[0]
+
+    # youtube.com/watch?v=VIDEO_ID, /shorts/VIDEO_ID, /embed/VIDEO_ID, /live/VIDEO_ID
+    elif host == "youtube.com":
+        video_id = parse_qs(parsed.query).get("v", [None])[0]
+        parts = [p for p in parsed.path.split("/") if p]
+        if not video_id and len(parts) >= 2 and parts[0] in ("shorts", "embed", "live"):
+            video_id = parts[1]
+
+    # Direct video ID
+    else:
+        video_id = url
+
+    if video_id and _YOUTUBE_ID_RE.match(video_id):
+        return video_id
+    raise ValueError(f"Invalid YouTube URL: {url}")
+
+
+def format_transcript(transcript: list[dict]) -> str:
+    """Format transcript into readable text"""
+    return " ".join(entry["text"] for entry in transcript)
+
+
+def parse_item(ref: str) -> tuple[Optional[TranscriptItem], str]:
+    """Classify a meeting ID / Fireflies URL / YouTube URL / video ID."""
+    ref = ref.strip()
+    if not ref:
+        return None, "empty reference"
+    try:
+        if "fireflies.ai" in ref:
+            return TranscriptItem("fireflies", extract_meeting_id(ref), ref), ""
+        if "youtu" in ref:
+            return TranscriptItem("youtube", extract_video_id(ref), ref), ""
+    except ValueError as e:
+        return None, str(e)
+    if _FIREFLIES_ID_RE.match(ref):
+        return TranscriptItem("fireflies", ref, ref), ""
+    if _YOUTUBE_ID_RE.match(ref):
+        return TranscriptItem("youtube", ref, ref), ""
+    return None, f"Not a Fireflies meeting or YouTube video: {ref}"
+
+
+def content_hash(doc: dict) -> str:
+    """Hash of a normalized transcript, ignoring content_hash / fetched_at."""
+    content = {k: v for k, v in doc.items() if k not in _UNHASHED_FIELDS}
+    canonical = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def stored_hash(path: Path) -> Optional[str]:
+    """content_hash of a stored transcript, or None if missing, unreadable or modified."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            doc = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or doc.get("content_hash") != content_hash(doc):
+        return None
+    return doc["content_hash"]
+
+
+def _tool_text(result: Any) -> str:
+    """Text of a DataGen tool result (a list of strings, usually one)."""
+    if isinstance(result, list):
+        return "\n".join(r if isinstance(r, str) else json.dumps(r) for r in result)
+    if isinstance(result, str):
+        return result
+    return json.dumps(result) if result is not None else ""
+
+
+def normalize_fireflies(meeting_id: str, summary: Any, transcript: Any) -> dict:
+    """Normalized transcript from Fireflies get_summary / get_transcript results."""
+    transcript_text = _tool_text(transcript)
+    summary_text = _tool_text(summary)
+
+    headers: dict[str, str] = {}
+    segments = []
+    in_sentences = False
+    for line in transcript_text.splitlines():
+        if not in_sentences:
+            if line.startswith("Sentences:"):
+                in_sentences = True
+                line = line[len("Sentences:"):].strip()
+            else:
+                match = _HEADER_RE.match(line)
+                if match:
+                    headers[match.group(1)] = match.group(2).strip()
+                continue
+        match = _SENTENCE_RE.match(line)
+        if match:
+            segments.append({"speaker": match.group(1).strip(), "text": match.group(2).strip()})
+        elif line.strip() and segments:
+            # Wrapped sentence: belongs to the previous speaker
+            segments[-1]["text"] += " " + line.strip()
+
+    # Title and other fields may only be in the summary's header
+    summary_meta = parse_meeting_metadata([summary_text]) if summary_text else {}
+    metadata = {**summary_meta, **parse_meeting_metadata([transcript_text])}
+    participants = metadata.get("participants") or [
+        p.strip() for p in headers.get("Speakers", "").split(",") if p.strip()
+    ]
+    summary_match = re.search(r"^Summary: (.*)", summary_text, re.MULTILINE | re.DOTALL)
+
+    return {
+        "source": "fireflies",
+        "id": meeting_id,
+        "url": f"https://app.fireflies.ai/view/{meeting_id}",
+        "title": metadata.get("title"),
+        "date": metadata.get("date") or headers.get("DateString"),
+        "duration_minutes": metadata.get("duration_minutes"),
+        "participants": list(dict.fromkeys(participants)),
+        "segments": segments,
+        "text": "\n".join(f"{s['speaker']}: {s['text']}" for s in segments) or transcript_text,
+        "summary": summary_match.group(1).strip() if summary_match else (summary_text or None),
+    }
+
+
+def normalize_youtube(video_id: str, entries: list[dict]) -> dict:
+    """Normalized transcript from youtube-transcript-api raw data."""
+    segments = [
+        {
+            "speaker": None,
+            "text": entry.get("text", ""),
+            "start": entry.get("start"),
+            "duration": entry.get("duration"),
+        }
+        for entry in entries
+    ]
+    duration = None
+    if entries:
+        last = entries[-1]
+        duration = round(((last.get("start") or 0) + (last.get("duration") or 0)) / 60, 2)
+    return {
+        "source": "youtube",
+        "id": video_id,
+        "url": f"https://www.youtube.com/watch?v={video_id}",
+        "title": None,
+        "date": None,
+        "duration_minutes": duration,
+        "participants": [],
+        "segments": segments,
+        "text": format_transcript(entries),
+        "summary": None,
+    }
+
+
+def fetch_youtube(video_id: str, languages: Iterable[str] = DEFAULT_LANGUAGES) -> list[dict]:
+    """Fetch raw transcript entries (text, start, duration) for a video."""
+    if not YOUTUBE_TRANSCRIPT_AVAILABLE:
+        raise RuntimeError("youtube-transcript-api not installed. Run: pip install youtube-transcript-api")
+    return YouTubeTranscriptApi().fetch(video_id, languages=tuple(languages)).to_raw_data()
+
+
+def write_transcript(doc: dict, path: Path) -> None:
+    """Write a normalized transcript atomically (temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+@dataclass
+class IngestResult:
+    """Outcome of an ingest() call."""
+
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def format_summary(self) -> str:
+        return (
+            f"written={len(self.written)} unchanged={len(self.unchanged)} "
+            f"already_stored={len(self.skipped)} failed={len(self.failed)} time={self.seconds:.1f}s"
+        )
+
+
+class TranscriptIngester:
+    """Fetches items concurrently and writes normalized transcripts as they complete."""
+
+    def __init__(
+        self,
+        output_dir: Path = Path(DEFAULT_OUTPUT_DIR),
+        *,
+        client: Any = None,
+        workers: int = DEFAULT_WORKERS,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        languages: Iterable[str] = DEFAULT_LANGUAGES,
+        fetchers: Optional[dict[str, Callable[[str], dict]]] = None,
+    ):
+        """
+        Initialize TranscriptIngester.
+
+        Args:
+            output_dir: Corpus directory (one subdirectory per source)
+            client: DatagenClient for Fireflies (created on first use)
+            workers: Items fetched at once
+            requests_per_second: Max API calls per second per source
+            languages: Preferred YouTube transcript languages
+            fetchers: Override fetch(item_id) -> normalized doc per source
+        """
+        self.output_dir = Path(output_dir)
+        self.client = client
+        self.workers = max(1, workers)
+        self.languages = tuple(languages)
+        self.fetchers = {
+            "fireflies": self._fetch_fireflies,
+            "youtube": self._fetch_youtube,
+            **(fetchers or {}),
+        }
+        self._limiters = {source: RateLimiter(requests_per_second) for source in self.fetchers}
+
+    def _fetch_fireflies(self, meeting_id: str) -> dict:
+        if self.client is None:
+            from datagen_sdk import DatagenClient
+            self.client = DatagenClient()
+        # Two tool calls per meeting: each takes its own rate-limit slot
+        summary, transcript = fetch_meeting(self.client, meeting_id, before_call=self._limiters["fireflies"].acquire)
+        return normalize_fireflies(meeting_id, summary, transcript)
+
+    def _fetch_youtube(self, video_id: str) -> dict:
+        self._limiters["youtube"].acquire()
+        return normalize_youtube(video_id, fetch_youtube(video_id, self.languages))
+
+    def _fetch(self, item: TranscriptItem) -> dict:
+        fetch = self.fetchers[item.source]
+        # The built-in fetchers acquire the limiter per API call; overrides count as one call
+        if fetch not in (self._fetch_fireflies, self._fetch_youtube):
+            self._limiters[item.source].acquire()
+        return fetch(item.item_id)
+
+    def ingest(
+        self,
+        items: Iterable[TranscriptItem],
+        *,
+        refresh: bool = False,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> IngestResult:
+        """
+        Fetch and store items not already on disk (all of them with refresh).
+
+        Returns:
+            IngestResult (per-item errors are collected in .failed, never raised)
+        """
+        start = time.monotonic()
+        result = IngestResult()
+
+        todo: list[TranscriptItem] = []
+        previous: dict[TranscriptItem, Optional[str]] = {}
+        for item in dict.fromkeys(items):
+            key = f"{item.source}:{item.item_id}"
+            if item.source not in self.fetchers:
+                result.failed[key] = f"unknown source {item.source}"
+                continue
+            previous[item] = stored_hash(item.path(self.output_dir))
+            if previous[item] and not refresh:
+                result.skipped.append(key)
+            else:
+                todo.append(item)
+
+        if todo:
+            executor = ThreadPoolExecutor(max_workers=min(self.workers, len(todo)), thread_name_prefix="transcript")
+            futures: dict[Future, TranscriptItem] = {executor.submit(self._fetch, item): item for item in todo}
+            try:
+                while futures:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        item = futures.pop(future)
+                        key = f"{item.source}:{item.item_id}"
+                        try:
+                            doc = future.result()
+                        except Exception as e:
+                            result.failed[key] = str(e)[:300]
+                            if log:
+                                log(f"✗ {key}: {result.failed[key]}")
+                            continue
+
+                        digest = content_hash(doc)
+                        if digest == previous.get(item):
+                            result.unchanged.append(key)
+                            if log:
+                                log(f"= {key} (unchanged)")
+                            continue
+                        doc["content_hash"] = digest
+                        doc["fetched_at"] = datetime.now(timezone.utc).isoformat()
+                        path = item.path(self.output_dir)
+                        try:
+                            write_transcript(doc, path)
+                        except OSError as e:
+                            result.failed[key] = f"write failed: {e}"
+                            continue
+                        result.written.append(key)
+                        if log:
+                            log(f"✓ {key} -> {path} ({len(doc.get('segments') or [])} segments)")
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        result.seconds = time.monotonic() - start
+        return result
+
+
+def read_refs(refs: Iterable[str], files: Iterable[str]) -> tuple[list[str], str]:
+    """References from the command line plus files (one per line, # comments allowed)."""
+    collected = [r for r in refs if r.strip()]
+    for path in files:
+        try:
+            with open(path, encoding="utf-8") as f:
+                collected.extend(
+                    line.split("#", 1)[0].strip() for line in f
+                    if line.split("#", 1)[0].strip()
+                )
+        except OSError as e:
+            return [], f"Failed to read {path}: {e}"
+    return collected, ""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch Fireflies and YouTube transcripts concurrently into a normalized corpus",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument("refs", nargs="*", help="Fireflies meeting IDs/URLs and YouTube URLs/video IDs")
+    parser.add_argument("--file", "-f", action="append", default=[],
+                        help="File with one reference per line (repeatable)")
+    parser.add_argument("--output-dir", "-o", default=DEFAULT_OUTPUT_DIR,
+                        help=f"Output directory (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Items fetched at once (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--rps", type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help=f"Max requests per second per source (default: {DEFAULT_REQUESTS_PER_SECOND:g})")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Fetch stored items again (files are rewritten only if the content changed)")
+    parser.add_argument("--json", action="store_true", help="Output result as JSON")
+
+    args = parser.parse_args()
+
+    refs, err = read_refs(args.refs, args.file)
+    if err:
+        print(f"Error: {err}", file=sys.stderr)
+        sys.exit(1)
+    if not refs:
+        parser.print_help()
+        sys.exit(1)
+
+    items = []
+    invalid = {}
+    for ref in refs:
+        item, err = parse_item(ref)
+        if err:
+            invalid[ref] = err
+        else:
+            items.append(item)
+
+    log = None if args.json else print
+    if log:
+        for ref, err in invalid.items():
+            print(f"✗ {ref}: {err}")
+        print(f"Ingesting {len(items)} item(s) into {args.output_dir}/ with {args.workers} workers...\n")
+
+    ingester = TranscriptIngester(Path(args.output_dir), workers=args.workers, requests_per_second=args.rps)
+    result = ingester.ingest(items, refresh=args.refresh, log=log)
+    result.failed.update(invalid)
+
+    if args.json:
+        print(json.dumps({
+            "written": result.written,
+            "unchanged": result.unchanged,
+            "already_stored": result.skipped,
+            "failed": result.failed,
+            "seconds": round(result.seconds, 2),
+        }, indent=2))
+    else:
+        print(f"\nDone: {result.format_summary()}")
+
+    sys.exit(1 if result.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ from pathlib import Path
 
 from datagen_sdk import DatagenClient
 
+from neon_client import NeonClient, render
+
 
 def _load_env_file(path: Path) -> None:
     """Load environment variables from a file."""
@@ -62,44 +64,47 @@ def main() -> None:
         parser.error("At least one of --heyreach-campaign-id or --heyreach-list-id is required")
 
     _ensure_env_loaded()
-    client = DatagenClient()
+    neon = NeonClient(
+        DatagenClient(),
+        project_id=args.neon_project_id,
+        branch_id=None,
+        database_name=args.neon_database,
+    )
 
     # Build UPDATE statement
     set_clauses = []
+    params = {"campaign_id": args.campaign_id}
     if args.heyreach_campaign_id:
-        set_clauses.append(f"heyreach_campaign_id = {args.heyreach_campaign_id}")
+        set_clauses.append("heyreach_campaign_id = %(heyreach_campaign_id)s")
+        params["heyreach_campaign_id"] = args.heyreach_campaign_id
     if args.heyreach_list_id:
-        set_clauses.append(f"heyreach_list_id = {args.heyreach_list_id}")
+        set_clauses.append("heyreach_list_id = %(heyreach_list_id)s")
+        params["heyreach_list_id"] = args.heyreach_list_id
 
     sql = f"""
 UPDATE campaigns
 SET {', '.join(set_clauses)}
-WHERE id = {args.campaign_id}
+WHERE id = %(campaign_id)s
 RETURNING id, name, heyreach_campaign_id, heyreach_list_id;
 """.strip()
 
     print(f"Updating campaign {args.campaign_id}...")
-    print(f"SQL: {sql}\n")
+    print(f"SQL: {render(sql, params)}\n")
 
-    result = client.execute_tool(
-        "mcp_Neon_run_sql",
-        {"sql": sql, "projectId": args.neon_project_id, "databaseName": args.neon_database},
-    )
+    try:
+        row = neon.query_one(sql, params)
+    except Exception as e:
+        print(f"❌ Update failed: {e}")
+        sys.exit(1)
 
-    if result and isinstance(result, list) and len(result) > 0:
-        rows = result[0] if isinstance(result[0], list) else []
-        if rows:
-            row = rows[0]
-            print("✅ Campaign updated successfully:")
-            print(f"   ID: {row.get('id')}")
-            print(f"   Name: {row.get('name')}")
-            print(f"   HeyReach Campaign ID: {row.get('heyreach_campaign_id')}")
-            print(f"   HeyReach List ID: {row.get('heyreach_list_id')}")
-        else:
-            print(f"❌ Campaign {args.campaign_id} not found")
-            sys.exit(1)
+    if row:
+        print("✅ Campaign updated successfully:")
+        print(f"   ID: {row.get('id')}")
+        print(f"   Name: {row.get('name')}")
+        print(f"   HeyReach Campaign ID: {row.get('heyreach_campaign_id')}")
+        print(f"   HeyReach List ID: {row.get('heyreach_list_id')}")
     else:
-        print("❌ Update failed")
+        print(f"❌ Campaign {args.campaign_id} not found")
         sys.exit(1)
 
 
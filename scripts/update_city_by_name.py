@@ -8,11 +8,14 @@ import csv
 import os
 from datagen_sdk import DatagenClient
 
+from neon_client import NeonClient
+
 # Ensure API key is set
 if not os.getenv("DATAGEN_API_KEY"):
     raise RuntimeError("DATAGEN_API_KEY not set")
 
 client = DatagenClient()
+neon = NeonClient(client, branch_id=None)
 
 # Read HeyReach CSV export
 import os.path
@@ -53,17 +56,9 @@ print(f"Found {len(location_map)} prospects with location data")
 
 # Get all prospects from Neon
 print("\nFetching prospects from Neon...")
-result = client.execute_tool(
-    "mcp_Neon_run_sql",
-    {
-        "params": {
-            "projectId": "blue-tree-25780810",
-            "sql": "SELECT id, profile_enrichment->>'name' as name, engager_linkedin_url FROM linkedin_outreach;"
-        }
-    }
+prospects = neon.query(
+    "SELECT id, profile_enrichment->>'name' as name, engager_linkedin_url FROM linkedin_outreach;"
 )
-
-prospects = result[0]
 print(f"Found {len(prospects)} prospects in database")
 
 # Match and update
@@ -73,6 +68,8 @@ updated_count = 0
 error_count = 0
 not_found = []
 
+updates = []
+
 for prospect in prospects:
     db_name = prospect['name']
     normalized_db_name = normalize_name(db_name)
@@ -80,36 +77,26 @@ for prospect in prospects:
     if normalized_db_name in location_map:
         matched_count += 1
         location = location_map[normalized_db_name]['location']
-        prospect_id = prospect['id']
-
-        try:
-            # Update the city column
-            sql = f"""
-            UPDATE linkedin_outreach
-            SET city = '{location.replace("'", "''")}',
-                updated_at = now()
-            WHERE id = {prospect_id}
-            """
-
-            client.execute_tool(
-                "mcp_Neon_run_sql",
-                {
-                    "params": {
-                        "projectId": "blue-tree-25780810",
-                        "sql": sql
-                    }
-                }
-            )
-
-            updated_count += 1
-            print(f"✓ {db_name:35} → {location}")
-
-        except Exception as e:
-            error_count += 1
-            print(f"✗ Error updating {db_name}: {e}")
+        updates.append((db_name, prospect['id'], location))
     else:
         not_found.append(db_name)
 
+# Update the city column, batched into transactions
+update_sql = """
+UPDATE linkedin_outreach
+SET city = %s,
+    updated_at = now()
+WHERE id = %s
+"""
+failed = neon.try_execute_many((update_sql, [location, prospect_id]) for _, prospect_id, location in updates)
+for i, (db_name, _, location) in enumerate(updates):
+    if i in failed:
+        error_count += 1
+        print(f"✗ Error updating {db_name}: {failed[i]}")
+    else:
+        updated_count += 1
+        print(f"✓ {db_name:35} → {location}")
+
 print(f"\n{'='*80}")
 print(f"Summary:")
 print(f"  Total in database: {len(prospects)}")
@@ -127,23 +114,13 @@ if not_found and len(not_found) <= 10:
 
 # Verify updates
 print("\nVerifying updates...")
-result = client.execute_tool(
-    "mcp_Neon_run_sql",
-    {
-        "params": {
-            "projectId": "blue-tree-25780810",
-            "sql": """
-            SELECT
-                COUNT(*) as total,
-                COUNT(city) as with_city,
-                COUNT(CASE WHEN city IS NULL THEN 1 END) as without_city
-            FROM linkedin_outreach;
-            """
-        }
-    }
-)
-
-stats = result[0][0]
+stats = neon.query_one("""
+SELECT
+    COUNT(*) as total,
+    COUNT(city) as with_city,
+    COUNT(CASE WHEN city IS NULL THEN 1 END) as without_city
+FROM linkedin_outreach;
+""")
 print(f"  Total records: {stats['total']}")
 print(f"  With city: {stats['with_city']}")
 print(f"  Without city: {stats['without_city']}")
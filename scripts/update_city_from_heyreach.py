@@ -7,11 +7,14 @@ import csv
 import os
 from datagen_sdk import DatagenClient
 
+from neon_client import NeonClient
+
 # Ensure API key is set
 if not os.getenv("DATAGEN_API_KEY"):
     raise RuntimeError("DATAGEN_API_KEY not set")
 
 client = DatagenClient()
+neon = NeonClient(client, branch_id=None)
 
 # Read HeyReach CSV export
 import os.path
@@ -47,33 +50,22 @@ print("\nUpdating city column in Neon database...")
 updated_count = 0
 error_count = 0
 
-for linkedin_url, location in location_map.items():
-    try:
-        # Update the city column
-        sql = f"""
-        UPDATE linkedin_outreach
-        SET city = '{location.replace("'", "''")}',
-            updated_at = now()
-        WHERE engager_linkedin_url = '{linkedin_url}'
-        """
-
-        result = client.execute_tool(
-            "mcp_Neon_run_sql",
-            {
-                "params": {
-                    "projectId": "blue-tree-25780810",
-                    "sql": sql
-                }
-            }
-        )
-
+# Update the city column, batched into transactions
+update_sql = """
+UPDATE linkedin_outreach
+SET city = %s,
+    updated_at = now()
+WHERE engager_linkedin_url = %s
+"""
+failed = neon.try_execute_many((update_sql, [location, linkedin_url]) for linkedin_url, location in location_map.items())
+for i, (linkedin_url, location) in enumerate(location_map.items()):
+    if i in failed:
+        error_count += 1
+        print(f"✗ Error updating {linkedin_url}: {failed[i]}")
+    else:
         updated_count += 1
         print(f"✓ Updated: {location}")
 
-    except Exception as e:
-        error_count += 1
-        print(f"✗ Error updating {linkedin_url}: {e}")
-
 print(f"\n{'='*60}")
 print(f"Summary:")
 print(f"  Total prospects: {len(location_map)}")
@@ -83,24 +75,16 @@ print(f"{'='*60}")
 
 # Show sample of updated data
 print("\nSample of updated records:")
-result = client.execute_tool(
-    "mcp_Neon_run_sql",
-    {
-        "params": {
-            "projectId": "blue-tree-25780810",
-            "sql": """
-            SELECT
-                profile_enrichment->>'name' as name,
-                city,
-                engager_linkedin_url
-            FROM linkedin_outreach
-            WHERE city IS NOT NULL
-            ORDER BY id
-            LIMIT 10;
-            """
-        }
-    }
-)
-
-for record in result[0]:
+records = neon.query("""
+SELECT
+    profile_enrichment->>'name' as name,
+    city,
+    engager_linkedin_url
+FROM linkedin_outreach
+WHERE city IS NOT NULL
+ORDER BY id
+LIMIT 10;
+""")
+
+for record in records:
     print(f"  • {record['name']:30} → {record['city']}")
@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 """
 Update the top 10 RevOps/GTM prospects with the new detailed message.
+
+Messages are rendered from the compiled template in one pass and pushed back
+to HeyReach in a single add_leads_to_list_v2 call (adds are upserts).
 """
 
 import os
 import sys
 from datagen_sdk import DatagenClient
 
+from heyreach_loader import load_leads
+from message_renderer import MessageTemplate, extract_first_name
+
 # Verify API key
 DATAGEN_API_KEY = os.getenv("DATAGEN_API_KEY")
 if not DATAGEN_API_KEY:
@@ -26,6 +32,8 @@ Let me know if interested.
 
 Yu-Sheng"""
 
+NEW_MESSAGE = MessageTemplate(NEW_MESSAGE_TEMPLATE)
+
 # Top 10 RevOps/GTM-focused prospects (ordered by relevance)
 TOP_10_PROFILES = [
     "https://www.linkedin.com/in/jackileahy",        # Fractional RevOps
@@ -41,21 +49,6 @@ TOP_10_PROFILES = [
 ]
 
 
-def extract_first_name(full_name):
-    """Extract first name from full name, handling emojis."""
-    if not full_name:
-        return "there"
-
-    # Remove common emojis
-    clean_name = full_name.replace("🦾", "").replace("👨‍💻", "").replace("🪄", "").strip()
-
-    # Split and get first part
-    parts = clean_name.split()
-    if parts:
-        return parts[0]
-    return "there"
-
-
 def get_leads_from_list():
     """Get all leads from the HeyReach list."""
 
@@ -105,76 +98,53 @@ def update_lead_messages(leads):
 
     print(f"📝 Updating messages for {len(leads)} leads...\n")
 
-    updated_count = 0
-    failed_count = 0
-
-    for i, lead in enumerate(leads, 1):
-        first_name = extract_first_name(f"{lead.get('firstName', '')} {lead.get('lastName', '')}".strip())
-        profile_url = lead.get("profileUrl")
-
-        # Generate new message
-        new_message = NEW_MESSAGE_TEMPLATE.format(first_name=first_name)
+    first_names = [
+        extract_first_name(f"{lead.get('firstName', '')} {lead.get('lastName', '')}".strip())
+        for lead in leads
+    ]
+    new_messages = NEW_MESSAGE.render_many([{"first_name": name} for name in first_names])
 
-        # Get existing custom fields
+    updated_leads = []
+    for lead, new_message in zip(leads, new_messages):
+        # Replace the message field in place (or add it), keep the other custom fields
+        message_field = {"name": "message", "value": new_message}
         custom_fields = lead.get("customFields", [])
-
-        # Update the message field
-        updated_fields = []
-        message_updated = False
-
-        for field in custom_fields:
-            if field.get("name") == "message":
-                updated_fields.append({
-                    "name": "message",
-                    "value": new_message
-                })
-                message_updated = True
-            else:
-                updated_fields.append(field)
-
-        # If message field didn't exist, add it
-        if not message_updated:
-            updated_fields.append({
-                "name": "message",
-                "value": new_message
-            })
-
-        # Update the lead
-        try:
-            result = client.execute_tool(
-                "mcp_Heyreach_add_leads_to_list_v2",
-                {
-                    "listId": LIST_ID,
-                    "leads": [{
-                        "profileUrl": profile_url,
-                        "firstName": lead.get("firstName"),
-                        "lastName": lead.get("lastName"),
-                        "companyName": lead.get("companyName"),
-                        "position": lead.get("headline"),
-                        "customUserFields": updated_fields
-                    }]
-                }
-            )
-
+        updated_fields = [message_field if f.get("name") == "message" else f for f in custom_fields]
+        if not any(f.get("name") == "message" for f in custom_fields):
+            updated_fields.append(message_field)
+
+        updated_leads.append({
+            "profileUrl": lead.get("profileUrl"),
+            "firstName": lead.get("firstName"),
+            "lastName": lead.get("lastName"),
+            "companyName": lead.get("companyName"),
+            "position": lead.get("headline"),
+            "customUserFields": updated_fields
+        })
+
+    # One call for up to 100 leads
+    result, err = load_leads(client, LIST_ID, updated_leads)
+
+    if err:
+        print(f"   ❌ {err}")
+        for error in result.errors[:10]:
+            print(f"      - {error}")
+    else:
+        for i, first_name in enumerate(first_names, 1):
             print(f"   ✅ {i}. Updated: {first_name}")
-            updated_count += 1
-
-        except Exception as e:
-            print(f"   ❌ {i}. Failed: {first_name} - {str(e)}")
-            failed_count += 1
 
     print(f"\n{'='*80}")
     print(f"UPDATE SUMMARY:")
     print(f"{'='*80}")
-    print(f"✅ Successfully updated: {updated_count}")
-    print(f"❌ Failed: {failed_count}")
+    print(f"✅ Successfully updated: {result.acked}")
+    print(f"❌ Failed: {result.failed}")
     print(f"{'='*80}\n")
 
 
 def preview_new_message():
     """Show a preview of the new message."""
 
-    sample_message = NEW_MESSAGE_TEMPLATE.format(first_name="Jacki")
+    sample_message = NEW_MESSAGE.render({"first_name": "Jacki"})
 
     print("="*80)
     print("NEW MESSAGE PREVIEW:")
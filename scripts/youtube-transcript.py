@@ -2,12 +2,13 @@
 """
 Download YouTube transcript and save to ./youtube-transcript directory
 Usage: python youtube-transcript.py <youtube_url>
+
+For many videos (and Fireflies meetings) at once, use transcript_ingest.py.
 """
 
 import sys
 import os
 from pathlib import Path
-from urllib.parse import urlparse, parse_qs
 from youtube_transcript_api import (
     YouTubeTranscriptApi,
     NoTranscriptFound,
@@ -17,23 +18,7 @@ from youtube_transcript_api import (
 )
 from typing import Iterable
 
-def extract_video_id(url: str) -> str:
-    """Extract video ID from various YouTube URL formats"""
-    parsed = urlparse(url)
-
-    # youtu.be/VIDEO_ID
-    if parsed.netloc == 'youtu.be':
-        return parsed.path[1:]
-
-    # youtube.com/watch?v=VIDEO_ID
-    if parsed.netloc in ['youtube.com', 'www.youtube.com']:
-        return parse_qs(parsed.query).get('v', [None])[0]
-
-    # Direct video ID
-    if len(url) == 11 and url.replace('-', '').replace('_', '').isalnum():
-        return url
-
-    raise ValueError(f"Invalid YouTube URL: {url}")
+from transcript_ingest import extract_video_id, format_transcript
 
 def get_transcript(video_id: str, languages: Iterable[str] | None = None) -> list[dict]:
     """Fetch transcript from YouTube using latest API (1.x)"""
@@ -55,13 +40,6 @@ def get_transcript(video_id: str, languages: Iterable[str] | None = None) -> lis
         print(f"Unexpected error fetching transcript: {e}")
         sys.exit(1)
 
-def format_transcript(transcript: list[dict]) -> str:
-    """Format transcript into readable text"""
-    lines = []
-    for entry in transcript:
-        lines.append(entry['text'])
-    return ' '.join(lines)
-
 def main():
     if len(sys.argv) < 2:
         print("Usage: python youtube-transcript.py <youtube_url>")
@@ -123,6 +123,140 @@ def test_database_integration():
     print(f"    Column count: {stats['column_count']}")
     print(f"    Status counts: {stats['status_counts']}")
 
+    # Test 9: Concurrent reads use per-thread connections
+    print("\n[Test 9] Concurrent reads with a writer...")
+    from concurrent.futures import ThreadPoolExecutor
+
+    def read_and_write(i):
+        _, _, read_err = db.get_cache_entry(f"missing-{i}")
+        write_err = db.update_row(test_row_id, {"test_column": f"value_{i}"})
+        return read_err or write_err
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        errors = [e for e in executor.map(read_and_write, range(20)) if e]
+    if errors:
+        print(f"  ❌ Concurrent access failed: {errors[0]}")
+        return False
+
+    conn_stats, err = db.get_connection_stats()
+    if err:
+        print(f"  ❌ Failed to get connection stats: {err}")
+        return False
+    if conn_stats["reader_connections"] < 2:
+        print(f"  ❌ Expected per-thread readers, got {conn_stats['reader_connections']}")
+        return False
+    print(f"  ✓ {conn_stats['reader_connections']} reader connections, {conn_stats['writes']} writes")
+
+    # Test 10: Change log
+    print("\n[Test 10] Reading change log...")
+    changes, cursor, err = db.changes_since(0)
+    if err:
+        print(f"  ❌ Failed to read changes: {err}")
+        return False
+    inserted = [c for c in changes if c["column_name"] == "*"]
+    if len(inserted) != len(csv_rows):
+        print(f"  ❌ Expected {len(csv_rows)} insert changes, got {len(inserted)}")
+        return False
+    err = db.update_row(test_row_id, {"enriched_field": "enrichment_data"})
+    if err:
+        print(f"  ❌ Failed to update: {err}")
+        return False
+    unchanged, cursor, err = db.changes_since(cursor)
+    if err or unchanged:
+        print(f"  ❌ No-op update should not be logged: {err or unchanged}")
+        return False
+    err = db.update_row(test_row_id, {"enriched_field": "new_value"})
+    new_changes, cursor, err = db.changes_since(cursor)
+    if err or [c["column_name"] for c in new_changes] != ["enriched_field"]:
+        print(f"  ❌ Expected one enriched_field change: {err or new_changes}")
+        return False
+    print(f"  ✓ {len(changes) + len(new_changes)} changes logged, cursor at {cursor}")
+    db.close()
+
+    # Test 11: Sharded table
+    print("\n[Test 11] Sharded table...")
+    import tempfile
+    from db_sharded import ShardedLeadDB, create_shards
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shard_dir = Path(tmp) / "table.shards"
+        err = create_shards(shard_dir, 3)
+        sharded = ShardedLeadDB(shard_dir)
+        err = err or sharded.connect() or sharded.init_schema()
+        if err:
+            print(f"  ❌ Failed to open shards: {err}")
+            return False
+        count, err = sharded.import_csv(csv_rows)
+        rows, err2 = sharded.get_rows()
+        if err or err2 or count != len(csv_rows) or [r["_source_row_index"] for r in rows] != list(range(len(csv_rows))):
+            print(f"  ❌ Sharded import/merge failed: {err or err2 or count}")
+            return False
+        err = sharded.update_rows([(row["_id"], {"shard_score": str(i)}, "completed", "") for i, row in enumerate(rows)])
+        done, err2 = sharded.filter_rows("shard_score IS NOT NULL")
+        exported, err3 = sharded.export_to_csv()
+        if err or err2 or err3 or len(done) != len(rows) or exported[-1]["shard_score"] != str(len(rows) - 1):
+            print(f"  ❌ Sharded update failed: {err or err2 or err3}")
+            return False
+        shard_changes, shard_cursor, err = sharded.changes_since("")
+        more, _, err2 = sharded.changes_since(shard_cursor)
+        if err or err2 or more or len(shard_changes) != 3 * len(rows):  # insert, shard_score, _status
+            print(f"  ❌ Sharded change log failed: {err or err2 or len(shard_changes)}")
+            return False
+        stats, _ = sharded.get_stats()
+        merged, _ = sharded.get_rows()
+        sharded.close()
+
+        from snapshot import NUMPY_AVAILABLE, open_lead_snapshot
+        if NUMPY_AVAILABLE:
+            snap, err = open_lead_snapshot(Path(tmp) / "table.db")
+            if err or snap.rows(range(snap.row_count)) != merged or snap.is_stale(Path(tmp) / "table.db"):
+                print(f"  ❌ Sharded snapshot differs from merged rows: {err}")
+                return False
+    print(f"  ✓ {stats['total_rows']} rows over shards {stats['shard_rows']}, cursor {shard_cursor}")
+
+    # Test 12: Columnar snapshot
+    print("\n[Test 12] Columnar snapshot...")
+    import sqlite3
+    from snapshot import NUMPY_AVAILABLE, LeadSnapshot, write_snapshot
+
+    if not NUMPY_AVAILABLE:
+        print("  numpy not installed; skipping snapshot test")
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = sqlite3.connect(Path(tmp) / "typed.db")
+            conn.execute("CREATE TABLE leads (_id INTEGER PRIMARY KEY, score REAL, label TEXT, raw, _status TEXT)")
+            conn.executemany(
+                "INSERT INTO leads (score, label, raw, _status) VALUES (?, ?, ?, ?)",
+                [(0.1 + 0.2, "a", 5, "completed"), (None, "2.5", 1.5, "COMPLETED"), (3, None, 2**62 + 1, "")],
+            )
+            conn.commit()
+            _, err = write_snapshot(conn, Path(tmp) / "typed.snapshot")
+            snap, err2 = LeadSnapshot.open(Path(tmp) / "typed.snapshot")
+            if err or err2:
+                print(f"  ❌ Failed to write snapshot: {err or err2}")
+                return False
+            conn.row_factory = sqlite3.Row
+            expected = [dict(row) for row in conn.execute("SELECT * FROM leads ORDER BY rowid")]
+            decoded = snap.rows(range(snap.row_count))
+            if decoded != expected:
+                print(f"  ❌ Snapshot rows differ from SELECT:\n    {decoded}\n    {expected}")
+                return False
+            exact = snap.indices(snap.equals("_status", "completed")).tolist()
+            loose = snap.indices(snap.iequals("_status", "completed")).tolist()
+            if exact != [0] or loose != [0, 1]:
+                print(f"  ❌ Equality filters wrong: exact={exact} case-insensitive={loose}")
+                return False
+            if snap.is_stale(Path(tmp) / "typed.db"):
+                print("  ❌ Fresh snapshot reported stale")
+                return False
+            conn.execute("UPDATE leads SET label = 'b' WHERE _id = 1")
+            conn.commit()
+            conn.close()
+            if not snap.is_stale(Path(tmp) / "typed.db"):
+                print("  ❌ Snapshot not stale after a write")
+                return False
+        print(f"  ✓ {len(decoded)} snapshot rows decode with their SQLite types, exact equality, staleness")
+
     print("\n" + "=" * 60)
     print("✅ All tests passed!")
     print("=" * 60)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for federated search timeouts.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from federated_search import SearchProvider, iter_search
+
+
+def test_federated_search():
+    """Test that a hanging provider times out without starving the other calls."""
+    print("=" * 60)
+    print("Testing Federated Search")
+    print("=" * 60)
+
+    release = threading.Event()
+
+    def hang(query):
+        release.wait(30)
+        return []
+
+    def respond(query):
+        return [f"{query} result"]
+
+    providers = [
+        SearchProvider("Hangs", hang, timeout=0.5),
+        SearchProvider("Responds", respond, timeout=5),
+    ]
+    queries = ["q1", "q2", "q3"]
+
+    # Test 1: More hung calls than workers
+    print("\n[Test 1] Hanging provider with max_workers=2...")
+    results = []
+    finished = threading.Event()
+
+    def collect():
+        results.extend(iter_search(providers, queries, max_workers=2))
+        finished.set()
+
+    start = time.monotonic()
+    threading.Thread(target=collect, daemon=True).start()
+    if not finished.wait(10):
+        release.set()
+        print(f"  ❌ Search hung after {len(results)} results")
+        return False
+    elapsed = time.monotonic() - start
+    release.set()
+
+    if len(results) != len(providers) * len(queries):
+        print(f"  ❌ Expected {len(providers) * len(queries)} results, got {len(results)}")
+        return False
+    timed_out = [r for r in results if r.timed_out]
+    answered = [r for r in results if r.ok]
+    if len(timed_out) != 3 or {r.provider for r in timed_out} != {"Hangs"}:
+        print(f"  ❌ Expected 3 Hangs timeouts, got {[(r.provider, r.query) for r in timed_out]}")
+        return False
+    if sorted(r.query for r in answered) != queries:
+        print(f"  ❌ Missing responses: {[r.query for r in answered]}")
+        return False
+    print(f"  ✓ {len(answered)} responses, {len(timed_out)} timeouts in {elapsed:.1f}s")
+
+    # Test 2: Errors are reported, not raised
+    print("\n[Test 2] Failing provider...")
+
+    def fail(query):
+        raise RuntimeError("boom")
+
+    results = list(iter_search([SearchProvider("Fails", fail)], "q"))
+    if len(results) != 1 or results[0].ok or "boom" not in results[0].error:
+        print(f"  ❌ Expected one failed result, got {results}")
+        return False
+    print(f"  ✓ {results[0].error}")
+
+    print("\n" + "=" * 60)
+    print("✅ All tests passed!")
+    print("=" * 60)
+    return True
+
+if __name__ == "__main__":
+    try:
+        success = test_federated_search()
+        sys.exit(0 if success else 1)
+    except Exception as e:
+        print(f"\n❌ Test failed with exception: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
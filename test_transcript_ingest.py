@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch transcript ingester.
+
+Uses fetchers= overrides and a fake DataGen client, so no network or API
+keys are needed.
+"""
+import json
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from transcript_ingest import TranscriptIngester, TranscriptItem, extract_video_id
+
+
+class FakeFetcher:
+    """Returns a normalized doc per ID, counting calls; IDs in fail raise."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.title = "v1"
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, item_id):
+        with self._lock:
+            self.calls.append(item_id)
+        if item_id in self.fail:
+            raise RuntimeError(f"fetch failed for {item_id}")
+        return {
+            "source": "youtube",
+            "id": item_id,
+            "title": self.title,
+            "segments": [{"speaker": None, "text": "hello", "start": 0, "duration": 1}],
+            "text": "hello",
+        }
+
+
+class FakeClient:
+    """DataGen client stub answering both Fireflies tools."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def execute_tool(self, tool, payload):
+        with self._lock:
+            self.calls += 1
+        return ["Title: Sync\nSentences:\nAda: Hi there"]
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            self.acquired += 1
+
+
+def test_transcript_ingest():
+    """Test video ID parsing, skip/refresh/failure handling and rate limiting."""
+    print("=" * 60)
+    print("Testing Transcript Ingest")
+    print("=" * 60)
+
+    output_dir = Path(tempfile.mkdtemp())
+    try:
+        # Test 1: Video IDs are validated for every URL form
+        print("\n[Test 1] Extracting video IDs...")
+        valid = [
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://youtube.com/shorts/dQw4w9WgXcQ",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ?start=5",
+            "https://m.youtube.com/live/dQw4w9WgXcQ",
+            "dQw4w9WgXcQ",
+        ]
+        invalid = [
+            "https://youtu.be/",
+            "https://youtu.be/short",
+            "https://youtube.com/shorts/../../etc",
+            "https://www.youtube.com/embed/dQw4w9WgXcQ-extra",
+            "https://www.youtube.com/watch?v=bad id!",
+            "https://www.youtube.com/live/",
+        ]
+        for url in valid:
+            if extract_video_id(url) != "dQw4w9WgXcQ":
+                print(f"  ❌ Wrong ID for {url}: {extract_video_id(url)}")
+                return False
+        for url in invalid:
+            try:
+                video_id = extract_video_id(url)
+                print(f"  ❌ Expected ValueError for {url}, got {video_id!r}")
+                return False
+            except ValueError:
+                pass
+        print(f"  ✓ {len(valid)} valid, {len(invalid)} rejected")
+
+        fetcher = FakeFetcher(fail={"failingvid1"})
+        ingester = TranscriptIngester(output_dir, workers=4, requests_per_second=0, fetchers={"youtube": fetcher})
+        items = [TranscriptItem("youtube", video_id) for video_id in ("video000001", "video000002", "failingvid1")]
+
+        # Test 2: First run writes, failures are collected
+        print("\n[Test 2] First ingest...")
+        result = ingester.ingest(items)
+        if sorted(result.written) != ["youtube:video000001", "youtube:video000002"]:
+            print(f"  ❌ Unexpected written: {result.written}")
+            return False
+        if list(result.failed) != ["youtube:failingvid1"] or "fetch failed" not in result.failed["youtube:failingvid1"]:
+            print(f"  ❌ Unexpected failures: {result.failed}")
+            return False
+        doc = json.loads((output_dir / "youtube" / "video000001.json").read_text())
+        if not doc.get("content_hash") or not doc.get("fetched_at"):
+            print(f"  ❌ Stored transcript missing content_hash/fetched_at: {doc}")
+            return False
+        print(f"  ✓ {result.format_summary()}")
+
+        # Test 3: Stored items are skipped; failed and hand-edited ones are fetched again
+        print("\n[Test 3] Skipping stored items...")
+        doc["title"] = "edited by hand"
+        (output_dir / "youtube" / "video000002.json").write_text(json.dumps(doc))
+        fetcher.calls.clear()
+        result = ingester.ingest(items)
+        if result.skipped != ["youtube:video000001"] or sorted(fetcher.calls) != ["failingvid1", "video000002"]:
+            print(f"  ❌ Expected only video000001 skipped, fetched {fetcher.calls}")
+            return False
+        if result.written != ["youtube:video000002"]:
+            print(f"  ❌ Modified file not rewritten: {result.written}")
+            return False
+        print(f"  ✓ {result.format_summary()}")
+
+        # Test 4: Refresh fetches everything, rewrites only changed content
+        print("\n[Test 4] Refresh...")
+        path = output_dir / "youtube" / "video000001.json"
+        before = path.read_text()
+        fetcher.calls.clear()
+        result = ingester.ingest(items[:2], refresh=True)
+        if sorted(fetcher.calls) != ["video000001", "video000002"] or len(result.unchanged) != 2 or result.written:
+            print(f"  ❌ Expected 2 unchanged refetches: {result.format_summary()}")
+            return False
+        if path.read_text() != before:
+            print("  ❌ Unchanged transcript was rewritten")
+            return False
+        fetcher.title = "v2"
+        result = ingester.ingest(items[:2], refresh=True)
+        if len(result.written) != 2 or json.loads(path.read_text())["title"] != "v2":
+            print(f"  ❌ Changed content not rewritten: {result.format_summary()}")
+            return False
+        print(f"  ✓ {result.format_summary()}")
+
+        # Test 5: Each Fireflies tool call takes a rate-limit slot
+        print("\n[Test 5] Rate limiting Fireflies tool calls...")
+        client = FakeClient()
+        ingester = TranscriptIngester(output_dir, client=client, workers=2)
+        limiter = CountingLimiter()
+        ingester._limiters["fireflies"] = limiter
+        meetings = [TranscriptItem("fireflies", f"01KB8EFR4YVD6TVS4B2XZV3S5{c}") for c in "NP"]
+        result = ingester.ingest(meetings)
+        if len(result.written) != 2 or client.calls != 4 or limiter.acquired != 4:
+            print(f"  ❌ {client.calls} tool calls, {limiter.acquired} acquires: {result.failed}")
+            return False
+        print(f"  ✓ {client.calls} tool calls, {limiter.acquired} limiter slots")
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    print("\n" + "=" * 60)
+    print("✅ All tests passed!")
+    print("=" * 60)
+    return True
+
+if __name__ == "__main__":
+    try:
+        success = test_transcript_ingest()
+        sys.exit(0 if success else 1)
+    except Exception as e:
+        print(f"\n❌ Test failed with exception: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)